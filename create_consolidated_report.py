@@ -1,12 +1,18 @@
 """
 Create consolidated tender sales report from extracted DSS CSV data
 Formats data to match the standard tender sales report format
+
+With --start/--end, builds the same report from Supabase (tender_daily_pivot
+view), or with --lake from DuckDB over the local Parquet lake (data/lake).
 """
 
+import argparse
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
 
+from dashboard.utils.tender_types import classify_series, display_label
+
 def create_consolidated_report(sales_summary_file, tender_type_file, output_file=None):
     """
     Create consolidated report from extracted DSS data
@@ -38,21 +44,12 @@ def create_consolidated_report(sales_summary_file, tender_type_file, output_file
     # Pivot tender type data to wide format
     print("\nProcessing tender type data...")
     
-    # Normalize tender type names to match expected format
-    tender_mapping = {
-        'Visa': 'Visa',
-        'Mastercard': 'Mastercard',
-        'Discover': 'Discover',
-        'Amex': 'Amex',
-        'Gift Card Redeem': 'Gift Card Redeem',
-        'Uber Eats': 'Uber Eats',
-        'Doordash': 'Door Dash',
-        'Door Dash': 'Door Dash',
-        'Grub Hub': 'Grubhub',
-        'Grubhub': 'Grubhub',
-    }
-    
-    df_tender['tender_type_clean'] = df_tender['tender_type'].map(tender_mapping).fillna(df_tender['tender_type'])
+    # Canonical tender category -> report column name (unmapped tenders keep their label)
+    if 'tender_category' in df_tender.columns:
+        category = df_tender['tender_category'].fillna(classify_series(df_tender['tender_type']))
+    else:
+        category = classify_series(df_tender['tender_type'])
+    df_tender['tender_type_clean'] = [display_label(label, cat) for label, cat in zip(df_tender['tender_type'], category)]
     
     # Pivot tender data
     tender_pivot = df_tender.pivot_table(
@@ -107,6 +104,66 @@ def create_consolidated_report(sales_summary_file, tender_type_file, output_file
     # Sort by Store and Date
     report_df = report_df.sort_values(['Store', 'Date']).reset_index(drop=True)
     
+    return save_report(report_df, df_merged['date'].min(), df_merged['date'].max(), output_file)
+
+
+def create_consolidated_report_from_lake(start_date, end_date, output_file=None):
+    """
+    Create the consolidated report with DuckDB over the local Parquet lake
+    (data/lake) instead of extracted Excel files - no Supabase round trips.
+    """
+    from dashboard.utils.lake_reports import connect_lake, tender_sales_report
+    
+    print("="*80)
+    print("CREATING CONSOLIDATED TENDER SALES REPORT (Parquet lake)")
+    print("="*80)
+    print()
+    
+    con = connect_lake()
+    try:
+        report_df = tender_sales_report(con, start_date, end_date)
+    finally:
+        con.close()
+    
+    if report_df.empty:
+        print(f"No sales_summary rows in the lake for {start_date} to {end_date}.")
+        return None
+    
+    min_date = datetime.strptime(str(start_date), '%Y-%m-%d')
+    max_date = datetime.strptime(str(end_date), '%Y-%m-%d')
+    return save_report(report_df, min_date, max_date, output_file)
+
+
+def create_consolidated_report_from_db(start_date, end_date, output_file=None):
+    """
+    Create the consolidated report straight from Supabase: sales_summary joined
+    once to the tender_daily_pivot view, instead of extracted Excel files.
+    """
+    from dashboard.utils.supabase_db import get_supabase_connection
+    from dashboard.utils.report_queries import load_daily_tender_sales, format_tender_sales_report
+    
+    print("="*80)
+    print("CREATING CONSOLIDATED TENDER SALES REPORT (Supabase)")
+    print("="*80)
+    print()
+    
+    conn = get_supabase_connection()
+    try:
+        report_df = format_tender_sales_report(load_daily_tender_sales(conn, start_date, end_date))
+    finally:
+        conn.close()
+    
+    if report_df.empty:
+        print(f"No sales_summary rows for {start_date} to {end_date}.")
+        return None
+    
+    min_date = datetime.strptime(str(start_date), '%Y-%m-%d')
+    max_date = datetime.strptime(str(end_date), '%Y-%m-%d')
+    return save_report(report_df, min_date, max_date, output_file)
+
+
+def save_report(report_df, min_date, max_date, output_file=None):
+    """Write the consolidated report to Excel and print summary totals."""
     # Generate output filename if not provided
     if output_file is None:
         exports_dir = Path('exports')
@@ -114,8 +171,6 @@ def create_consolidated_report(sales_summary_file, tender_type_file, output_file
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
         # Get date range from data
-        min_date = df_merged['date'].min()
-        max_date = df_merged['date'].max()
         date_range = f"{min_date.strftime('%Y%m%d')}_to_{max_date.strftime('%Y%m%d')}"
         
         output_file = exports_dir / f'tender_sales_report_{date_range}_{timestamp}.xlsx'
@@ -153,6 +208,21 @@ def create_consolidated_report(sales_summary_file, tender_type_file, output_file
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create consolidated tender sales report")
+    parser.add_argument("--start", help="Start date (YYYY-MM-DD); with --end, builds from the database")
+    parser.add_argument("--end", help="End date (YYYY-MM-DD)")
+    parser.add_argument("--lake", action="store_true",
+                        help="With --start/--end: build from the local Parquet lake with DuckDB instead of Supabase")
+    args = parser.parse_args()
+    
+    if args.lake and not (args.start and args.end):
+        parser.error("--lake requires --start and --end")
+    if args.start and args.end:
+        build = create_consolidated_report_from_lake if args.lake else create_consolidated_report_from_db
+        if build(args.start, args.end) is None:
+            exit(1)
+        exit(0)
+    
     # Find the most recent extracted files
     exports_dir = Path('exports')
     
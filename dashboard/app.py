@@ -1,7 +1,7 @@
 # streamlit_app/app.py
 
 import streamlit as st
-from utils.db import get_connection
+from utils.db import get_dashboard_connection
 from utils.exports import export_page_as_pdf
 from pathlib import Path
 import sqlite3
@@ -12,7 +12,7 @@ st.set_page_config(page_title="Dunkin Sales Dashboard", layout="wide")
 st.title("🍩 Dunkin' Donuts - Sales Insights")
 
 # --- SIDEBAR FILTERS ---
-conn = get_connection()
+conn = get_dashboard_connection()
 stores = pd.read_sql("SELECT DISTINCT store FROM sales_summary", conn)['store'].tolist()
 dates = pd.read_sql("SELECT DISTINCT date FROM sales_summary ORDER BY Date DESC", conn)['date']
 
@@ -0,0 +1,62 @@
+# dashboard/components/charts.py
+# Chart builders shared by the dashboard pages and scripts/generate_store_reports.py
+
+import plotly.express as px
+
+
+# --- Executive Summary ---
+def executive_summary_charts(df):
+    """Returns (sales trend, guest count, sales share) figures for sales_summary rows."""
+    trend = df.groupby(['date', 'store'])['net_sales'].sum().reset_index()
+    trend_fig = px.line(trend, x='date', y='net_sales', color='store', markers=True)
+
+    guest_fig = px.bar(df.groupby("store")["guest_count"].sum().reset_index(),
+                       x="store", y="guest_count", text_auto=True)
+
+    pie_fig = px.pie(df, names='store', values='net_sales', hole=0.4)
+    return trend_fig, guest_fig, pie_fig
+
+
+# --- Labor Efficiency ---
+def labor_breakdowns(df):
+    """Returns (hours, pay, % labor) per labor position for labor_metrics rows."""
+    hr_by_role = df.groupby("labor_position")["total_hours"].sum().reset_index()
+    pay_by_role = df.groupby("labor_position")["total_pay"].sum().reset_index()
+    percent_labor = df.groupby("labor_position")["percent_labor"].mean().reset_index()
+    return hr_by_role, pay_by_role, percent_labor
+
+
+def labor_charts(hr_by_role, pay_by_role, percent_labor):
+    fig_hr = px.bar(hr_by_role, x="labor_position", y="total_hours", text_auto=True)
+    fig_pay = px.bar(pay_by_role, x="labor_position", y="total_pay", text_auto=True)
+    fig_percent = px.bar(percent_labor, x="labor_position", y="percent_labor", text_auto=True)
+    return fig_hr, fig_pay, fig_percent
+
+
+# --- Tender Type ---
+def tender_breakdowns(df):
+    """Returns (totals per tender type, totals per store and tender type) for standardized tender rows."""
+    tender_totals = df.groupby("tender_type")["detail_amount"].sum().reset_index()
+    df_grouped = df.groupby(["store", "tender_type"])["detail_amount"].sum().reset_index()
+    return tender_totals, df_grouped
+
+
+def tender_charts(tender_totals, df_grouped):
+    fig_tender = px.bar(tender_totals, x="tender_type", y="detail_amount", text_auto=True)
+    fig_store = px.bar(df_grouped, x="store", y="detail_amount", color="tender_type", barmode="stack")
+    return fig_tender, fig_store
+
+
+# --- Guest Reviews ---
+def score_distribution_chart(counts, score_col, axis_label, title):
+    """Bar chart of review counts per score (output of report_queries.load_review_score_counts)."""
+    fig = px.bar(
+        x=counts[score_col],
+        y=counts['count'],
+        labels={'x': axis_label, 'y': 'Count'},
+        title=title,
+        color=counts[score_col],
+        color_continuous_scale='RdYlGn'
+    )
+    fig.update_layout(showlegend=False)
+    return fig
@@ -0,0 +1,110 @@
+# streamlit_app/pages/10_Data_Status.py
+
+import streamlit as st
+import pandas as pd
+from utils.db import get_dashboard_connection, is_replica
+from utils.coverage import POS_FEEDS
+
+st.title("🩺 Data Status")
+
+conn = get_dashboard_connection()
+
+# --- FEED SUMMARY (store x date x feed coverage matrix) ---
+st.subheader("📦 Feeds")
+summary = pd.read_sql("""
+    SELECT feed, MIN(date) AS first_date, MAX(date) AS last_date,
+           COUNT(DISTINCT date) AS days, COUNT(DISTINCT pc_number) AS stores
+    FROM feed_coverage
+    GROUP BY feed
+    ORDER BY feed
+""", conn)
+
+if summary.empty:
+    st.warning("No coverage recorded yet. Run: python scripts/refresh_coverage.py --all")
+    st.stop()
+
+st.dataframe(summary, use_container_width=True, hide_index=True)
+
+# --- DATE SELECTION ---
+max_date = pd.to_datetime(summary["last_date"]).max().date()
+min_date = pd.to_datetime(summary["first_date"]).min().date()
+date_range = st.date_input(
+    "Date Range",
+    value=(max(min_date, max_date - pd.Timedelta(days=13)), max_date),
+    min_value=min_date,
+    max_value=max_date,
+)
+if not isinstance(date_range, tuple) or len(date_range) != 2:
+    st.info("Select a start and end date.")
+    st.stop()
+start_date, end_date = date_range
+
+cov = pd.read_sql(
+    "SELECT pc_number, store, date, feed, row_count FROM feed_coverage WHERE date BETWEEN %s AND %s",
+    conn, params=(str(start_date), str(end_date)),
+)
+cov["date"] = pd.to_datetime(cov["date"]).dt.date
+
+# --- POS COMPLETENESS GRID ---
+st.subheader("🗓️ Daily Reports Loaded")
+st.caption(f"Number of the {len(POS_FEEDS)} daily DSS reports loaded per store and day.")
+
+pos = cov[cov["feed"].isin(POS_FEEDS)]
+stores = (pos[pos["feed"] == "sales_summary"]
+          .groupby("pc_number")["store"].max()
+          .to_dict())
+if not stores:
+    st.warning("No sales data in the selected range.")
+    st.stop()
+
+days = pd.date_range(start_date, end_date).date
+grid = (pos[pos["pc_number"].isin(stores)]
+        .groupby(["pc_number", "date"])["feed"].nunique()
+        .unstack("date")
+        .reindex(index=list(stores), columns=days)
+        .fillna(0)
+        .astype(int))
+grid.index = [stores[pc] or pc for pc in grid.index]
+grid.columns = [d.strftime("%m/%d") for d in grid.columns]
+
+st.dataframe(
+    grid.style.map(lambda v: "" if v == len(POS_FEEDS) else "background-color: #f8d7da"),
+    use_container_width=True,
+)
+
+# --- MISSING FEEDS ---
+st.subheader("⚠️ Missing")
+present = set(zip(pos["pc_number"], pos["date"], pos["feed"]))
+missing = [
+    {"Store": stores[pc] or pc, "Date": day, "Missing": ", ".join(f for f in POS_FEEDS if (pc, day, f) not in present)}
+    for pc in stores
+    for day in days
+    if any((pc, day, f) not in present for f in POS_FEEDS)
+]
+if missing:
+    st.dataframe(pd.DataFrame(missing).sort_values(["Date", "Store"]), use_container_width=True, hide_index=True)
+else:
+    st.success("Every store has all daily reports loaded for this range.")
+
+# --- LATEST DATA-QUALITY RUN (scripts/data_quality.py; not in the local replica) ---
+if not is_replica(conn):
+    st.subheader("🔎 Latest Data-Quality Run")
+    try:
+        run = pd.read_sql("SELECT * FROM data_quality_runs ORDER BY id DESC LIMIT 1", conn)
+    except Exception:
+        run = pd.DataFrame()
+    if run.empty:
+        st.info("No data-quality runs recorded. Run: python scripts/data_quality.py")
+    else:
+        r = run.iloc[0]
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Window", f"{r['start_date']} → {r['end_date']}")
+        c2.metric("Failures", int(r["failures"]))
+        c3.metric("Errors", int(r["errors"]))
+        results = pd.read_sql(
+            "SELECT rule, severity, store, date, value, detail FROM data_quality_results "
+            "WHERE run_id = %s ORDER BY severity, rule, date",
+            conn, params=(int(r["id"]),),
+        )
+        if not results.empty:
+            st.dataframe(results, use_container_width=True, hide_index=True)
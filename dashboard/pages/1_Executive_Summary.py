@@ -3,21 +3,19 @@
 import streamlit as st
 from utils.checkbox_multiselect import checkbox_multiselect
 import pandas as pd
-from utils.supabase_db import get_supabase_connection
+from utils.db import get_dashboard_connection
 from datetime import datetime
-import plotly.express as px
 from utils.exports import export_page_as_pdf
+from utils.pdf_export import figures_to_base64, build_report_html, html_to_pdf_bytes
+from utils.report_queries import load_sales_summary
+from components.charts import executive_summary_charts
 from io import StringIO
-import tempfile
 import subprocess
-import base64
-import os
-from weasyprint import HTML
 
 st.title("📊 Executive Summary")
 
 # --- FILTER CONTEXT ---
-conn = get_supabase_connection()
+conn = get_dashboard_connection()
 
 
 # Get available stores from the database (Postgres is case-sensitive, use lowercase column names)
@@ -73,15 +71,7 @@ if not selected_stores:
     st.warning("Please select at least one store.")
     st.stop()
 
-# Use lowercase column names and %s placeholders for Postgres
-query = """
-SELECT * FROM sales_summary
-WHERE store IN ({})
-    AND date BETWEEN %s AND %s
-""".format(
-    ",".join([f"'{store}'" for store in selected_stores])
-)
-df = pd.read_sql(query, conn, params=(str(start_date), str(end_date)))
+df = load_sales_summary(conn, selected_stores, start_date, end_date)
 
 if df.empty:
     st.warning("No data found for selected filters.")
@@ -101,52 +91,23 @@ t4.metric("Discounts Given", f"${total_discounts:,.2f}")
 
 # --- CHARTS ---
 st.markdown("---")
+fig, guest_fig, pie_fig = executive_summary_charts(df)
+
 st.subheader("Sales Trend by Store")
-trend = df.groupby(['date', 'store'])['net_sales'].sum().reset_index()
-fig = px.line(trend, x='date', y='net_sales', color='store', markers=True)
 st.plotly_chart(fig, use_container_width=True)
 
 st.subheader("Guest Count Distribution")
-guest_fig = px.bar(df.groupby("store")["guest_count"].sum().reset_index(),
-                   x="store", y="guest_count", text_auto=True)
 st.plotly_chart(guest_fig, use_container_width=True)
 
 st.subheader("Sales by Store")
-pie_fig = px.pie(df, names='store', values='net_sales', hole=0.4)
 st.plotly_chart(pie_fig, use_container_width=True)
 
 # --- EXPORT TO PDF ---
 def export_exec_summary_to_pdf():
-    with tempfile.TemporaryDirectory() as tmpdir:
-        trend_img = os.path.join(tmpdir, "trend.jpg")
-        guest_img = os.path.join(tmpdir, "guest.jpg")
-        pie_img = os.path.join(tmpdir, "pie.jpg")
-        fig.write_image(trend_img, format="jpg", scale=2)
-        guest_fig.write_image(guest_img, format="jpg", scale=2)
-        pie_fig.write_image(pie_img, format="jpg", scale=2)
-
-        def img_to_base64(img_path):
-            with open(img_path, "rb") as img_file:
-                return base64.b64encode(img_file.read()).decode()
-
-        trend_b64 = img_to_base64(trend_img)
-        guest_b64 = img_to_base64(guest_img)
-        pie_b64 = img_to_base64(pie_img)
-
-        html_content = f"""
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <style>
-                body {{ font-family: Arial, sans-serif; }}
-                h2 {{ color: #d17a22; }}
-                table {{ border-collapse: collapse; width: 100%; margin-bottom: 20px; }}
-                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: center; }}
-                th {{ background-color: #f2f2f2; }}
-                img {{ display: block; margin: 20px auto; max-width: 700px; }}
-            </style>
-        </head>
-        <body>
+    try:
+        trend_b64, guest_b64, pie_b64 = figures_to_base64([fig, guest_fig, pie_fig])
+
+        html_content = build_report_html(f"""
             <h2>Executive Summary</h2>
             <p><strong>Total Sales:</strong> ${total_sales:,.2f}</p>
             <p><strong>Guest Count:</strong> {int(total_guests):,}</p>
@@ -160,23 +121,17 @@ def export_exec_summary_to_pdf():
             <img src="data:image/jpeg;base64,{pie_b64}" />
             <h3>Raw Data</h3>
             {df.to_html(index=False)}
-        </body>
-        </html>
-        """
-
-        pdf_path = os.path.join(tmpdir, "Executive_Summary.pdf")
-        try:
-            HTML(string=html_content).write_pdf(pdf_path)
-            with open(pdf_path, "rb") as f:
-                pdf_bytes = f.read()
-            st.download_button(
-                label="📤 Download PDF",
-                data=pdf_bytes,
-                file_name="Executive_Summary.pdf",
-                mime="application/pdf"
-            )
-        except Exception as e:
-            st.error(f"PDF export failed: {e}")
+        """)
+
+        pdf_bytes = html_to_pdf_bytes(html_content)
+        st.download_button(
+            label="📤 Download PDF",
+            data=pdf_bytes,
+            file_name="Executive_Summary.pdf",
+            mime="application/pdf"
+        )
+    except Exception as e:
+        st.error(f"PDF export failed: {e}")
 
 if st.button("📤 Export This Page to PDF"):
     export_exec_summary_to_pdf()
@@ -3,7 +3,7 @@
 import streamlit as st
 from utils.checkbox_multiselect import checkbox_multiselect
 import pandas as pd
-from utils.supabase_db import get_supabase_connection
+from utils.db import get_dashboard_connection
 import plotly.express as px
 import base64
 from weasyprint import HTML
@@ -12,7 +12,7 @@ import os
 
 st.title("📦 Sales Mix Analysis")
 
-conn = get_supabase_connection()
+conn = get_dashboard_connection()
 
 # --- FILTERS ---
 store_list = pd.read_sql("SELECT DISTINCT store FROM sales_by_order_type", conn)["store"].tolist()
@@ -3,20 +3,17 @@
 import streamlit as st
 from utils.checkbox_multiselect import checkbox_multiselect
 import pandas as pd
-from utils.supabase_db import get_supabase_connection
+from utils.db import get_dashboard_connection
 import plotly.express as px
 from utils.exports import export_page_as_pdf
+from utils.pdf_export import figures_to_base64, build_report_html, html_to_pdf_bytes
 from io import StringIO
-import tempfile
 import subprocess
-import base64
-import os
-from weasyprint import HTML
 
 st.title("⏰ Sales by Daypart")
 
 # --- DB Connection ---
-conn = get_supabase_connection()
+conn = get_dashboard_connection()
 
 # --- FILTERS ---
 store_list = pd.read_sql("SELECT DISTINCT store FROM sales_by_daypart", conn)["store"].tolist()
@@ -94,37 +91,11 @@ st.plotly_chart(fig_count, use_container_width=True)
 
 # --- EXPORT TO PDF USING weasyprint ---
 def export_daypart_to_pdf():
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Save charts as images (JPEG for best compatibility)
-        sales_img = os.path.join(tmpdir, "sales.jpg")
-        check_img = os.path.join(tmpdir, "check.jpg")
-        count_img = os.path.join(tmpdir, "count.jpg")
-        fig_sales.write_image(sales_img, format="jpg", scale=2)
-        fig_check.write_image(check_img, format="jpg", scale=2)
-        fig_count.write_image(count_img, format="jpg", scale=2)
-
-        def img_to_base64(img_path):
-            with open(img_path, "rb") as img_file:
-                return base64.b64encode(img_file.read()).decode()
-
-        sales_b64 = img_to_base64(sales_img)
-        check_b64 = img_to_base64(check_img)
-        count_b64 = img_to_base64(count_img)
-
-        html_content = f"""
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <style>
-                body {{ font-family: Arial, sans-serif; }}
-                h2 {{ color: #d17a22; }}
-                table {{ border-collapse: collapse; width: 100%; margin-bottom: 20px; }}
-                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: center; }}
-                th {{ background-color: #f2f2f2; }}
-                img {{ display: block; margin: 20px auto; max-width: 700px; }}
-            </style>
-        </head>
-        <body>
+    try:
+        # Render all charts in one batch (cached per figure spec)
+        sales_b64, check_b64, count_b64 = figures_to_base64([fig_sales, fig_check, fig_count])
+
+        html_content = build_report_html(f"""
             <h2>Sales by Daypart</h2>
             <p><strong>Date Range:</strong> {start_date} to {end_date}</p>
             <p><strong>Stores:</strong> {', '.join(selected_stores)}</p>
@@ -137,23 +108,17 @@ def export_daypart_to_pdf():
             <h3>Check Count by Daypart</h3>
             <img src="data:image/jpeg;base64,{count_b64}" />
             {check_count.to_html(index=False)}
-        </body>
-        </html>
-        """
-
-        pdf_path = os.path.join(tmpdir, "Sales_by_Daypart.pdf")
-        try:
-            HTML(string=html_content).write_pdf(pdf_path)
-            with open(pdf_path, "rb") as f:
-                pdf_bytes = f.read()
-            st.download_button(
-                label="📤 Download PDF",
-                data=pdf_bytes,
-                file_name="Sales_by_Daypart.pdf",
-                mime="application/pdf"
-            )
-        except Exception as e:
-            st.error(f"PDF export failed: {e}")
+        """)
+
+        pdf_bytes = html_to_pdf_bytes(html_content)
+        st.download_button(
+            label="📤 Download PDF",
+            data=pdf_bytes,
+            file_name="Sales_by_Daypart.pdf",
+            mime="application/pdf"
+        )
+    except Exception as e:
+        st.error(f"PDF export failed: {e}")
 
 if st.button("📤 Export This Page to PDF"):
     export_daypart_to_pdf()
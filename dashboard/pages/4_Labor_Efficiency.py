@@ -3,16 +3,14 @@
 import streamlit as st
 from utils.checkbox_multiselect import checkbox_multiselect
 import pandas as pd
-from utils.supabase_db import get_supabase_connection
-import plotly.express as px
-import tempfile
-import base64
-import os
-from weasyprint import HTML
+from utils.db import get_dashboard_connection
+from utils.pdf_export import figures_to_base64, build_report_html, html_to_pdf_bytes
+from utils.report_queries import load_labor_metrics
+from components.charts import labor_breakdowns, labor_charts
 
 st.title("👷 Labor Efficiency Analysis")
 
-conn = get_supabase_connection()
+conn = get_dashboard_connection()
 
 # --- FILTERS ---
 store_list = pd.read_sql("SELECT DISTINCT store FROM labor_metrics", conn)["store"].tolist()
@@ -62,11 +60,7 @@ if not selected_stores:
     st.warning("Please select at least one store.")
     st.stop()
 
-query = """
-SELECT * FROM labor_metrics
-WHERE store IN ({}) AND date BETWEEN %s AND %s
-""".format(",".join([f"'{s}'" for s in selected_stores]))
-df = pd.read_sql(query, conn, params=(str(start_date), str(end_date)))
+df = load_labor_metrics(conn, selected_stores, start_date, end_date)
 
 if df.empty:
     st.warning("No labor data for selected filters.")
@@ -84,53 +78,24 @@ c3.metric("Avg % Labor", f"{avg_percent_labor:.2%}")
 
 # --- Charts ---
 st.markdown("---")
+hr_by_role, pay_by_role, percent_labor = labor_breakdowns(df)
+fig_hr, fig_pay, fig_percent = labor_charts(hr_by_role, pay_by_role, percent_labor)
+
 st.subheader("Total Hours by Labor Position")
-hr_by_role = df.groupby("labor_position")["total_hours"].sum().reset_index()
-fig_hr = px.bar(hr_by_role, x="labor_position", y="total_hours", text_auto=True)
 st.plotly_chart(fig_hr, use_container_width=True)
 
 st.subheader("Total Pay by Labor Position")
-pay_by_role = df.groupby("labor_position")["total_pay"].sum().reset_index()
-fig_pay = px.bar(pay_by_role, x="labor_position", y="total_pay", text_auto=True)
 st.plotly_chart(fig_pay, use_container_width=True)
 
 st.subheader("Labor % by Position")
-percent_labor = df.groupby("labor_position")["percent_labor"].mean().reset_index()
-fig_percent = px.bar(percent_labor, x="labor_position", y="percent_labor", text_auto=True)
 st.plotly_chart(fig_percent, use_container_width=True)
 
 # --- EXPORT TO PDF ---
 def export_labor_to_pdf():
-    with tempfile.TemporaryDirectory() as tmpdir:
-        hr_img = os.path.join(tmpdir, "hr.jpg")
-        pay_img = os.path.join(tmpdir, "pay.jpg")
-        percent_img = os.path.join(tmpdir, "percent.jpg")
-        fig_hr.write_image(hr_img, format="jpg", scale=2)
-        fig_pay.write_image(pay_img, format="jpg", scale=2)
-        fig_percent.write_image(percent_img, format="jpg", scale=2)
-
-        def img_to_base64(img_path):
-            with open(img_path, "rb") as img_file:
-                return base64.b64encode(img_file.read()).decode()
-
-        hr_b64 = img_to_base64(hr_img)
-        pay_b64 = img_to_base64(pay_img)
-        percent_b64 = img_to_base64(percent_img)
-
-        html_content = f"""
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <style>
-                body {{ font-family: Arial, sans-serif; }}
-                h2 {{ color: #d17a22; }}
-                table {{ border-collapse: collapse; width: 100%; margin-bottom: 20px; }}
-                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: center; }}
-                th {{ background-color: #f2f2f2; }}
-                img {{ display: block; margin: 20px auto; max-width: 700px; }}
-            </style>
-        </head>
-        <body>
+    try:
+        hr_b64, pay_b64, percent_b64 = figures_to_base64([fig_hr, fig_pay, fig_percent])
+
+        html_content = build_report_html(f"""
             <h2>Labor Efficiency Analysis</h2>
             <p><strong>Date Range:</strong> {start_date} to {end_date}</p>
             <p><strong>Stores:</strong> {', '.join(selected_stores)}</p>
@@ -143,23 +108,17 @@ def export_labor_to_pdf():
             <h3>Labor % by Position</h3>
             <img src="data:image/jpeg;base64,{percent_b64}" />
             {percent_labor.to_html(index=False)}
-        </body>
-        </html>
-        """
-
-        pdf_path = os.path.join(tmpdir, "Labor_Efficiency.pdf")
-        try:
-            HTML(string=html_content).write_pdf(pdf_path)
-            with open(pdf_path, "rb") as f:
-                pdf_bytes = f.read()
-            st.download_button(
-                label="📤 Download PDF",
-                data=pdf_bytes,
-                file_name="Labor_Efficiency.pdf",
-                mime="application/pdf"
-            )
-        except Exception as e:
-            st.error(f"PDF export failed: {e}")
+        """)
+
+        pdf_bytes = html_to_pdf_bytes(html_content)
+        st.download_button(
+            label="📤 Download PDF",
+            data=pdf_bytes,
+            file_name="Labor_Efficiency.pdf",
+            mime="application/pdf"
+        )
+    except Exception as e:
+        st.error(f"PDF export failed: {e}")
 
 if st.button("📤 Export This Page to PDF"):
     export_labor_to_pdf()
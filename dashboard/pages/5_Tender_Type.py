@@ -3,16 +3,14 @@
 import streamlit as st
 from utils.checkbox_multiselect import checkbox_multiselect
 import pandas as pd
-import plotly.express as px
-from utils.supabase_db import get_supabase_connection
-import tempfile
-import base64
-import os
-from weasyprint import HTML
+from utils.db import get_dashboard_connection
+from utils.pdf_export import figures_to_base64, build_report_html, html_to_pdf_bytes
+from utils.report_queries import load_tender_metrics
+from components.charts import tender_breakdowns, tender_charts
 
 st.title("💳 Tender Type Analysis")
 
-conn = get_supabase_connection()
+conn = get_dashboard_connection()
 
 # --- FILTERS ---
 store_list = pd.read_sql("SELECT DISTINCT store FROM tender_type_metrics", conn)["store"].tolist()
@@ -62,72 +60,29 @@ if not selected_stores:
     st.warning("Please select at least one store.")
     st.stop()
 
-query = """
-SELECT * FROM tender_type_metrics
-WHERE store IN ({}) AND date BETWEEN %s AND %s
-""".format(",".join([f"'{s}'" for s in selected_stores]))
-df = pd.read_sql(query, conn, params=(str(start_date), str(end_date)))
+df = load_tender_metrics(conn, selected_stores, start_date, end_date)
 
 if df.empty:
     st.warning("No tender data found for selected filters.")
     st.stop()
 
-# --- Tender Type Standardization ---
-rename_map = {
-    "4000059 crdit card - discover": "Discover",
-    "4000061 credit card - visa": "Visa",
-    "4000060 credit card - mastercard": "Mastercard",
-    "4000058 credir card - amex": "Amex",
-    "4000065 gift card redeem": "GC Redeem",
-    "4000098": "Grubhub",
-    "4000106": "Uber Eats",
-    "4000107": "Doordash",
-    "4000097": "GC Redeem Offline"
-}
-df = df[~df['tender_type'].str.lower().str.contains("gl")]  # Remove GL lines
-df['tender_type'] = df['tender_type'].str.lower().replace(rename_map)
+tender_totals, df_grouped = tender_breakdowns(df)
+fig_tender, fig_store = tender_charts(tender_totals, df_grouped)
 
 # --- Summary Chart ---
 st.subheader("Total Amount by Tender Type")
-tender_totals = df.groupby("tender_type")["detail_amount"].sum().reset_index()
-fig_tender = px.bar(tender_totals, x="tender_type", y="detail_amount", text_auto=True)
 st.plotly_chart(fig_tender, use_container_width=True)
 
 # --- Store-Level Comparison ---
 st.subheader("Tender Breakdown by Store")
-df_grouped = df.groupby(["store", "tender_type"])["detail_amount"].sum().reset_index()
-fig_store = px.bar(df_grouped, x="store", y="detail_amount", color="tender_type", barmode="stack")
 st.plotly_chart(fig_store, use_container_width=True)
 
 # --- EXPORT TO PDF ---
 def export_tender_to_pdf():
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tender_img = os.path.join(tmpdir, "tender.jpg")
-        store_img = os.path.join(tmpdir, "store.jpg")
-        fig_tender.write_image(tender_img, format="jpg", scale=2)
-        fig_store.write_image(store_img, format="jpg", scale=2)
-
-        def img_to_base64(img_path):
-            with open(img_path, "rb") as img_file:
-                return base64.b64encode(img_file.read()).decode()
-
-        tender_b64 = img_to_base64(tender_img)
-        store_b64 = img_to_base64(store_img)
-
-        html_content = f"""
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <style>
-                body {{ font-family: Arial, sans-serif; }}
-                h2 {{ color: #d17a22; }}
-                table {{ border-collapse: collapse; width: 100%; margin-bottom: 20px; }}
-                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: center; }}
-                th {{ background-color: #f2f2f2; }}
-                img {{ display: block; margin: 20px auto; max-width: 700px; }}
-            </style>
-        </head>
-        <body>
+    try:
+        tender_b64, store_b64 = figures_to_base64([fig_tender, fig_store])
+
+        html_content = build_report_html(f"""
             <h2>Tender Type Analysis</h2>
             <p><strong>Date Range:</strong> {start_date} to {end_date}</p>
             <p><strong>Stores:</strong> {', '.join(selected_stores)}</p>
@@ -137,23 +92,17 @@ def export_tender_to_pdf():
             <h3>Tender Breakdown by Store</h3>
             <img src="data:image/jpeg;base64,{store_b64}" />
             {df_grouped.to_html(index=False)}
-        </body>
-        </html>
-        """
-
-        pdf_path = os.path.join(tmpdir, "Tender_Type_Analysis.pdf")
-        try:
-            HTML(string=html_content).write_pdf(pdf_path)
-            with open(pdf_path, "rb") as f:
-                pdf_bytes = f.read()
-            st.download_button(
-                label="📤 Download PDF",
-                data=pdf_bytes,
-                file_name="Tender_Type_Analysis.pdf",
-                mime="application/pdf"
-            )
-        except Exception as e:
-            st.error(f"PDF export failed: {e}")
+        """)
+
+        pdf_bytes = html_to_pdf_bytes(html_content)
+        st.download_button(
+            label="📤 Download PDF",
+            data=pdf_bytes,
+            file_name="Tender_Type_Analysis.pdf",
+            mime="application/pdf"
+        )
+    except Exception as e:
+        st.error(f"PDF export failed: {e}")
 
 if st.button("📤 Export This Page to PDF"):
     export_tender_to_pdf()
@@ -4,15 +4,12 @@ import streamlit as st
 from utils.checkbox_multiselect import checkbox_multiselect
 import pandas as pd
 import plotly.express as px
-from utils.supabase_db import get_supabase_connection
-import tempfile
-import base64
-import os
-from weasyprint import HTML
+from utils.db import get_dashboard_connection
+from utils.pdf_export import figures_to_base64, build_report_html, html_to_pdf_bytes
 
 st.title("🏪 Store Comparison Dashboard")
 
-conn = get_supabase_connection()
+conn = get_dashboard_connection()
 
 # --- FILTERS ---
 store_list = pd.read_sql("SELECT DISTINCT store FROM sales_summary", conn)["store"].tolist()
@@ -123,24 +120,10 @@ st.plotly_chart(fig_misc, use_container_width=True)
 
 # --- EXPORT TO PDF ---
 def export_store_comparison_to_pdf():
-    with tempfile.TemporaryDirectory() as tmpdir:
-        sales_img = os.path.join(tmpdir, "sales.jpg")
-        guests_img = os.path.join(tmpdir, "guests.jpg")
-        check_img = os.path.join(tmpdir, "check.jpg")
-        misc_img = os.path.join(tmpdir, "misc.jpg")
-        fig_sales.write_image(sales_img, format="jpg", scale=2)
-        fig_guests.write_image(guests_img, format="jpg", scale=2)
-        fig_check.write_image(check_img, format="jpg", scale=2)
-        fig_misc.write_image(misc_img, format="jpg", scale=2)
-
-        def img_to_base64(img_path):
-            with open(img_path, "rb") as img_file:
-                return base64.b64encode(img_file.read()).decode()
-
-        sales_b64 = img_to_base64(sales_img)
-        guests_b64 = img_to_base64(guests_img)
-        check_b64 = img_to_base64(check_img)
-        misc_b64 = img_to_base64(misc_img)
+    try:
+        sales_b64, guests_b64, check_b64, misc_b64 = figures_to_base64(
+            [fig_sales, fig_guests, fig_check, fig_misc]
+        )
 
         # Format date selection info for PDF
         if start_date == end_date:
@@ -148,20 +131,7 @@ def export_store_comparison_to_pdf():
         else:
             date_info = f"Date Range: {start_date} to {end_date}"
 
-        html_content = f"""
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <style>
-                body {{ font-family: Arial, sans-serif; }}
-                h2 {{ color: #d17a22; }}
-                table {{ border-collapse: collapse; width: 100%; margin-bottom: 20px; }}
-                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: center; }}
-                th {{ background-color: #f2f2f2; }}
-                img {{ display: block; margin: 20px auto; max-width: 700px; }}
-            </style>
-        </head>
-        <body>
+        html_content = build_report_html(f"""
             <h2>Store Comparison Dashboard</h2>
             <p><strong>{date_info}</strong></p>
             <p><strong>Stores:</strong> {', '.join(selected_stores)}</p>
@@ -175,23 +145,17 @@ def export_store_comparison_to_pdf():
             <img src="data:image/jpeg;base64,{misc_b64}" />
             <h3>Aggregated Data</h3>
             {grouped.to_html(index=False)}
-        </body>
-        </html>
-        """
-
-        pdf_path = os.path.join(tmpdir, "Store_Comparison.pdf")
-        try:
-            HTML(string=html_content).write_pdf(pdf_path)
-            with open(pdf_path, "rb") as f:
-                pdf_bytes = f.read()
-            st.download_button(
-                label="📤 Download PDF",
-                data=pdf_bytes,
-                file_name="Store_Comparison.pdf",
-                mime="application/pdf"
-            )
-        except Exception as e:
-            st.error(f"PDF export failed: {e}")
+        """)
+
+        pdf_bytes = html_to_pdf_bytes(html_content)
+        st.download_button(
+            label="📤 Download PDF",
+            data=pdf_bytes,
+            file_name="Store_Comparison.pdf",
+            mime="application/pdf"
+        )
+    except Exception as e:
+        st.error(f"PDF export failed: {e}")
 
 if st.button("📤 Export This Page to PDF"):
     export_store_comparison_to_pdf()
@@ -2,7 +2,10 @@ import streamlit as st
 from utils.checkbox_multiselect import checkbox_multiselect
 import pandas as pd
 import plotly.express as px
+from utils.db import get_dashboard_connection
 from utils.supabase_db import get_supabase_connection
+from utils.report_queries import load_daily_tender_sales, REPORT_TENDER_CATEGORIES
+from utils.tender_types import tender_display_name
 import tempfile
 import base64
 import os
@@ -13,7 +16,7 @@ st.set_page_config(page_title="Cash Reconciliation", layout="wide")
 
 st.title("💵 Cash Reconciliation")
 
-conn = get_supabase_connection()
+conn = get_dashboard_connection()
 
 # --- FILTERS ---
 store_list = pd.read_sql("SELECT DISTINCT store FROM sales_summary", conn)["store"].tolist()
@@ -59,13 +62,6 @@ if not selected_stores:
     st.warning("Please select at least one store.")
     st.stop()
 
-query = """
-SELECT store, date, cash_in, paid_in, paid_out
-FROM sales_summary
-WHERE store IN ({}) AND date BETWEEN %s AND %s
-""".format(",".join([f"'{s}'" for s in selected_stores]))
-
-
 # --- Supabase latest data check ---
 try:
     supabase_conn = get_supabase_connection()
@@ -73,7 +69,8 @@ try:
     st.info(f"Latest date in Supabase sales_summary: **{supabase_latest}**")
 except Exception as e:
     st.warning(f"Could not connect to Supabase or fetch data: {e}")
-df = pd.read_sql(query, conn, params=(str(start_date), str(end_date)))
+# Cash columns plus the day's tenders (sales_summary joined once to tender_daily_pivot)
+df = load_daily_tender_sales(conn, start_date, end_date, selected_stores)
 
 if df.empty:
     st.warning("No cash data found for selected filters.")
@@ -116,6 +113,17 @@ fig_date = px.line(recon_by_date_store, x="date", y="net_cash_recon", color="sto
 fig_date.update_layout(hovermode='x unified')
 st.plotly_chart(fig_date, use_container_width=True)
 
+st.subheader("Tender Breakdown by Store")
+tender_cols = {c: tender_display_name(c) for c in REPORT_TENDER_CATEGORIES}
+for col in tender_cols:
+    df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+tender_by_store = (
+    df.groupby("store")[["cash_in"] + list(tender_cols)].sum()
+    .rename(columns={"cash_in": "Cash Due", **tender_cols})
+)
+tender_by_store.loc["Total"] = tender_by_store.sum()
+st.dataframe(tender_by_store.style.format("${:,.2f}"))
+
 st.subheader("Cash Reconciliation Pivot Table (Date x Store)")
 st.info("📊 **Note:** This table shows ALL available data regardless of date/store filters above")
 st.info("💡 **Formula:** Cash In + Paid In - Paid Out")
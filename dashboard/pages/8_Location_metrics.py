@@ -1,11 +1,11 @@
 import streamlit as st
 from utils.checkbox_multiselect import checkbox_multiselect
 import pandas as pd
-from utils.supabase_db import get_supabase_connection
+from utils.db import get_dashboard_connection
 
 st.title("💵 Payroll Metrics Dashboard")
 
-conn = get_supabase_connection()
+conn = get_dashboard_connection()
 
 # --- FILTERS ---
 store_list = pd.read_sql("SELECT DISTINCT store FROM labor_metrics", conn)["store"].tolist()
@@ -2,7 +2,6 @@
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import sys
@@ -11,8 +10,10 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from utils.supabase_db import get_supabase_connection
+from utils.db import get_dashboard_connection, is_replica
 from utils.checkbox_multiselect import checkbox_multiselect
+from utils.report_queries import review_filter_clause, load_review_kpis, load_review_score_counts
+from components.charts import score_distribution_chart
 
 st.set_page_config(page_title="Guest Reviews", page_icon="💬", layout="wide")
 
@@ -21,7 +22,7 @@ st.markdown("Analysis of customer feedback from Medallia surveys")
 
 # --- DATABASE CONNECTION ---
 try:
-    conn = get_supabase_connection()
+    conn = get_dashboard_connection()
 except Exception as e:
     st.error(f"Failed to connect to database: {e}")
     st.stop()
@@ -119,55 +120,57 @@ channel_filter = st.sidebar.multiselect(
     default=["In-store", "Other"]
 )
 
-# --- LOAD DATA ---
-placeholders = ','.join(['%s'] * len(selected_pcs))
-accuracy_placeholders = ','.join(['%s'] * len(accuracy_filter))
-channel_placeholders = ','.join(['%s'] * len(channel_filter))
-
-query = f"""
-    SELECT *
-    FROM medallia_reports
-    WHERE report_date BETWEEN %s AND %s
-    AND pc_number IN ({placeholders})
-    AND osat >= %s
-    AND ltr >= %s
-    AND accuracy IN ({accuracy_placeholders})
-    AND order_channel IN ({channel_placeholders})
-    ORDER BY response_datetime DESC
-"""
-
-params = [start_date, end_date] + selected_pcs + [min_osat, min_ltr] + accuracy_filter + channel_filter
+# Comment search (ranked full-text query against the comment_tsv GIN index)
+search_text = st.sidebar.text_input(
+    "Search Comments",
+    placeholder="e.g. cold coffee",
+    help="Full-text search over review comments, most relevant first"
+).strip()
+
+# --- FILTER CLAUSE ---
+# Every query below shares this WHERE clause; only aggregates and the visible
+# page of reviews are ever fetched, so transfer stays flat for any date range.
+where_clause, where_params = review_filter_clause(
+    start_date, end_date, selected_pcs,
+    min_osat=min_osat, min_ltr=min_ltr,
+    accuracy=accuracy_filter, channels=channel_filter,
+    search_text=search_text,
+    full_text=not is_replica(conn)
+)
 
-df = pd.read_sql(query, conn, params=params)
+# --- LOAD KPIs ---
+kpis = load_review_kpis(conn, where_clause, where_params)
+total_reviews = int(kpis['total_reviews'])
 
-if df.empty:
-    st.warning("No reviews found matching the selected filters")
+if total_reviews == 0:
+    if search_text:
+        st.warning(f"No reviews found matching \"{search_text}\" with the selected filters")
+    else:
+        st.warning("No reviews found matching the selected filters")
     st.stop()
 
+if search_text:
+    st.info(f"🔎 {total_reviews:,} review(s) match \"{search_text}\", most relevant first")
+
 # --- METRICS SECTION ---
 st.header("📊 Overview Metrics")
 
 col1, col2, col3, col4, col5 = st.columns(5)
 
 with col1:
-    total_reviews = len(df)
     st.metric("Total Reviews", f"{total_reviews:,}")
 
 with col2:
-    avg_osat = df['osat'].mean()
-    st.metric("Avg OSAT", f"{avg_osat:.2f}/5")
+    st.metric("Avg OSAT", f"{kpis['avg_osat']:.2f}/5")
 
 with col3:
-    avg_ltr = df['ltr'].mean()
-    st.metric("Avg LTR", f"{avg_ltr:.1f}/10")
+    st.metric("Avg LTR", f"{kpis['avg_ltr']:.1f}/10")
 
 with col4:
-    accuracy_rate = (df['accuracy'] == 'Yes').sum() / len(df) * 100
-    st.metric("Accuracy Rate", f"{accuracy_rate:.1f}%")
+    st.metric("Accuracy Rate", f"{kpis['accuracy_rate']:.1f}%")
 
 with col5:
-    promoters = (df['ltr'] >= 9).sum() / len(df) * 100
-    st.metric("Promoters %", f"{promoters:.1f}%")
+    st.metric("Promoters %", f"{kpis['promoters_pct']:.1f}%")
 
 st.divider()
 
@@ -178,39 +181,25 @@ chart_col1, chart_col2 = st.columns(2)
 
 with chart_col1:
     # OSAT Distribution
-    osat_counts = df['osat'].value_counts().sort_index()
-    fig_osat = px.bar(
-        x=osat_counts.index,
-        y=osat_counts.values,
-        labels={'x': 'OSAT Score', 'y': 'Count'},
-        title='OSAT Score Distribution',
-        color=osat_counts.index,
-        color_continuous_scale='RdYlGn'
-    )
-    fig_osat.update_layout(showlegend=False)
+    osat_counts = load_review_score_counts(conn, where_clause, where_params, 'osat')
+    fig_osat = score_distribution_chart(osat_counts, 'osat', 'OSAT Score', 'OSAT Score Distribution')
     st.plotly_chart(fig_osat, use_container_width=True)
 
 with chart_col2:
     # LTR Distribution
-    ltr_counts = df['ltr'].value_counts().sort_index()
-    fig_ltr = px.bar(
-        x=ltr_counts.index,
-        y=ltr_counts.values,
-        labels={'x': 'LTR Score', 'y': 'Count'},
-        title='Likelihood to Return Distribution',
-        color=ltr_counts.index,
-        color_continuous_scale='RdYlGn'
-    )
-    fig_ltr.update_layout(showlegend=False)
+    ltr_counts = load_review_score_counts(conn, where_clause, where_params, 'ltr')
+    fig_ltr = score_distribution_chart(ltr_counts, 'ltr', 'LTR Score', 'Likelihood to Return Distribution')
     st.plotly_chart(fig_ltr, use_container_width=True)
 
 # Scores over time
-df['report_date'] = pd.to_datetime(df['report_date'])
-daily_scores = df.groupby('report_date').agg({
-    'osat': 'mean',
-    'ltr': 'mean',
-    'id': 'count'
-}).reset_index()
+daily_scores = pd.read_sql(f"""
+    SELECT report_date, AVG(osat) AS avg_osat, AVG(ltr) AS avg_ltr, COUNT(*) AS review_count
+    FROM medallia_reports
+    {where_clause}
+    GROUP BY report_date
+    ORDER BY report_date
+""", conn, params=where_params)
+daily_scores['report_date'] = pd.to_datetime(daily_scores['report_date'])
 daily_scores.columns = ['Date', 'Avg OSAT', 'Avg LTR', 'Review Count']
 
 fig_timeline = go.Figure()
@@ -239,13 +228,14 @@ fig_timeline.update_layout(
 st.plotly_chart(fig_timeline, use_container_width=True)
 
 # Store comparison
-store_scores = df.groupby('pc_number').agg({
-    'osat': 'mean',
-    'ltr': 'mean',
-    'id': 'count'
-}).reset_index()
+store_scores = pd.read_sql(f"""
+    SELECT pc_number, AVG(osat) AS avg_osat, AVG(ltr) AS avg_ltr, COUNT(*) AS count
+    FROM medallia_reports
+    {where_clause}
+    GROUP BY pc_number
+    ORDER BY avg_osat DESC
+""", conn, params=where_params)
 store_scores.columns = ['Store', 'Avg OSAT', 'Avg LTR', 'Count']
-store_scores = store_scores.sort_values('Avg OSAT', ascending=False)
 
 fig_stores = go.Figure()
 fig_stores.add_trace(go.Bar(
@@ -268,25 +258,100 @@ st.divider()
 st.header("💬 Individual Reviews")
 
 # View options
-view_option = st.radio(
-    "Filter by sentiment:",
-    ["All Reviews", "Positive (OSAT 4-5, LTR 7-10)", "Negative (OSAT 1-2, LTR 0-5)", "Order Accuracy Issues"],
-    horizontal=True
-)
+view_clauses = {
+    "All Reviews": "",
+    "Positive (OSAT 4-5, LTR 7-10)": "AND osat >= 4 AND ltr >= 7",
+    "Negative (OSAT 1-2, LTR 0-5)": "AND (osat <= 2 OR ltr <= 5)",
+    "Order Accuracy Issues": "AND accuracy = 'No'",
+}
+
+view_col, size_col = st.columns([4, 1])
+with view_col:
+    view_option = st.radio(
+        "Filter by sentiment:",
+        list(view_clauses.keys()),
+        horizontal=True
+    )
+with size_col:
+    page_size = st.selectbox("Reviews per page", [25, 50, 100], index=1)
 
-display_df = df.copy()
+view_clause = view_clauses[view_option]
 
-if view_option == "Positive (OSAT 4-5, LTR 7-10)":
-    display_df = display_df[(display_df['osat'] >= 4) & (display_df['ltr'] >= 7)]
-elif view_option == "Negative (OSAT 1-2, LTR 0-5)":
-    display_df = display_df[(display_df['osat'] <= 2) | (display_df['ltr'] <= 5)]
-elif view_option == "Order Accuracy Issues":
-    display_df = display_df[display_df['accuracy'] == 'No']
+view_count = int(pd.read_sql(f"""
+    SELECT COUNT(*) AS count
+    FROM medallia_reports
+    {where_clause}
+    {view_clause}
+""", conn, params=where_params)['count'].iloc[0])
+
+# Keyset pagination on (response_datetime, id), newest first. When searching,
+# relevance leads the key so pages still come back most relevant first.
+review_columns = """id, report_date, pc_number, restaurant_address, order_channel,
+           transaction_datetime, response_datetime, osat, ltr, accuracy, comment"""
+
+if search_text and not is_replica(conn):
+    # ts_rank is float4; as float8 it round-trips exactly through the Python
+    # float in the cursor, so page boundaries neither skip nor repeat rows
+    rank_expr = "ts_rank(comment_tsv, websearch_to_tsquery('english', %s))::float8"
+    select_sql = f"{review_columns}, {rank_expr} AS search_rank"
+    select_params = [search_text]
+    key_columns = ['search_rank', 'response_datetime', 'id']
+    key_sql = f"({rank_expr}, response_datetime, id)"
+    key_placeholders = "%s::float8, %s, %s"
+    key_params = [search_text]
+else:
+    select_sql = review_columns
+    select_params = []
+    key_columns = ['response_datetime', 'id']
+    key_sql = "(response_datetime, id)"
+    key_placeholders = "%s, %s"
+    key_params = []
+
+# Start over from the first page whenever the filters or page size change
+page_signature = tuple(str(p) for p in where_params) + (view_option, page_size)
+if st.session_state.get("reviews_page_signature") != page_signature:
+    st.session_state["reviews_page_signature"] = page_signature
+    st.session_state["reviews_page_cursors"] = [None]
+
+page_cursors = st.session_state["reviews_page_cursors"]
+cursor = page_cursors[-1]
+
+if cursor is None:
+    cursor_clause = ""
+    cursor_params = []
+else:
+    cursor_clause = f"AND {key_sql} < ({key_placeholders})"
+    cursor_params = key_params + list(cursor)
 
-st.write(f"Showing {len(display_df)} review(s)")
+page_query = f"""
+    SELECT {select_sql}
+    FROM medallia_reports
+    {where_clause}
+    {view_clause}
+    {cursor_clause}
+    ORDER BY {', '.join(f'{c} DESC' for c in key_columns)}
+    LIMIT %s
+"""
+
+# Fetch one extra row to know whether an older page exists
+page_df = pd.read_sql(
+    page_query, conn,
+    params=select_params + where_params + cursor_params + [page_size + 1]
+)
+has_next_page = len(page_df) > page_size
+page_df = page_df.head(page_size)
+
+page_number = len(page_cursors)
+first_shown = (page_number - 1) * page_size + 1
+last_shown = first_shown + len(page_df) - 1
+
+if page_df.empty:
+    st.write("Showing 0 review(s)")
+else:
+    st.write(f"Showing reviews {first_shown:,}–{last_shown:,} of {view_count:,}")
 
 # Display reviews as cards
-for idx, row in display_df.head(50).iterrows():
+for idx, row in page_df.iterrows():
     with st.container():
         col1, col2, col3 = st.columns([2, 1, 1])
         
@@ -315,8 +380,30 @@ for idx, row in display_df.head(50).iterrows():
         
         st.divider()
 
-if len(display_df) > 50:
-    st.info(f"Showing first 50 reviews. Total matching reviews: {len(display_df)}")
+# Page navigation
+nav_col1, nav_col2, nav_col3 = st.columns([1, 2, 1])
+with nav_col1:
+    if st.button("◀ Newer", disabled=page_number == 1):
+        page_cursors.pop()
+        st.rerun()
+with nav_col2:
+    total_pages = max(1, -(-view_count // page_size))
+    st.markdown(f"Page {page_number} of {total_pages}")
+with nav_col3:
+    if st.button("Older ▶", disabled=not has_next_page):
+        last_row = page_df.iloc[-1]
+        next_cursor = []
+        for c in key_columns:
+            value = last_row[c]
+            if c == 'response_datetime':
+                value = value.to_pydatetime()
+            elif c == 'id':
+                value = int(value)
+            else:
+                value = float(value)
+            next_cursor.append(value)
+        page_cursors.append(tuple(next_cursor))
+        st.rerun()
 
 # --- EXPORT SECTION ---
 st.divider()
@@ -325,19 +412,63 @@ st.header("📥 Export Data")
 col1, col2 = st.columns(2)
 
 with col1:
-    # CSV export
-    csv = display_df.to_csv(index=False)
-    st.download_button(
-        label="Download as CSV",
-        data=csv,
-        file_name=f"guest_reviews_{start_date}_to_{end_date}.csv",
-        mime="text/csv"
-    )
+    # CSV export (full result set is only fetched on request, then kept for the
+    # current filters so the download button survives the rerun its click causes)
+    export_signature = tuple(str(p) for p in where_params) + (view_option,)
+    if st.button("Prepare CSV Export"):
+        export_df = pd.read_sql(f"""
+            SELECT {review_columns}
+            FROM medallia_reports
+            {where_clause}
+            {view_clause}
+            ORDER BY response_datetime DESC, id DESC
+        """, conn, params=where_params)
+        st.session_state["reviews_export"] = (export_signature, export_df.to_csv(index=False))
+
+    prepared = st.session_state.get("reviews_export")
+    if prepared and prepared[0] == export_signature:
+        st.download_button(
+            label="Download as CSV",
+            data=prepared[1],
+            file_name=f"guest_reviews_{start_date}_to_{end_date}.csv",
+            mime="text/csv"
+        )
 
 with col2:
     # Summary stats
     if st.button("Show Summary Statistics"):
         st.subheader("Summary Statistics")
-        st.dataframe(df[['osat', 'ltr']].describe())
+        if is_replica(conn):
+            # SQLite has no STDDEV/PERCENTILE_CONT; two small int columns are cheap to pull
+            stats_df = pd.read_sql(f"""
+                SELECT osat, ltr
+                FROM medallia_reports
+                {where_clause}
+            """, conn, params=where_params).describe()
+        else:
+            stat_exprs = []
+            for col in ['osat', 'ltr']:
+                stat_exprs += [
+                    f"COUNT({col}) AS {col}_count",
+                    f"AVG({col}) AS {col}_mean",
+                    f"STDDEV_SAMP({col}) AS {col}_std",
+                    f"MIN({col}) AS {col}_min",
+                    f"PERCENTILE_CONT(0.25) WITHIN GROUP (ORDER BY {col}) AS {col}_25",
+                    f"PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY {col}) AS {col}_50",
+                    f"PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY {col}) AS {col}_75",
+                    f"MAX({col}) AS {col}_max",
+                ]
+            stats_row = pd.read_sql(f"""
+                SELECT {', '.join(stat_exprs)}
+                FROM medallia_reports
+                {where_clause}
+            """, conn, params=where_params).iloc[0]
+            stat_names = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+            stat_suffixes = ['count', 'mean', 'std', 'min', '25', '50', '75', 'max']
+            stats_df = pd.DataFrame(
+                {col: [stats_row[f"{col}_{s}"] for s in stat_suffixes] for col in ['osat', 'ltr']},
+                index=stat_names
+            )
+        st.dataframe(stats_df)
 
 conn.close()
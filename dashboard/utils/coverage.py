@@ -0,0 +1,171 @@
+# dashboard/utils/coverage.py
+# The store x date x feed coverage matrix (feed_coverage, db/migrations/0007_feed_coverage.sql).
+#
+# Loaders call refresh_coverage() for the feed and dates they just wrote; readers
+# (batch_processor, scripts/data_quality.py, the Data Status page) ask
+# missing_coverage() / loaded_dates() instead of scanning the fact tables.
+#
+# All functions take an open psycopg2 cursor and leave committing to the caller.
+
+from __future__ import annotations
+
+# feed -> (table, pc number column, date column, store name column or None)
+FEEDS = {
+    "sales_summary": ("sales_summary", "pc_number", "date", "store"),
+    "tender_type_metrics": ("tender_type_metrics", "pc_number", "date", "store"),
+    "labor_metrics": ("labor_metrics", "pc_number", "date", "store"),
+    "sales_by_daypart": ("sales_by_daypart", "pc_number", "date", "store"),
+    "sales_by_subcategory": ("sales_by_subcategory", "pc_number", "date", "store"),
+    "sales_by_order_type": ("sales_by_order_type", "pc_number", "date", "store"),
+    "hme_report": ("hme_report", "store", "date", None),
+    "medallia_reports": ("medallia_reports", "pc_number", "report_date", None),
+}
+
+# The six DSS reports every store sends every day
+POS_FEEDS = [
+    "sales_summary",
+    "tender_type_metrics",
+    "labor_metrics",
+    "sales_by_daypart",
+    "sales_by_subcategory",
+    "sales_by_order_type",
+]
+
+# loaded_dates(): a store reporting within this many days of a date is expected on it
+STORE_WINDOW_DAYS = 7
+
+
+def _source_select(feed: str) -> str:
+    table, pc_col, date_col, store_col = FEEDS[feed]
+    store = f"MAX({store_col})" if store_col else "NULL"
+    return f"""
+        SELECT {pc_col}::text, {date_col}, '{feed}', {store}, COUNT(*)
+        FROM {table}
+        WHERE {date_col} BETWEEN %(start)s AND %(end)s
+        GROUP BY {pc_col}, {date_col}
+    """
+
+
+def refresh_coverage(cur, feed: str, start_date, end_date) -> int:
+    """
+    Recompute a feed's coverage for start..end from its table (one GROUP BY
+    over the loaded dates). Returns the (pc_number, date) cells now covered.
+    """
+    params = {"start": start_date, "end": end_date, "feed": feed}
+    cur.execute(
+        "DELETE FROM feed_coverage WHERE feed = %(feed)s AND date BETWEEN %(start)s AND %(end)s",
+        params,
+    )
+    cur.execute(f"""
+        INSERT INTO feed_coverage (pc_number, date, feed, store, row_count)
+        {_source_select(feed)}
+    """, params)
+    return cur.rowcount
+
+
+def rebuild_coverage(cur, feeds=None) -> dict:
+    """Rebuild coverage for whole tables (backfill). Returns {feed: cells}."""
+    built = {}
+    for feed in feeds or FEEDS:
+        table, _, date_col, _ = FEEDS[feed]
+        cur.execute(f"SELECT MIN({date_col}), MAX({date_col}) FROM {table}")
+        start, end = cur.fetchone()
+        if start is None:
+            cur.execute("DELETE FROM feed_coverage WHERE feed = %s", (feed,))
+            built[feed] = 0
+        else:
+            built[feed] = refresh_coverage(cur, feed, start, end)
+    return built
+
+
+def missing_coverage_sql(feeds=None) -> str:
+    """
+    Query (params %(start)s / %(end)s) returning pc_number, store, date and
+    missing_feeds (text[]) for each store-day lacking any of `feeds`. The
+    expected stores are those with sales_summary coverage in the range, from
+    their first covered day on.
+    """
+    feeds = list(feeds or POS_FEEDS)
+    unknown = set(feeds) - set(FEEDS)
+    if unknown:
+        raise ValueError(f"Unknown feed(s): {', '.join(sorted(unknown))}")
+    feed_array = "ARRAY[" + ", ".join(f"'{f}'" for f in feeds) + "]"
+    return f"""
+        WITH stores AS (
+            SELECT pc_number, MAX(store) AS store, MIN(date) AS first_date
+            FROM feed_coverage
+            WHERE feed = 'sales_summary' AND date BETWEEN %(start)s AND %(end)s
+            GROUP BY pc_number
+        ),
+        grid AS (
+            SELECT s.pc_number, s.store, d::date AS date, f.feed
+            FROM stores s
+            CROSS JOIN generate_series(s.first_date, %(end)s::date, interval '1 day') d
+            CROSS JOIN unnest({feed_array}) AS f(feed)
+        )
+        SELECT g.pc_number, g.store, g.date, array_agg(g.feed ORDER BY g.feed) AS missing_feeds
+        FROM grid g
+        LEFT JOIN feed_coverage c
+          ON c.date = g.date AND c.pc_number = g.pc_number AND c.feed = g.feed
+        WHERE c.pc_number IS NULL
+        GROUP BY g.pc_number, g.store, g.date
+    """
+
+
+def missing_coverage(cur, start_date, end_date, feeds=None):
+    """[(pc_number, store, date, [missing feeds])] for start..end, in date order."""
+    cur.execute(
+        f"SELECT * FROM ({missing_coverage_sql(feeds)}) m ORDER BY date, store",
+        {"start": start_date, "end": end_date},
+    )
+    return cur.fetchall()
+
+
+def loaded_dates(cur, dates, feeds=None) -> set:
+    """
+    The dates (of those given) that have every feed for every expected store.
+    A store is expected on a day if it has coverage within STORE_WINDOW_DAYS of
+    it and was first covered on or before it, so a store missing from a whole
+    day still counts against that day.
+    """
+    feeds = list(feeds or POS_FEEDS)
+    if not dates:
+        return set()
+    cur.execute("""
+        WITH days AS (
+            SELECT DISTINCT unnest(%(dates)s::date[]) AS date
+        ),
+        first_seen AS (
+            SELECT pc_number, MIN(date) AS first_date
+            FROM feed_coverage
+            WHERE feed = ANY(%(feeds)s)
+            GROUP BY pc_number
+        ),
+        expected AS (
+            SELECT DISTINCT d.date, c.pc_number
+            FROM days d
+            JOIN feed_coverage c
+              ON c.feed = ANY(%(feeds)s)
+             AND c.date BETWEEN d.date - %(window)s AND d.date + %(window)s
+            JOIN first_seen f ON f.pc_number = c.pc_number AND f.first_date <= d.date
+        )
+        SELECT e.date
+        FROM expected e
+        CROSS JOIN unnest(%(feeds)s::text[]) AS f(feed)
+        LEFT JOIN feed_coverage c
+          ON c.date = e.date AND c.pc_number = e.pc_number AND c.feed = f.feed
+        GROUP BY e.date
+        HAVING COUNT(c.pc_number) = COUNT(*)
+    """, {"dates": list(dates), "feeds": feeds, "window": STORE_WINDOW_DAYS})
+    return {row[0] for row in cur.fetchall()}
+
+
+def feed_summary(cur):
+    """[(feed, first date, last date, days, stores)] from the coverage matrix."""
+    cur.execute("""
+        SELECT feed, MIN(date), MAX(date), COUNT(DISTINCT date), COUNT(DISTINCT pc_number)
+        FROM feed_coverage
+        GROUP BY feed
+        ORDER BY feed
+    """)
+    return cur.fetchall()
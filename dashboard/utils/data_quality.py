@@ -0,0 +1,205 @@
+# dashboard/utils/data_quality.py
+# Rule-driven data-quality checks over the fact tables.
+#
+# A profile is one aggregate query producing a row per (store, date); a rule
+# is a SQL predicate over a profile's columns. All rules on the same profile
+# are evaluated in that profile's single query, so a full check is a handful
+# of GROUP BY scans regardless of how many rules there are.
+# scripts/data_quality.py runs the rules and stores failures in
+# data_quality_runs / data_quality_results (db/migrations/0006_data_quality.sql).
+
+from __future__ import annotations
+
+from .coverage import POS_FEEDS, missing_coverage_sql
+from .tender_types import EXCLUDED_CATEGORIES
+
+PERCENT_TOLERANCE = 0.02     # percent columns must sum to 100% +/- 2 points
+BALANCE_TOLERANCE = 25.00    # tender vs sales: allowed $ difference ...
+BALANCE_TOLERANCE_PCT = 0.02  # ... or share of the day's sales, whichever is larger
+
+_EXCLUDED = ", ".join(f"'{c}'" for c in sorted(EXCLUDED_CATEGORIES))
+
+
+# profile name -> query returning store, date and the columns rules refer to.
+# Queries take %(start)s / %(end)s.
+PROFILES = {
+    "sales_summary": """
+        SELECT store, date,
+               MIN(gift_card_sales) AS gift_card_min,
+               SUM(net_sales) AS net_sales,
+               COUNT(*) AS row_count
+        FROM sales_summary
+        WHERE date BETWEEN %(start)s AND %(end)s
+        GROUP BY store, date
+    """,
+    "sales_by_daypart": """
+        SELECT store, date, SUM(percent_sales) AS percent_sales
+        FROM sales_by_daypart
+        WHERE date BETWEEN %(start)s AND %(end)s
+        GROUP BY store, date
+    """,
+    "sales_by_subcategory": """
+        SELECT store, date, SUM(percent_sales) AS percent_sales
+        FROM sales_by_subcategory
+        WHERE date BETWEEN %(start)s AND %(end)s
+        GROUP BY store, date
+    """,
+    "sales_by_order_type": """
+        SELECT store, date,
+               SUM(percent_sales) AS percent_sales,
+               SUM(percent_guest) AS percent_guest
+        FROM sales_by_order_type
+        WHERE date BETWEEN %(start)s AND %(end)s
+        GROUP BY store, date
+    """,
+    "tender_balance": f"""
+        SELECT s.store, s.date,
+               s.dd_adjusted_no_markup + s.pa_sales_tax + ABS(s.gift_card_sales) AS sales_total,
+               COALESCE(s.cash_in, 0) + COALESCE(t.tender_total, 0) AS collected
+        FROM sales_summary s
+        LEFT JOIN (
+            SELECT store, date, SUM(detail_amount) AS tender_total
+            FROM tender_type_metrics
+            WHERE date BETWEEN %(start)s AND %(end)s
+              AND COALESCE(tender_category, '') NOT IN ({_EXCLUDED})
+            GROUP BY store, date
+        ) t ON t.store = s.store AND t.date = s.date
+        WHERE s.date BETWEEN %(start)s AND %(end)s
+    """,
+    # Store-days missing any of the daily POS feeds, from the coverage matrix
+    "coverage": f"""
+        SELECT COALESCE(store, pc_number) AS store, date,
+               array_to_string(missing_feeds, ', ') AS missing_feeds
+        FROM ({missing_coverage_sql(POS_FEEDS)}) m
+    """,
+}
+
+
+def _percent_off(col: str) -> str:
+    # Percent columns are stored either as fractions or as 0-100 values
+    return f"ABS({col} / (CASE WHEN {col} > 2 THEN 100 ELSE 1 END) - 1) > {PERCENT_TOLERANCE}"
+
+
+# rule name -> profile, severity, description, failing predicate, value (and optional detail)
+RULES = {
+    "coverage_gap": {
+        "profile": "coverage",
+        "severity": "error",
+        "description": "Store/day missing one or more feeds",
+        "when": "missing_feeds <> ''",
+        "value": "array_length(string_to_array(missing_feeds, ', '), 1)",
+        "detail": "missing_feeds",
+    },
+    "negative_gift_card_sales": {
+        "profile": "sales_summary",
+        "severity": "error",
+        "description": "Gift card sales stored as a negative amount (sign flipped on upload)",
+        "when": "gift_card_min < 0",
+        "value": "gift_card_min",
+    },
+    "zero_net_sales": {
+        "profile": "sales_summary",
+        "severity": "warning",
+        "description": "Sales summary row with no net sales",
+        "when": "COALESCE(net_sales, 0) = 0",
+        "value": "net_sales",
+    },
+    "duplicate_sales_summary": {
+        "profile": "sales_summary",
+        "severity": "error",
+        "description": "More than one sales_summary row (run scripts/cleanup_duplicates.py)",
+        "when": "row_count > 1",
+        "value": "row_count",
+    },
+    "daypart_percent_sum": {
+        "profile": "sales_by_daypart",
+        "severity": "warning",
+        "description": "Daypart % of sales does not add up to 100%",
+        "when": _percent_off("percent_sales"),
+        "value": "percent_sales",
+    },
+    "subcategory_percent_sum": {
+        "profile": "sales_by_subcategory",
+        "severity": "warning",
+        "description": "Subcategory % of sales does not add up to 100%",
+        "when": _percent_off("percent_sales"),
+        "value": "percent_sales",
+    },
+    "order_type_percent_sum": {
+        "profile": "sales_by_order_type",
+        "severity": "warning",
+        "description": "Order type % of sales does not add up to 100%",
+        "when": _percent_off("percent_sales"),
+        "value": "percent_sales",
+    },
+    "order_type_guest_percent_sum": {
+        "profile": "sales_by_order_type",
+        "severity": "warning",
+        "description": "Order type % of guests does not add up to 100%",
+        "when": _percent_off("percent_guest"),
+        "value": "percent_guest",
+    },
+    "tender_vs_sales_balance": {
+        "profile": "tender_balance",
+        "severity": "warning",
+        "description": "Cash + tenders differ from net sales + tax + gift card sales",
+        "when": f"ABS(collected - sales_total) > GREATEST({BALANCE_TOLERANCE}, {BALANCE_TOLERANCE_PCT} * ABS(sales_total))",
+        "value": "collected - sales_total",
+        "detail": "'sales ' || ROUND(sales_total::numeric, 2) || ', collected ' || ROUND(collected::numeric, 2)",
+    },
+}
+
+
+def profile_query(profile: str, rule_names) -> str:
+    """One query evaluating every rule in rule_names against a profile; returns only failures."""
+    checks = ",\n                   ".join(
+        f"('{name}', ({RULES[name]['when']}), ({RULES[name]['value']})::numeric, "
+        f"({RULES[name].get('detail', 'NULL')})::text)"
+        for name in rule_names
+    )
+    return f"""
+        WITH p AS ({PROFILES[profile]})
+        SELECT r.rule, p.store::text, p.date, r.value, r.detail
+        FROM p
+        CROSS JOIN LATERAL (
+            VALUES {checks}
+        ) AS r(rule, failed, value, detail)
+        WHERE r.failed
+        ORDER BY r.rule, p.date, p.store
+    """
+
+
+def evaluate(cur, start_date, end_date, rule_names=None):
+    """
+    Run the rules (default: all) over start..end.
+    Returns [(rule, severity, store, date, value, detail)] for every failure.
+    """
+    by_profile = {}
+    for name in rule_names or RULES:
+        by_profile.setdefault(RULES[name]["profile"], []).append(name)
+
+    failures = []
+    for profile, names in by_profile.items():
+        cur.execute(profile_query(profile, names), {"start": start_date, "end": end_date})
+        for rule, store, day, value, detail in cur.fetchall():
+            failures.append((rule, RULES[rule]["severity"], store, day, value, detail))
+    return failures
+
+
+def save_run(cur, start_date, end_date, rules_checked, failures, duration_ms) -> int:
+    """Record a run and its failures. Returns the run id."""
+    from psycopg2.extras import execute_values
+
+    errors = sum(1 for f in failures if f[1] == "error")
+    cur.execute("""
+        INSERT INTO data_quality_runs (start_date, end_date, rules_checked, failures, errors, duration_ms)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        RETURNING id
+    """, (start_date, end_date, rules_checked, len(failures), errors, duration_ms))
+    run_id = cur.fetchone()[0]
+    if failures:
+        execute_values(cur, """
+            INSERT INTO data_quality_results (run_id, rule, severity, store, date, value, detail)
+            VALUES %s
+        """, [(run_id, *f) for f in failures], page_size=1000)
+    return run_id
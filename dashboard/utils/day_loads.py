@@ -0,0 +1,59 @@
+# dashboard/utils/day_loads.py
+# One transaction per business date, one savepoint per file.
+#
+# Loaders group their input files by business date and hand the groups to
+# load_days() with a callable that writes one file through a cursor. Each file
+# runs inside its own SAVEPOINT, so a bad file rolls back only what it wrote;
+# the date is committed once all of its files have run, so the dashboard never
+# sees half a day. The whole run uses the one connection it is given.
+
+from __future__ import annotations
+
+
+def group_by_date(items, date_of) -> dict:
+    """{business date: [items]} in date order; items date_of() can't date go last, under None."""
+    groups = {}
+    for item in items:
+        groups.setdefault(date_of(item), []).append(item)
+    dated = sorted(d for d in groups if d is not None)
+    return {d: groups[d] for d in dated + ([None] if None in groups else [])}
+
+
+def load_days(conn, days: dict, load_file, on_error=None):
+    """
+    For each date in days ({date: [items]}), run load_file(cur, item) for every
+    item under a savepoint, then commit the date.
+
+    A file that raises is rolled back to its savepoint and reported through
+    on_error(item, exc); the rest of its date still commits. If the commit
+    itself fails, every file of that date counts as failed.
+
+    Returns (loaded, failed): [(item, load_file's result)] and [(item, exc)].
+    """
+    loaded, failed = [], []
+    for _, items in days.items():
+        day_loaded = []
+        with conn.cursor() as cur:
+            for item in items:
+                cur.execute("SAVEPOINT load_file")
+                try:
+                    result = load_file(cur, item)
+                except Exception as e:
+                    cur.execute("ROLLBACK TO SAVEPOINT load_file")
+                    failed.append((item, e))
+                    if on_error:
+                        on_error(item, e)
+                    continue
+                cur.execute("RELEASE SAVEPOINT load_file")
+                day_loaded.append((item, result))
+        try:
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            for item, _ in day_loaded:
+                failed.append((item, e))
+                if on_error:
+                    on_error(item, e)
+            continue
+        loaded.extend(day_loaded)
+    return loaded, failed
@@ -1,11 +1,72 @@
+import os
+import re
 import sqlite3
 from pathlib import Path
 
-# Debugging
+from .supabase_db import get_supabase_connection
+
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = BASE_DIR / "db" / "sales.db"
-print(f"Resolved DB path: {DB_PATH}")
-print(f"Exists: {DB_PATH.exists()}")
+
+# Local read replica of the Supabase fact tables (built by scripts/sync_local_replica.py)
+REPLICA_PATH = Path(os.getenv("DASHBOARD_REPLICA_PATH", BASE_DIR / "db" / "replica.db"))
+
+# Where dashboard pages read from: "supabase" (default), "replica", or
+# "auto" (Supabase, falling back to the replica when Supabase is unreachable)
+DB_SOURCE_ENV = "DASHBOARD_DB_SOURCE"
+AUTO_CONNECT_TIMEOUT = 5  # seconds
 
 def get_connection():
-    return sqlite3.connect(DB_PATH)
\ No newline at end of file
+    return sqlite3.connect(DB_PATH)
+
+# --- Replica connection ---
+_PARAM_RE = re.compile(r"%(s|%)")
+
+def _to_qmark(sql: str) -> str:
+    """Rewrite psycopg2-style %s / %% to sqlite3's ? / %."""
+    return _PARAM_RE.sub(lambda m: "?" if m.group(1) == "s" else "%", sql)
+
+class _QmarkCursor(sqlite3.Cursor):
+    """Accepts %s placeholders so page SQL written for Postgres runs unchanged."""
+    def execute(self, sql, params=None):
+        if params is None:
+            return super().execute(sql)
+        return super().execute(_to_qmark(sql), params)
+
+    def executemany(self, sql, seq_of_params):
+        return super().executemany(_to_qmark(sql), seq_of_params)
+
+class ReplicaConnection(sqlite3.Connection):
+    def cursor(self, factory=_QmarkCursor):
+        return super().cursor(factory)
+
+def is_replica(conn) -> bool:
+    return isinstance(conn, ReplicaConnection)
+
+def get_replica_connection():
+    if not REPLICA_PATH.exists():
+        raise FileNotFoundError(
+            f"Local replica not found at {REPLICA_PATH}. Run: python scripts/sync_local_replica.py"
+        )
+    # Read-only; WAL mode lets the sync job write while pages read
+    return sqlite3.connect(
+        f"file:{REPLICA_PATH.as_posix()}?mode=ro",
+        uri=True,
+        factory=ReplicaConnection,
+        detect_types=sqlite3.PARSE_DECLTYPES,
+        check_same_thread=False,
+    )
+
+def get_dashboard_connection():
+    """Connection for dashboard pages, chosen by the DASHBOARD_DB_SOURCE env var."""
+    source = os.getenv(DB_SOURCE_ENV, "supabase").strip().lower()
+    if source == "replica":
+        return get_replica_connection()
+    if source == "auto":
+        try:
+            return get_supabase_connection(connect_timeout=AUTO_CONNECT_TIMEOUT)
+        except Exception:
+            if REPLICA_PATH.exists():
+                return get_replica_connection()
+            raise
+    return get_supabase_connection()
@@ -0,0 +1,118 @@
+# dashboard/utils/dedupe.py
+# Set-based duplicate removal keyed on each table's natural key.
+#
+# Duplicates are ranked once per table with ROW_NUMBER() over the natural key
+# (newest id kept), the losing (id, date) pairs are collected in a temp table,
+# and then deleted in batches so no single statement holds locks for long.
+#
+# All functions take an open psycopg2 cursor and leave committing to the
+# caller (delete_duplicates commits between batches through `on_batch`).
+
+from __future__ import annotations
+
+from .partitions import PARTITIONED_TABLES
+
+# table -> natural key (the unique constraints in db/migrations/0001 and
+# db/guest_comments_schema.sql; hme_report has no constraint, but its loader
+# writes one row per store/date/time_measure)
+NATURAL_KEYS = {
+    "sales_summary": ["store", "pc_number", "date"],
+    "labor_metrics": ["store", "pc_number", "date", "labor_position"],
+    "sales_by_daypart": ["store", "pc_number", "date", "daypart"],
+    "sales_by_subcategory": ["store", "pc_number", "date", "subcategory"],
+    "sales_by_order_type": ["store", "pc_number", "date", "order_type"],
+    "tender_type_metrics": ["store", "pc_number", "date", "tender_type"],
+    "hme_report": ["store", "date", "time_measure"],
+    "medallia_reports": ["pc_number", "response_datetime", "comment", "report_date"],
+}
+DEFAULT_BATCH_SIZE = 5000
+
+_DOOMED = "_dedupe_doomed"
+
+
+def _key_sql(table: str) -> str:
+    return ", ".join(f'"{col}"' for col in NATURAL_KEYS[table])
+
+
+def _date_col(table: str) -> str:
+    return PARTITIONED_TABLES.get(table, "date")
+
+
+def duplicate_summary(cur, table: str) -> tuple[int, int]:
+    """(duplicate rows that would be deleted, natural keys affected)."""
+    cur.execute(f"""
+        SELECT COALESCE(SUM(n - 1), 0), COUNT(*)
+        FROM (
+            SELECT COUNT(*) AS n
+            FROM "{table}"
+            GROUP BY {_key_sql(table)}
+            HAVING COUNT(*) > 1
+        ) d
+    """)
+    extra, groups = cur.fetchone()
+    return int(extra), int(groups)
+
+
+def duplicate_samples(cur, table: str, limit: int = 5):
+    """[(key values..., copies)] for the most duplicated natural keys."""
+    cur.execute(f"""
+        SELECT {_key_sql(table)}, COUNT(*) AS copies
+        FROM "{table}"
+        GROUP BY {_key_sql(table)}
+        HAVING COUNT(*) > 1
+        ORDER BY copies DESC
+        LIMIT %s
+    """, (limit,))
+    return cur.fetchall()
+
+
+def collect_duplicates(cur, table: str) -> int:
+    """
+    Rank every row within its natural key (newest id first) and stage the
+    (id, date) of all but the first in a temp table. Returns the rows staged.
+    """
+    date_col = _date_col(table)
+    cur.execute(f"DROP TABLE IF EXISTS {_DOOMED}")
+    cur.execute(f"""
+        CREATE TEMP TABLE {_DOOMED} AS
+        SELECT id, "{date_col}" AS key_date
+        FROM (
+            SELECT id, "{date_col}",
+                   ROW_NUMBER() OVER (PARTITION BY {_key_sql(table)} ORDER BY id DESC) AS rn
+            FROM "{table}"
+        ) ranked
+        WHERE rn > 1
+    """)
+    staged = cur.rowcount
+    cur.execute(f"CREATE INDEX ON {_DOOMED} (id)")
+    return staged
+
+
+def delete_duplicates(cur, table: str, batch_size: int = DEFAULT_BATCH_SIZE, on_batch=None) -> int:
+    """
+    Delete the duplicates of `table`, keeping the newest row of each natural
+    key. Rows go in batches of `batch_size`; `on_batch(deleted_so_far)` is
+    called after each one (e.g. to commit). Returns the rows deleted.
+    """
+    date_col = _date_col(table)
+    remaining = collect_duplicates(cur, table)
+    deleted = 0
+    while remaining > 0:
+        # Joining on (id, date) matches the partitioned tables' primary key
+        cur.execute(f"""
+            WITH batch AS (
+                DELETE FROM {_DOOMED}
+                WHERE id IN (SELECT id FROM {_DOOMED} ORDER BY id LIMIT %s)
+                RETURNING id, key_date
+            )
+            DELETE FROM "{table}" t
+            USING batch
+            WHERE t.id = batch.id AND t."{date_col}" = batch.key_date
+        """, (batch_size,))
+        remaining -= batch_size
+        deleted += max(cur.rowcount, 0)
+        if on_batch:
+            on_batch(deleted)
+
+    cur.execute(f"DROP TABLE IF EXISTS {_DOOMED}")
+    return deleted
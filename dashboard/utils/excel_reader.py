@@ -0,0 +1,171 @@
+# dashboard/utils/excel_reader.py
+# One place to read raw report workbooks, with a selectable engine.
+#
+#   openpyxl  load the whole workbook, unmerge every sheet in place, save it to
+#             memory and read that back (what the compile scripts always did)
+#   readonly  pandas' streaming openpyxl read; merged ranges are taken from the
+#             sheet XML and filled in the DataFrame
+#   calamine  Rust reader (pip install python-calamine, pandas >= 2.2); merged
+#             ranges as for readonly. Falls back to readonly when not installed.
+#
+# The engine comes from the EXCEL_READER env var (default openpyxl) unless a
+# caller passes one. Without merged=True all three are a plain pd.read_excel,
+# so openpyxl and readonly only differ for merged sheets.
+#
+# Formula cells: the openpyxl engine saves the workbook before reading it back,
+# which drops cached formula results, so it sees them empty; the others read
+# the cached values. The POS exports carry no formulas. calamine also reads
+# whitespace-only cells as empty, which the compile scripts treat alike.
+
+from __future__ import annotations
+from io import BytesIO
+import importlib.util
+import os
+import re
+import zipfile
+
+import pandas as pd
+
+ENGINE_ENV = "EXCEL_READER"
+DEFAULT_ENGINE = "openpyxl"
+ENGINES = ["openpyxl", "readonly", "calamine"]
+
+_MERGE_CELL = re.compile(rb'<(?:\w+:)?mergeCell\s+ref="([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?"')
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+
+def calamine_available() -> bool:
+    return importlib.util.find_spec("python_calamine") is not None
+
+
+def available_engines() -> list:
+    return [e for e in ENGINES if e != "calamine" or calamine_available()]
+
+
+def resolve_engine(engine: str | None = None) -> str:
+    """The engine to use: the one asked for, else EXCEL_READER, else DEFAULT_ENGINE."""
+    engine = (engine or os.getenv(ENGINE_ENV) or DEFAULT_ENGINE).strip().lower()
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown Excel reader '{engine}' (expected one of {', '.join(ENGINES)})")
+    if engine == "calamine" and not calamine_available():
+        return "readonly"
+    return engine
+
+
+def _pandas_engine(engine: str):
+    # None lets pandas pick (openpyxl for .xlsx, xlrd for .xls) as before
+    return "calamine" if engine == "calamine" else None
+
+
+def excel_file(path, engine: str | None = None) -> pd.ExcelFile:
+    """pd.ExcelFile for the engine, for callers that pick a sheet by name."""
+    return pd.ExcelFile(path, engine=_pandas_engine(resolve_engine(engine)))
+
+
+# ------------- Merged cells -------------
+def _col_index(letters: bytes) -> int:
+    n = 0
+    for ch in letters:
+        n = n * 26 + ch - 64
+    return n - 1
+
+
+def _sheet_part(zf: zipfile.ZipFile, sheet_name) -> str:
+    """Zip member holding the worksheet XML for a sheet index or name."""
+    import xml.etree.ElementTree as ET
+
+    workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+    sheets = workbook.find(f"{_NS_MAIN}sheets")
+    sheets = list(sheets) if sheets is not None else []
+    if isinstance(sheet_name, int):
+        sheet = sheets[sheet_name] if sheet_name < len(sheets) else None
+    else:
+        sheet = next((s for s in sheets if s.get("name") == sheet_name), None)
+    if sheet is None:
+        raise ValueError(f"Worksheet {sheet_name!r} not found")
+    rel_id = sheet.get(f"{_NS_REL}id")
+
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    target = next(r.get("Target") for r in rels if r.get("Id") == rel_id)
+    return target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+
+
+def merged_ranges(path, sheet_name=0) -> list:
+    """
+    Merged ranges of one sheet as 0-based (first_row, first_col, last_row, last_col),
+    read from the .xlsx XML without loading the workbook. Non-.xlsx files give [].
+    """
+    try:
+        with zipfile.ZipFile(path) as zf:
+            data = zf.read(_sheet_part(zf, sheet_name))
+    except zipfile.BadZipFile:
+        return []
+    ranges = []
+    for c0, r0, c1, r1 in _MERGE_CELL.findall(data):
+        first = (int(r0) - 1, _col_index(c0))
+        last = (int(r1) - 1, _col_index(c1)) if c1 else first
+        ranges.append(first + last)
+    return ranges
+
+
+def fill_merged(df: pd.DataFrame, ranges) -> pd.DataFrame:
+    """Copy each merged range's top-left value into all of its cells (header=None frames)."""
+    # Ranges starting beyond pandas' trimmed edge are empty, so there is nothing to copy
+    ranges = [(r0, c0, r1, c1) for r0, c0, r1, c1 in ranges if r0 < len(df) and c0 < df.shape[1]]
+    if not ranges:
+        return df
+    n_rows = max([len(df)] + [r1 + 1 for _, _, r1, _ in ranges])
+    n_cols = max([df.shape[1]] + [c1 + 1 for _, _, _, c1 in ranges])
+    extended = (n_rows, n_cols) != df.shape
+    if extended:
+        # A merge with a value can reach past the edge; unmerging writes those cells
+        df = df.reindex(index=range(n_rows), columns=range(n_cols))
+
+    touched = sorted({c for _, c0, _, c1 in ranges for c in range(c0, c1 + 1)})
+    df[touched] = df[touched].astype(object)
+    for r0, c0, r1, c1 in ranges:
+        df.iloc[r0:r1 + 1, c0:c1 + 1] = df.iat[r0, c0]
+    df[touched] = df[touched].infer_objects()
+
+    if extended:
+        # A range with an empty top-left adds nothing; trim what it reached, as pandas does
+        while len(df) and df.iloc[-1].isna().all():
+            df = df.iloc[:-1]
+        while df.shape[1] and df.iloc[:, -1].isna().all():
+            df = df.iloc[:, :-1]
+    return df
+
+
+def _unmerged_workbook(path) -> BytesIO:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path)
+    for ws in wb.worksheets:
+        for rng in list(ws.merged_cells.ranges):
+            tl = ws.cell(row=rng.min_row, column=rng.min_col).value
+            ws.unmerge_cells(str(rng))
+            for r in range(rng.min_row, rng.max_row + 1):
+                for c in range(rng.min_col, rng.max_col + 1):
+                    ws.cell(row=r, column=c).value = tl
+    buf = BytesIO(); wb.save(buf); buf.seek(0)
+    return buf
+
+
+# ------------- Reading -------------
+def read_sheet(path, sheet_name=0, header=0, engine: str | None = None, merged: bool = False) -> pd.DataFrame:
+    """
+    pd.read_excel of one sheet through the configured engine. merged=True
+    gives every cell of a merged range the range's top-left value (needs
+    header=None, so positions match the sheet).
+    """
+    engine = resolve_engine(engine)
+    if not merged:
+        return pd.read_excel(path, sheet_name=sheet_name, header=header, engine=_pandas_engine(engine))
+    if header is not None:
+        raise ValueError("merged=True reads with header=None")
+
+    if engine == "openpyxl":
+        return pd.read_excel(_unmerged_workbook(path), sheet_name=sheet_name, header=None)
+    df = pd.read_excel(path, sheet_name=sheet_name, header=None, engine=_pandas_engine(engine))
+    return fill_merged(df, merged_ranges(path, sheet_name))
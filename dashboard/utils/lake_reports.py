@@ -0,0 +1,110 @@
+# dashboard/utils/lake_reports.py
+# DuckDB report engine over the Parquet lake (see parquet_lake.py).
+# Runs the month-end tender / consolidated reports locally, with no load on Supabase.
+
+from __future__ import annotations
+
+import duckdb
+import pandas as pd
+
+from .parquet_lake import LAKE_DIR, LAKE_TABLES, table_glob
+
+
+def connect_lake(tables=("sales_summary", "tender_type_metrics")):
+    """In-memory DuckDB connection with one view per lake table."""
+    if not LAKE_DIR.exists():
+        raise FileNotFoundError(
+            f"Parquet lake not found at {LAKE_DIR}. Run: python scripts/build_parquet_lake.py"
+        )
+    con = duckdb.connect()
+    for table in tables:
+        date_col = LAKE_TABLES[table]
+        con.execute(f"""
+            CREATE VIEW {table} AS
+            SELECT * FROM read_parquet(
+                '{table_glob(table)}',
+                hive_partitioning = true,
+                hive_types = {{'{date_col}': DATE}},
+                union_by_name = true
+            )
+        """)
+    return con
+
+
+def tender_sales_report(con, start_date, end_date) -> pd.DataFrame:
+    """
+    The tender & sales report (one row per store/day, tender categories as
+    columns), matching scripts/download_tender_sales_report.py's Supabase query.
+    The tender side is pivoted in a single pass instead of one join per category.
+    """
+    return con.execute("""
+        WITH tender_labeled AS (
+          -- tender_category is stamped at load (dashboard/utils/tender_types.py)
+          SELECT store, date, detail_amount,
+                 tender_category AS tcat,
+                 _seq
+          FROM tender_type_metrics
+          WHERE date BETWEEN ? AND ?
+        ),
+        tender_clean AS (
+          -- first occurrence of each category per store/day
+          SELECT store, date, tcat, arg_min(detail_amount, _seq) AS detail_amount
+          FROM tender_labeled
+          WHERE tcat IS NOT NULL
+          GROUP BY store, date, tcat
+        ),
+        tender_wide AS (
+          SELECT store, date,
+            SUM(detail_amount) FILTER (WHERE tcat = 'mastercard') AS mastercard,
+            SUM(detail_amount) FILTER (WHERE tcat = 'visa') AS visa,
+            SUM(detail_amount) FILTER (WHERE tcat = 'discover') AS discover,
+            SUM(detail_amount) FILTER (WHERE tcat = 'amex') AS amex,
+            SUM(detail_amount) FILTER (WHERE tcat = 'gift_card_redeem') AS gift_card_redeem,
+            SUM(detail_amount) FILTER (WHERE tcat = 'uber_eats') AS uber_eats,
+            SUM(detail_amount) FILTER (WHERE tcat = 'door_dash') AS door_dash,
+            SUM(detail_amount) FILTER (WHERE tcat = 'grubhub') AS grubhub
+          FROM tender_clean
+          GROUP BY store, date
+        )
+        SELECT
+          s.store AS "Store",
+          strftime(s.date, '%m/%d/%y') AS "Date",
+          strftime(s.date, '%a') AS "day",
+          s.dd_adjusted_no_markup AS "Dunkin Net Sales",
+          s.pa_sales_tax AS "Tax",
+          ABS(s.gift_card_sales) AS "Gift Card Sales",
+          (s.dd_adjusted_no_markup + s.pa_sales_tax + ABS(s.gift_card_sales)) AS "Total",
+          s.cash_in AS "Cash Due",
+          COALESCE(t.mastercard, 0) AS "Mastercard",
+          COALESCE(t.visa, 0) AS "Visa",
+          COALESCE(t.discover, 0) AS "Discover",
+          COALESCE(t.amex, 0) AS "Amex",
+          COALESCE(t.gift_card_redeem, 0) AS "Gift Card Redeem",
+          COALESCE(t.uber_eats, 0) AS "Uber Eats",
+          COALESCE(t.door_dash, 0) AS "Door Dash",
+          COALESCE(t.grubhub, 0) AS "Grubhub",
+          s.paid_out AS "Paid Out"
+        FROM sales_summary s
+        LEFT JOIN tender_wide t ON t.store = s.store AND t.date = s.date
+        WHERE s.date BETWEEN ? AND ?
+        ORDER BY s.store, s.date
+    """, [start_date, end_date, start_date, end_date]).df()
+
+
+def report_stores(con, start_date, end_date) -> list:
+    """Stores with sales_summary rows in the range (used to zero-fill missing days)."""
+    rows = con.execute("""
+        SELECT DISTINCT store FROM sales_summary
+        WHERE date BETWEEN ? AND ?
+        ORDER BY store
+    """, [start_date, end_date]).fetchall()
+    return [row[0] for row in rows]
+
+
+def load_range(con, table, start_date, end_date) -> pd.DataFrame:
+    """All lake rows of a table in an inclusive date range."""
+    date_col = LAKE_TABLES[table]
+    return con.execute(
+        f"SELECT * EXCLUDE (_seq) FROM {table} WHERE {date_col} BETWEEN ? AND ?",
+        [start_date, end_date],
+    ).df()
@@ -0,0 +1,231 @@
+# dashboard/utils/mail_client.py
+# Shared IMAP client for the Gmail downloaders (DSS, tender, Medallia, HME).
+#
+# Each downloader describes what it wants as a feed:
+#     {"search":  IMAP search criteria, e.g. '(SUBJECT "Daily Guest Comments Summary")',
+#      "latest":  True to keep only the newest match (optional),
+#      "handler": callable(email.message.Message) -> list of saved paths}
+#
+# MailClient.run() searches for every feed at once, fetches the union of the
+# matched UIDs with a few batched UID FETCH commands (a message two feeds want
+# is fetched once), and hands each message to the handler of every feed that
+# matched it.
+#
+# imaplib is blocking and an IMAP connection answers one command at a time, so
+# the client keeps a pool of logged-in sessions - at most MAX_SESSIONS per
+# server - and runs each command on one of them in a worker thread. Sessions
+# are opened on first use and reused for the rest of the run.
+#
+# IMAP_SERVER / IMAP_PORT / IMAP_SSL in the environment point the client (and
+# so every downloader) somewhere else, e.g. the offline replay server in
+# scripts/imap_replay.py.
+
+from __future__ import annotations
+import asyncio
+import email
+import imaplib
+import os
+import re
+import time
+
+GMAIL_SERVER = "imap.gmail.com"
+
+# Sessions per server (Gmail allows 15 per account; leave room for phones/other jobs)
+MAX_SESSIONS = {GMAIL_SERVER: 4}
+DEFAULT_MAX_SESSIONS = 2
+
+# UIDs per FETCH command
+FETCH_BATCH = 20
+
+_UID_RE = re.compile(rb"UID (\d+)")
+
+
+def credentials():
+    return os.getenv("EMAIL_USER"), os.getenv("EMAIL_PASS")
+
+
+def server_settings():
+    """(server, port, ssl) from IMAP_SERVER / IMAP_PORT / IMAP_SSL, defaulting to Gmail."""
+    return (
+        os.getenv("IMAP_SERVER", GMAIL_SERVER),
+        int(os.getenv("IMAP_PORT", "993")),
+        os.getenv("IMAP_SSL", "1") != "0",
+    )
+
+
+def imap_date(value) -> str:
+    """date/datetime -> IMAP search date (01-Nov-2025)."""
+    return value.strftime("%d-%b-%Y")
+
+
+class MailClient:
+    def __init__(self, user=None, password=None, server=None, port=None, ssl=None,
+                 max_sessions=None, fetch_batch=FETCH_BATCH, mailbox="inbox"):
+        default_user, default_password = credentials()
+        default_server, default_port, default_ssl = server_settings()
+        self.user = user or default_user
+        self.password = password or default_password
+        self.server = server or default_server
+        self.port = port or default_port
+        self.ssl = default_ssl if ssl is None else ssl
+        self.mailbox = mailbox
+        self.limit = max_sessions or MAX_SESSIONS.get(self.server, DEFAULT_MAX_SESSIONS)
+        self.fetch_batch = fetch_batch
+        self.logins = 0
+        self.messages_fetched = 0
+        self.bytes_fetched = 0
+        self._idle = []      # logged-in sessions not running a command
+        self._sessions = []  # every session opened, for logout
+        self._slots = None   # asyncio.Semaphore(limit), created inside the event loop
+
+    async def __aenter__(self):
+        if not self.user or not self.password:
+            raise ValueError("EMAIL_USER and EMAIL_PASS must be set in .env")
+        self._slots = asyncio.Semaphore(self.limit)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _connect(self):
+        session = (imaplib.IMAP4_SSL if self.ssl else imaplib.IMAP4)(self.server, self.port)
+        session.login(self.user, self.password)
+        session.select(self.mailbox)
+        return session
+
+    async def _call(self, command):
+        """Run command(session) on a pooled session in a worker thread."""
+        async with self._slots:
+            if self._idle:
+                session = self._idle.pop()
+            else:
+                session = await asyncio.to_thread(self._connect)
+                self._sessions.append(session)
+                self.logins += 1
+            try:
+                return await asyncio.to_thread(command, session)
+            except Exception:
+                # Aborted, socket/SSL error or a failed command: the session may be
+                # mid-response or dead, so don't hand it out again
+                self._sessions.remove(session)
+                try:
+                    session.shutdown()
+                except Exception:
+                    pass
+                session = None
+                raise
+            finally:
+                if session is not None:
+                    self._idle.append(session)
+
+    async def search(self, criteria: str) -> list[bytes]:
+        """UIDs matching the criteria, oldest first."""
+        def command(session):
+            status, data = session.uid("SEARCH", None, criteria)
+            if status != "OK":
+                raise imaplib.IMAP4.error(f"SEARCH {criteria} failed: {data}")
+            return data[0].split()
+        return await self._call(command)
+
+    async def fetch(self, uids) -> dict:
+        """{uid: Message}, fetch_batch UIDs per command, batches spread over the pool."""
+        messages, failed = await self._fetch_batches(uids)
+        if failed:
+            raise next(iter(failed.values()))
+        return messages
+
+    async def _fetch_batches(self, uids):
+        """
+        ({uid: Message}, {uid: exception}): like fetch, but a failed batch only
+        fails its own UIDs.
+        """
+        def command_for(batch):
+            def command(session):
+                status, data = session.uid("FETCH", b",".join(batch).decode(), "(RFC822)")
+                if status != "OK":
+                    raise imaplib.IMAP4.error(f"FETCH failed: {data}")
+                messages, size = {}, 0
+                for part in data:
+                    if isinstance(part, tuple):
+                        match = _UID_RE.search(part[0])
+                        if match:
+                            messages[match.group(1)] = email.message_from_bytes(part[1])
+                            size += len(part[1])
+                return messages, size
+            return command
+
+        uids = list(uids)
+        batches = [uids[i:i + self.fetch_batch] for i in range(0, len(uids), self.fetch_batch)]
+        results = await asyncio.gather(*(self._call(command_for(b)) for b in batches), return_exceptions=True)
+        messages, failed = {}, {}
+        for batch, result in zip(batches, results):
+            if isinstance(result, BaseException):
+                failed.update((uid, result) for uid in batch)
+                continue
+            fetched, size = result
+            messages.update(fetched)
+            self.messages_fetched += len(fetched)
+            self.bytes_fetched += size
+        return messages, failed
+
+    async def run(self, feeds: dict):
+        """
+        Search, fetch and route for every feed. Returns (saved, errors):
+        {feed: [paths from its handler]} and {feed: exception} for feeds whose
+        search, fetch or handler failed (the other feeds still complete).
+        """
+        names = list(feeds)
+        found = await asyncio.gather(*(self.search(feeds[n]["search"]) for n in names), return_exceptions=True)
+
+        wanted, errors = {}, {}
+        for name, uids in zip(names, found):
+            if isinstance(uids, BaseException):
+                errors[name] = uids
+                continue
+            wanted[name] = uids[-1:] if feeds[name].get("latest") else uids
+
+        messages, failed = await self._fetch_batches(sorted({u for uids in wanted.values() for u in uids}, key=int))
+
+        saved = {}
+        for name, uids in wanted.items():
+            saved[name] = []
+            lost = [uid for uid in uids if uid in failed]
+            if lost:
+                # Part of this feed's mail didn't arrive; a rerun picks it up
+                errors[name] = failed[lost[0]]
+                continue
+            try:
+                for uid in uids:
+                    if uid in messages:
+                        saved[name].extend(feeds[name]["handler"](messages[uid]) or [])
+            except Exception as e:
+                errors[name] = e
+        return saved, errors
+
+    async def close(self):
+        for session in self._sessions:
+            try:
+                await asyncio.to_thread(session.logout)
+            except Exception:
+                pass
+        self._sessions, self._idle = [], []
+
+
+def download(feeds: dict, **client_args):
+    """
+    Run feeds on one MailClient from synchronous code. Returns (saved, errors,
+    stats); stats has the elapsed seconds, logins, messages and bytes fetched.
+    """
+    async def go():
+        async with MailClient(**client_args) as client:
+            saved, errors = await client.run(feeds)
+            return saved, errors, {
+                "logins": client.logins,
+                "messages": client.messages_fetched,
+                "bytes": client.bytes_fetched,
+            }
+
+    started = time.perf_counter()
+    saved, errors, stats = asyncio.run(go())
+    stats["seconds"] = time.perf_counter() - started
+    return saved, errors, stats
@@ -0,0 +1,77 @@
+# dashboard/utils/parquet_lake.py
+# Date-partitioned Parquet copy of the fact tables, for local report engines.
+#
+# Layout:  data/lake/<table>/date=YYYY-MM-DD/<store>.parquet
+#
+# One file per (table, date, store). Writing a slice replaces that file, so
+# re-loading a day (or re-running the backfill) never double counts. The date
+# lives in the directory name only; readers use hive partitioning to get it
+# back and to skip whole days outside a report's range.
+
+from __future__ import annotations
+from pathlib import Path
+import os
+import re
+
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+LAKE_DIR = Path(os.getenv("PARQUET_LAKE_DIR", BASE_DIR / "data" / "lake"))
+
+# table -> business date column
+LAKE_TABLES = {
+    "sales_summary": "date",
+    "sales_by_daypart": "date",
+    "sales_by_subcategory": "date",
+    "sales_by_order_type": "date",
+    "tender_type_metrics": "date",
+    "labor_metrics": "date",
+    "hme_report": "date",
+    "medallia_reports": "report_date",
+}
+SKIP_COLUMNS = {"comment_tsv", "row_hash"}  # Postgres-only search column / upsert bookkeeping
+
+# Order of rows within a slice (the database id order when backfilled, file
+# order when written by the loader); reports use it where SQL used ORDER BY id
+SEQ_COLUMN = "_seq"
+
+
+def _file_stem(store) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", str(store)).strip("_") or "unknown"
+
+
+def table_glob(table: str) -> str:
+    """Glob over every Parquet file of a lake table (for DuckDB's read_parquet)."""
+    return (LAKE_DIR / table / "*" / "*.parquet").as_posix()
+
+
+def write_slices(table: str, df: pd.DataFrame) -> int:
+    """
+    Write rows to the lake, replacing each (date, store) slice they cover.
+    Returns the number of files written.
+    """
+    if table not in LAKE_TABLES:
+        raise ValueError(f"{table} is not a lake table")
+    date_col = LAKE_TABLES[table]
+    store_col = "store" if "store" in df.columns else "pc_number"
+    if df.empty or date_col not in df.columns or store_col not in df.columns:
+        return 0
+
+    df = df.drop(columns=[c for c in SKIP_COLUMNS if c in df.columns])
+    df[date_col] = pd.to_datetime(df[date_col], errors="coerce").dt.date
+    df = df[df[date_col].notna()]
+    if "id" in df.columns:
+        df = df.sort_values("id")
+
+    written = 0
+    for (day, store), part in df.groupby([date_col, store_col], sort=False):
+        part = part.drop(columns=[date_col]).reset_index(drop=True)
+        part[SEQ_COLUMN] = range(len(part))
+        out_dir = LAKE_DIR / table / f"{date_col}={day.isoformat()}"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        out_path = out_dir / f"{_file_stem(store)}.parquet"
+        tmp_path = out_path.with_suffix(".parquet.tmp")
+        part.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, out_path)  # readers never see a half-written file
+        written += 1
+    return written
@@ -0,0 +1,160 @@
+# dashboard/utils/partitions.py
+# Monthly partition maintenance for the fact tables (see db/migrations/0003_monthly_partitioning.sql).
+#
+# All functions take an open psycopg2 cursor and leave committing to the caller,
+# so several operations can be grouped into one transaction.
+
+from __future__ import annotations
+from datetime import date
+import re
+
+# table -> partition key column
+PARTITIONED_TABLES = {
+    "sales_summary": "date",
+    "tender_type_metrics": "date",
+    "labor_metrics": "date",
+    "sales_by_subcategory": "date",
+    "hme_report": "date",
+    "medallia_reports": "report_date",
+}
+FUTURE_MONTHS = 3
+
+_BOUND_RE = re.compile(r"FROM \('([\d-]+)'\) TO \('([\d-]+)'\)")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month:%Y}m{month:%m}"
+
+
+def is_partitioned(cur, table: str) -> bool:
+    cur.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", (table,))
+    return cur.fetchone() is not None
+
+
+def list_partitions(cur, table: str):
+    """[(partition_name, from_date, to_date)] in date order; the DEFAULT partition has (None, None)."""
+    cur.execute("""
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(%s)
+    """, (table,))
+    partitions = []
+    for name, bound in cur.fetchall():
+        match = _BOUND_RE.search(bound)
+        if match:
+            partitions.append((name, date.fromisoformat(match.group(1)), date.fromisoformat(match.group(2))))
+        else:
+            partitions.append((name, None, None))
+    return sorted(partitions, key=lambda p: (p[1] is None, p[1] or date.min))
+
+
+def ensure_partitions(cur, table: str, start: date, end: date) -> int:
+    """Create any missing monthly partitions covering start..end. Returns how many were created."""
+    cur.execute("SELECT ensure_month_partitions(%s, %s, %s)", (table, start, end))
+    return cur.fetchone()[0]
+
+
+def ensure_future_partitions(cur, months: int = FUTURE_MONTHS) -> int:
+    """Create partitions up to `months` ahead for every partitioned table."""
+    cur.execute("SELECT ensure_future_partitions(%s)", (months,))
+    return cur.fetchone()[0]
+
+
+def count_rows(cur, relation: str, date_col: str | None = None, since: date | None = None) -> int:
+    if since is None:
+        cur.execute(f'SELECT COUNT(*) FROM "{relation}"')
+    else:
+        cur.execute(f'SELECT COUNT(*) FROM "{relation}" WHERE "{date_col}" >= %s', (since,))
+    return cur.fetchone()[0]
+
+
+def detach_month(cur, table: str, month: date, keep_as: str | None = None) -> str | None:
+    """
+    Detach a month's partition from its table. The detached table is renamed to
+    keep_as (default <partition>_detached) and returned, or None if there was no partition.
+    """
+    name = partition_name(table, month_start(month))
+    cur.execute("SELECT to_regclass(%s)", (name,))
+    if cur.fetchone()[0] is None:
+        return None
+    keep_as = keep_as or f"{name}_detached"
+    cur.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"')
+    cur.execute(f'ALTER TABLE "{name}" RENAME TO "{keep_as}"')
+    return keep_as
+
+
+def drop_month(cur, table: str, month: date) -> int:
+    """
+    Remove a whole month of data by dropping its partition, then put an empty
+    partition back so the month can be reloaded. Returns the rows removed.
+    """
+    month = month_start(month)
+    detached = detach_month(cur, table, month)
+    removed = 0
+    if detached:
+        removed = count_rows(cur, detached)
+        cur.execute(f'DROP TABLE "{detached}"')
+    ensure_partitions(cur, table, month, month)
+    return removed
+
+
+def attach_month(cur, table: str, source_table: str, month: date) -> None:
+    """
+    Swap a standalone table in as a month's partition (e.g. a month reloaded
+    into a staging table, or one kept by detach_month). The current partition
+    for that month, if any, is detached and dropped first.
+    """
+    month = month_start(month)
+    date_col = PARTITIONED_TABLES[table]
+    # A matching CHECK constraint lets ATTACH skip its validation scan
+    check_name = f"{source_table}_month_check"
+    cur.execute(
+        f'ALTER TABLE "{source_table}" ADD CONSTRAINT "{check_name}" '
+        f'CHECK ("{date_col}" >= %s AND "{date_col}" < %s)',
+        (month, next_month(month)),
+    )
+    current = detach_month(cur, table, month)
+    if current:
+        cur.execute(f'DROP TABLE "{current}"')
+    cur.execute(
+        f'ALTER TABLE "{table}" ATTACH PARTITION "{source_table}" FOR VALUES FROM (%s) TO (%s)',
+        (month, next_month(month)),
+    )
+    cur.execute(f'ALTER TABLE "{source_table}" RENAME TO "{partition_name(table, month)}"')
+    cur.execute(f'ALTER TABLE "{partition_name(table, month)}" DROP CONSTRAINT "{check_name}"')
+
+
+def clear_from(cur, table: str, since: date) -> int:
+    """
+    Remove every row dated on/after `since`. Whole months are dropped as
+    partitions; a partial first month and the DEFAULT partition fall back to
+    DELETE. Unpartitioned tables are handled with a plain DELETE.
+    Returns the rows removed.
+    """
+    date_col = PARTITIONED_TABLES.get(table, "date")
+    if not is_partitioned(cur, table):
+        cur.execute(f'DELETE FROM "{table}" WHERE "{date_col}" >= %s', (since,))
+        return cur.rowcount
+
+    removed = 0
+    for name, lower, upper in list_partitions(cur, table):
+        if lower is None or upper <= since:
+            continue
+        if lower >= since:
+            removed += drop_month(cur, table, lower)
+        else:
+            cur.execute(f'DELETE FROM "{name}" WHERE "{date_col}" >= %s', (since,))
+            removed += cur.rowcount
+
+    cur.execute(f'DELETE FROM "{table}_default" WHERE "{date_col}" >= %s', (since,))
+    removed += cur.rowcount
+    return removed
@@ -0,0 +1,184 @@
+# dashboard/utils/pdf_export.py
+# Shared "Export This Page to PDF" helpers.
+#
+# - One warm Kaleido renderer per process (Kaleido 1.x sync server, or the
+#   persistent scope Kaleido 0.2.x keeps on its own) instead of a cold start
+#   for every chart.
+# - All of a page's figures are rendered in one batch.
+# - Images are cached by a hash of the figure spec (in memory, plus on disk
+#   under exports/.chart_cache), so repeated exports of the same view skip
+#   Kaleido entirely. Both are bounded: the memory cache to MEMORY_CACHE_SIZE
+#   images, the disk cache to DISK_CACHE_MAX_BYTES and DISK_CACHE_MAX_DAYS
+#   since an image was last used (least recently used go first).
+
+from __future__ import annotations
+from collections import OrderedDict
+from pathlib import Path
+import base64
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+import plotly.io as pio
+from weasyprint import HTML
+
+IMAGE_FORMAT = "jpg"
+IMAGE_SCALE = 2
+MEMORY_CACHE_SIZE = 256
+DISK_CACHE_MAX_BYTES = 200 * 1024 * 1024
+DISK_CACHE_MAX_DAYS = 30
+CACHE_DIR = Path(__file__).resolve().parents[2] / "exports" / ".chart_cache"
+
+REPORT_CSS = """
+    body { font-family: Arial, sans-serif; }
+    h2 { color: #d17a22; }
+    table { border-collapse: collapse; width: 100%; margin-bottom: 20px; }
+    th, td { border: 1px solid #ddd; padding: 8px; text-align: center; }
+    th { background-color: #f2f2f2; }
+    img { display: block; margin: 20px auto; max-width: 700px; }
+"""
+
+_image_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_render_lock = threading.Lock()
+_renderer_started = False
+
+
+def _start_renderer():
+    """Start the persistent Kaleido renderer once per process."""
+    global _renderer_started
+    if _renderer_started:
+        return
+    try:
+        import kaleido
+        if hasattr(kaleido, "start_sync_server"):  # Kaleido 1.x
+            kaleido.start_sync_server(silence_warnings=True)
+    except Exception:
+        # Kaleido 0.2.x keeps its own long-lived subprocess; nothing to start
+        pass
+    _renderer_started = True
+
+
+def figure_key(fig, fmt: str = IMAGE_FORMAT, scale: float = IMAGE_SCALE) -> str:
+    """Cache key for a figure: hash of its full JSON spec plus render options."""
+    digest = hashlib.sha256()
+    digest.update(fig.to_json().encode("utf-8"))
+    digest.update(f"|{fmt}|{scale}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _cache_get(key: str, fmt: str) -> bytes | None:
+    img = _image_cache.get(key)
+    if img is not None:
+        _image_cache.move_to_end(key)
+        return img
+    disk_path = CACHE_DIR / f"{key}.{fmt}"
+    if disk_path.exists():
+        img = disk_path.read_bytes()
+        try:
+            os.utime(disk_path)  # mtime = last use, for _prune_disk_cache
+        except OSError:
+            pass
+        _cache_put(key, fmt, img, write_disk=False)
+        return img
+    return None
+
+
+def _cache_put(key: str, fmt: str, img: bytes, write_disk: bool = True) -> None:
+    _image_cache[key] = img
+    _image_cache.move_to_end(key)
+    while len(_image_cache) > MEMORY_CACHE_SIZE:
+        _image_cache.popitem(last=False)
+    if write_disk:
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            (CACHE_DIR / f"{key}.{fmt}").write_bytes(img)
+        except OSError:
+            pass  # disk cache is best-effort
+
+
+def _prune_disk_cache() -> None:
+    """Delete disk-cached images unused for too long, or least recently used beyond the size cap."""
+    try:
+        entries = sorted(
+            ((e.stat().st_mtime, e.stat().st_size, Path(e.path)) for e in os.scandir(CACHE_DIR) if e.is_file()),
+            reverse=True,
+        )
+    except OSError:
+        return
+    cutoff = time.time() - DISK_CACHE_MAX_DAYS * 86400
+    total = 0
+    for mtime, size, path in entries:  # newest first
+        if mtime >= cutoff and total + size <= DISK_CACHE_MAX_BYTES:
+            total += size
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def _render_batch(figs: list, fmt: str, scale: float) -> list[bytes]:
+    """Render several figures with a single renderer call where plotly supports it."""
+    if hasattr(pio, "write_images"):  # plotly >= 6.1
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = [Path(tmpdir) / f"chart_{i}.{fmt}" for i in range(len(figs))]
+            pio.write_images(figs, paths, format=fmt, scale=scale)
+            return [p.read_bytes() for p in paths]
+    return [pio.to_image(fig, format=fmt, scale=scale) for fig in figs]
+
+
+def render_figures(figs: list, fmt: str = IMAGE_FORMAT, scale: float = IMAGE_SCALE) -> list[bytes]:
+    """
+    Render plotly figures to image bytes, in order.
+    Cached figures are returned without touching Kaleido; the rest are rendered in one batch.
+    """
+    keys = [figure_key(fig, fmt, scale) for fig in figs]
+    images: dict[str, bytes] = {}
+    pending: dict[str, object] = {}
+
+    with _render_lock:
+        for fig, key in zip(figs, keys):
+            if key in images or key in pending:
+                continue
+            img = _cache_get(key, fmt)
+            if img is None:
+                pending[key] = fig
+            else:
+                images[key] = img
+
+        if pending:
+            _start_renderer()
+            rendered = _render_batch(list(pending.values()), fmt, scale)
+            for key, img in zip(pending.keys(), rendered):
+                _cache_put(key, fmt, img)
+                images[key] = img
+            _prune_disk_cache()
+
+    return [images[key] for key in keys]
+
+
+def figures_to_base64(figs: list, fmt: str = IMAGE_FORMAT, scale: float = IMAGE_SCALE) -> list[str]:
+    """Render figures (batched + cached) and return base64 strings for <img> data URIs."""
+    return [base64.b64encode(img).decode() for img in render_figures(figs, fmt, scale)]
+
+
+def build_report_html(body: str) -> str:
+    """Wrap a page's report body in the standard export HTML shell."""
+    return f"""
+    <html>
+    <head>
+        <meta charset="utf-8">
+        <style>{REPORT_CSS}</style>
+    </head>
+    <body>
+        {body}
+    </body>
+    </html>
+    """
+
+
+def html_to_pdf_bytes(html: str) -> bytes:
+    """Render HTML to PDF bytes in memory (no temp files)."""
+    return HTML(string=html).write_pdf()
@@ -0,0 +1,149 @@
+# dashboard/utils/raw_catalog.py
+# Persistent catalog of the downloaded DSS report files in data/raw_emails.
+#
+# One row per file with its business date (parsed from the name) and report
+# type, kept in a small SQLite file indexed by (business_date, report_type).
+# refresh() only re-lists the directory when its mtime changed, and only
+# re-parses files that are new or whose size/mtime changed, so looking up a
+# date costs an index probe rather than a glob + regex over every file.
+
+from __future__ import annotations
+from pathlib import Path
+import os
+import re
+import sqlite3
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+RAW_DIR = BASE_DIR / "data" / "raw_emails"
+CATALOG_PATH = Path(os.getenv("RAW_CATALOG_PATH", BASE_DIR / "db" / "raw_catalog.db"))
+
+# The six daily DSS reports, as they appear in the downloaded file names
+REPORT_TYPES = [
+    "Labor Hours",
+    "Sales by Daypart",
+    "Sales by Subcategory",
+    "Tender Type",
+    "Sales Mix Detail",
+    "Menu Mix Metrics",
+]
+
+_DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2}) to (\d{4}-\d{2}-\d{2})")
+
+
+def parse_business_date(filename) -> str | None:
+    """
+    Business date (YYYY-MM-DD) from a DSS file name, e.g.
+    "... Sales Summary v2_Sales ... 2025-10-01 to 2025-10-01_20251015T0227.xlsx".
+    Multi-day files use the start date.
+    """
+    match = _DATE_RE.search(str(filename))
+    return match.group(1) if match else None
+
+
+def report_type(filename) -> str | None:
+    for name in REPORT_TYPES:
+        if name in str(filename):
+            return name
+    return None
+
+
+def open_catalog(path: Path = CATALOG_PATH) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS raw_files (
+            path TEXT PRIMARY KEY,
+            dir TEXT NOT NULL,
+            name TEXT NOT NULL,
+            business_date TEXT,
+            report_type TEXT,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_raw_files_date_type ON raw_files (business_date, report_type);
+        CREATE TABLE IF NOT EXISTS catalog_dirs (
+            path TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL
+        );
+    """)
+    return conn
+
+
+def refresh(conn: sqlite3.Connection, raw_dir: Path = RAW_DIR, force: bool = False) -> dict:
+    """
+    Bring the catalog in line with raw_dir. Returns counts of added / updated /
+    removed files (all zero when the directory hasn't changed since last time).
+    """
+    counts = {"added": 0, "updated": 0, "removed": 0}
+    raw_dir = Path(raw_dir)
+    if not raw_dir.exists():
+        return counts
+
+    dir_mtime = raw_dir.stat().st_mtime_ns
+    row = conn.execute("SELECT mtime_ns FROM catalog_dirs WHERE path = ?", (str(raw_dir),)).fetchone()
+    if row and row[0] == dir_mtime and not force:
+        return counts
+
+    known = {
+        path: (size, mtime)
+        for path, size, mtime in conn.execute(
+            "SELECT path, size, mtime_ns FROM raw_files WHERE dir = ?", (str(raw_dir),)
+        )
+    }
+    seen = set()
+    upserts = []
+    with os.scandir(raw_dir) as entries:
+        for entry in entries:
+            if not entry.is_file() or not entry.name.endswith(".xlsx") or "_copy" in entry.name:
+                continue
+            st = entry.stat()
+            seen.add(entry.path)
+            previous = known.get(entry.path)
+            if previous == (st.st_size, st.st_mtime_ns):
+                continue
+            counts["updated" if previous else "added"] += 1
+            upserts.append((entry.path, str(raw_dir), entry.name, parse_business_date(entry.name),
+                            report_type(entry.name), st.st_size, st.st_mtime_ns))
+
+    gone = [(path,) for path in known if path not in seen]
+    counts["removed"] = len(gone)
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO raw_files VALUES (?, ?, ?, ?, ?, ?, ?)", upserts)
+        conn.executemany("DELETE FROM raw_files WHERE path = ?", gone)
+        conn.execute("INSERT OR REPLACE INTO catalog_dirs VALUES (?, ?)", (str(raw_dir), dir_mtime))
+    return counts
+
+
+def files_for_date(conn: sqlite3.Connection, business_date: str) -> list[Path]:
+    rows = conn.execute(
+        "SELECT path FROM raw_files WHERE business_date = ? ORDER BY name", (business_date,)
+    ).fetchall()
+    return [Path(row[0]) for row in rows]
+
+
+def files_by_date(conn: sqlite3.Connection, start_date: str | None = None, end_date: str | None = None) -> dict:
+    """{business_date: [Path]} for every dated file, optionally limited to start..end."""
+    sql = "SELECT business_date, path FROM raw_files WHERE business_date IS NOT NULL"
+    params = []
+    if start_date:
+        sql += " AND business_date >= ?"
+        params.append(start_date)
+    if end_date:
+        sql += " AND business_date <= ?"
+        params.append(end_date)
+    grouped = {}
+    for business_date, path in conn.execute(sql + " ORDER BY business_date, name", params):
+        grouped.setdefault(business_date, []).append(Path(path))
+    return grouped
+
+
+def undated_files(conn: sqlite3.Connection) -> list[Path]:
+    rows = conn.execute("SELECT path FROM raw_files WHERE business_date IS NULL ORDER BY name").fetchall()
+    return [Path(row[0]) for row in rows]
+
+
+def missing_report_types(conn: sqlite3.Connection, business_date: str) -> list[str]:
+    found = {row[0] for row in conn.execute(
+        "SELECT DISTINCT report_type FROM raw_files WHERE business_date = ?", (business_date,)
+    )}
+    return [t for t in REPORT_TYPES if t not in found]
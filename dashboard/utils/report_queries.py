@@ -0,0 +1,173 @@
+# dashboard/utils/report_queries.py
+# Data queries behind the dashboard pages.
+# Shared by the Streamlit pages and scripts/generate_store_reports.py so the
+# batch PDFs always show exactly what the pages show.
+
+import pandas as pd
+
+from .tender_types import EXCLUDED_CATEGORIES, classify_series, display_label, tender_display_name
+
+
+def _in_placeholders(values) -> str:
+    return ",".join(["%s"] * len(values))
+
+
+def load_sales_summary(conn, stores, start_date, end_date) -> pd.DataFrame:
+    """sales_summary rows for the given stores and inclusive date range (Executive Summary / Store Comparison)."""
+    query = f"""
+    SELECT * FROM sales_summary
+    WHERE store IN ({_in_placeholders(stores)})
+        AND date BETWEEN %s AND %s
+    """
+    return pd.read_sql(query, conn, params=list(stores) + [str(start_date), str(end_date)])
+
+
+def load_labor_metrics(conn, stores, start_date, end_date) -> pd.DataFrame:
+    """labor_metrics rows for the given stores and inclusive date range (Labor Efficiency)."""
+    query = f"""
+    SELECT * FROM labor_metrics
+    WHERE store IN ({_in_placeholders(stores)}) AND date BETWEEN %s AND %s
+    """
+    return pd.read_sql(query, conn, params=list(stores) + [str(start_date), str(end_date)])
+
+
+def standardize_tender_types(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Drop GL lines and name rows by their canonical tender category; tenders
+    with no category of their own keep their original label. tender_category
+    holds the category for grouping.
+    """
+    # Rows loaded before tender_category existed are classified on the fly
+    category = df['tender_category'].fillna(classify_series(df['tender_type']))
+    df = df[~category.isin(EXCLUDED_CATEGORIES)].copy()
+    df['tender_category'] = category[df.index]
+    df['tender_type'] = [display_label(label, cat) for label, cat in zip(df['tender_type'], df['tender_category'])]
+    return df
+
+
+def load_tender_metrics(conn, stores, start_date, end_date) -> pd.DataFrame:
+    """Standardized tender_type_metrics rows for the given stores and date range (Tender Type)."""
+    query = f"""
+    SELECT * FROM tender_type_metrics
+    WHERE store IN ({_in_placeholders(stores)}) AND date BETWEEN %s AND %s
+    """
+    df = pd.read_sql(query, conn, params=list(stores) + [str(start_date), str(end_date)])
+    if df.empty:
+        return df
+    if 'tender_category' not in df.columns:
+        df['tender_category'] = None
+    return standardize_tender_types(df)
+
+
+# --- Tender & Sales (tender_daily_pivot, db/migrations/0005_tender_daily_pivot.sql) ---
+# Tender categories shown on the tender & sales report, in column order
+REPORT_TENDER_CATEGORIES = [
+    "mastercard", "visa", "discover", "amex", "gift_card_redeem", "uber_eats", "door_dash", "grubhub",
+]
+
+
+def load_daily_tender_sales(conn, start_date, end_date, stores=None) -> pd.DataFrame:
+    """
+    One row per store/day: sales_summary joined once to the tender pivot.
+    Tender columns are named by tender_category and are 0 when absent.
+    """
+    store_clause = f"AND s.store IN ({_in_placeholders(stores)})" if stores else ""
+    tender_cols = ",\n        ".join(
+        f"COALESCE(p.{c}, 0) AS {c}" for c in REPORT_TENDER_CATEGORIES
+    )
+    query = f"""
+    SELECT
+        s.store, s.pc_number, s.date,
+        s.dd_adjusted_no_markup, s.pa_sales_tax, ABS(s.gift_card_sales) AS gift_card_sales,
+        s.cash_in, s.paid_in, s.paid_out,
+        {tender_cols}
+    FROM sales_summary s
+    LEFT JOIN tender_daily_pivot p
+        ON p.store = s.store AND p.date = s.date
+        AND p.date BETWEEN %s AND %s
+    WHERE s.date BETWEEN %s AND %s
+    {store_clause}
+    ORDER BY s.store, s.date
+    """
+    dates = [str(start_date), str(end_date)]
+    return pd.read_sql(query, conn, params=dates + dates + list(stores or []))
+
+
+def format_tender_sales_report(df: pd.DataFrame) -> pd.DataFrame:
+    """Lay out load_daily_tender_sales() rows as the tender & sales report columns."""
+    dates = pd.to_datetime(df["date"])
+    num = lambda col: pd.to_numeric(df[col], errors="coerce")  # NUMERIC columns arrive as Decimal
+    report = pd.DataFrame({
+        "Store": df["store"],
+        "Date": dates.dt.strftime("%m/%d/%y"),
+        "day": dates.dt.strftime("%a"),
+        "Dunkin Net Sales": num("dd_adjusted_no_markup"),
+        "Tax": num("pa_sales_tax"),
+        "Gift Card Sales": num("gift_card_sales"),
+        "Total": num("dd_adjusted_no_markup") + num("pa_sales_tax") + num("gift_card_sales"),
+        "Cash Due": num("cash_in"),
+    })
+    for category in REPORT_TENDER_CATEGORIES:
+        report[tender_display_name(category)] = num(category)
+    report["Paid Out"] = num("paid_out")
+    return report
+
+
+# --- Guest Reviews (medallia_reports) ---
+def review_filter_clause(start_date, end_date, pc_numbers, min_osat=1, min_ltr=0,
+                         accuracy=("Yes", "No"), channels=("In-store", "Other"), search_text="",
+                         full_text=True):
+    """
+    WHERE clause + params shared by every Guest Reviews query.
+    full_text=False swaps the Postgres tsvector match for a plain substring
+    match (used when reading from the local SQLite replica).
+    Returns (where_clause, params).
+    """
+    params = [start_date, end_date] + list(pc_numbers) + [min_osat, min_ltr] + list(accuracy) + list(channels)
+
+    if search_text and full_text:
+        search_clause = "AND comment_tsv @@ websearch_to_tsquery('english', %s)"
+        params += [search_text]
+    elif search_text:
+        search_clause = "AND LOWER(comment) LIKE %s"
+        params += [f"%{search_text.lower()}%"]
+    else:
+        search_clause = ""
+
+    where_clause = f"""
+    WHERE report_date BETWEEN %s AND %s
+    AND pc_number IN ({_in_placeholders(pc_numbers)})
+    AND osat >= %s
+    AND ltr >= %s
+    AND accuracy IN ({_in_placeholders(accuracy)})
+    AND order_channel IN ({_in_placeholders(channels)})
+    {search_clause}
+"""
+    return where_clause, params
+
+
+def load_review_kpis(conn, where_clause, params) -> pd.Series:
+    """Single-row aggregate behind the Guest Reviews KPI tiles."""
+    return pd.read_sql(f"""
+    SELECT
+        COUNT(*) AS total_reviews,
+        AVG(osat) AS avg_osat,
+        AVG(ltr) AS avg_ltr,
+        AVG(CASE WHEN accuracy = 'Yes' THEN 1.0 ELSE 0.0 END) * 100 AS accuracy_rate,
+        AVG(CASE WHEN ltr >= 9 THEN 1.0 ELSE 0.0 END) * 100 AS promoters_pct
+    FROM medallia_reports
+    {where_clause}
+""", conn, params=params).iloc[0]
+
+
+def load_review_score_counts(conn, where_clause, params, score_col) -> pd.DataFrame:
+    """Review counts per score value; score_col is 'osat' or 'ltr'."""
+    if score_col not in ("osat", "ltr"):
+        raise ValueError(f"Unsupported score column: {score_col}")
+    return pd.read_sql(f"""
+        SELECT {score_col}, COUNT(*) AS count
+        FROM medallia_reports
+        {where_clause}
+        GROUP BY {score_col}
+        ORDER BY {score_col}
+    """, conn, params=params)
@@ -0,0 +1,68 @@
+# dashboard/utils/slices.py
+# Replace whole (store, date) slices of a fact table, for re-issued reports.
+#
+# replace_slices() stages the new rows in a temp table, counts what each
+# slice holds now, deletes the old rows of every (store, date) present in the
+# new data and inserts the staged rows - all in the caller's transaction, so
+# readers see either the old day or the new one. Rows the new report no
+# longer has (a labor position or tender that disappeared) go away too, which
+# an upsert cannot do.
+#
+# All functions take an open psycopg2 cursor and leave committing to the caller.
+
+from __future__ import annotations
+
+from psycopg2.extras import execute_values
+
+from .dedupe import NATURAL_KEYS
+from .upsert import UPSERT_TABLES, row_hash
+
+SLICE_KEY = ["store", "date"]
+PAGE_SIZE = 500
+
+_STAGE = "_slice_stage"
+
+
+def replace_slices(cur, table: str, columns: list, rows, page_size: int = PAGE_SIZE) -> dict:
+    """
+    Replace every (store, date) slice of table present in rows (sequences in
+    `columns` order). Returns {"slices": [(store, date, old_rows, new_rows)],
+    "deleted": n, "inserted": n}.
+    """
+    missing = [c for c in SLICE_KEY if c not in columns]
+    if missing:
+        raise ValueError(f"Slice replacement in {table} needs columns {missing}")
+
+    rows = [list(row) for row in rows]
+    insert_cols = list(columns)
+    if table in UPSERT_TABLES:
+        # Keep row_hash current so later upserts compare against these rows
+        value_idx = [i for i, c in enumerate(columns) if c not in NATURAL_KEYS[table]]
+        rows = [row + [row_hash(row[i] for i in value_idx)] for row in rows]
+        insert_cols.append("row_hash")
+    if not rows:
+        return {"slices": [], "deleted": 0, "inserted": 0}
+
+    cols = ", ".join(insert_cols)
+    cur.execute(f"DROP TABLE IF EXISTS {_STAGE}")
+    cur.execute(f"CREATE TEMP TABLE {_STAGE} ON COMMIT DROP AS SELECT {cols} FROM {table} WITH NO DATA")
+    execute_values(cur, f"INSERT INTO {_STAGE} ({cols}) VALUES %s", rows, page_size=page_size)
+
+    match = " AND ".join(f"t.{c} = k.{c}" for c in SLICE_KEY)
+    keys = ", ".join(SLICE_KEY)
+    cur.execute(f"""
+        SELECT k.store, k.date,
+               (SELECT COUNT(*) FROM {table} t WHERE {match}),
+               k.new_rows
+        FROM (SELECT {keys}, COUNT(*) AS new_rows FROM {_STAGE} GROUP BY {keys}) k
+        ORDER BY k.date, k.store
+    """)
+    slices = cur.fetchall()
+
+    cur.execute(f"DELETE FROM {table} t USING (SELECT DISTINCT {keys} FROM {_STAGE}) k WHERE {match}")
+    deleted = cur.rowcount
+    cur.execute(f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {_STAGE}")
+    inserted = cur.rowcount
+    cur.execute(f"DROP TABLE {_STAGE}")
+
+    return {"slices": slices, "deleted": deleted, "inserted": inserted}
@@ -1,9 +1,12 @@
 # dashboard/utils/supabase_db.py
 # Unified secrets loader for CLI + Streamlit.
 # Looks for:
-#   1) ~/.streamlit/secrets.toml
-#   2) <repo>/.streamlit/secrets.toml
-#   3) Environment variables: SUPABASE_HOST, SUPABASE_PORT, SUPABASE_DB, SUPABASE_USER, SUPABASE_PASS
+#   1) Environment variables: SUPABASE_HOST, SUPABASE_PORT, SUPABASE_DB, SUPABASE_USER, SUPABASE_PASS
+#      (when all are set they win, so a local database - scripts/pg_sandbox.py - is never
+#      shadowed by the production secrets file)
+#   2) ~/.streamlit/secrets.toml
+#   3) <repo>/.streamlit/secrets.toml
+# SUPABASE_SSLMODE overrides sslmode (default "require"; a local server needs "disable").
 
 from __future__ import annotations
 from pathlib import Path
@@ -33,12 +36,6 @@ def _load_secrets() -> dict:
     home_secrets = Path.home() / ".streamlit" / "secrets.toml"
     proj_secrets = _project_root_from_this_file() / ".streamlit" / "secrets.toml"
 
-    if home_secrets.exists():
-        return _read_toml(home_secrets)
-    if proj_secrets.exists():
-        return _read_toml(proj_secrets)
-
-    # Fallback: env vars
     env = {
         "SUPABASE_HOST": os.getenv("SUPABASE_HOST"),
         "SUPABASE_PORT": os.getenv("SUPABASE_PORT", "5432"),
@@ -47,7 +44,13 @@ def _load_secrets() -> dict:
         "SUPABASE_PASS": os.getenv("SUPABASE_PASS"),
     }
     if all(env.values()):
-        return env
+        # Nested like secrets.toml's [supabase] section (_get_db_params reads either key style)
+        return {"supabase": env}
+
+    if home_secrets.exists():
+        return _read_toml(home_secrets)
+    if proj_secrets.exists():
+        return _read_toml(proj_secrets)
 
     # Helpful error with the exact paths we checked
     raise FileNotFoundError(
@@ -72,8 +75,9 @@ def _get_db_params() -> dict:
         )
     return dict(host=host, port=port, dbname=db, user=user, password=pwd)
 
-def get_supabase_connection():
+def get_supabase_connection(connect_timeout: int | None = None):
     params = _get_db_params()
+    extra = {"connect_timeout": connect_timeout} if connect_timeout else {}
     # Force SSL for Supabase
     return psycopg2.connect(
         host=params["host"],
@@ -81,5 +85,6 @@ def get_supabase_connection():
         dbname=params["dbname"],
         user=params["user"],
         password=params["password"],
-        sslmode="require",
+        sslmode=os.getenv("SUPABASE_SSLMODE", "require"),
+        **extra,
     )
@@ -0,0 +1,125 @@
+# dashboard/utils/tender_types.py
+# The one place tender labels are normalized.
+#
+# - canonical_label(): cleans a raw DSS tender label at compile time
+#   (this was TENDER_MAP in scripts/compile_store_reports.py).
+# - classify_tender(): maps any stored label to a tender_category. The loader
+#   stamps the result onto tender_type_metrics.tender_category and registers
+#   the label in the tender_types table (db/migrations/0004_tender_types.sql),
+#   so pages and reports group by the category instead of pattern-matching
+#   tender_type on every query.
+
+from __future__ import annotations
+import re
+
+# tender_category -> display name (also the tender report column headers)
+TENDER_CATEGORIES = {
+    "mastercard": "Mastercard",
+    "visa": "Visa",
+    "visa_kiosk": "Visa-Kiosk",
+    "discover": "Discover",
+    "amex": "Amex",
+    "gift_card_redeem": "Gift Card Redeem",
+    "gc_redeem_offline": "GC Redeem Offline",
+    "uber_eats": "Uber Eats",
+    "door_dash": "Door Dash",
+    "grubhub": "Grubhub",
+    "clover_go": "Clover Go",
+    "gl_line": "GL Line",
+    "other": "Other",
+}
+
+# Categories that are not tenders (GL description lines in the DSS export)
+EXCLUDED_CATEGORIES = {"gl_line"}
+
+# (pattern, category), checked in order against the lower-cased label; first
+# match wins. Order matters: redeem before card brands, kiosk before visa.
+# The numeric codes are GL account numbers some exports use as the only label.
+CATEGORY_RULES = [
+    (r"4000097", "gc_redeem_offline"),
+    (r"gc.*redeem|gift.*card.*redeem", "gift_card_redeem"),
+    (r"uber.*eats|4000106", "uber_eats"),
+    (r"door.*dash|4000107", "door_dash"),
+    (r"grub.*hub|4000098", "grubhub"),
+    (r"visa.*kiosk", "visa_kiosk"),
+    (r"visa", "visa"),
+    (r"american express|amex", "amex"),
+    (r"discover", "discover"),
+    (r"mastercard|master card", "mastercard"),
+    (r"clover go", "clover_go"),
+    (r"gl", "gl_line"),
+]
+_COMPILED_RULES = [(re.compile(pattern), category) for pattern, category in CATEGORY_RULES]
+
+# Raw DSS label (lower-cased, substring match) -> label written to the compiled files.
+# Unchanged from compile_store_reports so previously loaded rows keep matching.
+COMPILE_LABELS = {
+    "credit card - amex": "Amex",
+    "credit card - discover": "Discover",
+    "credit card - mastercard": "Mastercard",
+    "credit card - visa": "Visa",
+    "visa - kiosk": "Visa-Kiosk",
+    "gift card redeem": "GC Redeem",
+    "clover go": "Clover Go",
+    "delivery: doordash": "Doordash",
+    "delivery: uber eats": "Uber Eats",
+    "grub hub": "Grub Hub",
+}
+
+
+def canonical_label(label: str) -> str:
+    """Clean label for a raw DSS tender line (used when compiling the Tender Type files)."""
+    key = label.strip().lower()
+    for pattern, out in COMPILE_LABELS.items():
+        if key == pattern or pattern in key:
+            return out
+    return label.strip()
+
+
+def classify_tender(label) -> str:
+    """tender_category for a stored tender_type label ('other' when nothing matches)."""
+    key = str(label or "").strip().lower()
+    for pattern, category in _COMPILED_RULES:
+        if pattern.search(key):
+            return category
+    return "other"
+
+
+def tender_display_name(category) -> str:
+    return TENDER_CATEGORIES.get(category, "Other")
+
+
+def display_label(label, category) -> str:
+    """Display name for a tender row: its category's name, or the label itself when unmapped."""
+    if category in TENDER_CATEGORIES and category != "other":
+        return TENDER_CATEGORIES[category]
+    return str(label).strip() if label is not None and label == label else "Other"
+
+
+def classify_series(labels):
+    """classify_tender over a pandas Series, evaluating each distinct label once."""
+    return labels.map({label: classify_tender(label) for label in labels.dropna().unique()})
+
+
+def resolve_tender_categories(cur, labels) -> dict:
+    """
+    tender_category for each label, as recorded in the tender_types table.
+    Labels not in the table yet are classified and added first; existing rows
+    are left alone, so a manual re-classification in the table wins.
+    """
+    from psycopg2.extras import execute_values
+
+    labels = sorted({str(label) for label in labels if label})
+    if not labels:
+        return {}
+    rows = [(label, classify_tender(label), tender_display_name(classify_tender(label))) for label in labels]
+    execute_values(cur, """
+        INSERT INTO tender_types (tender_type, tender_category, display_name)
+        VALUES %s
+        ON CONFLICT (tender_type) DO NOTHING
+    """, rows, page_size=len(rows))
+    cur.execute(
+        "SELECT tender_type, tender_category FROM tender_types WHERE tender_type = ANY(%s)",
+        (labels,),
+    )
+    return dict(cur.fetchall())
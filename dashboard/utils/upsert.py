@@ -0,0 +1,107 @@
+# dashboard/utils/upsert.py
+# Change-aware upsert keyed on each table's natural key.
+#
+# Every row carries row_hash, an md5 of its non-key values
+# (db/migrations/0008_row_hash.sql). upsert_rows() sends
+#     INSERT ... ON CONFLICT (natural key) DO UPDATE ... WHERE the hash differs
+#     RETURNING (xmax = 0)
+# so re-loading a corrected file rewrites only the rows whose values changed,
+# and the RETURNING flag tells new rows from updated ones; rows that come back
+# unreturned were unchanged. Rows loaded before row_hash existed have NULL
+# there, and for those the values themselves are compared.
+#
+# All functions take an open psycopg2 cursor and leave committing to the caller.
+
+from __future__ import annotations
+import hashlib
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from psycopg2.extras import execute_values
+
+from .coverage import POS_FEEDS
+from .dedupe import NATURAL_KEYS
+
+# Tables with a natural-key unique constraint and a row_hash column
+UPSERT_TABLES = POS_FEEDS
+PAGE_SIZE = 500
+
+
+def _canonical(value):
+    """JSON-able form of a cell, so 5, 5.0, numpy.int64(5) and Decimal('5') hash alike."""
+    try:
+        if value is None or value != value:  # None, NaN, NaT
+            return None
+    except TypeError:  # pandas.NA
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "item"):  # numpy scalar
+        value = value.item()
+    if isinstance(value, Decimal):
+        value = float(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def row_hash(values) -> str:
+    return hashlib.md5(json.dumps([_canonical(v) for v in values], default=str).encode("utf-8")).hexdigest()
+
+
+def upsert_rows(cur, table: str, columns: list, rows, page_size: int = PAGE_SIZE) -> dict:
+    """
+    Upsert rows (sequences in `columns` order, which must include the table's
+    natural key). Returns {"inserted", "updated", "unchanged"} counts.
+
+    Rows repeating a key within the call collapse to the last one (a single
+    INSERT ... ON CONFLICT cannot touch a row twice).
+    """
+    if table not in UPSERT_TABLES:
+        raise ValueError(f"{table} has no row_hash / natural-key constraint for upserts")
+    key = NATURAL_KEYS[table]
+    missing = [k for k in key if k not in columns]
+    if missing:
+        raise ValueError(f"Upsert into {table} needs its key columns: {missing}")
+
+    key_idx = [columns.index(c) for c in key]
+    value_cols = [c for c in columns if c not in key]
+    value_idx = [columns.index(c) for c in value_cols]
+
+    by_key = {}
+    for row in rows:
+        row = list(row)
+        by_key[tuple(_canonical(row[i]) for i in key_idx)] = row + [row_hash(row[i] for i in value_idx)]
+    data = list(by_key.values())
+    if not data:
+        return {"inserted": 0, "updated": 0, "unchanged": 0}
+
+    if value_cols:
+        current = ", ".join(f"{table}.{c}" for c in value_cols)
+        incoming = ", ".join(f"EXCLUDED.{c}" for c in value_cols)
+        on_conflict = f"""
+            DO UPDATE SET {", ".join(f"{c} = EXCLUDED.{c}" for c in value_cols + ["row_hash"])}
+            WHERE {table}.row_hash IS DISTINCT FROM EXCLUDED.row_hash
+              AND ({table}.row_hash IS NOT NULL OR ROW({current}) IS DISTINCT FROM ROW({incoming}))
+        """
+    else:
+        on_conflict = "DO NOTHING"
+
+    returned = execute_values(
+        cur,
+        f"""
+        INSERT INTO {table} ({", ".join(columns)}, row_hash) VALUES %s
+        ON CONFLICT ({", ".join(key)}) {on_conflict}
+        RETURNING (xmax = 0)
+        """,
+        data,
+        page_size=page_size,
+        fetch=True,
+    )
+    inserted = sum(1 for (is_new,) in returned if is_new)
+    return {
+        "inserted": inserted,
+        "updated": len(returned) - inserted,
+        "unchanged": len(data) - len(returned),
+    }
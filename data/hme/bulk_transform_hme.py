@@ -1,40 +1,82 @@
 #!/usr/bin/env python3
 """
-bulk_transform_hme.py — Process all HME raw Excel files in data/hme/raw and combine into a single transformed output.
+bulk_transform_hme.py — Transform the HME raw Excel files in data/hme/raw into the
+Parquet dataset in data/hme/transformed/dataset (see hme_dataset.py).
+
+Only files that are new or changed since their last transform are parsed, in
+parallel worker processes; each becomes one part in its report date's
+partition. Upload the new parts with: python upload_hme_to_supabase.py --dataset
+
+Usage:
+    python bulk_transform_hme.py
+    python bulk_transform_hme.py --workers 8
+    python bulk_transform_hme.py --all      # re-transform every raw file
 """
-import pandas as pd
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+
+import hme_dataset
 from transform_hme import parse_hme_to_desired
-import sys
+
+RAW_DIR = Path(__file__).parent / "raw"
+
+
+def transform_file(path: Path) -> dict:
+    """Worker: transform one raw file and write its part. Returns a status entry."""
+    try:
+        df = parse_hme_to_desired(path)
+        part = hme_dataset.write_part(path, df)
+    except Exception as e:
+        return {"path": path, "status": "error", "error": str(e)}
+    return {"path": path, "status": "ok", "part": part, "rows": len(df)}
+
 
 def main():
-    raw_dir = Path(__file__).parent / "raw"
-    outdir = Path(__file__).parent / "transformed"
-    outdir.mkdir(parents=True, exist_ok=True)
-    xlsx_path = outdir / "hme_transformed_bulk.xlsx"
-    
+    parser = argparse.ArgumentParser(description="Transform new HME raw files into the Parquet dataset")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1),
+                        help="Worker processes (default: min(4, CPUs))")
+    parser.add_argument("--all", action="store_true", help="Re-transform files already in the dataset")
+    args = parser.parse_args()
+
     # Find all files matching hme_report_YYYYMMDD.xlsx
-    files = sorted(raw_dir.glob("hme_report_*.xlsx"))
+    files = sorted(RAW_DIR.glob("hme_report_*.xlsx"))
     if not files:
         print("[ERR] No HME raw files found.")
         sys.exit(1)
-    
-    all_dfs = []
-    for f in files:
-        try:
-            df = parse_hme_to_desired(f)
-            all_dfs.append(df)
-            print(f"[OK] Processed: {f.name} ({len(df)} rows)")
-        except Exception as e:
-            print(f"[ERR] Failed to process {f.name}: {e}")
-    
-    if not all_dfs:
-        print("[ERR] No data processed.")
+
+    manifest = hme_dataset.load_manifest()
+    todo = files if args.all else [f for f in files if hme_dataset.needs_transform(f, manifest)]
+    print(f"[INFO] {len(files)} raw files, {len(todo)} to transform with {args.workers} worker(s)")
+    if not todo:
+        print("[OK] Dataset is up to date.")
+        return
+
+    # Size/mtime as of now, so a file rewritten mid-run is picked up next time
+    states = {f: hme_dataset.file_state(f) for f in todo}
+    # Rows uploaded from earlier transforms, replaced on the next upload
+    stale = {f: hme_dataset.uploaded_slices(manifest, f) for f in todo}
+    failed = rows = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(transform_file, f) for f in todo]
+        for i, future in enumerate(as_completed(futures), 1):
+            entry = future.result()
+            path = entry["path"]
+            if entry["status"] == "error":
+                failed += 1
+                print(f"[ERR] [{i}/{len(todo)}] Failed to process {path.name}: {entry['error']}")
+                continue
+            hme_dataset.record_part(manifest, path, states[path], entry["part"], entry["rows"], stale[path])
+            hme_dataset.save_manifest(manifest)  # keep what's done if the run is interrupted
+            rows += entry["rows"]
+            print(f"[OK] [{i}/{len(todo)}] Processed: {path.name} ({entry['rows']} rows) -> {entry['part']}")
+
+    print(f"[OK] Wrote {rows} rows from {len(todo) - failed} file(s) to: {hme_dataset.DATASET_DIR.resolve()}")
+    if failed:
+        print(f"[ERR] {failed} file(s) failed")
         sys.exit(1)
-    
-    df_all = pd.concat(all_dfs, ignore_index=True)
-    df_all.to_excel(xlsx_path, index=False)
-    print(f"[OK] Wrote {len(df_all)} rows to: {xlsx_path.resolve()}")
 
 if __name__ == "__main__":
     main()
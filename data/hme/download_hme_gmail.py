@@ -1,52 +1,26 @@
-import imaplib
-import email
 from email.header import decode_header
 import os
+import sys
 from dotenv import load_dotenv
 from pathlib import Path
 
+BASE_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BASE_DIR))
 
+from dashboard.utils import mail_client
 
 # Email credentials from .env
-IMAP_SERVER = "imap.gmail.com"
-BASE_DIR = Path(__file__).resolve().parents[2]
 load_dotenv(dotenv_path=BASE_DIR / '.env')
-EMAIL = os.getenv("EMAIL_USER")
-PASSWORD = os.getenv("EMAIL_PASS")
-print(f"[DEBUG] EMAIL loaded: {EMAIL}")
-print(f"[DEBUG] PASSWORD loaded: {'*' * len(PASSWORD) if PASSWORD else None}")
 
 # Directory to save the attachment
-SAVE_DIR = r"C:\Projects\Dunkin-sales-summary\data\hme\raw"
+SAVE_DIR = BASE_DIR / "data" / "hme" / "raw"
 SAVE_FILENAME = "hme_report.xlsx"
 
 
-def download_hme_report():
+def save_hme_attachment(msg):
+    """Save the first Excel attachment as raw/hme_report.xlsx; returns the saved path(s)."""
     os.makedirs(SAVE_DIR, exist_ok=True)
 
-    mail = imaplib.IMAP4_SSL(IMAP_SERVER)
-    mail.login(EMAIL, PASSWORD)
-    mail.select("inbox")
-
-    # Search emails from no-reply@hmeqsr.com
-    result, data = mail.search(None, '(FROM "no-reply@hmeqsr.com")')
-    email_ids = data[0].split()
-
-    if not email_ids:
-        print("No matching emails found.")
-        return
-
-    # Process the latest email
-    latest_email_id = email_ids[-1]
-    res, msg_data = mail.fetch(latest_email_id, "(RFC822)")
-    if res != "OK":
-        print("Failed to fetch the email.")
-        return
-
-    raw_email = msg_data[0][1]
-    msg = email.message_from_bytes(raw_email)
-
-    attachment_saved = False
     for part in msg.walk():
         if part.get_content_maintype() == "multipart":
             continue
@@ -62,13 +36,31 @@ def download_hme_report():
                 with open(filepath, "wb") as f:
                     f.write(part.get_payload(decode=True))
                 print(f"[OK] Saved HME report: {filepath}")
-                attachment_saved = True
-                break
+                return [filepath]
+
+    print("No Excel attachment found in the latest email.")
+    return []
+
 
-    if not attachment_saved:
-        print("No Excel attachment found in the latest email.")
+def mail_feed():
+    """Feed for dashboard.utils.mail_client: the latest email from HME."""
+    return {
+        "search": '(FROM "no-reply@hmeqsr.com")',
+        "latest": True,
+        "handler": save_hme_attachment,
+    }
 
-    mail.logout()
+
+def download_hme_report():
+    email_user, password = mail_client.credentials()
+    print(f"[DEBUG] EMAIL loaded: {email_user}")
+    print(f"[DEBUG] PASSWORD loaded: {'*' * len(password) if password else None}")
+
+    saved, errors, _ = mail_client.download({"hme": mail_feed()})
+    if "hme" in errors:
+        raise errors["hme"]
+    if not saved["hme"]:
+        print("No matching emails found.")
 
 
 if __name__ == "__main__":
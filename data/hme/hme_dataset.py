@@ -0,0 +1,150 @@
+# hme_dataset.py — append-only Parquet store of transformed HME reports
+#
+# Layout:  transformed/dataset/date=YYYY-MM-DD/<raw file stem>.parquet
+#
+# One part per raw file, in the partition of its report date (the date lives
+# in the directory name only, as in dashboard/utils/parquet_lake.py).
+# _manifest.json records for every raw file the size/mtime it was transformed
+# at, the part it produced and when that part was uploaded, so
+# bulk_transform_hme.py only parses new or changed files and
+# upload_hme_to_supabase.py --dataset only reads parts not uploaded yet.
+#
+# When an uploaded file is transformed again, its entry keeps the (date,
+# stores) the earlier upload wrote under "stale", so the next upload clears
+# them - also when the report moved to another date - before loading the new part.
+
+from __future__ import annotations
+from datetime import date, datetime
+from pathlib import Path
+import json
+import os
+
+import pandas as pd
+
+DATA_DIR = Path(__file__).resolve().parent
+DATASET_DIR = DATA_DIR / "transformed" / "dataset"
+MANIFEST_PATH = DATASET_DIR / "_manifest.json"
+
+
+def load_manifest() -> dict:
+    """{raw file name: {"size", "mtime_ns", "part", "rows", "transformed_at", "uploaded_at", "stale"}}"""
+    if not MANIFEST_PATH.exists():
+        return {}
+    with open(MANIFEST_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest: dict) -> None:
+    DATASET_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = MANIFEST_PATH.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def file_state(path: Path) -> dict:
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def needs_transform(path: Path, manifest: dict) -> bool:
+    """True for raw files not in the manifest, or changed since they were transformed."""
+    entry = manifest.get(path.name)
+    if entry is None:
+        return True
+    state = file_state(path)
+    return (entry["size"], entry["mtime_ns"]) != (state["size"], state["mtime_ns"])
+
+
+def write_part(raw_path: Path, df: pd.DataFrame) -> str | None:
+    """
+    Write one raw file's transformed rows (transform_hme output) as its part.
+    Returns the part path relative to DATASET_DIR, or None if there were no rows.
+    """
+    if df.empty:
+        return None
+    days = pd.to_datetime(df["Date"]).dt.date.unique()
+    if len(days) != 1:
+        raise ValueError(f"{raw_path.name}: expected one report date, got {len(days)}")
+    rel = Path(f"date={days[0].isoformat()}") / f"{raw_path.stem}.parquet"
+    out_path = DATASET_DIR / rel
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_suffix(".parquet.tmp")
+    df.drop(columns=["Date"]).to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, out_path)  # readers never see a half-written part
+    return rel.as_posix()
+
+
+def part_date(part: str) -> date:
+    """Report date of a part, from its partition directory."""
+    return date.fromisoformat(Path(part).parent.name.split("=", 1)[1])
+
+
+def uploaded_slices(manifest: dict, raw_path: Path) -> list:
+    """
+    The (date, stores) already in the database from this raw file: stale
+    slices not cleared yet plus its uploaded part. Read it before the file is
+    transformed again, as write_part overwrites a part that keeps its date.
+    """
+    entry = manifest.get(raw_path.name) or {}
+    slices = list(entry.get("stale") or [])
+    part = entry.get("part")
+    if part and entry.get("uploaded_at") and (DATASET_DIR / part).exists():
+        stores = pd.read_parquet(DATASET_DIR / part, columns=["store"])["store"].astype(str).unique()
+        slices.append({"date": part_date(part).isoformat(), "stores": sorted(stores)})
+    return slices
+
+
+def record_part(manifest: dict, raw_path: Path, state: dict, part: str | None, rows: int, stale: list) -> None:
+    """
+    Update the manifest entry of a freshly transformed raw file; its part is
+    due for upload, after clearing `stale` (uploaded_slices from before the transform).
+    """
+    old_part = (manifest.get(raw_path.name) or {}).get("part")
+    if old_part and old_part != part:
+        # The report moved to another date; drop the part it wrote before
+        (DATASET_DIR / old_part).unlink(missing_ok=True)
+    manifest[raw_path.name] = {
+        **state,
+        "part": part,
+        "rows": rows,
+        "transformed_at": datetime.now().isoformat(timespec="seconds"),
+        "uploaded_at": None,
+        "stale": stale,
+    }
+
+
+def pending_uploads(manifest: dict) -> dict:
+    """
+    {raw file name: part} for entries not uploaded yet: new parts, and files
+    with stale rows to clear (part None if the new transform had no rows).
+    """
+    return {
+        name: e["part"] for name, e in sorted(manifest.items())
+        if (e.get("part") or e.get("stale")) and not e.get("uploaded_at")
+    }
+
+
+def stale_slices(manifest: dict, names) -> list:
+    """[(date, store text)] written by earlier uploads of these raw files."""
+    return sorted({
+        (date.fromisoformat(s["date"]), store)
+        for name in names for s in manifest[name].get("stale") or [] for store in s["stores"]
+    })
+
+
+def mark_uploaded(manifest: dict, names) -> None:
+    now = datetime.now().isoformat(timespec="seconds")
+    for name in names:
+        manifest[name]["uploaded_at"] = now
+        manifest[name]["stale"] = []
+
+
+def read_parts(parts) -> pd.DataFrame:
+    """Concatenate parts, with the Date column restored from their partition directory."""
+    frames = []
+    for part in filter(None, parts):
+        df = pd.read_parquet(DATASET_DIR / part)
+        df.insert(0, "Date", part_date(part))
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
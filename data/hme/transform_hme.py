@@ -4,13 +4,16 @@
 #   python transform_hme.py raw/hme_report.xlsx
 #   python transform_hme.py raw/hme_report.xlsx --outdir transformed --csv custom.csv --xlsx custom.xlsx
 
-import re
 from datetime import datetime
 from pathlib import Path
 import argparse
+import sys
 import pandas as pd
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from dashboard.utils import excel_reader
+
 DESIRED_SHEET = "Paginated Summary Multi Store R"
 EXPECTED_OUTPUT_COLS = [
     "Date","store","time_measure","Total Cars","menu_all","greet_all",
@@ -19,138 +22,98 @@ EXPECTED_OUTPUT_COLS = [
 ]
 
 def _read_hme_sheet(hme_path: Path) -> pd.DataFrame:
-    xls = pd.ExcelFile(hme_path)
+    xls = excel_reader.excel_file(hme_path)
     sheet = DESIRED_SHEET if DESIRED_SHEET in xls.sheet_names else xls.sheet_names[0]
-    return pd.read_excel(xls, sheet_name=sheet)
+    return xls.parse(sheet)
+
+# Header text -> output column for the metric columns we keep
+METRIC_COLUMNS = {
+    "Total Cars": "Total Cars",
+    "Menu Board": "Menu Board",
+    "Greet": "Greet",
+    "Menu 1": "Menu 1",
+    "Greet 1": "Greet 1",
+    "Menu 2": "Menu 2",
+    "Greet 2": "Greet 2",
+    "Service": "service",
+    "Lane Queue": "lane_queue",
+    "Lane Total": "lane_total",
+}
+DAY_PATTERN = r"Day:\s*(\d{2}/\d{2}/\d{4})"
 
 def _extract_report_date(df: pd.DataFrame) -> datetime.date:
-    for col in df.columns:
-        for val in df[col].astype(str).fillna(""):
-            m = re.search(r"Day:\s*(\d{2}/\d{2}/\d{4})", val)
-            if m:
-                return datetime.strptime(m.group(1), "%m/%d/%Y").date()
-    raise RuntimeError("Could not find a 'Day: mm/dd/yyyy' date in the report.")
-
-def _nz(v):
-    """Return value if numeric > 0, else None."""
-    try:
-        x = float(v)
-        return x if x > 0 else None
-    except Exception:
-        return None
+    # Column by column, top to bottom; only text cells can hold "Day: ..."
+    cells = pd.Series(df.to_numpy(dtype=object).ravel(order="F"), dtype=object)
+    text = cells[cells.map(type) == str]
+    found = text.str.extract(DAY_PATTERN, expand=False).dropna()
+    if found.empty:
+        raise RuntimeError("Could not find a 'Day: mm/dd/yyyy' date in the report.")
+    return datetime.strptime(found.iloc[0], "%m/%d/%Y").date()
+
+def _to_float(values: pd.Series) -> pd.Series:
+    """float(v) per cell, NaN where that fails - whole column at once."""
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.astype(float)
+    out = pd.to_numeric(values, errors="coerce").astype(float)
+    # Text float() still reads but to_numeric doesn't ("1_000", "infinity", ...)
+    for i in np.flatnonzero(out.isna().to_numpy() & values.notna().to_numpy()):
+        try:
+            out.iat[i] = float(values.iat[i])
+        except (TypeError, ValueError):
+            pass
+    return out
 
-def parse_hme_to_desired(hme_path: Path) -> pd.DataFrame:
-    df = _read_hme_sheet(hme_path)
-    report_date = _extract_report_date(df)
-
-    # ---- Find the header row (contains "Time Measure") ----
-    header_row_idx = None
-    for i in range(len(df)):
-        if (df.iloc[i] == "Time Measure").any():
-            header_row_idx = i
-            break
-    if header_row_idx is None:
+def transform_hme_frame(df: pd.DataFrame, report_date=None) -> pd.DataFrame:
+    """Raw HME sheet (as read by _read_hme_sheet) -> one row per store and time measure."""
+    if report_date is None:
+        report_date = _extract_report_date(df)
+    grid = df.to_numpy(dtype=object)
+
+    # ---- Find the header row and column (first "Time Measure" cell) ----
+    hits = np.argwhere(grid == "Time Measure")
+    if len(hits) == 0:
         raise RuntimeError("Could not find 'Time Measure' header row in the sheet.")
+    header_row_idx = int(hits[0][0])
+    time_measure_col = int(hits[0][1])
 
-    header_row = df.iloc[header_row_idx]
-    tm_matches = np.where(header_row.values == "Time Measure")[0]
-    if len(tm_matches) == 0:
-        raise RuntimeError("Header row found, but no 'Time Measure' column index.")
-    time_measure_col = int(tm_matches[0])
-
-    # ---- Map the columns we care about to their indices ----
-    wanted = {
-        "Total Cars": "Total Cars",
-        "Menu Board": "Menu Board",
-        "Greet": "Greet",
-        "Menu 1": "Menu 1",
-        "Greet 1": "Greet 1",
-        "Menu 2": "Menu 2",
-        "Greet 2": "Greet 2",
-        "Service": "service",
-        "Lane Queue": "lane_queue",
-        "Lane Total": "lane_total",
-    }
+    # ---- Map the columns we care about to their indices (last one wins) ----
     idx_map = {}
-    for j, v in enumerate(header_row):
-        if isinstance(v, str) and v in wanted:
-            idx_map[wanted[v]] = j
-
-    records = []
-    current_store = None
-
-    for r in range(header_row_idx + 1, len(df)):
-        row = df.iloc[r]
-        if pd.isna(row).all():
-            continue
-
-        # Update current store when we hit a row with a non-empty first cell
-        v0 = row.iloc[0]
-        if isinstance(v0, str) and v0.strip():
-            current_store = " ".join(v0.strip().split())  # collapse whitespace
-
-        if not current_store:
-            continue
-
-        time_measure = row.iloc[time_measure_col]
-        if pd.isna(time_measure):
-            continue
-
-        def get_val(key):
-            j = idx_map.get(key)
-            if j is None:
-                return None
-            v = row.iloc[j]
-            try:
-                return float(v)
-            except Exception:
-                return pd.to_numeric(pd.Series([v]), errors="coerce").iloc[0]
-
-        menu_board = get_val("Menu Board")
-        greet      = get_val("Greet")
-        menu1      = get_val("Menu 1")
-        greet1     = get_val("Greet 1")
-
-        rec = {
-            "Date": pd.to_datetime(report_date),
-            "store": current_store,
-            "time_measure": str(time_measure),
-            "Total Cars": get_val("Total Cars"),
-            "Menu Board": menu_board,
-            "Greet":      greet,
-            "Menu 1":     menu1,
-            "Greet 1":    greet1,
-            "Menu 2":     get_val("Menu 2"),
-            "Greet 2":    get_val("Greet 2"),
-            "service":    get_val("service"),
-            "lane_queue": get_val("lane_queue"),
-            "lane_total": get_val("lane_total"),
-        }
-
-        # Fallbacks: use Menu Board/Greet ONLY if > 0; else use Menu 1/Greet 1
-        rec["menu_all"]  = _nz(menu_board) if _nz(menu_board) is not None else _nz(menu1)
-        rec["greet_all"] = _nz(greet)      if _nz(greet)      is not None else _nz(greet1)
-
-        records.append(rec)
-
-    out = pd.DataFrame.from_records(records)
-
-    # Normalize types
-    if "Date" in out.columns:
-        out["Date"] = pd.to_datetime(out["Date"], errors="coerce").dt.date
-
-    numeric_cols = [
-        "Total Cars","menu_all","greet_all","Menu Board","Greet",
-        "Menu 1","Greet 1","Menu 2","Greet 2","service","lane_queue","lane_total"
-    ]
-    for c in numeric_cols:
-        if c in out.columns:
-            out[c] = pd.to_numeric(out[c], errors="coerce")
+    for j, v in enumerate(grid[header_row_idx]):
+        if isinstance(v, str) and v in METRIC_COLUMNS:
+            idx_map[METRIC_COLUMNS[v]] = j
+
+    body = df.iloc[header_row_idx + 1:]
+
+    # Store = last non-blank text in the first column, whitespace collapsed
+    first = body.iloc[:, 0].astype(object)
+    labels = first[first.map(type) == str].str.split().str.join(" ")
+    store = labels[labels != ""].reindex(body.index).ffill()
+
+    time_measure = body.iloc[:, time_measure_col]
+    keep = (store.notna() & time_measure.notna()).to_numpy()
+    body = body[keep]
+
+    out = pd.DataFrame({
+        "Date": [report_date] * len(body),
+        "store": store[keep].to_numpy(),
+        "time_measure": time_measure[keep].map(str).to_numpy(),
+    })
+    for name in ["Total Cars", "Menu Board", "Greet", "Menu 1", "Greet 1", "Menu 2", "Greet 2",
+                 "service", "lane_queue", "lane_total"]:
+        j = idx_map.get(name)
+        out[name] = _to_float(body.iloc[:, j]).to_numpy() if j is not None else np.nan
+
+    # Fallbacks: use Menu Board/Greet ONLY if > 0; else use Menu 1/Greet 1
+    out["menu_all"] = out["Menu Board"].where(out["Menu Board"] > 0, out["Menu 1"].where(out["Menu 1"] > 0))
+    out["greet_all"] = out["Greet"].where(out["Greet"] > 0, out["Greet 1"].where(out["Greet 1"] > 0))
 
     # Final order + stable sort (keeps original block ordering where ties)
     out = out[EXPECTED_OUTPUT_COLS].sort_values(["store","time_measure"], kind="stable").reset_index(drop=True)
     return out
 
+def parse_hme_to_desired(hme_path: Path) -> pd.DataFrame:
+    return transform_hme_frame(_read_hme_sheet(hme_path))
+
 def main():
     # Always use hme_report.xlsx in data/hme/raw
     input_path = Path(__file__).parent / "raw" / "hme_report.xlsx"
@@ -17,6 +17,7 @@ BASE_DIR  = DATA_DIR.parents[1]               # .../Dunkin-Sales-Summary
 # Reuse existing Supabase Postgres connection helper
 sys.path.append(str(BASE_DIR))
 from dashboard.utils import supabase_db  # expects get_supabase_connection()
+from dashboard.utils import coverage
 
 # Table: public.hme_report (id serial PK)
 # Columns to insert (exact names & types):
@@ -124,6 +125,9 @@ def main():
                 rows = df.to_dict(orient="records")
                 for i in range(0, total, batch_size):
                     cur.executemany(INSERT_SQL, rows[i:i+batch_size])
+                dates = df["date"].dropna()
+                if not dates.empty:
+                    coverage.refresh_coverage(cur, "hme_report", dates.min(), dates.max())
                 print(f"[OK] Uploaded {src.name}")
 
 if __name__ == "__main__":
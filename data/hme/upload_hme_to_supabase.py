@@ -1,8 +1,16 @@
 #!/usr/bin/env python3
 # upload_hme_to_supabase.py — insert transformed HME into public.hme_report (your schema)
+# Usage:
+#   python upload_hme_to_supabase.py             # latest transformed XLSX
+#   python upload_hme_to_supabase.py --dataset   # parts of transformed/dataset not uploaded yet
+#
+# The latest XLSX is inserted skipping rows already present; dataset parts
+# replace their (date, store) slices, so a re-transformed report overwrites
+# what its earlier upload wrote.
 
 from __future__ import annotations
 from pathlib import Path
+import argparse
 import sys
 import os
 import re
@@ -16,6 +24,10 @@ BASE_DIR  = DATA_DIR.parents[1]               # .../Dunkin-Sales-Summary
 # Reuse existing Supabase Postgres connection helper
 sys.path.append(str(BASE_DIR))
 from dashboard.utils import supabase_db  # expects get_supabase_connection()
+from dashboard.utils import coverage
+from dashboard.utils import partitions
+from dashboard.utils import slices
+import hme_dataset
 
 # Table: public.hme_report (id serial PK)
 # Columns to insert (exact names & types):
@@ -31,6 +43,8 @@ TARGET_COLS = [
     "lane_total"   # bigint
 ]
 
+BATCH_SIZE = 1000  # rows per executemany
+
 INSERT_SQL = f"""
 insert into public.hme_report ({",".join(TARGET_COLS)})
 values (
@@ -77,7 +91,10 @@ def load_for_upload(path: Path) -> pd.DataFrame:
         df = pd.read_excel(path)
     else:
         raise ValueError(f"[ERR] Only XLSX files are supported for upload: {path}")
+    return to_upload_frame(df)
 
+def to_upload_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """transform_hme output -> rows shaped like public.hme_report."""
     # Expect columns from transform script
     needed = [
         "Date","store","time_measure","Total Cars","menu_all","greet_all",
@@ -116,15 +133,113 @@ def check_existing_data(cursor, date_val, store_val, time_measure_val) -> bool:
     count = cursor.fetchone()[0]
     return count > 0
 
+def upload_rows(conn, rows: list[dict], batch_size: int = BATCH_SIZE) -> tuple[int, int]:
+    """
+    Insert rows (dicts keyed by TARGET_COLS) that aren't in hme_report yet, in
+    one transaction, and refresh feed coverage for their dates.
+    Returns (inserted, duplicates).
+    """
+    # Check for duplicates BEFORE inserting
+    rows_to_insert = []
+    duplicates_found = 0
+
+    with conn.cursor() as cur:
+        print("[INFO] Checking for existing records...")
+        for row in rows:
+            if not check_existing_data(cur, row['date'], row['store'], row['time_measure']):
+                rows_to_insert.append(row)
+            else:
+                duplicates_found += 1
+
+    if duplicates_found > 0:
+        print(f"[WARN] Found {duplicates_found} duplicate records (will skip)")
+
+    if not rows_to_insert:
+        print("[INFO] No new records to insert (all data already exists)")
+        return 0, duplicates_found
+
+    print(f"[INFO] Inserting {len(rows_to_insert)} new rows to public.hme_report")
+
+    dates = [row["date"] for row in rows if row["date"] is not None]
+    with conn:
+        with conn.cursor() as cur:
+            # Give the months being loaded their own partitions (not the DEFAULT one)
+            if partitions.is_partitioned(cur, "hme_report"):
+                partitions.ensure_partitions(cur, "hme_report", min(dates), max(dates))
+
+            # batch insert
+            for i in range(0, len(rows_to_insert), batch_size):
+                batch = rows_to_insert[i:i+batch_size]
+                try:
+                    cur.executemany(INSERT_SQL, batch)
+                    print(f"[INFO] Inserted batch {i//batch_size + 1} ({len(batch)} rows)")
+                except Exception as e:
+                    print(f"[ERR] Failed to insert batch {i//batch_size + 1}: {e}")
+                    raise
+            coverage.refresh_coverage(cur, "hme_report", min(dates), max(dates))
+
+    return len(rows_to_insert), duplicates_found
+
+def replace_rows(conn, rows: list[dict], stale=()) -> tuple[int, int]:
+    """
+    Replace the (date, store) slices of hme_report present in rows (dicts keyed
+    by TARGET_COLS), after deleting the stale (date, store text) slices earlier
+    uploads left, in one transaction; refresh feed coverage for all those dates.
+    Returns (inserted, deleted).
+    """
+    stale = [(day, pc_number_from_store(store)) for day, store in stale]
+    stale = [(day, pc) for day, pc in stale if pc is not None]
+    dates = [row["date"] for row in rows if row["date"] is not None] + [day for day, _ in stale]
+    if not dates:
+        return 0, 0
+
+    with conn:
+        with conn.cursor() as cur:
+            deleted = 0
+            for day, pc in stale:
+                cur.execute("DELETE FROM hme_report WHERE date = %s AND store = %s", (day, pc))
+                deleted += cur.rowcount
+            if deleted:
+                print(f"[INFO] Deleted {deleted} rows written by earlier uploads of these reports")
+
+            # Give the months being loaded their own partitions (not the DEFAULT one)
+            if rows and partitions.is_partitioned(cur, "hme_report"):
+                partitions.ensure_partitions(cur, "hme_report", min(dates), max(dates))
+
+            result = slices.replace_slices(cur, "hme_report", TARGET_COLS,
+                                           [[row[c] for c in TARGET_COLS] for row in rows])
+            deleted += result["deleted"]
+            print(f"[INFO] Replaced {len(result['slices'])} store-day slice(s): "
+                  f"{result['deleted']} rows deleted, {result['inserted']} inserted")
+            coverage.refresh_coverage(cur, "hme_report", min(dates), max(dates))
+
+    return result["inserted"], deleted
+
 def main():
-    src = find_latest_transformed()
-    if not src:
-        print("[ERR] Could not find a transformed XLSX file in: transformed/")
-        print("      Expected hme_transformed.xlsx or hme_transformed_*.xlsx")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Upload transformed HME data to public.hme_report")
+    parser.add_argument("--dataset", action="store_true",
+                        help="Upload the transformed/dataset parts not uploaded yet (bulk_transform_hme.py)")
+    args = parser.parse_args()
 
-    print(f"[INFO] Loading: {src.name}")
-    df = load_for_upload(src)
+    if args.dataset:
+        manifest = hme_dataset.load_manifest()
+        pending = hme_dataset.pending_uploads(manifest)
+        if not pending:
+            print("[INFO] No new dataset parts to upload")
+            return
+        print(f"[INFO] Loading {len(pending)} new part(s) from: {hme_dataset.DATASET_DIR}")
+        parts = hme_dataset.read_parts(pending.values())
+        df = to_upload_frame(parts) if not parts.empty else pd.DataFrame(columns=TARGET_COLS)
+        stale = hme_dataset.stale_slices(manifest, pending)
+    else:
+        src = find_latest_transformed()
+        if not src:
+            print("[ERR] Could not find a transformed XLSX file in: transformed/")
+            print("      Expected hme_transformed.xlsx or hme_transformed_*.xlsx")
+            sys.exit(1)
+
+        print(f"[INFO] Loading: {src.name}")
+        df = load_for_upload(src)
 
     try:
         conn = supabase_db.get_supabase_connection()
@@ -135,43 +250,14 @@ def main():
     total = len(df)
     print(f"[INFO] Processing {total} rows for upload to public.hme_report")
 
-    # Check for duplicates BEFORE inserting
-    rows = df.to_dict(orient="records")
-    rows_to_insert = []
-    duplicates_found = 0
-
     try:
-        with conn.cursor() as cur:
-            print("[INFO] Checking for existing records...")
-            for row in rows:
-                if not check_existing_data(cur, row['date'], row['store'], row['time_measure']):
-                    rows_to_insert.append(row)
-                else:
-                    duplicates_found += 1
-
-        if duplicates_found > 0:
-            print(f"[WARN] Found {duplicates_found} duplicate records (will skip)")
-
-        if not rows_to_insert:
-            print("[INFO] No new records to insert (all data already exists)")
-            return
-
-        print(f"[INFO] Inserting {len(rows_to_insert)} new rows to public.hme_report")
-
-        with conn:
-            with conn.cursor() as cur:
-                # batch insert
-                batch_size = 1000
-                for i in range(0, len(rows_to_insert), batch_size):
-                    batch = rows_to_insert[i:i+batch_size]
-                    try:
-                        cur.executemany(INSERT_SQL, batch)
-                        print(f"[INFO] Inserted batch {i//batch_size + 1} ({len(batch)} rows)")
-                    except Exception as e:
-                        print(f"[ERR] Failed to insert batch {i//batch_size + 1}: {e}")
-                        raise
-
-        print(f"[OK] Upload complete. Inserted {len(rows_to_insert)} new rows, skipped {duplicates_found} duplicates.")
+        if args.dataset:
+            inserted, deleted = replace_rows(conn, df.to_dict(orient="records"), stale)
+            print(f"[OK] Upload complete. Inserted {inserted} rows, replacing {deleted}.")
+        else:
+            inserted, duplicates_found = upload_rows(conn, df.to_dict(orient="records"))
+            if inserted:
+                print(f"[OK] Upload complete. Inserted {inserted} new rows, skipped {duplicates_found} duplicates.")
 
     except Exception as e:
         print(f"[ERR] Upload failed: {e}")
@@ -179,5 +265,10 @@ def main():
         traceback.print_exc()
         sys.exit(1)
 
+    if args.dataset:
+        # Only now: replace_rows has committed every pending part's rows
+        hme_dataset.mark_uploaded(manifest, pending)
+        hme_dataset.save_manifest(manifest)
+
 if __name__ == "__main__":
     main()
@@ -1,3 +1,4 @@
+-- Superseded by db/migrations/0001_unique_constraints.sql (apply with: python scripts/migrate.py)
 -- Add proper unique constraints to prevent duplicates while allowing multiple stores per date
 -- Each table should have a unique constraint on the combination of identifying columns
 
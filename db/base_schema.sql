@@ -0,0 +1,103 @@
+-- Base tables of the Supabase (Postgres) database
+--
+-- Supabase's tables were created by hand, so this file reconstructs them from
+-- the loaders and db/sales_schema.sql (the SQLite copy). It is only used to
+-- build an empty database - the local sandbox in scripts/pg_sandbox.py - and is
+-- applied before db/guest_comments_schema.sql and db/migrations, which add the
+-- unique keys, indexes, partitioning and the later tables.
+
+CREATE TABLE IF NOT EXISTS sales_summary (
+    id SERIAL PRIMARY KEY,
+    store TEXT NOT NULL,
+    pc_number TEXT NOT NULL,
+    date DATE NOT NULL,
+    gross_sales DOUBLE PRECISION,
+    net_sales DOUBLE PRECISION,
+    dd_adjusted_no_markup DOUBLE PRECISION,
+    pa_sales_tax DOUBLE PRECISION,
+    dd_discount DOUBLE PRECISION,
+    guest_count INTEGER,
+    avg_check DOUBLE PRECISION,
+    gift_card_sales DOUBLE PRECISION,
+    void_amount DOUBLE PRECISION,
+    refund DOUBLE PRECISION,
+    void_qty INTEGER,
+    paid_in DOUBLE PRECISION,
+    paid_out DOUBLE PRECISION,
+    cash_in DOUBLE PRECISION
+);
+
+CREATE TABLE IF NOT EXISTS sales_by_daypart (
+    id SERIAL PRIMARY KEY,
+    store TEXT NOT NULL,
+    pc_number TEXT NOT NULL,
+    date DATE NOT NULL,
+    daypart TEXT NOT NULL,
+    net_sales DOUBLE PRECISION,
+    percent_sales DOUBLE PRECISION,
+    check_count INTEGER,
+    avg_check DOUBLE PRECISION
+);
+
+CREATE TABLE IF NOT EXISTS tender_type_metrics (
+    id SERIAL PRIMARY KEY,
+    store TEXT NOT NULL,
+    pc_number TEXT NOT NULL,
+    date DATE NOT NULL,
+    tender_type TEXT NOT NULL,
+    detail_amount DOUBLE PRECISION
+);
+
+CREATE TABLE IF NOT EXISTS labor_metrics (
+    id SERIAL PRIMARY KEY,
+    store TEXT NOT NULL,
+    pc_number TEXT NOT NULL,
+    date DATE NOT NULL,
+    labor_position TEXT NOT NULL,
+    reg_hours DOUBLE PRECISION,
+    ot_hours DOUBLE PRECISION,
+    total_hours DOUBLE PRECISION,
+    reg_pay DOUBLE PRECISION,
+    ot_pay DOUBLE PRECISION,
+    total_pay DOUBLE PRECISION,
+    percent_labor DOUBLE PRECISION
+);
+
+CREATE TABLE IF NOT EXISTS sales_by_order_type (
+    id SERIAL PRIMARY KEY,
+    store TEXT NOT NULL,
+    pc_number TEXT NOT NULL,
+    date DATE NOT NULL,
+    order_type TEXT NOT NULL,
+    net_sales DOUBLE PRECISION,
+    percent_sales DOUBLE PRECISION,
+    guests INTEGER,
+    percent_guest DOUBLE PRECISION,
+    avg_check DOUBLE PRECISION
+);
+
+CREATE TABLE IF NOT EXISTS sales_by_subcategory (
+    id SERIAL PRIMARY KEY,
+    store TEXT NOT NULL,
+    pc_number TEXT NOT NULL,
+    date DATE NOT NULL,
+    subcategory TEXT NOT NULL,
+    qty_sold INTEGER,
+    net_sales DOUBLE PRECISION,
+    percent_sales DOUBLE PRECISION
+);
+
+-- store is the PC number; no natural-key constraint in production
+-- (data/hme/upload_hme_to_supabase.py checks for existing rows itself)
+CREATE TABLE IF NOT EXISTS hme_report (
+    id BIGSERIAL PRIMARY KEY,
+    date DATE,
+    store BIGINT,
+    time_measure VARCHAR,
+    total_cars BIGINT,
+    menu_all BIGINT,
+    greet_all BIGINT,
+    service BIGINT,
+    lane_queue BIGINT,
+    lane_total BIGINT
+);
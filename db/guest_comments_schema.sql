@@ -16,7 +16,8 @@ CREATE TABLE IF NOT EXISTS medallia_reports (
     created_at TIMESTAMP DEFAULT NOW(),
     
     -- Unique constraint to prevent duplicate entries
-    CONSTRAINT unique_guest_comment UNIQUE (pc_number, response_datetime, comment)
+    -- (includes report_date, the partition key - see db/migrations/0003_monthly_partitioning.sql)
+    CONSTRAINT unique_guest_comment UNIQUE (pc_number, response_datetime, comment, report_date)
 );
 
 -- Create indexes for common queries
@@ -25,6 +26,15 @@ CREATE INDEX IF NOT EXISTS idx_medallia_reports_pc_number ON medallia_reports(pc
 CREATE INDEX IF NOT EXISTS idx_medallia_reports_response_datetime ON medallia_reports(response_datetime);
 CREATE INDEX IF NOT EXISTS idx_medallia_reports_osat ON medallia_reports(osat);
 CREATE INDEX IF NOT EXISTS idx_medallia_reports_ltr ON medallia_reports(ltr);
+-- Keyset pagination for the Individual Reviews list (newest first)
+CREATE INDEX IF NOT EXISTS idx_medallia_reports_response_id ON medallia_reports(response_datetime DESC, id DESC);
+
+-- Full-text search on comments (maintained at insert time by process_medallia_data.insert_records)
+ALTER TABLE medallia_reports ADD COLUMN IF NOT EXISTS comment_tsv TSVECTOR;
+UPDATE medallia_reports
+SET comment_tsv = to_tsvector('english', COALESCE(comment, ''))
+WHERE comment_tsv IS NULL;
+CREATE INDEX IF NOT EXISTS idx_medallia_reports_comment_tsv ON medallia_reports USING GIN (comment_tsv);
 
 -- Add comment to table
 COMMENT ON TABLE medallia_reports IS 'Stores daily guest feedback from Medallia email reports';
@@ -37,3 +47,4 @@ COMMENT ON COLUMN medallia_reports.osat IS 'Overall Satisfaction score (1-5)';
 COMMENT ON COLUMN medallia_reports.ltr IS 'Likelihood to Return score (0-10)';
 COMMENT ON COLUMN medallia_reports.accuracy IS 'Order accuracy (Yes/No)';
 COMMENT ON COLUMN medallia_reports.comment IS 'Customer comment text';
+COMMENT ON COLUMN medallia_reports.comment_tsv IS 'English tsvector of comment for ranked full-text search';
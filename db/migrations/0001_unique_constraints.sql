@@ -0,0 +1,24 @@
+-- 0001: Natural-key unique constraints on the fact tables
+-- Same constraints as db/add_unique_constraints.sql, made re-runnable so
+-- databases where that file was already applied are recorded without changes.
+
+DO $$
+DECLARE
+    c RECORD;
+BEGIN
+    FOR c IN
+        SELECT * FROM (VALUES
+            ('sales_summary',        'unique_sales_summary',     'store, pc_number, date'),
+            ('labor_metrics',        'unique_labor_metrics',     'store, pc_number, date, labor_position'),
+            ('sales_by_daypart',     'unique_sales_daypart',     'store, pc_number, date, daypart'),
+            ('sales_by_subcategory', 'unique_sales_subcategory', 'store, pc_number, date, subcategory'),
+            ('sales_by_order_type',  'unique_sales_order_type',  'store, pc_number, date, order_type'),
+            ('tender_type_metrics',  'unique_tender_type',       'store, pc_number, date, tender_type')
+        ) AS t(table_name, constraint_name, key_columns)
+    LOOP
+        IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = c.constraint_name) THEN
+            EXECUTE format('ALTER TABLE %I ADD CONSTRAINT %I UNIQUE (%s)',
+                           c.table_name, c.constraint_name, c.key_columns);
+        END IF;
+    END LOOP;
+END $$;
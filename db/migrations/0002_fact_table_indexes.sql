@@ -0,0 +1,32 @@
+-- 0002: Date-range indexes for dashboard and report queries
+--
+-- The unique constraints lead with store, so "date BETWEEN" filters and
+-- MIN/MAX(date) lookups had no usable index. Every fact table gets a
+-- (date, store) index; the tender index also carries the columns the tender
+-- reports read so they can be answered from the index alone.
+
+CREATE INDEX IF NOT EXISTS idx_sales_summary_date_store
+    ON sales_summary (date, store);
+
+CREATE INDEX IF NOT EXISTS idx_labor_metrics_date_store
+    ON labor_metrics (date, store);
+
+CREATE INDEX IF NOT EXISTS idx_sales_by_daypart_date_store
+    ON sales_by_daypart (date, store);
+
+CREATE INDEX IF NOT EXISTS idx_sales_by_subcategory_date_store
+    ON sales_by_subcategory (date, store);
+
+CREATE INDEX IF NOT EXISTS idx_sales_by_order_type_date_store
+    ON sales_by_order_type (date, store);
+
+CREATE INDEX IF NOT EXISTS idx_tender_type_metrics_date_store
+    ON tender_type_metrics (date, store) INCLUDE (tender_type, detail_amount);
+
+-- Location Metrics reads one store at a time over a date range
+CREATE INDEX IF NOT EXISTS idx_hme_report_store_date
+    ON hme_report (store, date);
+
+-- Guest Reviews filters on report_date range plus a pc_number list
+CREATE INDEX IF NOT EXISTS idx_medallia_reports_report_date_pc
+    ON medallia_reports (report_date, pc_number);
@@ -0,0 +1,181 @@
+-- 0003: Monthly range partitioning for the large fact tables
+--
+-- sales_summary, tender_type_metrics, labor_metrics, sales_by_subcategory and
+-- hme_report are partitioned by date, medallia_reports by report_date.
+-- Partitions are named <table>_yYYYYmMM; each table also gets a DEFAULT
+-- partition so a row for a month without a partition is never rejected.
+--
+-- Postgres cannot partition a table in place, so each table is rebuilt:
+-- the old heap is renamed, a partitioned copy is created, rows are copied,
+-- and the old table is dropped. Primary keys become (id, <date>) and unique
+-- keys gain the date column, because keys on a partitioned table must include
+-- the partition key (the natural keys already do, except medallia_reports').
+--
+-- Helpers left in the database (used by dashboard/utils/partitions.py):
+--   ensure_month_partitions(table, from, to)  create missing monthly partitions
+--   ensure_future_partitions(months)         ...for every partitioned table, up to N months ahead
+
+
+CREATE OR REPLACE FUNCTION month_partition_name(p_table text, p_month date)
+RETURNS text LANGUAGE sql IMMUTABLE AS $$
+    SELECT p_table || '_y' || to_char(p_month, 'YYYY') || 'm' || to_char(p_month, 'MM')
+$$;
+
+
+CREATE OR REPLACE FUNCTION partition_key_column(p_table text)
+RETURNS text LANGUAGE sql STABLE AS $$
+    SELECT a.attname::text
+    FROM pg_partitioned_table pt
+    JOIN pg_attribute a ON a.attrelid = pt.partrelid AND a.attnum = pt.partattrs[0]
+    WHERE pt.partrelid = to_regclass(p_table)
+$$;
+
+
+CREATE OR REPLACE FUNCTION ensure_month_partitions(p_table text, p_from date, p_to date)
+RETURNS integer LANGUAGE plpgsql AS $$
+DECLARE
+    date_col text := partition_key_column(p_table);
+    default_part text := p_table || '_default';
+    month_start date := date_trunc('month', p_from)::date;
+    part_name text;
+    created integer := 0;
+BEGIN
+    IF date_col IS NULL THEN
+        RAISE EXCEPTION '% is not a partitioned table', p_table;
+    END IF;
+
+    WHILE month_start <= p_to LOOP
+        part_name := month_partition_name(p_table, month_start);
+        IF to_regclass(part_name) IS NULL THEN
+            -- Rows for this month that landed in the default partition have to
+            -- move out before a partition covering them can be created
+            EXECUTE format(
+                'CREATE TEMP TABLE _partition_move ON COMMIT DROP AS
+                 SELECT * FROM %I WHERE %I >= %L AND %I < %L',
+                default_part, date_col, month_start, date_col, (month_start + interval '1 month')::date);
+            EXECUTE format('DELETE FROM %I WHERE %I >= %L AND %I < %L',
+                default_part, date_col, month_start, date_col, (month_start + interval '1 month')::date);
+            EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                part_name, p_table, month_start, (month_start + interval '1 month')::date);
+            EXECUTE format('INSERT INTO %I SELECT * FROM _partition_move', p_table);
+            DROP TABLE _partition_move;
+            created := created + 1;
+        END IF;
+        month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+    RETURN created;
+END $$;
+
+
+CREATE OR REPLACE FUNCTION ensure_future_partitions(p_months integer DEFAULT 3)
+RETURNS integer LANGUAGE plpgsql AS $$
+DECLARE
+    t record;
+    created integer := 0;
+BEGIN
+    FOR t IN
+        SELECT c.relname::text AS table_name
+        FROM pg_partitioned_table pt
+        JOIN pg_class c ON c.oid = pt.partrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public' AND pt.partstrat = 'r'
+    LOOP
+        created := created + ensure_month_partitions(
+            t.table_name, current_date, (current_date + make_interval(months => p_months))::date);
+    END LOOP;
+    RETURN created;
+END $$;
+
+
+CREATE OR REPLACE FUNCTION partition_table_by_month(p_table text, p_date_col text)
+RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    legacy text := p_table || '_unpartitioned';
+    was_identity boolean;
+    id_seq text;
+    rec record;
+    key_def text;
+    saved_ddl text[] := '{}';
+    ddl text;
+    min_date date;
+    max_id bigint;
+BEGIN
+    IF to_regclass(p_table) IS NULL THEN
+        RAISE NOTICE 'Table % does not exist, skipping', p_table;
+        RETURN;
+    END IF;
+    IF partition_key_column(p_table) IS NOT NULL THEN
+        RETURN;  -- already partitioned
+    END IF;
+
+    -- Unique constraints, re-created with the partition key included
+    FOR rec IN
+        SELECT conname, pg_get_constraintdef(oid) AS def
+        FROM pg_constraint
+        WHERE conrelid = p_table::regclass AND contype = 'u'
+    LOOP
+        key_def := rec.def;
+        IF key_def !~ ('[(, ]' || p_date_col || '[,)]') THEN
+            key_def := regexp_replace(key_def, '\)$', ', ' || p_date_col || ')');
+        END IF;
+        saved_ddl := saved_ddl || format('ALTER TABLE %I ADD CONSTRAINT %I %s', p_table, rec.conname, key_def);
+    END LOOP;
+
+    -- Plain indexes (constraint indexes are handled above / by the new primary key)
+    FOR rec IN
+        SELECT i.indexname, i.indexdef
+        FROM pg_indexes i
+        WHERE i.schemaname = 'public' AND i.tablename = p_table
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = to_regclass(i.indexname))
+    LOOP
+        IF rec.indexdef LIKE 'CREATE UNIQUE%' AND rec.indexdef !~ ('[(, ]' || p_date_col || '[,)]') THEN
+            RAISE NOTICE 'Dropping unique index % (cannot be enforced without %)', rec.indexname, p_date_col;
+            CONTINUE;
+        END IF;
+        saved_ddl := saved_ddl || rec.indexdef;
+    END LOOP;
+
+    SELECT attidentity <> '' INTO was_identity
+    FROM pg_attribute WHERE attrelid = p_table::regclass AND attname = 'id';
+    id_seq := pg_get_serial_sequence(p_table, 'id');
+
+    EXECUTE format('ALTER TABLE %I RENAME TO %I', p_table, legacy);
+    EXECUTE format(
+        'CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS INCLUDING STORAGE)
+         PARTITION BY RANGE (%I)',
+        p_table, legacy, p_date_col);
+    EXECUTE format('CREATE TABLE %I PARTITION OF %I DEFAULT', p_table || '_default', p_table);
+
+    EXECUTE format('SELECT MIN(%I) FROM %I', p_date_col, legacy) INTO min_date;
+    PERFORM ensure_month_partitions(
+        p_table, COALESCE(min_date, current_date), (current_date + interval '3 months')::date);
+
+    EXECUTE format('INSERT INTO %I SELECT * FROM %I', p_table, legacy);
+
+    -- Keep the id sequence alive once the old table (its owner) is dropped
+    IF NOT was_identity AND id_seq IS NOT NULL THEN
+        EXECUTE format('ALTER SEQUENCE %s OWNED BY %I.id', id_seq, p_table);
+    END IF;
+
+    EXECUTE format('DROP TABLE %I', legacy);
+
+    IF was_identity THEN
+        EXECUTE format('SELECT MAX(id) FROM %I', p_table) INTO max_id;
+        EXECUTE format('CREATE SEQUENCE %I OWNED BY %I.id', p_table || '_id_seq', p_table);
+        PERFORM setval(p_table || '_id_seq', COALESCE(max_id, 0) + 1, false);
+        EXECUTE format('ALTER TABLE %I ALTER COLUMN id SET DEFAULT nextval(%L)', p_table, p_table || '_id_seq');
+    END IF;
+
+    EXECUTE format('ALTER TABLE %I ADD PRIMARY KEY (id, %I)', p_table, p_date_col);
+    FOREACH ddl IN ARRAY saved_ddl LOOP
+        EXECUTE ddl;
+    END LOOP;
+END $$;
+
+
+SELECT partition_table_by_month('sales_summary', 'date');
+SELECT partition_table_by_month('tender_type_metrics', 'date');
+SELECT partition_table_by_month('labor_metrics', 'date');
+SELECT partition_table_by_month('sales_by_subcategory', 'date');
+SELECT partition_table_by_month('hme_report', 'date');
+SELECT partition_table_by_month('medallia_reports', 'report_date');
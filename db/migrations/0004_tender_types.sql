@@ -0,0 +1,42 @@
+-- 0004: Canonical tender dimension
+--
+-- tender_types holds one row per tender_type label seen in tender_type_metrics
+-- with its tender_category (the report bucket: visa, amex, gift_card_redeem, ...).
+-- The loader registers new labels (rules in dashboard/utils/tender_types.py)
+-- and stamps tender_category onto every row it inserts; the trigger below
+-- fills it for rows inserted by any other script.
+--
+-- Existing rows are categorized by: python scripts/sync_tender_types.py
+
+CREATE TABLE IF NOT EXISTS tender_types (
+    tender_type TEXT PRIMARY KEY,
+    tender_category TEXT NOT NULL,
+    display_name TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_tender_types_category ON tender_types (tender_category);
+
+ALTER TABLE tender_type_metrics ADD COLUMN IF NOT EXISTS tender_category TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_tender_type_metrics_date_store_category
+    ON tender_type_metrics (date, store, tender_category) INCLUDE (detail_amount);
+
+CREATE OR REPLACE FUNCTION stamp_tender_category()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF NEW.tender_category IS NULL THEN
+        SELECT tender_category INTO NEW.tender_category
+        FROM tender_types
+        WHERE tender_type = NEW.tender_type;
+    END IF;
+    RETURN NEW;
+END $$;
+
+DROP TRIGGER IF EXISTS trg_stamp_tender_category ON tender_type_metrics;
+CREATE TRIGGER trg_stamp_tender_category
+    BEFORE INSERT OR UPDATE OF tender_type ON tender_type_metrics
+    FOR EACH ROW EXECUTE FUNCTION stamp_tender_category();
+
+COMMENT ON TABLE tender_types IS 'Tender label -> tender_category dimension (see dashboard/utils/tender_types.py)';
+COMMENT ON COLUMN tender_type_metrics.tender_category IS 'tender_types.tender_category for tender_type, stamped at load';
@@ -0,0 +1,32 @@
+-- 0005: Single-pass tender pivot
+--
+-- tender_daily_pivot: one row per store/day with a column per tender_category,
+-- built in one GROUP BY. Where a day has more than one row in a category (the
+-- same tender loaded under two labels) the first loaded row is used, as the
+-- old ROW_NUMBER() ... rn = 1 report query did.
+--
+-- It is a plain view, so it is always current. Filters on store/date are pushed
+-- into the GROUP BY and use the (date, store, tender_category) index on
+-- tender_type_metrics. Readers join it once to sales_summary and repeat the date
+-- range in the join condition (Postgres does not carry a range filter across a
+-- join into a grouped view) - see report_queries.load_daily_tender_sales().
+
+CREATE OR REPLACE VIEW tender_daily_pivot AS
+SELECT
+    store,
+    date,
+    (array_agg(detail_amount ORDER BY id) FILTER (WHERE tender_category = 'mastercard'))[1] AS mastercard,
+    (array_agg(detail_amount ORDER BY id) FILTER (WHERE tender_category = 'visa'))[1] AS visa,
+    (array_agg(detail_amount ORDER BY id) FILTER (WHERE tender_category = 'visa_kiosk'))[1] AS visa_kiosk,
+    (array_agg(detail_amount ORDER BY id) FILTER (WHERE tender_category = 'discover'))[1] AS discover,
+    (array_agg(detail_amount ORDER BY id) FILTER (WHERE tender_category = 'amex'))[1] AS amex,
+    (array_agg(detail_amount ORDER BY id) FILTER (WHERE tender_category = 'gift_card_redeem'))[1] AS gift_card_redeem,
+    (array_agg(detail_amount ORDER BY id) FILTER (WHERE tender_category = 'gc_redeem_offline'))[1] AS gc_redeem_offline,
+    (array_agg(detail_amount ORDER BY id) FILTER (WHERE tender_category = 'uber_eats'))[1] AS uber_eats,
+    (array_agg(detail_amount ORDER BY id) FILTER (WHERE tender_category = 'door_dash'))[1] AS door_dash,
+    (array_agg(detail_amount ORDER BY id) FILTER (WHERE tender_category = 'grubhub'))[1] AS grubhub,
+    (array_agg(detail_amount ORDER BY id) FILTER (WHERE tender_category = 'clover_go'))[1] AS clover_go
+FROM tender_type_metrics
+GROUP BY store, date;
+
+COMMENT ON VIEW tender_daily_pivot IS 'Tender amounts per store/day, one column per tender_category';
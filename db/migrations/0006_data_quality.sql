@@ -0,0 +1,29 @@
+-- 0006: Data-quality results
+--
+-- One data_quality_runs row per run of scripts/data_quality.py, and one
+-- data_quality_results row per (rule, store, date) that failed in that run.
+-- Rules live in dashboard/utils/data_quality.py.
+
+CREATE TABLE IF NOT EXISTS data_quality_runs (
+    id SERIAL PRIMARY KEY,
+    started_at TIMESTAMP NOT NULL DEFAULT now(),
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    rules_checked INTEGER NOT NULL,
+    failures INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    duration_ms INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS data_quality_results (
+    run_id INTEGER NOT NULL REFERENCES data_quality_runs (id) ON DELETE CASCADE,
+    rule TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    store TEXT NOT NULL,
+    date DATE NOT NULL,
+    value NUMERIC,
+    detail TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_data_quality_results_run ON data_quality_results (run_id, rule);
+CREATE INDEX IF NOT EXISTS idx_data_quality_results_date_store ON data_quality_results (date, store);
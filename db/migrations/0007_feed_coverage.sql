@@ -0,0 +1,23 @@
+-- 0007: Store x date x feed coverage matrix
+--
+-- One row per (pc_number, date, feed) that has data, with its row count.
+-- Loaders refresh the slices they write (dashboard/utils/coverage.py), so
+-- "what's missing?" is a lookup here instead of a scan of every fact table
+-- or of data/raw_emails.
+--
+-- pc_number is the common store key across feeds (hme_report.store holds it
+-- too); store is the name from the POS feeds, NULL for hme/medallia.
+--
+-- Existing data is backfilled by: python scripts/refresh_coverage.py --all
+
+CREATE TABLE IF NOT EXISTS feed_coverage (
+    pc_number TEXT NOT NULL,
+    date DATE NOT NULL,
+    feed TEXT NOT NULL,
+    store TEXT,
+    row_count INTEGER NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT now(),
+    PRIMARY KEY (date, pc_number, feed)
+);
+
+CREATE INDEX IF NOT EXISTS idx_feed_coverage_feed_date ON feed_coverage (feed, date);
@@ -0,0 +1,22 @@
+-- 0008: Content hash for change-aware upserts
+--
+-- row_hash is an md5 of a row's non-key values, written by the loader
+-- (dashboard/utils/upsert.py). Re-loading a corrected file compares it with
+-- the incoming row and rewrites only rows whose values changed.
+--
+-- Rows loaded before this migration keep NULL here; the upsert compares their
+-- values directly instead, so no backfill is needed.
+
+ALTER TABLE sales_summary ADD COLUMN IF NOT EXISTS row_hash TEXT;
+ALTER TABLE labor_metrics ADD COLUMN IF NOT EXISTS row_hash TEXT;
+ALTER TABLE sales_by_daypart ADD COLUMN IF NOT EXISTS row_hash TEXT;
+ALTER TABLE sales_by_subcategory ADD COLUMN IF NOT EXISTS row_hash TEXT;
+ALTER TABLE sales_by_order_type ADD COLUMN IF NOT EXISTS row_hash TEXT;
+ALTER TABLE tender_type_metrics ADD COLUMN IF NOT EXISTS row_hash TEXT;
+
+COMMENT ON COLUMN sales_summary.row_hash IS 'md5 of the non-key values, set by dashboard/utils/upsert.py';
+COMMENT ON COLUMN labor_metrics.row_hash IS 'md5 of the non-key values, set by dashboard/utils/upsert.py';
+COMMENT ON COLUMN sales_by_daypart.row_hash IS 'md5 of the non-key values, set by dashboard/utils/upsert.py';
+COMMENT ON COLUMN sales_by_subcategory.row_hash IS 'md5 of the non-key values, set by dashboard/utils/upsert.py';
+COMMENT ON COLUMN sales_by_order_type.row_hash IS 'md5 of the non-key values, set by dashboard/utils/upsert.py';
+COMMENT ON COLUMN tender_type_metrics.row_hash IS 'md5 of the non-key values, set by dashboard/utils/upsert.py';
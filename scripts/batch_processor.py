@@ -4,13 +4,10 @@ Batch process Dunkin sales reports for multiple dates.
 This script helps process data day by day from a start date to end date.
 """
 
-import os
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
 import time
-import re
-from collections import defaultdict
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 sys.path.append(str(BASE_DIR))
@@ -23,6 +20,7 @@ from compile_store_reports import (
     flatten_sales_by_subcategory_file, flatten_tender_type_file, flatten_sales_summary_horizontal
 )
 from load_to_sqlite import load_to_supabase
+from dashboard.utils import supabase_db, coverage, raw_catalog
 
 def parse_date_from_filename(filename):
     """
@@ -30,76 +28,95 @@ def parse_date_from_filename(filename):
     Example: "0 Consolidated Dunkin Sales Summary v2_Sales ... 2025-10-01 to 2025-10-01_20251015T0227.xlsx"
     Returns the date as YYYY-MM-DD string, or None if not found
     """
-    # Look for pattern: YYYY-MM-DD to YYYY-MM-DD
-    pattern = r'(\d{4}-\d{2}-\d{2}) to (\d{4}-\d{2}-\d{2})'
-    match = re.search(pattern, str(filename))
-    
-    if match:
-        start_date = match.group(1)
-        end_date = match.group(2)
-        # For daily reports, start and end should be the same
-        if start_date == end_date:
-            return start_date
-        else:
-            # If different, use the start date
-            return start_date
-    
-    return None
+    return raw_catalog.parse_business_date(filename)
+
+def open_raw_catalog():
+    """The raw-file catalog, brought up to date with data/raw_emails (cheap when nothing changed)."""
+    catalog = raw_catalog.open_catalog()
+    changes = raw_catalog.refresh(catalog)
+    if any(changes.values()):
+        print(f"🗂️  Raw file catalog: +{changes['added']} new, ~{changes['updated']} changed, -{changes['removed']} removed")
+    return catalog
 
 def scan_downloaded_files():
     """
-    Scan the raw_emails directory for downloaded files and group them by date
+    Downloaded files in data/raw_emails grouped by date, from the raw-file catalog
     Returns a dictionary: {date: [list of files for that date]}
     """
-    data_dir = Path("data/raw_emails")
-    files_by_date = defaultdict(list)
-    
-    # Look for Excel files in raw_emails directory
-    excel_files = list(data_dir.glob("*.xlsx"))
-    
-    print(f"📁 Found {len(excel_files)} Excel files in /data/raw_emails directory")
-    
-    for file in excel_files:
-        # Skip compiled files
-        if "_copy" in file.name:
-            continue
-            
-        date = parse_date_from_filename(file.name)
-        if date:
-            files_by_date[date].append(file)
+    catalog = open_raw_catalog()
+    try:
+        files_by_date = raw_catalog.files_by_date(catalog)
+        undated = raw_catalog.undated_files(catalog)
+    finally:
+        catalog.close()
+
+    print(f"📁 Found {sum(len(f) for f in files_by_date.values()) + len(undated)} Excel files in /data/raw_emails directory")
+    for date, files in files_by_date.items():
+        for file in files:
             print(f"   📅 {date}: {file.name}")
-        else:
-            print(f"   ⚠️  Could not parse date from: {file.name}")
-    
-    return dict(files_by_date)
+    for file in undated:
+        print(f"   ⚠️  Could not parse date from: {file.name}")
+
+    return files_by_date
+
+def files_for_date(date_str):
+    """Downloaded files for one date (catalog index lookup, no directory scan)."""
+    catalog = open_raw_catalog()
+    try:
+        return raw_catalog.files_for_date(catalog, date_str)
+    finally:
+        catalog.close()
 
 def validate_files_for_date(files):
     """
     Validate that we have all required report types for a date
     Returns (is_complete, missing_types)
     """
-    required_types = [
-        "Labor Hours",
-        "Sales by Daypart", 
-        "Sales by Subcategory",
-        "Tender Type",
-        "Sales Mix Detail",
-        "Menu Mix Metrics"
-    ]
-    
-    found_types = []
-    for file in files:
-        filename = file.name
-        for report_type in required_types:
-            if report_type in filename:
-                found_types.append(report_type)
-                break
-    
-    missing_types = [t for t in required_types if t not in found_types]
+    found_types = {raw_catalog.report_type(file.name) for file in files}
+    missing_types = [t for t in raw_catalog.REPORT_TYPES if t not in found_types]
     is_complete = len(missing_types) == 0
     
     return is_complete, missing_types
 
+def already_loaded_dates(dates):
+    """
+    The dates (YYYY-MM-DD strings) whose six feeds are all recorded in the
+    coverage matrix. Empty when the matrix can't be read, so nothing is skipped.
+    """
+    try:
+        conn = supabase_db.get_supabase_connection()
+    except Exception as e:
+        print(f"   ⚠️  Could not check loaded dates: {e}")
+        return set()
+    try:
+        with conn.cursor() as cur:
+            loaded = coverage.loaded_dates(cur, [datetime.strptime(d, '%Y-%m-%d').date() for d in dates])
+        return {d.strftime('%Y-%m-%d') for d in loaded}
+    except Exception as e:
+        print(f"   ⚠️  Could not check loaded dates: {e}")
+        return set()
+    finally:
+        conn.close()
+
+def show_database_status(days=7):
+    """Per-feed date ranges and the last few days' gaps, from the coverage matrix."""
+    conn = supabase_db.get_supabase_connection()
+    try:
+        with conn.cursor() as cur:
+            print(f"\n   {'Feed':<22} {'First':<12} {'Last':<12} {'Days':>6} {'Stores':>7}")
+            for feed, first, last, n_days, stores in coverage.feed_summary(cur):
+                print(f"   {feed:<22} {str(first):<12} {str(last):<12} {n_days:>6} {stores:>7}")
+
+            end = datetime.now().date() - timedelta(days=1)
+            missing = coverage.missing_coverage(cur, end - timedelta(days=days - 1), end)
+            print(f"\n   Last {days} days:")
+            if not missing:
+                print("   ✅ Every store has all six reports loaded")
+            for pc_number, store, day, feeds in missing:
+                print(f"   ⚠️  {day} {store or pc_number}: missing {', '.join(feeds)}")
+    finally:
+        conn.close()
+
 def generate_date_range(start_date, end_date):
     """Generate list of dates between start and end date"""
     start = datetime.strptime(start_date, '%Y-%m-%d')
@@ -133,13 +150,12 @@ def process_single_date(date_str, files=None):
             if proceed not in ['y', 'yes']:
                 return False
     else:
-        # Scan for files for this specific date
-        files_by_date = scan_downloaded_files()
-        if date_str not in files_by_date:
+        # Look up the files for this specific date in the raw-file catalog
+        date_files = files_for_date(date_str)
+        if not date_files:
             print(f"   ❌ No files found for {date_str}")
             return False
-        
-        date_files = files_by_date[date_str]
+
         is_complete, missing_types = validate_files_for_date(date_files)
         
         print(f"📁 Found {len(date_files)} files for {date_str}:")
@@ -269,6 +285,12 @@ def process_auto_detected_files():
     print(f"   ✅ Complete dates: {len(complete_dates)}")
     print(f"   ⚠️  Incomplete dates: {len(incomplete_dates)}")
     
+    # Skip dates the database already has in full (coverage matrix lookup)
+    loaded = already_loaded_dates(complete_dates)
+    if loaded:
+        print(f"   ⏭️  Already loaded: {', '.join(sorted(loaded))}")
+        complete_dates = [d for d in complete_dates if d not in loaded]
+
     if complete_dates:
         print(f"\n🎯 Ready to process: {', '.join(complete_dates)}")
         print(f"\n🚀 Starting automatic processing of {len(complete_dates)} complete dates...")
@@ -343,7 +365,10 @@ def interactive_mode():
         
         elif choice == "4":
             print("\n📊 Checking database status...")
-            os.system("python3 -c \"import sys; sys.path.append('.'); from dashboard.utils import supabase_db; conn = supabase_db.get_supabase_connection(); cur = conn.cursor(); cur.execute('SELECT MAX(date) FROM sales_summary'); print(f'Latest data: {cur.fetchone()[0]}'); conn.close()\"")
+            try:
+                show_database_status()
+            except Exception as e:
+                print(f"❌ Could not read database status: {e}")
         
         elif choice == "5":
             files_by_date = scan_downloaded_files()
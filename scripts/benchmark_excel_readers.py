@@ -0,0 +1,151 @@
+"""
+Benchmark the Excel reader engines (dashboard/utils/excel_reader.py) on real
+raw files, and check that every engine gives the same output as openpyxl.
+
+    reports  compile_store_reports.compile_one on data/raw_emails
+             (compiled files go to a temp dir; the compiled sheets are compared)
+    hme      transform_hme.parse_hme_to_desired on data/hme/raw
+    tender   compile_and_upload_tender_files.process_tender_file on data/tender_downloads
+
+Each engine is selected through EXCEL_READER, as in production. Engines that
+are not installed (calamine) are skipped.
+
+Usage:
+    python scripts/benchmark_excel_readers.py
+    python scripts/benchmark_excel_readers.py --kind reports --limit 30 --rounds 3
+    python scripts/benchmark_excel_readers.py --engine openpyxl --engine calamine
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(BASE_DIR / "data" / "hme"))
+
+from dashboard.utils import excel_reader
+import compile_store_reports
+import compile_and_upload_tender_files
+import transform_hme
+
+KINDS = ["reports", "hme", "tender"]
+BASELINE = "openpyxl"
+
+
+def safe_print(msg, end='\n'):
+    """Print with Unicode error handling for Windows console"""
+    try:
+        print(msg, end=end)
+    except UnicodeEncodeError:
+        print(msg.encode('ascii', errors='replace').decode('ascii'), end=end)
+
+
+def input_files(kind, limit):
+    if kind == "reports":
+        raw = compile_store_reports.RAW_DIR
+        files = [p for p in sorted(raw.glob("*.xlsx")) if not p.name.endswith("_copy.xlsx")]
+    elif kind == "hme":
+        files = sorted((BASE_DIR / "data" / "hme" / "raw").glob("hme_report_*.xlsx"))
+    else:
+        files = sorted(compile_and_upload_tender_files.TENDER_DIR.glob("*.xlsx"))
+    return files[:limit] if limit else files
+
+
+def run_one(kind, path, out_dir):
+    """Output of one file for one kind (a DataFrame, or None if the file was rejected)."""
+    if kind == "reports":
+        compile_store_reports.OUT_DIR = out_dir
+        out = compile_store_reports.compile_one(path)
+        return pd.read_excel(out) if out else None
+    if kind == "hme":
+        return transform_hme.parse_hme_to_desired(path)
+    return compile_and_upload_tender_files.process_tender_file(path)
+
+
+def same_output(a, b) -> bool:
+    if a is None or b is None:
+        return a is None and b is None
+    try:
+        pd.testing.assert_frame_equal(a.reset_index(drop=True), b.reset_index(drop=True), check_dtype=False)
+        return True
+    except AssertionError:
+        return False
+
+
+def run_engine(kind, files, engine, rounds, work_dir):
+    """(median seconds for all files, {file: output}) with EXCEL_READER=engine."""
+    os.environ[excel_reader.ENGINE_ENV] = engine
+    out_dir = Path(work_dir) / engine
+    out_dir.mkdir(exist_ok=True)
+    timings, outputs = [], {}
+    for _ in range(rounds):
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # the per-file chatter
+            for path in files:
+                try:
+                    outputs[path] = run_one(kind, path, out_dir)
+                except Exception as e:
+                    outputs[path] = None
+                    safe_print(f"   ⚠️  {engine}: {path.name}: {e}")
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), outputs
+
+
+def benchmark(kinds, engines, limit, rounds):
+    mismatches = 0
+    # Same work for every engine: no blocked-sheet layouts reused from earlier runs
+    compile_store_reports.USE_LAYOUT_CACHE = False
+    with tempfile.TemporaryDirectory() as work_dir:
+        safe_print(f"\n{'Kind':<8} {'Engine':<9} {'Files':>5} {'Seconds':>8} {'Speedup':>8}  Output")
+        for kind in kinds:
+            files = input_files(kind, limit)
+            if not files:
+                safe_print(f"{kind:<8} (no input files)")
+                continue
+            base_seconds, base_outputs = run_engine(kind, files, BASELINE, rounds, work_dir)
+            safe_print(f"{kind:<8} {BASELINE:<9} {len(files):>5} {base_seconds:>8.2f} {1:>7.2f}x  baseline")
+            for engine in engines:
+                if engine == BASELINE:
+                    continue
+                seconds, outputs = run_engine(kind, files, engine, rounds, work_dir)
+                differing = [p.name for p in files if not same_output(base_outputs[p], outputs[p])]
+                mismatches += len(differing)
+                verdict = "identical" if not differing else f"❌ {len(differing)} differ: {', '.join(differing[:3])}"
+                safe_print(f"{kind:<8} {engine:<9} {len(files):>5} {seconds:>8.2f} "
+                           f"{base_seconds / seconds:>7.2f}x  {verdict}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark and cross-check the Excel reader engines")
+    parser.add_argument("--kind", action="append", choices=KINDS, help="Input kind(s) to run (default: all)")
+    parser.add_argument("--engine", action="append", choices=excel_reader.ENGINES,
+                        help="Engine(s) to compare with openpyxl (default: every installed one)")
+    parser.add_argument("--limit", type=int, help="At most this many files per kind")
+    parser.add_argument("--rounds", type=int, default=1, help="Runs per case; the median is reported")
+    args = parser.parse_args()
+
+    engines = args.engine or excel_reader.available_engines()
+    missing = [e for e in engines if e not in excel_reader.available_engines()]
+    if missing:
+        safe_print(f"❌ Not installed: {', '.join(missing)} (pip install python-calamine)")
+        return 1
+
+    mismatches = benchmark(args.kind or KINDS, engines, args.limit, args.rounds)
+    if mismatches:
+        safe_print(f"\n❌ {mismatches} output(s) differ from {BASELINE}")
+        return 1
+    safe_print("\n✅ All engines produced identical outputs")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+"""
+Benchmark the Supabase loaders against a throwaway local PostgreSQL.
+
+Starts a sandbox (scripts/pg_sandbox.py) with the project schema, points
+dashboard.utils.supabase_db at it through the SUPABASE_* env vars, and times
+each loader's database write on synthetic rows at several batch sizes:
+
+    dss       load_to_sqlite.insert_rows, every DSS table
+    hme       upload_hme_to_supabase.upload_rows (duplicate check + insert)
+    medallia  process_medallia_data.insert_records (execute_values page size)
+    tender    compile_and_upload_tender_files.upload_to_supabase
+
+Reading the Excel/email files is not timed - only what reaches the database.
+The loaded tables are truncated before every run.
+
+Usage:
+    python scripts/benchmark_loaders.py
+    python scripts/benchmark_loaders.py --batch-size 100 --batch-size 1000 --days 90
+    python scripts/benchmark_loaders.py --loader hme --rounds 5
+    python scripts/benchmark_loaders.py --use-env   # sandbox already running (pg_sandbox.py start)
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(BASE_DIR / "data" / "hme"))
+
+from dashboard.utils import partitions
+from dashboard.utils.supabase_db import get_supabase_connection
+from pg_sandbox import DB_NAME, LocalPostgres
+import load_to_sqlite
+import upload_hme_to_supabase
+import process_medallia_data
+import compile_and_upload_tender_files
+from compile_and_upload_tender_files import PC_TO_STORE
+
+LOADERS = ["dss", "hme", "medallia", "tender"]
+BATCH_SIZES = [50, 500, 5000]
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+# Rows per store-day in each DSS table (roughly what the reports carry)
+DSS_KEYS = {
+    "sales_summary": None,
+    "sales_by_daypart": ("daypart", ["Early Morning", "Morning", "Midday", "Afternoon", "Evening", "Late Night"]),
+    "sales_by_subcategory": ("subcategory", [f"Subcategory {i}" for i in range(1, 41)]),
+    "sales_by_order_type": ("order_type", ["Dine In", "Take Out", "Drive Thru", "Mobile", "Delivery", "Kiosk"]),
+    "labor_metrics": ("labor_position", ["Crew", "Shift Leader", "Manager", "Baker", "Trainee"]),
+    "tender_type_metrics": ("tender_type", ["Cash", "Visa", "Mastercard", "Amex", "Discover", "Gift Card Redeem",
+                                            "Uber Eats", "Door Dash", "Grubhub", "Visa Kiosk", "Clover Go"]),
+}
+HME_TIME_MEASURES = ["Daypart 1", "Daypart 2", "Daypart 3", "Daypart 4", "Daypart 5", "Total"]
+MEDALLIA_PER_DAY = 4  # responses per store-day
+
+
+def safe_print(msg, end='\n'):
+    """Print with Unicode error handling for Windows console"""
+    try:
+        print(msg, end=end)
+    except UnicodeEncodeError:
+        print(msg.encode('ascii', errors='replace').decode('ascii'), end=end)
+
+
+# --- Synthetic rows ---
+def store_days(start: date, days: int):
+    for offset in range(days):
+        for pc, store in PC_TO_STORE.items():
+            yield start + timedelta(days=offset), pc, store
+
+
+def dss_frames(start, days, rng) -> dict:
+    """{table: DataFrame} shaped like load_to_supabase's df_upload."""
+    measures = {
+        "sales_summary": ["gross_sales", "net_sales", "dd_adjusted_no_markup", "pa_sales_tax", "dd_discount",
+                          "avg_check", "gift_card_sales", "void_amount", "refund", "paid_in", "paid_out", "cash_in"],
+        "sales_by_daypart": ["net_sales", "percent_sales", "avg_check"],
+        "sales_by_subcategory": ["net_sales", "percent_sales"],
+        "sales_by_order_type": ["net_sales", "percent_sales", "percent_guest", "avg_check"],
+        "labor_metrics": ["reg_hours", "ot_hours", "total_hours", "reg_pay", "ot_pay", "total_pay", "percent_labor"],
+        "tender_type_metrics": ["detail_amount"],
+    }
+    counts = {
+        "sales_summary": ["guest_count", "void_qty"],
+        "sales_by_daypart": ["check_count"],
+        "sales_by_subcategory": ["qty_sold"],
+        "sales_by_order_type": ["guests"],
+    }
+    frames = {}
+    for table, key in DSS_KEYS.items():
+        rows = []
+        for day, pc, store in store_days(start, days):
+            for label in (key[1] if key else [None]):
+                row = {"store": store, "pc_number": pc, "date": day}
+                if key:
+                    row[key[0]] = label
+                row.update({col: round(rng.uniform(0, 2000), 2) for col in measures[table]})
+                row.update({col: rng.randint(0, 400) for col in counts.get(table, [])})
+                rows.append(row)
+        frames[table] = pd.DataFrame(rows)
+    return frames
+
+
+def hme_rows(start, days, rng) -> list:
+    return [
+        {"date": day, "store": int(pc), "time_measure": measure,
+         "total_cars": rng.randint(0, 300), "menu_all": rng.randint(20, 90), "greet_all": rng.randint(5, 30),
+         "service": rng.randint(60, 240), "lane_queue": rng.randint(10, 120), "lane_total": rng.randint(120, 400)}
+        for day, pc, _ in store_days(start, days) for measure in HME_TIME_MEASURES
+    ]
+
+
+def medallia_records(start, days, rng) -> list:
+    records = []
+    for day, pc, store in store_days(start, days):
+        for i in range(MEDALLIA_PER_DAY):
+            responded = datetime.combine(day, datetime.min.time()) + timedelta(hours=6 + i * 3, minutes=rng.randint(0, 59))
+            records.append({
+                "report_date": day + timedelta(days=1), "pc_number": pc, "restaurant_address": f"{store} store",
+                "order_channel": rng.choice(["In-store", "Other"]), "transaction_datetime": responded - timedelta(hours=1),
+                "response_datetime": responded, "osat": rng.randint(1, 5), "ltr": rng.randint(0, 10),
+                "accuracy": rng.choice(["Yes", "No"]), "comment": f"Visit {i} at {store}: coffee was fine",
+            })
+    return records
+
+
+def tender_frame(start, days, rng) -> pd.DataFrame:
+    labels = DSS_KEYS["tender_type_metrics"][1]
+    return pd.DataFrame([
+        {"store": store, "pc_number": pc, "date": day.isoformat(), "tender_type": label,
+         "detail_amount": round(rng.uniform(1, 1500), 2)}
+        for day, pc, store in store_days(start, days) for label in labels
+    ])
+
+
+# --- Runs ---
+def ensure_local(conn):
+    """Refuse to run against anything but a local database - every run truncates the tables."""
+    params = conn.get_dsn_parameters()
+    host, dbname = params.get("host"), params.get("dbname")
+    # An empty host or a socket directory means a Unix-socket connection on this machine
+    local = not host or host.startswith("/") or host in LOCAL_HOSTS
+    if not local or dbname != DB_NAME:
+        raise RuntimeError(f"refusing to truncate tables on {host or 'local socket'}/{dbname} "
+                           f"(only the local '{DB_NAME}' database is allowed)")
+
+
+def reset(conn, tables, start, days):
+    """Empty the tables and make sure their months have partitions (loaders do this before inserting)."""
+    with conn.cursor() as cur:
+        cur.execute(f"TRUNCATE {', '.join(tables)}, feed_coverage RESTART IDENTITY")
+        for table in tables:
+            if table in partitions.PARTITIONED_TABLES and partitions.is_partitioned(cur, table):
+                partitions.ensure_partitions(cur, table, start, start + timedelta(days=days))
+    conn.commit()
+
+
+def run_loader(loader, conn, data, batch_size) -> int:
+    """Load data with one loader; returns the number of rows written."""
+    if loader == "dss":
+        with conn.cursor() as cur:
+            rows = sum(load_to_sqlite.insert_rows(cur, table, df, batch_size=batch_size) for table, df in data.items())
+        conn.commit()
+        return rows
+    if loader == "hme":
+        inserted, _ = upload_hme_to_supabase.upload_rows(conn, data, batch_size=batch_size)
+        return inserted
+    if loader == "medallia":
+        inserted, _ = process_medallia_data.insert_records(conn, data, page_size=batch_size)
+        return inserted
+    with conn.cursor() as cur:
+        rows = compile_and_upload_tender_files.upload_to_supabase(cur, data, batch_size=batch_size)
+    conn.commit()
+    return rows
+
+
+def loader_tables(loader):
+    return {
+        "dss": list(DSS_KEYS),
+        "hme": ["hme_report"],
+        "medallia": ["medallia_reports"],
+        "tender": ["tender_type_metrics"],
+    }[loader]
+
+
+def benchmark(loaders, batch_sizes, days, rounds, seed):
+    start = date.today() - timedelta(days=days)
+    rng = random.Random(seed)
+    data = {
+        "dss": dss_frames(start, days, rng),
+        "hme": hme_rows(start, days, rng),
+        "medallia": medallia_records(start, days, rng),
+        "tender": tender_frame(start, days, rng),
+    }
+
+    conn = get_supabase_connection()
+    try:
+        # supabase_db falls back to secrets.toml unless every SUPABASE_* var is set,
+        # so check where the connection really went before truncating anything
+        ensure_local(conn)
+        safe_print(f"\n{'Loader':<10} {'Batch':>6} {'Rows':>8} {'Seconds':>8} {'Rows/s':>9}")
+        for loader in loaders:
+            for batch_size in batch_sizes:
+                timings, rows = [], 0
+                for _ in range(rounds):
+                    reset(conn, loader_tables(loader), start, days)
+                    started = time.perf_counter()
+                    with contextlib.redirect_stdout(io.StringIO()):  # the loaders' per-batch chatter
+                        rows = run_loader(loader, conn, data[loader], batch_size)
+                    timings.append(time.perf_counter() - started)
+                if not rows:
+                    raise RuntimeError(f"{loader} wrote no rows at batch size {batch_size}")
+                seconds = statistics.median(timings)
+                safe_print(f"{loader:<10} {batch_size:>6} {rows:>8} {seconds:>8.2f} {rows / seconds:>9.0f}")
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Supabase loaders against a local PostgreSQL")
+    parser.add_argument("--loader", action="append", choices=LOADERS, help="Loader(s) to run (default: all)")
+    parser.add_argument("--batch-size", type=int, action="append",
+                        help=f"Batch size(s) to try (default: {', '.join(map(str, BATCH_SIZES))})")
+    parser.add_argument("--days", type=int, default=30, help="Days of synthetic data for the 7 stores (default 30)")
+    parser.add_argument("--rounds", type=int, default=3, help="Runs per case; the median is reported")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--use-env", action="store_true",
+                        help="Use the database in SUPABASE_* (must be a local sandbox database) instead of starting a sandbox")
+    parser.add_argument("--durable", action="store_true", help="Sandbox with fsync/synchronous_commit on")
+    args = parser.parse_args()
+
+    loaders = args.loader or LOADERS
+    batch_sizes = args.batch_size or BATCH_SIZES
+
+    if args.use_env:
+        # Every run truncates the tables - never let that reach Supabase
+        if os.getenv("SUPABASE_HOST") not in LOCAL_HOSTS:
+            safe_print("❌ --use-env needs SUPABASE_HOST set to a local address (see scripts/pg_sandbox.py start)")
+            return 1
+        sandbox = None
+    else:
+        try:
+            sandbox = LocalPostgres(fast=not args.durable).start()
+        except Exception as e:
+            safe_print(f"❌ Could not start the sandbox: {e}")
+            return 1
+        os.environ.update(sandbox.env())
+        safe_print(f"🐘 Sandbox PostgreSQL on 127.0.0.1:{sandbox.port}"
+                   f"{'' if args.durable else ' (fsync off)'}")
+
+    try:
+        benchmark(loaders, batch_sizes, args.days, args.rounds, args.seed)
+    except Exception as e:
+        safe_print(f"❌ Benchmark failed: {e}")
+        return 1
+    finally:
+        if sandbox is not None:
+            sandbox.stop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Benchmark the Gmail downloaders offline against scripts/imap_replay.py.
+
+Starts the replay server on the fixtures, points each downloader's feed at it
+(saving into a temp folder, not data/) and reports messages/s and MB/s:
+
+    dss / tender / medallia / hme   each feed alone, as its own script runs it
+    serial                          the four feeds one after another, one
+                                    session each (the old four-script morning)
+    all                             the four feeds in one client run
+                                    (scripts/download_mail.py)
+
+Usage:
+    python scripts/imap_replay.py synthesize --days 30      # once, if no recorded fixtures
+    python scripts/benchmark_mail.py
+    python scripts/benchmark_mail.py --latency 40 --login-latency 300 --rounds 5
+    python scripts/benchmark_mail.py --max-sessions 1 --fetch-batch 1   # un-pipelined baseline
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(BASE_DIR / "data" / "hme"))
+
+from dashboard.utils import mail_client
+from imap_replay import FIXTURE_DIR, MEDALLIA_SUBJECT, ReplayServer, load_fixtures
+import download_from_gmail
+import download_tender_files_gmail
+import download_medallia_emails
+import download_hme_gmail
+from download_mail import FEEDS, build_feeds
+
+
+def safe_print(msg, end='\n'):
+    """Print with Unicode error handling for Windows console"""
+    try:
+        print(msg, end=end)
+    except UnicodeEncodeError:
+        print(msg.encode('ascii', errors='replace').decode('ascii'), end=end)
+
+
+def redirect_downloads(folder: Path):
+    """Send every downloader's files into folder instead of data/."""
+    download_from_gmail.SAVE_DIR = str(folder / "raw_emails")
+    download_tender_files_gmail.DOWNLOAD_DIR = folder / "tender_downloads"
+    download_medallia_emails.SAVE_DIR = folder / "medallia"
+    download_hme_gmail.SAVE_DIR = folder / "hme"
+
+
+def run_case(names, report_date, tender_since, client_args, serial=False) -> dict:
+    """One timed run; returns seconds, logins, messages and bytes fetched."""
+    runs = [[name] for name in names] if serial else [names]
+    totals = {"seconds": 0.0, "logins": 0, "messages": 0, "bytes": 0}
+    for group in runs:
+        args = dict(client_args, max_sessions=1) if serial else client_args
+        with contextlib.redirect_stdout(io.StringIO()):  # the handlers' per-file chatter
+            _, errors, stats = mail_client.download(build_feeds(group, report_date, tender_since), **args)
+        if errors:
+            raise RuntimeError("; ".join(f"{name}: {e}" for name, e in errors.items()))
+        for key in totals:
+            totals[key] += stats[key]
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Gmail downloaders against recorded fixtures")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURE_DIR)
+    parser.add_argument("--latency", type=float, default=40, help="Milliseconds per server response (default 40)")
+    parser.add_argument("--login-latency", type=float, default=300, help="Milliseconds per LOGIN (default 300)")
+    parser.add_argument("--rounds", type=int, default=3, help="Runs per case; the median is reported")
+    parser.add_argument("--max-sessions", type=int, default=mail_client.MAX_SESSIONS[mail_client.GMAIL_SERVER])
+    parser.add_argument("--fetch-batch", type=int, default=mail_client.FETCH_BATCH)
+    parser.add_argument("--date", help="Medallia report date (default: last one in the fixtures)")
+    parser.add_argument("--tender-since", help="Tender search start (default: first date in the fixtures)")
+    parser.add_argument("--case", action="append", choices=FEEDS + ["serial", "all"],
+                        help="Case(s) to run (default: every feed, serial, all)")
+    args = parser.parse_args()
+
+    messages = load_fixtures(args.fixtures)
+    if not messages:
+        safe_print(f"❌ No .eml fixtures in {args.fixtures} (run: python scripts/imap_replay.py synthesize)")
+        return 1
+    dates = sorted(m["internal"].date() for m in messages)
+    medallia_dates = [m["internal"].date() for m in messages if MEDALLIA_SUBJECT in m["subject"]]
+    report_date = args.date or str(max(medallia_dates, default=dates[-1]))
+    tender_since = args.tender_since or str(dates[0])
+
+    server = ReplayServer(messages, args.latency / 1000, args.login_latency / 1000)
+    port = server.start()
+    client_args = {
+        "server": "127.0.0.1", "port": port, "ssl": False, "user": "bench", "password": "bench",
+        "max_sessions": args.max_sessions, "fetch_batch": args.fetch_batch,
+    }
+    safe_print(f"📮 {len(messages)} fixture message(s), {dates[0]} .. {dates[-1]}; "
+               f"latency {args.latency:.0f} ms, login {args.login_latency:.0f} ms, "
+               f"{args.max_sessions} session(s), {args.fetch_batch} UID(s)/FETCH")
+    safe_print(f"\n{'Case':<10} {'Msgs':>6} {'MB':>8} {'Seconds':>8} {'Msg/s':>8} {'MB/s':>7} {'Logins':>7}")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            redirect_downloads(Path(tmp))
+            for case in args.case or FEEDS + ["serial", "all"]:
+                names = FEEDS if case in ("serial", "all") else [case]
+                results = [run_case(names, report_date, tender_since, client_args, serial=case == "serial")
+                           for _ in range(args.rounds)]
+                seconds = statistics.median(r["seconds"] for r in results)
+                r = results[0]
+                mb = r["bytes"] / 1_048_576
+                safe_print(f"{case:<10} {r['messages']:>6} {mb:>8.2f} {seconds:>8.2f} "
+                           f"{r['messages'] / seconds:>8.1f} {mb / seconds:>7.2f} {r['logins']:>7}")
+    except Exception as e:
+        safe_print(f"❌ Benchmark failed: {e}")
+        return 1
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Backfill the Parquet lake (data/lake) from Supabase, one month at a time.
+
+The loader keeps the lake current as new files are uploaded; run this once to
+seed it, or with --start/--end to rebuild a range after fixing data upstream.
+
+Usage:
+    python scripts/build_parquet_lake.py
+    python scripts/build_parquet_lake.py --start 2025-10-01 --end 2025-12-31
+    python scripts/build_parquet_lake.py --tables sales_summary tender_type_metrics
+"""
+
+import argparse
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from dashboard.utils.supabase_db import get_supabase_connection
+from dashboard.utils.parquet_lake import LAKE_DIR, LAKE_TABLES, write_slices
+
+
+def safe_print(msg, end='\n'):
+    """Print with Unicode error handling for Windows console"""
+    try:
+        print(msg, end=end)
+    except UnicodeEncodeError:
+        print(msg.encode('ascii', errors='replace').decode('ascii'), end=end)
+
+
+def month_ranges(start: date, end: date):
+    """Yield (first_day, last_day) pairs covering start..end, clipped to the range."""
+    for month_start in pd.date_range(start.replace(day=1), end, freq="MS"):
+        month_end = (month_start + pd.offsets.MonthEnd(0)).date()
+        yield max(month_start.date(), start), min(month_end, end)
+
+
+def table_date_range(conn, table, date_col):
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT MIN({date_col}), MAX({date_col}) FROM {table}")
+        return cur.fetchone()
+
+
+def backfill_table(conn, table, start=None, end=None):
+    date_col = LAKE_TABLES[table]
+    min_date, max_date = table_date_range(conn, table, date_col)
+    if min_date is None:
+        safe_print(f"⚠️  {table}: no rows in Supabase")
+        return 0, 0
+    start = max(start or min_date, min_date)
+    end = min(end or max_date, max_date)
+
+    rows = files = 0
+    for month_start, month_end in month_ranges(start, end):
+        df = pd.read_sql(
+            f"SELECT * FROM {table} WHERE {date_col} BETWEEN %s AND %s",
+            conn, params=[month_start, month_end],
+        )
+        files += write_slices(table, df)
+        rows += len(df)
+        safe_print(f"   {table} {month_start:%Y-%m}: {len(df):,} rows")
+    return rows, files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill the Parquet lake from Supabase")
+    parser.add_argument("--start", type=lambda s: datetime.strptime(s, "%Y-%m-%d").date(), help="First date (YYYY-MM-DD)")
+    parser.add_argument("--end", type=lambda s: datetime.strptime(s, "%Y-%m-%d").date(), help="Last date (YYYY-MM-DD)")
+    parser.add_argument("--tables", nargs="+", choices=sorted(LAKE_TABLES), help="Tables to backfill (default: all)")
+    args = parser.parse_args()
+
+    safe_print("=" * 60)
+    safe_print(f"🗄️  Building Parquet lake: {LAKE_DIR}")
+    safe_print("=" * 60)
+
+    conn = get_supabase_connection()
+    try:
+        for table in args.tables or list(LAKE_TABLES):
+            started = time.perf_counter()
+            rows, files = backfill_table(conn, table, args.start, args.end)
+            safe_print(f"✅ {table}: {rows:,} rows -> {files:,} files in {time.perf_counter() - started:.1f}s")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
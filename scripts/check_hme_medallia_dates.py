@@ -2,6 +2,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from dashboard.utils.supabase_db import get_supabase_connection
+from dashboard.utils.coverage import feed_summary
 
 def safe_print(msg):
     """Print with Unicode error handling for Windows console"""
@@ -19,51 +20,19 @@ def check_latest_dates():
     safe_print("CHECKING LATEST DATA IN SUPABASE")
     safe_print("=" * 80)
 
-    # Check HME Report data
-    safe_print("\n📊 HME REPORT DATA")
-    safe_print("-" * 40)
-    try:
-        cur.execute("""
-            SELECT MIN(date) as earliest, MAX(date) as latest, COUNT(*) as total_rows
-            FROM hme_report
-        """)
-        row = cur.fetchone()
-        if row and row[1]:
-            safe_print(f"   Earliest Date: {row[0]}")
-            safe_print(f"   Latest Date:   {row[1]}")
-            safe_print(f"   Total Rows:    {row[2]:,}")
-
-            # Get store count
-            cur.execute("SELECT COUNT(DISTINCT store) FROM hme_report")
-            store_count = cur.fetchone()[0]
-            safe_print(f"   Stores:        {store_count}")
-        else:
-            safe_print("   ⚠️  No data found in hme_report table")
-    except Exception as e:
-        safe_print(f"   ❌ Error: {e}")
-
-    # Check Medallia Reports data
-    safe_print("\n📊 MEDALLIA REPORT DATA")
-    safe_print("-" * 40)
-    try:
-        cur.execute("""
-            SELECT MIN(report_date) as earliest, MAX(report_date) as latest, COUNT(*) as total_rows
-            FROM medallia_report
-        """)
-        row = cur.fetchone()
-        if row and row[1]:
-            safe_print(f"   Earliest Date: {row[0]}")
-            safe_print(f"   Latest Date:   {row[1]}")
-            safe_print(f"   Total Rows:    {row[2]:,}")
-
-            # Get PC number count
-            cur.execute("SELECT COUNT(DISTINCT pc_number) FROM medallia_report")
-            pc_count = cur.fetchone()[0]
-            safe_print(f"   Stores:        {pc_count}")
+    # Coverage matrix (dashboard/utils/coverage.py) instead of scanning the tables
+    summary = {row[0]: row[1:] for row in feed_summary(cur)}
+    for feed, title in (("hme_report", "HME REPORT DATA"), ("medallia_reports", "MEDALLIA REPORT DATA")):
+        safe_print(f"\n📊 {title}")
+        safe_print("-" * 40)
+        if feed in summary:
+            earliest, latest, days, stores = summary[feed]
+            safe_print(f"   Earliest Date: {earliest}")
+            safe_print(f"   Latest Date:   {latest}")
+            safe_print(f"   Days:          {days:,}")
+            safe_print(f"   Stores:        {stores}")
         else:
-            safe_print("   ⚠️  No data found in medallia_report table")
-    except Exception as e:
-        safe_print(f"   ❌ Error: {e}")
+            safe_print(f"   ⚠️  No coverage recorded for {feed} (run scripts/refresh_coverage.py --all)")
 
     safe_print("\n" + "=" * 80)
 
@@ -1,39 +1,37 @@
+"""
+Days with no tender data, from the feed coverage matrix (dashboard/utils/coverage.py).
+
+Usage:
+    python scripts/check_missing_tender_dates.py                 # current month so far
+    python scripts/check_missing_tender_dates.py 2025-11-01 2025-11-30
+"""
+
 import sys
+from datetime import date, datetime, timedelta
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from dashboard.utils.supabase_db import get_supabase_connection
+from dashboard.utils.coverage import missing_coverage
+
+if len(sys.argv) == 3:
+    start_date, end_date = (datetime.strptime(d, "%Y-%m-%d").date() for d in sys.argv[1:])
+else:
+    end_date = date.today() - timedelta(days=1)
+    start_date = end_date.replace(day=1)
 
 conn = get_supabase_connection()
 cur = conn.cursor()
 
-# Check what dates have tender data in November
-cur.execute("""
-    SELECT DISTINCT date
-    FROM tender_type_metrics
-    WHERE date >= '2025-11-01' AND date < '2025-12-01'
-    ORDER BY date
-""")
-
-dates_with_data = [row[0] for row in cur.fetchall()]
-
-print("Dates with tender data in November:\n")
-for d in dates_with_data:
-    print(f"  ✓ {d}")
-
-print(f"\nTotal: {len(dates_with_data)} days with data")
-
-# Check which dates are missing
-import datetime
-all_november_dates = [datetime.date(2025, 11, i) for i in range(1, 31)]
-missing_dates = [d for d in all_november_dates if d not in dates_with_data]
+missing = missing_coverage(cur, start_date, end_date, ["tender_type_metrics"])
 
-if missing_dates:
-    print(f"\n❌ Missing data for {len(missing_dates)} days:")
-    for d in missing_dates:
-        print(f"  ✗ {d}")
+print(f"Tender data coverage {start_date} .. {end_date}:\n")
+if missing:
+    print(f"❌ Missing tender data for {len(missing)} store-day(s):")
+    for pc_number, store, day, _ in missing:
+        print(f"  ✗ {day}  {store or pc_number}")
 else:
-    print("\n✅ All November dates have tender data!")
+    print("✅ Every store has tender data for every day!")
 
 cur.close()
 conn.close()
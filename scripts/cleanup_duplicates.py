@@ -1,98 +1,123 @@
 #!/usr/bin/env python3
 """
 Clean up duplicate data in Supabase tables.
-Keeps the most recent version of each unique (store, pc_number, date) combination.
+
+Each table is deduplicated on its natural key (dashboard/utils/dedupe.py),
+e.g. labor_metrics on (store, pc_number, date, labor_position), so detail rows
+for different positions/dayparts/tenders of the same day are left alone.
+The newest row (highest id) of each key is kept.
+
+Usage:
+    python scripts/cleanup_duplicates.py --dry-run            # report only
+    python scripts/cleanup_duplicates.py                      # all tables (asks first)
+    python scripts/cleanup_duplicates.py --table labor_metrics --yes
+    python scripts/cleanup_duplicates.py --batch-size 20000
 """
 
+import argparse
 import sys
+import time
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parents[1]
-sys.path.append(str(BASE_DIR))
-from dashboard.utils import supabase_db
-
-def clean_duplicates():
-    """Remove duplicate rows from all tables"""
-    
-    tables = [
-        'labor_metrics', 
-        'sales_summary', 
-        'sales_by_subcategory', 
-        'sales_by_daypart', 
-        'sales_by_order_type', 
-        'tender_type_metrics'
-    ]
-    
+sys.path.insert(0, str(BASE_DIR))
+
+from dashboard.utils.supabase_db import get_supabase_connection
+from dashboard.utils.dedupe import NATURAL_KEYS, DEFAULT_BATCH_SIZE, duplicate_summary, duplicate_samples, delete_duplicates
+
+
+def safe_print(msg, end='\n'):
+    """Print with Unicode error handling for Windows console"""
     try:
-        conn = supabase_db.get_supabase_connection()
-        
-        print("🧹 Starting duplicate cleanup...")
-        print("=" * 50)
-        
-        with conn.cursor() as cur:
-            for table in tables:
-                print(f"\n📊 Cleaning {table}...")
-                
-                # Get current count
-                cur.execute(f"SELECT COUNT(*) FROM {table}")
-                before_count = cur.fetchone()[0]
-                
-                # Delete duplicates, keeping the row with the highest ID (most recent)
-                cleanup_query = f"""
-                DELETE FROM {table} 
-                WHERE id NOT IN (
-                    SELECT MAX(id) 
-                    FROM {table} 
-                    GROUP BY store, pc_number, date
-                )
-                """
-                
-                cur.execute(cleanup_query)
-                deleted_count = cur.rowcount
-                
-                # Get new count
-                cur.execute(f"SELECT COUNT(*) FROM {table}")
-                after_count = cur.fetchone()[0]
-                
-                print(f"   Before: {before_count} rows")
-                print(f"   Deleted: {deleted_count} duplicates")
-                print(f"   After: {after_count} rows")
-                print(f"   ✅ Cleaned successfully")
-        
+        print(msg, end=end)
+    except UnicodeEncodeError:
+        print(msg.encode('ascii', errors='replace').decode('ascii'), end=end)
+
+
+def table_exists(cur, table):
+    cur.execute("SELECT to_regclass(%s)", (table,))
+    return cur.fetchone()[0] is not None
+
+
+def report(cur, tables):
+    """Duplicate counts and samples per table. Returns {table: duplicate rows}."""
+    found = {}
+    for table in tables:
+        started = time.perf_counter()
+        extra, groups = duplicate_summary(cur, table)
+        elapsed = time.perf_counter() - started
+        found[table] = extra
+        if not extra:
+            safe_print(f"✅ {table:<22} no duplicates ({elapsed:.2f}s)")
+            continue
+        safe_print(f"⚠️  {table:<22} {extra:,} duplicate row(s) across {groups:,} key(s) ({elapsed:.2f}s)")
+        safe_print(f"   key: ({', '.join(NATURAL_KEYS[table])})")
+        for row in duplicate_samples(cur, table):
+            safe_print(f"   {row[:-1]} x{row[-1]}")
+    return found
+
+
+def clean(conn, cur, tables, batch_size):
+    """Delete duplicates table by table, committing after every batch. Returns total rows deleted."""
+    total = 0
+    for table in tables:
+        safe_print(f"\n📊 {table}")
+        started = time.perf_counter()
+
+        def progress(deleted):
+            conn.commit()
+            safe_print(f"   ... {deleted:,} deleted", end='\r')
+
+        deleted = delete_duplicates(cur, table, batch_size, on_batch=progress)
         conn.commit()
-        print(f"\n🎉 All tables cleaned successfully!")
-        
-        # Verify cleanup
-        print(f"\n📋 Verification:")
-        print("=" * 30)
-        
-        with conn.cursor() as cur:
-            for table in tables:
-                cur.execute(f"SELECT COUNT(*) FROM {table}")
-                total_count = cur.fetchone()[0]
-                
-                cur.execute(f"SELECT COUNT(DISTINCT store || pc_number || date) FROM {table}")
-                unique_combinations = cur.fetchone()[0]
-                
-                if total_count == unique_combinations:
-                    print(f"✅ {table}: {total_count} rows (no duplicates)")
-                else:
-                    print(f"⚠️  {table}: {total_count} total, {unique_combinations} unique")
-        
-        conn.close()
-        
+        total += deleted
+        safe_print(f"   🗑️  Deleted {deleted:,} duplicate row(s) in {time.perf_counter() - started:.2f}s")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove duplicate rows by each table's natural key")
+    parser.add_argument("--table", action="append", choices=sorted(NATURAL_KEYS),
+                        help="Table to clean (repeatable; default: all)")
+    parser.add_argument("--dry-run", action="store_true", help="Report duplicates without deleting")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Rows deleted per batch (default {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--yes", action="store_true", help="Skip the confirmation prompt")
+    args = parser.parse_args()
+
+    conn = get_supabase_connection()
+    cur = conn.cursor()
+    try:
+        tables = [t for t in (args.table or list(NATURAL_KEYS)) if table_exists(cur, t)]
+
+        safe_print("🔍 Duplicate report")
+        safe_print("=" * 50)
+        started = time.perf_counter()
+        found = report(cur, tables)
+        safe_print(f"\n{sum(found.values()):,} duplicate row(s) in total ({time.perf_counter() - started:.2f}s)")
+
+        dirty = [t for t in tables if found[t]]
+        if args.dry_run or not dirty:
+            return 0
+
+        if not args.yes:
+            safe_print("\n⚠️  The newest row of each natural key will be kept; the rest are deleted.")
+            if input("🤔 Continue with cleanup? (y/n): ").lower().strip() not in ('y', 'yes'):
+                safe_print("❌ Cleanup cancelled.")
+                return 1
+
+        started = time.perf_counter()
+        deleted = clean(conn, cur, dirty, args.batch_size)
+        safe_print(f"\n🎉 Removed {deleted:,} duplicate row(s) in {time.perf_counter() - started:.2f}s")
     except Exception as e:
-        print(f"❌ Error during cleanup: {e}")
         conn.rollback()
+        safe_print(f"❌ Error during cleanup: {e}")
+        return 1
+    finally:
+        cur.close()
         conn.close()
+    return 0
+
 
 if __name__ == "__main__":
-    # Ask for confirmation
-    print("⚠️  This will remove duplicate data from Supabase tables.")
-    print("   Only the most recent version of each (store, pc_number, date) will be kept.")
-    response = input("\n🤔 Continue with cleanup? (y/n): ").lower().strip()
-    
-    if response in ['y', 'yes']:
-        clean_duplicates()
-    else:
-        print("❌ Cleanup cancelled.")
\ No newline at end of file
+    sys.exit(main())
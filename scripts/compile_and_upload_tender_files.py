@@ -18,6 +18,7 @@ BASE_DIR = Path(__file__).resolve().parents[1]
 sys.path.append(str(BASE_DIR))
 
 from dashboard.utils.supabase_db import get_supabase_connection
+from dashboard.utils import coverage, day_loads, excel_reader, tender_types
 
 # Directory containing downloaded tender files
 TENDER_DIR = BASE_DIR / "data" / "tender_downloads"
@@ -59,7 +60,7 @@ def process_tender_file(filepath):
     
     try:
         # Read Excel file with header=1 (skip first row)
-        df = pd.read_excel(filepath, header=1)
+        df = excel_reader.read_sheet(filepath, header=1)
         print(f"   📊 Read {len(df)} rows, {len(df.columns)} columns")
         
         # The tender type is in 'GL Description' column
@@ -151,54 +152,54 @@ def process_tender_file(filepath):
         return None
 
 
-def upload_to_supabase(df):
-    """Upload DataFrame to Supabase tender_type_metrics table"""
+def upload_to_supabase(cur, df, batch_size=None):
+    """
+    Write a DataFrame to tender_type_metrics through cur, replacing the rows
+    for its dates and stores. batch_size splits the insert into several
+    executemany calls (default: one call for everything). Committing is up
+    to the caller. Returns rows inserted.
+    """
     if df is None or len(df) == 0:
         return 0
     
-    try:
-        conn = get_supabase_connection()
-        cursor = conn.cursor()
-        
-        # First, check if records already exist and delete them to avoid duplicates
-        print("   🔍 Checking for existing records...")
-        
-        dates = df['date'].unique().tolist()
-        date_list = "','".join(dates)
-        
-        delete_query = f"""
-            DELETE FROM tender_type_metrics 
-            WHERE date IN ('{date_list}')
-        """
-        cursor.execute(delete_query)
-        deleted = cursor.rowcount
-        if deleted > 0:
-            print(f"   🗑️  Deleted {deleted} existing records for these dates")
-        
-        # Prepare insert query
-        insert_query = """
-            INSERT INTO tender_type_metrics (store, pc_number, date, tender_type, detail_amount)
-            VALUES (%s, %s, %s, %s, %s)
+    # First, check if records already exist and delete them to avoid duplicates
+    print("   🔍 Checking for existing records...")
+    
+    cur.execute(
         """
-        
-        # Convert DataFrame to list of tuples
-        data = df[['store', 'pc_number', 'date', 'tender_type', 'detail_amount']].values.tolist()
-        
-        # Execute batch insert
-        cursor.executemany(insert_query, data)
-        rows_inserted = cursor.rowcount
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return rows_inserted
-        
-    except Exception as e:
-        print(f"   ❌ Upload error: {e}")
-        import traceback
-        traceback.print_exc()
-        return 0
+        DELETE FROM tender_type_metrics
+        WHERE date = ANY(%s::date[]) AND pc_number = ANY(%s)
+        """,
+        (df['date'].unique().tolist(), df['pc_number'].unique().tolist()),
+    )
+    deleted = cur.rowcount
+    if deleted > 0:
+        print(f"   🗑️  Deleted {deleted} existing records for these dates")
+    
+    # Stamp the canonical tender category (registers any new labels in tender_types)
+    categories = tender_types.resolve_tender_categories(cur, df['tender_type'].unique())
+    df = df.assign(tender_category=df['tender_type'].map(categories).astype(object))
+    df['tender_category'] = df['tender_category'].where(df['tender_category'].notna(), None)
+    
+    # Prepare insert query
+    insert_query = """
+        INSERT INTO tender_type_metrics (store, pc_number, date, tender_type, detail_amount, tender_category)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """
+    
+    # Convert DataFrame to list of tuples
+    data = df[['store', 'pc_number', 'date', 'tender_type', 'detail_amount', 'tender_category']].values.tolist()
+    
+    # Execute batch insert
+    rows_inserted = 0
+    step = batch_size or len(data)
+    for i in range(0, len(data), step):
+        cur.executemany(insert_query, data[i:i + step])
+        rows_inserted += cur.rowcount
+    
+    coverage.refresh_coverage(cur, "tender_type_metrics", df['date'].min(), df['date'].max())
+    
+    return rows_inserted
 
 
 def main():
@@ -219,30 +220,28 @@ def main():
     print(f"📁 Found {len(tender_files)} tender files")
     print()
     
-    all_data = []
-    processed_count = 0
+    processed = []
     failed_count = 0
     
     for filepath in tender_files:
         df = process_tender_file(filepath)
         
         if df is not None and len(df) > 0:
-            all_data.append(df)
-            processed_count += 1
+            processed.append((filepath, df))
         else:
             failed_count += 1
     
-    if not all_data:
+    if not processed:
         print("\n❌ No data to upload")
         return
     
     # Combine all DataFrames
-    combined_df = pd.concat(all_data, ignore_index=True)
+    combined_df = pd.concat([df for _, df in processed], ignore_index=True)
     
     print("\n" + "=" * 80)
     print("COMPILATION SUMMARY")
     print("=" * 80)
-    print(f"✅ Successfully processed: {processed_count} files")
+    print(f"✅ Successfully processed: {len(processed)} files")
     print(f"❌ Failed: {failed_count} files")
     print(f"📊 Total records: {len(combined_df)}")
     print(f"📅 Date range: {combined_df['date'].min()} to {combined_df['date'].max()}")
@@ -255,12 +254,38 @@ def main():
     print("=" * 80)
     print()
     
-    rows_affected = upload_to_supabase(combined_df)
+    try:
+        conn = get_supabase_connection()
+    except Exception as e:
+        print(f"❌ Supabase connection error: {e}")
+        return
+    
+    # One session for the run; one transaction per date, one savepoint per file
+    def upload_file(cur, item):
+        filepath, df = item
+        print(f"📤 {filepath.name}")
+        return upload_to_supabase(cur, df)
+    
+    def report_failure(item, error):
+        print(f"   ❌ {item[0].name} rolled back: {error}")
+    
+    try:
+        loaded, failed = day_loads.load_days(
+            conn,
+            day_loads.group_by_date(processed, lambda item: item[1]['date'].iloc[0]),
+            upload_file,
+            on_error=report_failure,
+        )
+    finally:
+        conn.close()
+    rows_affected = sum(rows for _, rows in loaded)
     
     if rows_affected > 0:
         print(f"\n✅ Successfully uploaded/updated {rows_affected} records to tender_type_metrics table")
     else:
         print(f"\n❌ Upload failed or no new records to insert")
+    if failed:
+        print(f"⚠️  {len(failed)} file(s) rolled back: {', '.join(item[0].name for item, _ in failed)}")
     
     print("\n" + "=" * 80)
     print("COMPLETE")
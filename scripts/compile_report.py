@@ -4,6 +4,7 @@ from pathlib import Path
 from openpyxl import load_workbook
 import pandas as pd
 import re
+import sys
 import unicodedata
 
 # =================== CONFIG ===================
@@ -13,6 +14,9 @@ RAW_DIR  = BASE_DIR / "data" / "raw_emails"
 OUT_DIR  = BASE_DIR / "data" / "compiled"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
+sys.path.insert(0, str(BASE_DIR))
+from dashboard.utils.tender_types import canonical_label
+
 # ========= STORE / PC MAPPING =========
 LOC_TO_PC = {
     "301290 - 2820 Paxton St": "301290",
@@ -381,24 +385,8 @@ def flatten_sales_summary_horizontal(raw_path: Path) -> Path:
     return out_path
 
 # --------- Tender Type (mapping) ---------
-TENDER_MAP = {
-    "credit card - amex": "Amex",
-    "credit card - discover": "Discover",
-    "credit card - mastercard": "Mastercard",
-    "credit card - visa": "Visa",
-    "visa - kiosk": "Visa-Kiosk",
-    "gift card redeem": "GC Redeem",
-    "clover go": "Clover Go",
-    "delivery: doordash": "Doordash",
-    "delivery: uber eats": "Uber Eats",
-    "grub hub": "Grub Hub",
-}
 def map_tender_label(s: str) -> str:
-    k = norm(s).lower()
-    for pat, out in TENDER_MAP.items():
-        if k == pat or pat in k:
-            return out
-    return norm(s)
+    return canonical_label(norm(s))
 
 def flatten_tender_type_file(raw_path: Path) -> Path:
     """
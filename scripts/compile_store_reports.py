@@ -1,19 +1,26 @@
 # scripts/compile_store_reports.py
 
+from __future__ import annotations
 from pathlib import Path
-from io import BytesIO
-from openpyxl import load_workbook
+import hashlib
+import json
 import pandas as pd
 import re
+import sys
 import unicodedata
 
 # =================== CONFIG ===================
 DEBUG = True
+USE_LAYOUT_CACHE = True  # reuse resolved blocked-sheet layouts (data/report_layouts.json)
 BASE_DIR = Path(__file__).resolve().parents[1]
 RAW_DIR  = BASE_DIR / "data" / "raw_emails"
 OUT_DIR  = BASE_DIR / "data" / "compiled"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
+sys.path.insert(0, str(BASE_DIR))
+from dashboard.utils import excel_reader
+from dashboard.utils.tender_types import canonical_label
+
 # ========= STORE / PC MAPPING =========
 LOC_TO_PC = {
     "301290 - 2820 Paxton St": "301290",
@@ -85,58 +92,43 @@ def drop_totals(df: pd.DataFrame, label_col: str) -> pd.DataFrame:
     mask = lab.str.startswith("total") | lab.isin({"grand total","store total","overall total","totals"})
     return df.loc[~mask].copy()
 
-# ------------- In-memory unmerge helpers -------------
-def _wb_to_buf(wb) -> BytesIO:
-    buf = BytesIO(); wb.save(buf); buf.seek(0); return buf
+# ------------- Sheet readers (merged cells filled by excel_reader) -------------
+def _blank(values: pd.Series) -> pd.Series:
+    return values.isna() | values.astype(str).str.strip().eq("")
 
-def unmerge_all_sheets_and_ffill_row2(in_path: Path, fill_row2: bool = True) -> BytesIO:
+def read_unmerged_ffill_row2(in_path: Path, fill_row2: bool = True) -> pd.DataFrame:
     """
-    Unmerge ALL sheets, copy top-left value into all cells of each merged range.
-    If fill_row2=True, forward-fill row 2 across on the FIRST sheet only
+    First sheet with every merged range filled with its top-left value.
+    If fill_row2=True, forward-fill row 2 across
     (this is how we assign Location Name to each column block).
     """
-    wb = load_workbook(in_path)
-    for ws in wb.worksheets:
-        for rng in list(ws.merged_cells.ranges):
-            tl = ws.cell(row=rng.min_row, column=rng.min_col).value
-            ws.unmerge_cells(str(rng))
-            for r in range(rng.min_row, rng.max_row + 1):
-                for c in range(rng.min_col, rng.max_col + 1):
-                    ws.cell(row=r, column=c).value = tl
-    if fill_row2 and wb.worksheets:
-        ws0 = wb.worksheets[0]
-        last = None
-        for c in range(1, ws0.max_column + 1):
-            v = ws0.cell(row=2, column=c).value
-            if v is None or str(v).strip() == "":
-                if last is not None:
-                    ws0.cell(row=2, column=c).value = last
-            else:
-                last = v
-    return _wb_to_buf(wb)
-
-def unmerge_all_sheets_and_fill_col_e(in_path: Path) -> BytesIO:
+    df = excel_reader.read_sheet(in_path, header=None, merged=True)
+    if fill_row2 and len(df) > 1:
+        row = df.iloc[1]
+        blank = _blank(row)
+        filled = row.mask(blank).ffill()
+        cols = list(row.index[blank & filled.notna()])
+        if cols:
+            df[cols] = df[cols].astype(object)
+            df.loc[df.index[1], cols] = filled[cols]
+            df[cols] = df[cols].infer_objects()
+    return df
+
+def read_unmerged_fill_col_e(in_path: Path) -> pd.DataFrame:
     """
     For Tender Type:
-    - Unmerge ALL sheets
-    - On FIRST sheet: if Column E (5) rows 1..71 blank => set 0
+    - First sheet with merged ranges filled
+    - Column E (5) rows 1..71 blank => 0
     """
-    wb = load_workbook(in_path)
-    for ws in wb.worksheets:
-        for rng in list(ws.merged_cells.ranges):
-            tl = ws.cell(row=rng.min_row, column=rng.min_col).value
-            ws.unmerge_cells(str(rng))
-            for r in range(rng.min_row, rng.max_row + 1):
-                for c in range(rng.min_col, rng.max_col + 1):
-                    ws.cell(row=r, column=c).value = tl
-    if wb.worksheets:
-        ws0 = wb.worksheets[0]
-        max_row = min(71, ws0.max_row)
-        for r in range(1, max_row + 1):
-            cell = ws0.cell(row=r, column=5)
-            if cell.value is None or str(cell.value).strip() == "":
-                cell.value = 0
-    return _wb_to_buf(wb)
+    df = excel_reader.read_sheet(in_path, header=None, merged=True)
+    if df.shape[1] < 5:
+        df = df.reindex(columns=range(5))
+    blank = _blank(df.iloc[:71, 4])
+    if blank.any():
+        df[4] = df[4].astype(object)
+        df.loc[blank.index[blank], 4] = 0
+        df[4] = df[4].infer_objects()
+    return df
 
 # --------- DETECTORS (by filename) -------------
 def is_labor(name: str) -> bool: return "labor hours" in name
@@ -147,37 +139,81 @@ def is_tender(name: str) -> bool: return "tender type" in name or ("tender" in n
 def is_sales_summary(name: str) -> bool: return "sales mix detail" in name
 def is_order_type(name: str) -> bool: return "menu mix metrics" in name
 
-# ------------- CORE FLATTENER (shared) -------------
-def flatten_blocked_sheet(raw_path: Path, subheaders: list[str], label_regex: str, label_out: str, fill_row2=True) -> Path:
-    """
-    Generic flattener for the “horizontal blocks per location” pattern.
+# ------------- Report layout registry -------------
+# Expected subheader -> header texts that count as a match in headers_match()
+HEADER_ALIASES = {
+    "reg_hours": ["reg hours", "regular hours"],
+    "ot_hours": ["ot hours", "overtime hours"],
+    "total_hours": ["total hours"],
+    "reg_pay": ["reg pay", "regular pay"],
+    "ot_pay": ["ot pay", "overtime pay"], 
+    "total_pay": ["total pay"],
+    "percent_labor": ["% labor", "percent labor", "labor %"],
+    "net_sales": ["sales", "net sales"],
+    "percent_sales": ["% sales", "% of sales", "percent sales"],
+    "percent_guest": ["% guests", "percent guests"],
+    "check_count": ["guest count", "check count"],
+    "guests": ["guests", "guest count"],
+    "avg_check": ["avg check", "average check"],
+    "qty_sold": ["qty sold", "quantity sold"],
+    "daypart": ["daypart"],
+    "subcategory": ["subcategory", "subcategory name"],
+    "order_type": ["revenue center"]
+}
 
-    Steps:
-      1) Unmerge all sheets + forward-fill row 2 (Location Name across columns)
-      2) Detect header row that contains label_regex (e.g. 'Labor Position Name' / 'Daypart' / 'Subcategory' / 'Revenue Center')
-      3) Row 2 is location names; for each block (contiguous subheaders) slice data, map store/pc, add date
-      4) Drop totals; numeric coercion on numeric-like columns
-    """
-    buf = unmerge_all_sheets_and_ffill_row2(raw_path, fill_row2=fill_row2)
-    df0 = pd.read_excel(buf, header=None, sheet_name=0)  # first sheet
+# Resolved layouts (header row, label column, block starts) per report kind,
+# keyed by a fingerprint of the header row. Every day's file of a report has
+# the same layout, so detection runs once per layout, not once per file.
+LAYOUT_CACHE_PATH = BASE_DIR / "data" / "report_layouts.json"
+_layouts = None  # {kind: [layout, ...]}, loaded on first use
+
+def headers_match(file_headers, expected_subheaders):
+    """Check if file headers match expected subheaders with flexible matching"""
+    if len(file_headers) != len(expected_subheaders):
+        return False
+    
+    for i, expected in enumerate(expected_subheaders):
+        file_header = file_headers[i].lower()
+        patterns = HEADER_ALIASES.get(expected.lower(), [expected.lower()])
+        if not any(file_header.startswith(p) or p in file_header for p in patterns):
+            return False
+    return True
+
+def layout_kind(label_regex: str, subheaders: list[str]) -> str:
+    return "|".join([label_regex] + list(subheaders))
 
-    # 2) Find header row by label_regex
+def header_fingerprint(header_row: int, headers: list[str]) -> str:
+    return hashlib.md5(json.dumps([header_row, headers]).encode("utf-8")).hexdigest()
+
+def _load_layouts() -> dict:
+    global _layouts
+    if _layouts is None:
+        try:
+            _layouts = json.loads(LAYOUT_CACHE_PATH.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            _layouts = {}
+    return _layouts
+
+def _remember_layout(kind: str, layout: dict) -> None:
+    layouts = _load_layouts()
+    layouts.setdefault(kind, []).append(layout)
+    try:
+        LAYOUT_CACHE_PATH.write_text(json.dumps(layouts, indent=1), encoding="utf-8")
+    except OSError:
+        pass  # cache only; detection still works without it
+
+def detect_layout(df0: pd.DataFrame, pattern, subheaders: list[str]) -> dict:
+    """Full detection: header row by pattern (first 30 rows), label column, block starts."""
     hdr_row_idx = None
-    pattern = re.compile(label_regex, re.I)
     for i in range(min(30, len(df0))):
         row_texts = [norm(x) for x in df0.iloc[i].tolist()]
         if any(pattern.search(x) for x in row_texts):
             hdr_row_idx = i
             break
     if hdr_row_idx is None:
-        raise ValueError(f"Header row not found by /{label_regex}/.")
-
-    # 3) Locations are in row 2 (Excel indexing) => index 1
-    loc_row = [norm(x) for x in df0.iloc[1].tolist()]
+        raise ValueError(f"Header row not found by /{pattern.pattern}/.")
 
     headers = [norm(x) for x in df0.iloc[hdr_row_idx].tolist()]
-    df = df0.iloc[hdr_row_idx + 1:].copy()
-    df.columns = headers
 
     # Find label column index
     label_col = None
@@ -188,39 +224,6 @@ def flatten_blocked_sheet(raw_path: Path, subheaders: list[str], label_regex: st
         raise ValueError("Label column not found.")
 
     # Find all block starts by matching contiguous subheaders
-    def headers_match(file_headers, expected_subheaders):
-        """Check if file headers match expected subheaders with flexible matching"""
-        if len(file_headers) != len(expected_subheaders):
-            return False
-        
-        # Create mapping from expected to actual patterns
-        mapping = {
-            "reg_hours": ["reg hours", "regular hours"],
-            "ot_hours": ["ot hours", "overtime hours"],
-            "total_hours": ["total hours"],
-            "reg_pay": ["reg pay", "regular pay"],
-            "ot_pay": ["ot pay", "overtime pay"], 
-            "total_pay": ["total pay"],
-            "percent_labor": ["% labor", "percent labor", "labor %"],
-            "net_sales": ["sales", "net sales"],
-            "percent_sales": ["% sales", "% of sales", "percent sales"],
-            "percent_guest": ["% guests", "percent guests"],
-            "check_count": ["guest count", "check count"],
-            "guests": ["guests", "guest count"],
-            "avg_check": ["avg check", "average check"],
-            "qty_sold": ["qty sold", "quantity sold"],
-            "daypart": ["daypart"],
-            "subcategory": ["subcategory", "subcategory name"],
-            "order_type": ["revenue center"]
-        }
-        
-        for i, expected in enumerate(expected_subheaders):
-            file_header = file_headers[i].lower()
-            patterns = mapping.get(expected.lower(), [expected.lower()])
-            if not any(file_header.startswith(p) or p in file_header for p in patterns):
-                return False
-        return True
-    
     starts = []
     L = len(subheaders) 
     for j in range(label_col + 1, len(headers) - L + 2):
@@ -230,6 +233,72 @@ def flatten_blocked_sheet(raw_path: Path, subheaders: list[str], label_regex: st
     if not starts:
         raise ValueError("No per-location blocks detected.")
 
+    return {
+        "fingerprint": header_fingerprint(hdr_row_idx, headers),
+        "header_row": hdr_row_idx,
+        "label_col": label_col,
+        "starts": starts,
+    }
+
+def resolve_layout(df0: pd.DataFrame, label_regex: str, subheaders: list[str]) -> dict:
+    """
+    Layout of a blocked sheet: a cached one whose header-row fingerprint matches
+    this sheet (and no earlier row matches label_regex, as detection would pick
+    that row), else full detection - remembered for the next file.
+
+    The guard regex-scans the rows above the header as detect_layout does, so
+    a cache hit saves the label-column search and the headers_match sweep for
+    block starts, not the row scan. The rows above the header (report title
+    with its dates, location names) differ per file, so a fingerprint of them
+    would never hit.
+    """
+    pattern = re.compile(label_regex, re.I)
+    kind = layout_kind(label_regex, subheaders)
+    if USE_LAYOUT_CACHE:
+        for layout in _load_layouts().get(kind, []):
+            hdr = layout["header_row"]
+            if hdr >= min(30, len(df0)):
+                continue
+            headers = [norm(x) for x in df0.iloc[hdr].tolist()]
+            if header_fingerprint(hdr, headers) != layout["fingerprint"]:
+                continue
+            if any(pattern.search(norm(x)) for i in range(hdr) for x in df0.iloc[i].tolist()):
+                continue
+            log(f"Layout: cached (header row {hdr + 1}, {len(layout['starts'])} block(s))")
+            return layout
+
+    layout = detect_layout(df0, pattern, subheaders)
+    if USE_LAYOUT_CACHE:
+        _remember_layout(kind, layout)
+    log(f"Layout: detected (header row {layout['header_row'] + 1}, {len(layout['starts'])} block(s))")
+    return layout
+
+# ------------- CORE FLATTENER (shared) -------------
+def flatten_blocked_sheet(raw_path: Path, subheaders: list[str], label_regex: str, label_out: str, fill_row2=True) -> Path:
+    """
+    Generic flattener for the “horizontal blocks per location” pattern.
+
+    Steps:
+      1) Read the first sheet with merged cells filled + forward-fill row 2 (Location Name across columns)
+      2) Detect header row that contains label_regex (e.g. 'Labor Position Name' / 'Daypart' / 'Subcategory' / 'Revenue Center'),
+         or reuse the cached layout for this header row's fingerprint (resolve_layout)
+      3) Row 2 is location names; for each block (contiguous subheaders) slice data, map store/pc, add date
+      4) Drop totals; numeric coercion on numeric-like columns
+    """
+    df0 = read_unmerged_ffill_row2(raw_path, fill_row2=fill_row2)  # first sheet
+
+    # 2) Header row, label column and block starts (cached per layout)
+    layout = resolve_layout(df0, label_regex, subheaders)
+    hdr_row_idx, label_col, starts = layout["header_row"], layout["label_col"], layout["starts"]
+    L = len(subheaders)
+
+    # 3) Locations are in row 2 (Excel indexing) => index 1
+    loc_row = [norm(x) for x in df0.iloc[1].tolist()]
+
+    headers = [norm(x) for x in df0.iloc[hdr_row_idx].tolist()]
+    df = df0.iloc[hdr_row_idx + 1:].copy()
+    df.columns = headers
+
     # 4) Build output
     date_val = parse_first_date_from_filename(raw_path)
     out_rows = []
@@ -355,7 +424,7 @@ def flatten_sales_summary_horizontal(raw_path: Path) -> Path:
     Handle Sales Mix Detail files with horizontal structure: locations as columns, metrics as rows.
     This transforms it into the sales_summary table format.
     """
-    df = pd.read_excel(raw_path, header=None, sheet_name=0)
+    df = excel_reader.read_sheet(raw_path, header=None)
     
     # Row 1 contains location names (columns 1-7)
     locations = [norm(str(x)) for x in df.iloc[1].tolist()[1:] if norm(str(x)) != "" and str(x) != "nan"]
@@ -440,24 +509,8 @@ def flatten_sales_summary_horizontal(raw_path: Path) -> Path:
     return out_path
 
 # --------- Tender Type (unmerge + column E rule + mapping) ---------
-TENDER_MAP = {
-    "credit card - amex": "Amex",
-    "credit card - discover": "Discover",
-    "credit card - mastercard": "Mastercard",
-    "credit card - visa": "Visa",
-    "visa - kiosk": "Visa-Kiosk",
-    "gift card redeem": "GC Redeem",
-    "clover go": "Clover Go",
-    "delivery: doordash": "Doordash",
-    "delivery: uber eats": "Uber Eats",
-    "grub hub": "Grub Hub",
-}
 def map_tender_label(s: str) -> str:
-    k = norm(s).lower()
-    for pat, out in TENDER_MAP.items():
-        if k == pat or pat in k:
-            return out
-    return norm(s)
+    return canonical_label(norm(s))
 
 def flatten_tender_type_file(raw_path: Path) -> Path:
     """
@@ -467,8 +520,7 @@ def flatten_tender_type_file(raw_path: Path) -> Path:
     Row 1: "Sales Mix Tran Type", "GL Description", "301290 - 2820 Paxton St", "343939 - 807 E Main St", ...
     Row 2+: "Category", "Tender Type", amount1, amount2, amount3, ...
     """
-    buf = unmerge_all_sheets_and_fill_col_e(raw_path)
-    df = pd.read_excel(buf, header=None, sheet_name=0)
+    df = read_unmerged_fill_col_e(raw_path)
     
     # For this format, row 1 contains location names starting from column 2
     location_row = df.iloc[1].tolist()
@@ -531,28 +583,32 @@ def flatten_tender_type_file(raw_path: Path) -> Path:
     return out_path
 
 # ------------- Dispatcher -------------
-def process_one_input(path: Path) -> bool:
+def compile_one(path: Path) -> Path | None:
+    """Compile one raw report into data/compiled. Returns the compiled file, or None."""
     name_low = norm(path.name).lower()
     log(f"\n=== Processing: {path.name} ===")
     try:
         if is_labor(name_low):
-            outp = flatten_labor_file(path); log(f"OK (labor) → {outp.name}"); return True
+            outp = flatten_labor_file(path); log(f"OK (labor) → {outp.name}"); return outp
         if is_order_type(name_low):
-            outp = flatten_menu_mix_file(path); log(f"OK (order_type) → {outp.name}"); return True
+            outp = flatten_menu_mix_file(path); log(f"OK (order_type) → {outp.name}"); return outp
         if is_daypart(name_low):
-            outp = flatten_sales_by_daypart_file(path); log(f"OK (daypart) → {outp.name}"); return True
+            outp = flatten_sales_by_daypart_file(path); log(f"OK (daypart) → {outp.name}"); return outp
         if is_subcat(name_low):
-            outp = flatten_sales_by_subcategory_file(path); log(f"OK (subcategory) → {outp.name}"); return True
+            outp = flatten_sales_by_subcategory_file(path); log(f"OK (subcategory) → {outp.name}"); return outp
         if is_tender(name_low):
-            outp = flatten_tender_type_file(path); log(f"OK (tender) → {outp.name}"); return True
+            outp = flatten_tender_type_file(path); log(f"OK (tender) → {outp.name}"); return outp
         if is_sales_summary(name_low):
-            outp = flatten_sales_summary_horizontal(path); log(f"OK (sales_summary) → {outp.name}"); return True
+            outp = flatten_sales_summary_horizontal(path); log(f"OK (sales_summary) → {outp.name}"); return outp
 
         log("SKIP: No matching transformer for this file.")
-        return False
+        return None
     except Exception as e:
         log(f"ERROR: {e}")
-        return False
+        return None
+
+def process_one_input(path: Path) -> bool:
+    return compile_one(path) is not None
 
 def main():
     files = [p for p in sorted(RAW_DIR.glob("*.xlsx")) + sorted(RAW_DIR.glob("*.xls"))
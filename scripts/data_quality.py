@@ -0,0 +1,117 @@
+"""
+Data-quality check over the fact tables.
+
+Evaluates every rule in dashboard/utils/data_quality.py (coverage gaps,
+negative gift card sales, percent-sum sanity, tender vs sales balance, ...)
+for a date window, prints one report and records the run in
+data_quality_runs / data_quality_results (db/migrations/0006_data_quality.sql).
+
+Usage:
+    python scripts/data_quality.py                         # last 31 days
+    python scripts/data_quality.py --start 2025-11-01 --end 2025-11-30
+    python scripts/data_quality.py --rule coverage_gap --rule negative_gift_card_sales
+    python scripts/data_quality.py --list                  # show the rules
+    python scripts/data_quality.py --no-save --strict      # exit 1 on any error-level failure
+"""
+
+import argparse
+import sys
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from dashboard.utils.supabase_db import get_supabase_connection
+from dashboard.utils.data_quality import RULES, evaluate, save_run
+
+DEFAULT_DAYS = 31
+SAMPLE_ROWS = 10
+
+
+def safe_print(msg, end='\n'):
+    """Print with Unicode error handling for Windows console"""
+    try:
+        print(msg, end=end)
+    except UnicodeEncodeError:
+        print(msg.encode('ascii', errors='replace').decode('ascii'), end=end)
+
+
+def parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def print_report(rule_names, failures, start_date, end_date, elapsed):
+    by_rule = defaultdict(list)
+    for failure in failures:
+        by_rule[failure[0]].append(failure)
+
+    safe_print(f"🩺 Data quality {start_date} .. {end_date}")
+    safe_print("=" * 70)
+    for name in rule_names:
+        rule = RULES[name]
+        rows = by_rule.get(name, [])
+        if not rows:
+            safe_print(f"✅ {name:<30} ok")
+            continue
+        icon = "❌" if rule["severity"] == "error" else "⚠️ "
+        safe_print(f"{icon} {name:<30} {len(rows):,} store-day(s) - {rule['description']}")
+        for _, _, store, day, value, detail in rows[:SAMPLE_ROWS]:
+            shown = f"{value:,.2f}" if value is not None else "-"
+            safe_print(f"      {day}  {store:<14} {shown:>12}  {detail or ''}")
+        if len(rows) > SAMPLE_ROWS:
+            safe_print(f"      ... and {len(rows) - SAMPLE_ROWS:,} more")
+
+    errors = sum(1 for f in failures if f[1] == "error")
+    safe_print("=" * 70)
+    safe_print(f"{len(rule_names)} rule(s), {len(failures):,} failure(s) ({errors:,} error-level) in {elapsed:.2f}s")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the data-quality rules")
+    parser.add_argument("--start", type=parse_date, help="YYYY-MM-DD (default: --days before --end)")
+    parser.add_argument("--end", type=parse_date, help="YYYY-MM-DD (default: yesterday)")
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help=f"Window length when --start is omitted (default {DEFAULT_DAYS})")
+    parser.add_argument("--rule", action="append", choices=sorted(RULES), help="Rule to run (repeatable; default: all)")
+    parser.add_argument("--list", action="store_true", help="List the rules and exit")
+    parser.add_argument("--no-save", action="store_true", help="Do not record the run")
+    parser.add_argument("--strict", action="store_true", help="Exit 1 when any error-level rule fails")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, rule in RULES.items():
+            safe_print(f"{name:<30} {rule['severity']:<8} {rule['description']}")
+        return 0
+
+    end_date = args.end or date.today() - timedelta(days=1)
+    start_date = args.start or end_date - timedelta(days=args.days - 1)
+    rule_names = args.rule or list(RULES)
+
+    conn = get_supabase_connection()
+    cur = conn.cursor()
+    try:
+        started = time.perf_counter()
+        failures = evaluate(cur, start_date, end_date, rule_names)
+        elapsed = time.perf_counter() - started
+
+        errors = print_report(rule_names, failures, start_date, end_date, elapsed)
+
+        if not args.no_save:
+            run_id = save_run(cur, start_date, end_date, len(rule_names), failures, int(elapsed * 1000))
+            conn.commit()
+            safe_print(f"💾 Saved as run {run_id}")
+    except Exception as e:
+        conn.rollback()
+        safe_print(f"❌ Error: {e}")
+        return 1
+    finally:
+        cur.close()
+        conn.close()
+    return 1 if args.strict and errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
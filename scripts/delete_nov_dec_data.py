@@ -1,12 +1,18 @@
 """
 Delete all data from Nov 1 onwards (including Nov 1) from Supabase
 This includes ALL tables affected by the upload script
+Partitioned tables drop whole months as partitions (re-created empty for the
+reload); the rest fall back to DELETE - see dashboard/utils/partitions.py.
 """
 
 import sys
+from datetime import date
 from pathlib import Path
-sys.path.append(str(Path(__file__).resolve().parents[1] / "dashboard" / "utils"))
-from supabase_db import get_supabase_connection
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from dashboard.utils.supabase_db import get_supabase_connection
+from dashboard.utils.partitions import clear_from
+
+DELETE_FROM = date(2025, 11, 1)
 
 def delete_november_december_data():
     """Delete all data from Nov 1, 2025 onwards from ALL tables"""
@@ -32,12 +38,7 @@ def delete_november_december_data():
         
         for table in tables:
             print(f"\n🗑️  Deleting from {table} table...")
-            delete_query = f"""
-                DELETE FROM {table} 
-                WHERE date >= '2025-11-01'
-            """
-            cursor.execute(delete_query)
-            rows_deleted = cursor.rowcount
+            rows_deleted = clear_from(cursor, table, DELETE_FROM)
             total_deleted += rows_deleted
             print(f"✅ Deleted {rows_deleted} rows from {table}")
         
@@ -2,15 +2,21 @@
 Delete all data from October 1, 2025 onwards from sales_summary and tender_type_metrics tables
 
 This script will clear all data from Oct 1 onwards so we can re-upload it cleanly.
+Whole months are removed by dropping their partitions (re-created empty for the
+reload) - see dashboard/utils/partitions.py.
 """
 
 import os
 import sys
+from datetime import date
 
 # Add parent directory to path to import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from dashboard.utils.supabase_db import get_supabase_connection
+from dashboard.utils.partitions import clear_from
+
+DELETE_FROM = date(2025, 10, 1)
 
 
 def delete_october_data():
@@ -68,20 +74,12 @@ def delete_october_data():
         print("="*80)
         
         print("\nDeleting from sales_summary...")
-        cursor.execute("""
-            DELETE FROM sales_summary
-            WHERE date >= '2025-10-01'
-        """)
-        sales_deleted = cursor.rowcount
+        sales_deleted = clear_from(cursor, "sales_summary", DELETE_FROM)
         print(f"✓ Deleted {sales_deleted} records from sales_summary")
         
         # Delete from tender_type_metrics
         print("\nDeleting from tender_type_metrics...")
-        cursor.execute("""
-            DELETE FROM tender_type_metrics
-            WHERE date >= '2025-10-01'
-        """)
-        tender_deleted = cursor.rowcount
+        tender_deleted = clear_from(cursor, "tender_type_metrics", DELETE_FROM)
         print(f"✓ Deleted {tender_deleted} records from tender_type_metrics")
         
         # Commit the changes
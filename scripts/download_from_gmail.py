@@ -1,21 +1,23 @@
-import imaplib
-import email
 from email.header import decode_header
 import os
+import sys
 import datetime
 import re
-from bs4 import BeautifulSoup
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from dashboard.utils import mail_client
 
 # Load credentials from .env
 from dotenv import load_dotenv
-load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'))
-
-IMAP_SERVER = "imap.gmail.com"
-EMAIL = os.getenv("EMAIL_USER")
-PASSWORD = os.getenv("EMAIL_PASS")
+load_dotenv(BASE_DIR / '.env')
 
 # Directory to save raw email content
-SAVE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "raw_emails")
+SAVE_DIR = os.path.join(BASE_DIR, "data", "raw_emails")
+
+SUBJECT = "Consolidated Dunkin Sales Summary v2"
 
 
 def clean_filename(text):
@@ -42,41 +44,16 @@ def extract_store_info(subject):
     return "000000", "unknown_store"
 
 
-def download_email_bodies():
+def save_attachments(msg, date_for_filename):
+    """Save the message's Excel attachments as {date_for_filename}_{name}; returns the paths."""
     os.makedirs(SAVE_DIR, exist_ok=True)
 
-    today = datetime.datetime.now().strftime("%d-%b-%Y")
-    date_for_filename = (datetime.datetime.now() - datetime.timedelta(days=1)).strftime("%Y%m%d")
-
-    mail = imaplib.IMAP4_SSL(IMAP_SERVER)
-    mail.login(EMAIL, PASSWORD)
-    mail.select("inbox")
-
-    # Search for the new subject
-    result, data = mail.search(None, f'(SUBJECT "Consolidated Dunkin Sales Summary v2")')
-    email_ids = data[0].split()
-
-    if not email_ids:
-        print("No matching emails found.")
-        return
-
-    # Only process the latest email
-    latest_email_id = email_ids[-1]
-    res, msg_data = mail.fetch(latest_email_id, "(RFC822)")
-    if res != "OK":
-        print("Failed to fetch the latest email.")
-        return
-
-    raw_email = msg_data[0][1]
-    msg = email.message_from_bytes(raw_email)
-
     subject = decode_header(msg["Subject"])[0][0]
     if isinstance(subject, bytes):
         subject = subject.decode()
     subject = clean_filename(subject)
 
-    # Download all Excel attachments
-    attachment_count = 0
+    saved = []
     for part in msg.walk():
         if part.get_content_maintype() == "multipart":
             continue
@@ -97,13 +74,30 @@ def download_email_bodies():
                 except UnicodeEncodeError:
                     # Fallback for console encoding issues
                     print(f"[OK] Saved attachment: {filepath.encode('utf-8', errors='replace').decode('utf-8')}")
-                attachment_count += 1
-    if attachment_count == 0:
+                saved.append(filepath)
+    if not saved:
         print(f"No Excel attachments found in: {subject}")
-    else:
-        print(f"Total Excel attachments saved: {attachment_count}")
+    return saved
+
+
+def mail_feed():
+    """Feed for dashboard.utils.mail_client: the latest DSS email, saved under yesterday's date."""
+    date_for_filename = (datetime.datetime.now() - datetime.timedelta(days=1)).strftime("%Y%m%d")
+    return {
+        "search": f'(SUBJECT "{SUBJECT}")',
+        "latest": True,
+        "handler": lambda msg: save_attachments(msg, date_for_filename),
+    }
+
 
-    mail.logout()
+def download_email_bodies():
+    saved, errors, _ = mail_client.download({"dss": mail_feed()})
+    if "dss" in errors:
+        raise errors["dss"]
+    if not saved["dss"]:
+        print("No matching emails found.")
+    else:
+        print(f"Total Excel attachments saved: {len(saved['dss'])}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,87 @@
+"""
+Morning mail download: every Gmail feed in one run of the shared IMAP client
+(dashboard/utils/mail_client.py) instead of four scripts logging in one
+after another.
+
+Feeds:
+    dss       latest "Consolidated Dunkin Sales Summary v2" email -> data/raw_emails
+    tender    its Tender Type workbooks since --tender-since  -> data/tender_downloads
+    medallia  "Daily Guest Comments Summary" for --date       -> data/raw_emails/medallia
+    hme       latest HME report                               -> data/hme/raw/hme_report.xlsx
+
+All searches run at once; a message matched by several feeds (dss and tender
+share a subject) is fetched once and given to each feed's handler.
+
+Usage:
+    python scripts/download_mail.py
+    python scripts/download_mail.py --feed dss --feed hme
+    python scripts/download_mail.py --date 2025-11-30 --tender-since 2025-11-01
+"""
+
+import argparse
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(BASE_DIR / "data" / "hme"))
+
+from dotenv import load_dotenv
+load_dotenv(BASE_DIR / '.env')
+
+from dashboard.utils import mail_client
+import download_from_gmail
+import download_tender_files_gmail
+import download_medallia_emails
+import download_hme_gmail
+
+FEEDS = ["dss", "tender", "medallia", "hme"]
+
+
+def safe_print(msg, end='\n'):
+    """Print with Unicode error handling for Windows console"""
+    try:
+        print(msg, end=end)
+    except UnicodeEncodeError:
+        print(msg.encode('ascii', errors='replace').decode('ascii'), end=end)
+
+
+def build_feeds(names, report_date, tender_since):
+    builders = {
+        "dss": download_from_gmail.mail_feed,
+        "tender": lambda: download_tender_files_gmail.mail_feed(tender_since),
+        "medallia": lambda: download_medallia_emails.mail_feed(report_date),
+        "hme": download_hme_gmail.mail_feed,
+    }
+    return {name: builders[name]() for name in names}
+
+
+def main():
+    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+    parser = argparse.ArgumentParser(description="Download every Gmail feed in one session")
+    parser.add_argument("--feed", action="append", choices=FEEDS, help="Feed(s) to download (default: all)")
+    parser.add_argument("--date", default=yesterday, help="Medallia report date, YYYY-MM-DD (default: yesterday)")
+    parser.add_argument("--tender-since", default=yesterday, help="Tender emails since YYYY-MM-DD (default: yesterday)")
+    parser.add_argument("--max-sessions", type=int, help="IMAP sessions to open (default: per-server limit)")
+    args = parser.parse_args()
+
+    feeds = build_feeds(args.feed or FEEDS, args.date, args.tender_since)
+    safe_print(f"📬 Downloading {', '.join(feeds)}...")
+    try:
+        saved, errors, stats = mail_client.download(feeds, max_sessions=args.max_sessions)
+    except Exception as e:
+        safe_print(f"❌ Mail download failed: {e}")
+        return 1
+
+    for name in feeds:
+        if name in errors:
+            safe_print(f"   ❌ {name:<9} {errors[name]}")
+        else:
+            safe_print(f"   ✅ {name:<9} {len(saved[name])} file(s)")
+    safe_print(f"⏱️  {stats['seconds']:.1f}s, {stats['logins']} login(s)")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,21 +4,24 @@ Download Medallia Daily Guest Comments emails from Gmail
 Searches for emails with subject containing "Daily Guest Comments Summary"
 """
 
-import imaplib
 import email
+import email.utils
 from email.header import decode_header
-import os
 import datetime
 import re
+import sys
 from pathlib import Path
 
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from dashboard.utils import mail_client
+
 # Load credentials from .env
 from dotenv import load_dotenv
-load_dotenv(Path(__file__).parent.parent / '.env')
+load_dotenv(BASE_DIR / '.env')
 
-IMAP_SERVER = "imap.gmail.com"
-EMAIL = os.getenv("EMAIL_USER")
-PASSWORD = os.getenv("EMAIL_PASS")
+EMAIL, PASSWORD = mail_client.credentials()
 
 # Directory to save raw Medallia email content
 SAVE_DIR = Path(__file__).parent.parent / "data" / "raw_emails" / "medallia"
@@ -60,89 +63,76 @@ def get_email_text_body(msg):
     return body
 
 
-def download_medallia_emails(report_date):
-    """
-    Download Medallia guest comments emails for a specific report date
+def save_medallia_email(msg, report_date):
+    """Save the email body as medallia_{report_date}_{HHMMSS}.txt if it is that day's report."""
+    # Get subject
+    subject = decode_header(msg["Subject"])[0][0]
+    if isinstance(subject, bytes):
+        subject = subject.decode()
 
-    Args:
-        report_date: YYYY-MM-DD string
-    """
-    SAVE_DIR.mkdir(parents=True, exist_ok=True)
-    
-    print(f"Connecting to Gmail as {EMAIL}...")
-    mail = imaplib.IMAP4_SSL(IMAP_SERVER)
-    mail.login(EMAIL, PASSWORD)
-    mail.select("inbox")
-    
-    # Search for Medallia emails in a single day window
-    day_dt = datetime.datetime.strptime(report_date, "%Y-%m-%d")
-    imap_start = day_dt.strftime("%d-%b-%Y")
-    imap_end = (day_dt + datetime.timedelta(days=1)).strftime("%d-%b-%Y")
+    # Get email date
+    email_date = email.utils.parsedate_to_datetime(msg["Date"])
 
-    print(
-        "Searching for 'Daily Guest Comments Summary' emails "
-        f"for report date {report_date}..."
-    )
-    result, data = mail.search(
-        None,
-        f'(SUBJECT "Daily Guest Comments Summary" SINCE {imap_start} BEFORE {imap_end})'
-    )
-    
-    email_ids = data[0].split()
-    
-    if not email_ids:
-        print("No matching emails found.")
-        mail.logout()
+    # Extract report date from subject
+    if extract_report_date(subject) != report_date:
         return []
 
-    print(f"Found {len(email_ids)} email(s)")
-    downloaded_files = []
+    # Get email body
+    body = get_email_text_body(msg)
 
-    for email_id in email_ids:
-        res, msg_data = mail.fetch(email_id, "(RFC822)")
-        if res != "OK":
-            print(f"Failed to fetch email ID {email_id}")
-            continue
+    if not body.strip():
+        print(f"Warning: Empty body for email dated {email_date}")
+        return []
 
-        raw_email = msg_data[0][1]
-        msg = email.message_from_bytes(raw_email)
+    # Save to file (use time to keep filenames unique per day)
+    SAVE_DIR.mkdir(parents=True, exist_ok=True)
+    time_stamp = email_date.strftime("%H%M%S")
+    filename = f"medallia_{report_date}_{time_stamp}.txt"
+    filepath = SAVE_DIR / filename
 
-        # Get subject
-        subject = decode_header(msg["Subject"])[0][0]
-        if isinstance(subject, bytes):
-            subject = subject.decode()
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(f"Subject: {subject}\n")
+        f.write(f"Date: {email_date}\n")
+        f.write(f"Report Date: {report_date}\n")
+        f.write(f"{'-' * 80}\n\n")
+        f.write(body)
 
-        # Get email date
-        email_date = email.utils.parsedate_to_datetime(msg["Date"])
+    print(f"[OK] Saved: {filename}")
+    return [filepath]
 
-        # Extract report date from subject
-        subject_report_date = extract_report_date(subject)
-        if subject_report_date != report_date:
-            continue
 
-        # Get email body
-        body = get_email_text_body(msg)
+def mail_feed(report_date):
+    """Feed for dashboard.utils.mail_client: the report emails received on report_date (YYYY-MM-DD)."""
+    day_dt = datetime.datetime.strptime(report_date, "%Y-%m-%d")
+    imap_start = mail_client.imap_date(day_dt)
+    imap_end = mail_client.imap_date(day_dt + datetime.timedelta(days=1))
+    return {
+        "search": f'(SUBJECT "Daily Guest Comments Summary" SINCE {imap_start} BEFORE {imap_end})',
+        "handler": lambda msg: save_medallia_email(msg, report_date),
+    }
 
-        if not body.strip():
-            print(f"Warning: Empty body for email dated {email_date}")
-            continue
 
-        # Save to file (use time to keep filenames unique per day)
-        time_stamp = email_date.strftime("%H%M%S")
-        filename = f"medallia_{report_date}_{time_stamp}.txt"
-        filepath = SAVE_DIR / filename
+def download_medallia_emails(report_date):
+    """
+    Download Medallia guest comments emails for a specific report date
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(f"Subject: {subject}\n")
-            f.write(f"Date: {email_date}\n")
-            f.write(f"Report Date: {report_date}\n")
-            f.write(f"{'-' * 80}\n\n")
-            f.write(body)
+    Args:
+        report_date: YYYY-MM-DD string
+    """
+    print(f"Connecting to Gmail as {EMAIL}...")
+    print(
+        "Searching for 'Daily Guest Comments Summary' emails "
+        f"for report date {report_date}..."
+    )
+    saved, errors, _ = mail_client.download({"medallia": mail_feed(report_date)})
+    if "medallia" in errors:
+        raise errors["medallia"]
 
-        print(f"[OK] Saved: {filename}")
-        downloaded_files.append(filepath)
+    downloaded_files = saved["medallia"]
+    if not downloaded_files:
+        print("No matching emails found.")
+        return []
 
-    mail.logout()
     print(f"\nDownloaded {len(downloaded_files)} email(s) to {SAVE_DIR}")
     return downloaded_files
 
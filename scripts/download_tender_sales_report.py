@@ -1,10 +1,11 @@
 """
 Download Tender & Sales Report for September 2025
 
-This script executes a SQL query that combines sales summary data with tender type metrics,
-categorizes tender types, and exports the results to a CSV file.
+This script combines sales summary data with the per-day tender pivot
+(tender_daily_pivot view) and exports the results to an Excel file.
 """
 
+import argparse
 import os
 import sys
 from datetime import datetime
@@ -14,105 +15,44 @@ import pandas as pd
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from dashboard.utils.supabase_db import get_supabase_connection
+from dashboard.utils.report_queries import load_daily_tender_sales, format_tender_sales_report
 
 
-def download_tender_sales_report(start_date, end_date):
-    """Execute SQL query and download tender sales report."""
-    
-    sql_query = f"""
-    WITH tender_labeled AS (
-      SELECT
-        t.store,
-        t.date,
-        t.detail_amount,
-        CASE
-          WHEN t.tender_type ILIKE '%gc%redeem%' OR t.tender_type ILIKE '%gift%card%redeem%' THEN 'gift_card_redeem'
-          WHEN t.tender_type ILIKE '%uber%eats%' THEN 'uber_eats'
-          WHEN t.tender_type ILIKE '%door%dash%' THEN 'door_dash'
-          WHEN t.tender_type ILIKE '%grub%hub%' THEN 'grubhub'
-          WHEN t.tender_type ILIKE '%visa%' THEN 'visa'
-          WHEN t.tender_type ILIKE '%american express%' OR t.tender_type ILIKE '%amex%' THEN 'amex'
-          WHEN t.tender_type ILIKE '%discover%' THEN 'discover'
-          WHEN t.tender_type ILIKE '%mastercard%' OR t.tender_type ILIKE '%master card%' THEN 'mastercard'
-          ELSE NULL
-        END AS tcat,
-        ROW_NUMBER() OVER (
-          PARTITION BY t.store, t.date,
-                       CASE
-                         WHEN t.tender_type ILIKE '%gc%redeem%' OR t.tender_type ILIKE '%gift%card%redeem%' THEN 'gift_card_redeem'
-                         WHEN t.tender_type ILIKE '%uber%eats%' THEN 'uber_eats'
-                         WHEN t.tender_type ILIKE '%door%dash%' THEN 'door_dash'
-                         WHEN t.tender_type ILIKE '%grub%hub%' THEN 'grubhub'
-                         WHEN t.tender_type ILIKE '%visa%' THEN 'visa'
-                         WHEN t.tender_type ILIKE '%american express%' OR t.tender_type ILIKE '%amex%' THEN 'amex'
-                         WHEN t.tender_type ILIKE '%discover%' THEN 'discover'
-                         WHEN t.tender_type ILIKE '%mastercard%' OR t.tender_type ILIKE '%master card%' THEN 'mastercard'
-                         ELSE NULL
-                       END
-          ORDER BY t.id
-        ) AS rn
-      FROM tender_type_metrics t
-      WHERE t.date BETWEEN '{start_date}' AND '{end_date}'
-    ),
-    tender_clean AS (
-      SELECT store, date, tcat, detail_amount
-      FROM tender_labeled
-      WHERE tcat IS NOT NULL AND rn = 1
-    )
-    SELECT
-      s.store AS "Store",
-      TO_CHAR(s.date, 'MM/DD/YY') AS "Date",
-      TO_CHAR(s.date, 'Dy') AS "day",
-      s.dd_adjusted_no_markup AS "Dunkin Net Sales",
-      s.pa_sales_tax AS "Tax",
-      ABS(s.gift_card_sales) AS "Gift Card Sales",
-      (s.dd_adjusted_no_markup + s.pa_sales_tax + ABS(s.gift_card_sales)) AS "Total",
-      s.cash_in AS "Cash Due",
-      COALESCE(ma.detail_amount, 0) AS "Mastercard",
-      COALESCE(vi.detail_amount, 0) AS "Visa",
-      COALESCE(di.detail_amount, 0) AS "Discover",
-      COALESCE(ax.detail_amount, 0) AS "Amex",
-      COALESCE(gc.detail_amount, 0) AS "Gift Card Redeem",
-      COALESCE(ue.detail_amount, 0) AS "Uber Eats",
-      COALESCE(dd.detail_amount, 0) AS "Door Dash",
-      COALESCE(gh.detail_amount, 0) AS "Grubhub",
-      s.paid_out AS "Paid Out"
-    FROM sales_summary s
-    LEFT JOIN tender_clean gc ON gc.store = s.store AND gc.date = s.date AND gc.tcat = 'gift_card_redeem'
-    LEFT JOIN tender_clean ue ON ue.store = s.store AND ue.date = s.date AND ue.tcat = 'uber_eats'
-    LEFT JOIN tender_clean dd ON dd.store = s.store AND dd.date = s.date AND dd.tcat = 'door_dash'
-    LEFT JOIN tender_clean gh ON gh.store = s.store AND gh.date = s.date AND gh.tcat = 'grubhub'
-    LEFT JOIN tender_clean vi ON vi.store = s.store AND vi.date = s.date AND vi.tcat = 'visa'
-    LEFT JOIN tender_clean ma ON ma.store = s.store AND ma.date = s.date AND ma.tcat = 'mastercard'
-    LEFT JOIN tender_clean ax ON ax.store = s.store AND ax.date = s.date AND ax.tcat = 'amex'
-    LEFT JOIN tender_clean di ON di.store = s.store AND di.date = s.date AND di.tcat = 'discover'
-    WHERE s.date BETWEEN '{start_date}' AND '{end_date}'
-    ORDER BY s.store, s.date;
+def fetch_report_from_lake(start_date, end_date):
+    """Run the report with DuckDB over the local Parquet lake. Returns (df, all_stores)."""
+    from dashboard.utils.lake_reports import connect_lake, tender_sales_report, report_stores
+
+    print("Opening Parquet lake...")
+    con = connect_lake()
+    try:
+        print("Executing DuckDB query...")
+        df = tender_sales_report(con, start_date, end_date)
+        all_stores = report_stores(con, start_date, end_date)
+    finally:
+        con.close()
+    return df, all_stores
+
+
+def download_tender_sales_report(start_date, end_date, engine="supabase"):
+    """Execute SQL query and download tender sales report.
+
+    engine: "supabase" (query the database) or "lake" (DuckDB over data/lake).
     """
     
     try:
-        print("Connecting to Supabase...")
-        conn = get_supabase_connection()
-        cursor = conn.cursor()
-        
-        print("Executing SQL query...")
-        cursor.execute(sql_query)
-        
-        # Fetch all results
-        rows = cursor.fetchall()
-        column_names = [desc[0] for desc in cursor.description]
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(rows, columns=column_names)
-        
-        # Add missing dates with zero values (e.g., Nov 27 Thanksgiving)
-        # First, get list of all stores
-        cursor.execute(f"SELECT DISTINCT store FROM sales_summary WHERE date BETWEEN '{start_date}' AND '{end_date}' ORDER BY store")
-        all_stores = [row[0] for row in cursor.fetchall()]
-        
-        # Close cursor and connection
-        cursor.close()
-        conn.close()
+        if engine == "lake":
+            df, all_stores = fetch_report_from_lake(start_date, end_date)
+        else:
+            print("Connecting to Supabase...")
+            conn = get_supabase_connection()
+            
+            # Single pass: sales_summary joined once to the tender_daily_pivot view
+            print("Executing SQL query...")
+            df = format_tender_sales_report(load_daily_tender_sales(conn, start_date, end_date))
+            conn.close()
+            
+            # Stores in the range, used to add missing dates with zero values (e.g., Nov 27 Thanksgiving)
+            all_stores = sorted(df['Store'].unique().tolist())
         
         if len(df) > 0:
             # Generate all dates in range
@@ -210,10 +150,19 @@ if __name__ == "__main__":
     print("=" * 60)
     print()
     
+    parser = argparse.ArgumentParser(description="Tender & Sales Report Generator")
+    parser.add_argument("--start", help="Start date (YYYY-MM-DD); prompted if omitted")
+    parser.add_argument("--end", help="End date (YYYY-MM-DD); prompted if omitted")
+    parser.add_argument("--engine", choices=["supabase", "lake"], default="supabase",
+                        help="Query Supabase, or run locally with DuckDB over the Parquet lake")
+    args = parser.parse_args()
+    
     # Prompt user for date range
-    print("Enter the date range for the report:")
-    start_date = input("Start date (YYYY-MM-DD): ").strip()
-    end_date = input("End date (YYYY-MM-DD): ").strip()
+    start_date, end_date = args.start, args.end
+    if not (start_date and end_date):
+        print("Enter the date range for the report:")
+        start_date = input("Start date (YYYY-MM-DD): ").strip()
+        end_date = input("End date (YYYY-MM-DD): ").strip()
     
     # Validate date format
     try:
@@ -227,7 +176,7 @@ if __name__ == "__main__":
     print(f"Generating report for: {start_date} to {end_date}")
     print()
     
-    output_file = download_tender_sales_report(start_date, end_date)
+    output_file = download_tender_sales_report(start_date, end_date, engine=args.engine)
     
     if output_file:
         print("\n" + "=" * 60)
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Generate store-manager PDF packets in the background
+Builds the Executive Summary, Labor Efficiency, Tender Type and Guest Reviews
+PDFs for every store and period in a worker pool, using the same queries and
+charts as the dashboard pages. Output goes to exports/store_reports/ with a
+manifest.json per period.
+
+Usage:
+    python scripts/generate_store_reports.py                          # last 7 days, all stores
+    python scripts/generate_store_reports.py --period week month      # weekly + month-to-date
+    python scripts/generate_store_reports.py --start 2026-01-01 --end 2026-01-31 --workers 4
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+# Add parent directory to path for imports
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from dashboard.utils.supabase_db import get_supabase_connection
+from dashboard.utils.report_queries import (
+    load_sales_summary, load_labor_metrics, load_tender_metrics,
+    review_filter_clause, load_review_kpis, load_review_score_counts
+)
+from dashboard.utils.pdf_export import figures_to_base64, build_report_html, html_to_pdf_bytes
+from dashboard.components.charts import (
+    executive_summary_charts, labor_breakdowns, labor_charts,
+    tender_breakdowns, tender_charts, score_distribution_chart
+)
+
+REPORTS_DIR = BASE_DIR / "exports" / "store_reports"
+REPORT_TYPES = ["executive", "labor", "tender", "guest_reviews"]
+
+# Per-process connection, opened once by the pool initializer
+_worker_conn = None
+
+
+def _init_worker():
+    global _worker_conn
+    _worker_conn = get_supabase_connection()
+
+
+def _period_header(title, job):
+    return f"""
+        <h2>{title}</h2>
+        <p><strong>Store:</strong> {job['store']} ({job['pc_number']})</p>
+        <p><strong>Date Range:</strong> {job['start_date']} to {job['end_date']}</p>
+    """
+
+
+def build_executive_report(conn, job):
+    """Returns (html, row_count) for the Executive Summary packet page."""
+    df = load_sales_summary(conn, [job["store"]], job["start_date"], job["end_date"])
+    if df.empty:
+        return None, 0
+
+    trend_fig, guest_fig, _ = executive_summary_charts(df)  # sales share pie is trivial for one store
+    trend_b64, guest_b64 = figures_to_base64([trend_fig, guest_fig])
+    html = build_report_html(f"""
+        {_period_header("Executive Summary", job)}
+        <p><strong>Total Sales:</strong> ${df['net_sales'].sum():,.2f}</p>
+        <p><strong>Guest Count:</strong> {int(df['guest_count'].sum()):,}</p>
+        <p><strong>Avg Check:</strong> ${df['avg_check'].mean():,.2f}</p>
+        <p><strong>Discounts Given:</strong> ${df['dd_discount'].sum():,.2f}</p>
+        <h3>Sales Trend</h3>
+        <img src="data:image/jpeg;base64,{trend_b64}" />
+        <h3>Guest Count</h3>
+        <img src="data:image/jpeg;base64,{guest_b64}" />
+        <h3>Raw Data</h3>
+        {df.to_html(index=False)}
+    """)
+    return html, len(df)
+
+
+def build_labor_report(conn, job):
+    """Returns (html, row_count) for the Labor Efficiency packet page."""
+    df = load_labor_metrics(conn, [job["store"]], job["start_date"], job["end_date"])
+    if df.empty:
+        return None, 0
+
+    hr_by_role, pay_by_role, percent_labor = labor_breakdowns(df)
+    hr_b64, pay_b64, percent_b64 = figures_to_base64(
+        list(labor_charts(hr_by_role, pay_by_role, percent_labor))
+    )
+    html = build_report_html(f"""
+        {_period_header("Labor Efficiency Analysis", job)}
+        <p><strong>Total Labor Hours:</strong> {df['total_hours'].sum():.2f}</p>
+        <p><strong>Total Labor Cost:</strong> ${df['total_pay'].sum():,.2f}</p>
+        <h3>Total Hours by Labor Position</h3>
+        <img src="data:image/jpeg;base64,{hr_b64}" />
+        {hr_by_role.to_html(index=False)}
+        <h3>Total Pay by Labor Position</h3>
+        <img src="data:image/jpeg;base64,{pay_b64}" />
+        {pay_by_role.to_html(index=False)}
+        <h3>Labor % by Position</h3>
+        <img src="data:image/jpeg;base64,{percent_b64}" />
+        {percent_labor.to_html(index=False)}
+    """)
+    return html, len(df)
+
+
+def build_tender_report(conn, job):
+    """Returns (html, row_count) for the Tender Type packet page."""
+    df = load_tender_metrics(conn, [job["store"]], job["start_date"], job["end_date"])
+    if df.empty:
+        return None, 0
+
+    tender_totals, df_grouped = tender_breakdowns(df)
+    fig_tender, _ = tender_charts(tender_totals, df_grouped)  # per-store breakdown is redundant here
+    tender_b64, = figures_to_base64([fig_tender])
+    html = build_report_html(f"""
+        {_period_header("Tender Type Analysis", job)}
+        <h3>Total Amount by Tender Type</h3>
+        <img src="data:image/jpeg;base64,{tender_b64}" />
+        {tender_totals.to_html(index=False)}
+    """)
+    return html, len(df)
+
+
+def build_guest_reviews_report(conn, job):
+    """Returns (html, review_count) for the Guest Reviews packet page."""
+    where_clause, params = review_filter_clause(job["start_date"], job["end_date"], [job["pc_number"]])
+    kpis = load_review_kpis(conn, where_clause, params)
+    total_reviews = int(kpis["total_reviews"])
+    if total_reviews == 0:
+        return None, 0
+
+    osat_counts = load_review_score_counts(conn, where_clause, params, "osat")
+    ltr_counts = load_review_score_counts(conn, where_clause, params, "ltr")
+    osat_b64, ltr_b64 = figures_to_base64([
+        score_distribution_chart(osat_counts, "osat", "OSAT Score", "OSAT Score Distribution"),
+        score_distribution_chart(ltr_counts, "ltr", "LTR Score", "Likelihood to Return Distribution"),
+    ])
+
+    negative_df = pd.read_sql(f"""
+        SELECT report_date, response_datetime, osat, ltr, accuracy, order_channel, comment
+        FROM medallia_reports
+        {where_clause}
+        AND (osat <= 2 OR ltr <= 5)
+        ORDER BY response_datetime DESC, id DESC
+        LIMIT 25
+    """, conn, params=params)
+
+    html = build_report_html(f"""
+        {_period_header("Guest Reviews", job)}
+        <p><strong>Total Reviews:</strong> {total_reviews:,}</p>
+        <p><strong>Avg OSAT:</strong> {kpis['avg_osat']:.2f}/5</p>
+        <p><strong>Avg LTR:</strong> {kpis['avg_ltr']:.1f}/10</p>
+        <p><strong>Accuracy Rate:</strong> {kpis['accuracy_rate']:.1f}%</p>
+        <p><strong>Promoters %:</strong> {kpis['promoters_pct']:.1f}%</p>
+        <img src="data:image/jpeg;base64,{osat_b64}" />
+        <img src="data:image/jpeg;base64,{ltr_b64}" />
+        <h3>Recent Negative Reviews</h3>
+        {negative_df.to_html(index=False) if not negative_df.empty else "<p>None</p>"}
+    """)
+    return html, total_reviews
+
+
+REPORT_BUILDERS = {
+    "executive": ("Executive_Summary", build_executive_report),
+    "labor": ("Labor_Efficiency", build_labor_report),
+    "tender": ("Tender_Type_Analysis", build_tender_report),
+    "guest_reviews": ("Guest_Reviews", build_guest_reviews_report),
+}
+
+
+def run_job(job):
+    """Build one PDF in a worker process. Returns its manifest entry."""
+    file_stem, builder = REPORT_BUILDERS[job["report"]]
+    entry = dict(job)
+    started = time.time()
+    try:
+        html, rows = builder(_worker_conn, job)
+        entry["rows"] = rows
+        if html is None:
+            entry["status"] = "no_data"
+        else:
+            out_path = Path(job["out_dir"]) / f"{file_stem}.pdf"
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            out_path.write_bytes(html_to_pdf_bytes(html))
+            entry["status"] = "ok"
+            entry["path"] = str(out_path.relative_to(BASE_DIR))
+    except Exception as e:
+        try:
+            _worker_conn.rollback()
+        except Exception:
+            pass
+        entry["status"] = "error"
+        entry["error"] = str(e)
+    entry["seconds"] = round(time.time() - started, 2)
+    del entry["out_dir"]
+    return entry
+
+
+def resolve_periods(periods, start, end, latest_date):
+    """Returns a list of (label, start_date, end_date)."""
+    if start or end:
+        start_date = datetime.strptime(start, "%Y-%m-%d").date() if start else None
+        end_date = datetime.strptime(end, "%Y-%m-%d").date() if end else latest_date
+        if start_date is None:
+            start_date = end_date - timedelta(days=6)
+        return [("custom", start_date, end_date)]
+
+    end_date = datetime.strptime(end, "%Y-%m-%d").date() if end else latest_date
+    resolved = []
+    for period in periods:
+        if period == "week":
+            resolved.append(("week", end_date - timedelta(days=6), end_date))
+        elif period == "month":
+            resolved.append(("month", end_date.replace(day=1), end_date))
+    return resolved
+
+
+def _safe_name(s):
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", str(s))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate per-store PDF report packets")
+    parser.add_argument("--period", nargs="+", choices=["week", "month"], default=["week"],
+                        help="Period(s) ending on --end (default: week)")
+    parser.add_argument("--start", type=str, help="Custom start date (YYYY-MM-DD)")
+    parser.add_argument("--end", type=str, help="End date (YYYY-MM-DD, default: latest date in sales_summary)")
+    parser.add_argument("--stores", nargs="+", help="Store names to include (default: all)")
+    parser.add_argument("--reports", nargs="+", choices=REPORT_TYPES, default=REPORT_TYPES,
+                        help="Reports to build (default: all)")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1),
+                        help="Worker processes (default: min(4, CPUs))")
+    args = parser.parse_args()
+
+    print("Connecting to Supabase...")
+    try:
+        conn = get_supabase_connection()
+    except Exception as e:
+        print(f"Error connecting to database: {e}")
+        return 1
+
+    stores_df = pd.read_sql(
+        "SELECT DISTINCT store, pc_number FROM sales_summary WHERE store IS NOT NULL ORDER BY store", conn
+    )
+    latest_date = pd.to_datetime(
+        pd.read_sql("SELECT MAX(date) AS max_date FROM sales_summary", conn)["max_date"].iloc[0]
+    ).date()
+    conn.close()
+
+    if args.stores:
+        stores_df = stores_df[stores_df["store"].isin(args.stores)]
+    stores_df = stores_df.drop_duplicates(subset="store")
+    if stores_df.empty:
+        print("No matching stores found in sales_summary")
+        return 1
+
+    periods = resolve_periods(args.period, args.start, args.end, latest_date)
+
+    jobs = []
+    period_dirs = {}
+    for label, start_date, end_date in periods:
+        period_dir = REPORTS_DIR / f"{label}_{start_date}_to_{end_date}"
+        period_dirs[(label, str(start_date), str(end_date))] = period_dir
+        for _, row in stores_df.iterrows():
+            for report in args.reports:
+                jobs.append({
+                    "period": label,
+                    "start_date": str(start_date),
+                    "end_date": str(end_date),
+                    "store": row["store"],
+                    "pc_number": str(row["pc_number"]),
+                    "report": report,
+                    "out_dir": str(period_dir / _safe_name(row["store"])),
+                })
+
+    print(f"Building {len(jobs)} report(s) for {len(stores_df)} store(s), "
+          f"{len(periods)} period(s) with {args.workers} worker(s)")
+
+    started = time.time()
+    entries = []
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(run_job, job) for job in jobs]
+        for i, future in enumerate(as_completed(futures), 1):
+            entry = future.result()
+            entries.append(entry)
+            detail = entry.get("path") or entry.get("error") or "no data"
+            print(f"  [{i}/{len(jobs)}] {entry['status'].upper()} {entry['period']} "
+                  f"{entry['store']} {entry['report']}: {detail}")
+
+    # One manifest per period directory
+    for (label, start_date, end_date), period_dir in period_dirs.items():
+        period_entries = sorted(
+            (e for e in entries if (e["period"], e["start_date"], e["end_date"]) == (label, start_date, end_date)),
+            key=lambda e: (e["store"], e["report"])
+        )
+        period_dir.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "period": label,
+            "start_date": start_date,
+            "end_date": end_date,
+            "reports": period_entries,
+        }
+        with open(period_dir / "manifest.json", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        print(f"Manifest written: {period_dir / 'manifest.json'}")
+
+    failed = sum(1 for e in entries if e["status"] == "error")
+    print("\n" + "=" * 80)
+    print("Summary:")
+    print(f"  Reports built: {sum(1 for e in entries if e['status'] == 'ok')}")
+    print(f"  No data: {sum(1 for e in entries if e['status'] == 'no_data')}")
+    print(f"  Errors: {failed}")
+    print(f"  Elapsed: {time.time() - started:.1f}s")
+    print("=" * 80)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    exit(main())
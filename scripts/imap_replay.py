@@ -0,0 +1,494 @@
+"""
+Offline IMAP stand-in for the Gmail downloaders.
+
+Serves a folder of recorded .eml files as a single INBOX over plain IMAP on
+localhost. Enough of IMAP4rev1 is implemented for imaplib and
+dashboard/utils/mail_client.py: LOGIN, SELECT/EXAMINE, SEARCH and FETCH (with
+or without UID), NOOP, CLOSE, LOGOUT. A file named <uid>.eml keeps that UID;
+the INTERNALDATE used by SINCE/BEFORE/ON is the message's Date header.
+--latency delays every response and --login-latency the LOGIN (TLS + auth on
+the real server), so round-trip costs look like Gmail's.
+
+Fixtures (data/fixtures/imap by default, git-ignored - recorded mail holds
+real store data):
+    record       copy the messages every downloader would see from Gmail
+    synthesize   generate DSS / Medallia / HME mail (plus unrelated noise)
+                 with Gmail-like sparse UIDs, no account needed
+
+Point any downloader at a running server with
+    IMAP_SERVER=127.0.0.1 IMAP_PORT=1143 IMAP_SSL=0
+or use scripts/benchmark_mail.py, which starts one itself.
+
+Usage:
+    python scripts/imap_replay.py synthesize --start 2025-11-01 --days 30
+    python scripts/imap_replay.py record --since 2025-11-01
+    python scripts/imap_replay.py serve --port 1143 --latency 40 --login-latency 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import re
+import sys
+import threading
+from datetime import date, datetime, timedelta, timezone
+from email.message import EmailMessage
+from email.parser import BytesHeaderParser
+from email.utils import format_datetime, parsedate_to_datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from dashboard.utils import mail_client
+from dashboard.utils.raw_catalog import REPORT_TYPES
+
+FIXTURE_DIR = BASE_DIR / "data" / "fixtures" / "imap"
+DEFAULT_PORT = 1143
+
+DSS_SUBJECT = "Consolidated Dunkin Sales Summary v2"
+MEDALLIA_SUBJECT = "Daily Guest Comments Summary"
+HME_SENDER = "no-reply@hmeqsr.com"
+
+# The searches the downloaders run (scripts/download_mail.py), used by `record`
+RECORD_SEARCHES = [
+    f'(SUBJECT "{DSS_SUBJECT}" SINCE {{since}})',
+    f'(SUBJECT "{MEDALLIA_SUBJECT}" SINCE {{since}})',
+    f'(FROM "{HME_SENDER}" SINCE {{since}})',
+]
+
+_TOKEN_RE = re.compile(rb'"((?:[^"\\]|\\.)*)"|(\()|(\))|([^\s()"]+)')
+_LITERAL_RE = re.compile(rb"\{(\d+)\}$")
+
+
+def safe_print(msg, end='\n'):
+    """Print with Unicode error handling for Windows console"""
+    try:
+        print(msg, end=end)
+    except UnicodeEncodeError:
+        print(msg.encode('ascii', errors='replace').decode('ascii'), end=end)
+
+
+# --- Fixtures ---
+def load_fixtures(folder: Path = FIXTURE_DIR) -> list[dict]:
+    """[{uid, internal, subject, sender, raw}] for every .eml, in UID order."""
+    parser = BytesHeaderParser()
+    messages = []
+    files = sorted(Path(folder).glob("*.eml"))
+    next_uid = max((int(p.stem) for p in files if p.stem.isdigit()), default=0) + 1
+    for path in files:
+        raw = path.read_bytes()
+        headers = parser.parsebytes(raw)
+        if path.stem.isdigit():
+            uid = int(path.stem)
+        else:
+            uid, next_uid = next_uid, next_uid + 1
+        try:
+            internal = parsedate_to_datetime(headers["Date"])
+        except (TypeError, ValueError):
+            internal = datetime.fromtimestamp(path.stat().st_mtime, timezone.utc)
+        messages.append({
+            "uid": uid,
+            "internal": internal,
+            "subject": str(headers.get("Subject", "")),
+            "sender": str(headers.get("From", "")),
+            "raw": raw.replace(b"\r\n", b"\n").replace(b"\n", b"\r\n"),
+        })
+    messages.sort(key=lambda m: m["uid"])
+    return messages
+
+
+def _message(sender, subject, sent: datetime, text=None, html=None, attachments=()):
+    msg = EmailMessage()
+    msg["From"] = sender
+    msg["To"] = "reports@localhost"
+    msg["Subject"] = subject
+    msg["Date"] = format_datetime(sent)
+    msg.set_content(text or "")
+    if html:
+        msg.add_alternative(html, subtype="html")
+    for filename, payload in attachments:
+        msg.add_attachment(payload, maintype="application",
+                           subtype="vnd.openxmlformats-officedocument.spreadsheetml.sheet", filename=filename)
+    return msg.as_bytes()
+
+
+def _medallia_body(rng, report_date: date):
+    rows, lines = [], []
+    for _ in range(rng.randint(3, 12)):
+        pc = rng.choice(["301290", "343939", "357993", "358529", "359042", "363271", "364322"])
+        responded = datetime.combine(report_date, datetime.min.time()) + timedelta(minutes=rng.randint(360, 1380))
+        stamp = responded.strftime("%m/%d/%y %I:%M %p")
+        osat, ltr = rng.randint(1, 5), rng.randint(0, 10)
+        comment = rng.choice(["Fast and friendly.", "Coffee was cold.", "Order was wrong again.",
+                              "Great service at the drive thru.", "Long wait this morning."])
+        lines.append(f"{pc} - Store {pc} | {stamp} | OSAT {osat} | LTR {ltr} | {comment}")
+        rows.append(
+            f'<tr class="row-data"><td>{pc} - Store {pc}</td><td></td><td>{stamp}</td><td>{stamp}</td>'
+            f'<td>{osat}</td><td>{ltr}</td><td>Yes</td><td></td></tr>'
+            f'<tr class="comments-row"><td colspan="8"><div class="comments-verbiage">{comment}</div></td></tr>'
+        )
+    return "\n".join(lines), "<html><body><table>" + "".join(rows) + "</table></body></html>"
+
+
+def synthesize(folder: Path, start: date, days: int, attachment_kb: int = 40, noise: float = 1.0, seed: int = 7) -> int:
+    """
+    Write a day-by-day mailbox: per business date the DSS email (six workbooks,
+    sent 09:01 the next morning), the Medallia summary (sent that evening) and
+    the HME report, plus about `noise` unrelated messages per email. UIDs
+    start in the 40,000s with Gmail-like gaps. Returns the messages written.
+    """
+    rng = random.Random(seed)
+    folder.mkdir(parents=True, exist_ok=True)
+    eastern = timezone(timedelta(hours=-5))
+    mail = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        morning = datetime.combine(day + timedelta(days=1), datetime.min.time(), eastern)
+        sent = morning + timedelta(hours=9, minutes=1)
+        stamp = sent.strftime("%Y%m%dT%H%M")
+        attachments = [
+            (f"Consolidated Dunkin Sales Summary_{name}{day} to {day}_{stamp}.xlsx",
+             rng.randbytes(int(attachment_kb * 1024 * rng.uniform(0.5, 1.5))))
+            for name in REPORT_TYPES
+        ]
+        mail.append(_message("dss-reports@localhost", DSS_SUBJECT, sent,
+                             text="Attached are the consolidated reports.", attachments=attachments))
+
+        text, html = _medallia_body(rng, day)
+        evening = datetime.combine(day, datetime.min.time(), eastern) + timedelta(hours=rng.randint(18, 22))
+        mail.append(_message("medallia@localhost", f"{MEDALLIA_SUBJECT} {day}", evening, text=text, html=html))
+
+        hme_sent = morning + timedelta(hours=6, minutes=rng.randint(0, 30))
+        mail.append(_message(HME_SENDER, f"HME Report - Day: {day:%m/%d/%Y}", hme_sent,
+                             text="Your scheduled report is attached.",
+                             attachments=[(f"hme_report_{day:%Y%m%d}.xlsx", rng.randbytes(attachment_kb * 512))]))
+
+    for _ in range(int(len(mail) * noise)):
+        when = datetime.combine(start, datetime.min.time(), eastern) + timedelta(minutes=rng.randint(0, days * 1440))
+        mail.append(_message("someone@localhost", rng.choice(["Weekly schedule", "Invoice", "Re: coverage", "Promo kit"]),
+                             when, text="x" * rng.randint(200, 4000)))
+
+    mail.sort(key=lambda raw: parsedate_to_datetime(BytesHeaderParser().parsebytes(raw)["Date"]))
+    uid = rng.randint(40000, 49000)
+    for raw in mail:
+        uid += rng.randint(1, 40)
+        (folder / f"{uid}.eml").write_bytes(raw)
+    return len(mail)
+
+
+async def _record(folder: Path, since: date) -> int:
+    folder.mkdir(parents=True, exist_ok=True)
+    async with mail_client.MailClient() as client:
+        uids = set()
+        for search in RECORD_SEARCHES:
+            uids.update(await client.search(search.format(since=mail_client.imap_date(since))))
+        messages = await client.fetch(sorted(uids, key=int))
+    for uid, msg in messages.items():
+        (folder / f"{uid.decode()}.eml").write_bytes(msg.as_bytes())
+    return len(messages)
+
+
+def record(folder: Path, since: date) -> int:
+    """Copy the downloaders' messages since `since` from the live mailbox. Returns the count."""
+    return asyncio.run(_record(folder, since))
+
+
+# --- Server ---
+def _tokens(data: bytes) -> list:
+    """IMAP arguments -> nested lists of bytes (parenthesised groups become lists)."""
+    stack = [[]]
+    for quoted, open_paren, close_paren, atom in _TOKEN_RE.findall(data):
+        if open_paren:
+            stack.append([])
+        elif close_paren:
+            group = stack.pop()
+            stack[-1].append(group)
+        elif atom:
+            stack[-1].append(atom)
+        else:
+            stack[-1].append(re.sub(rb"\\(.)", rb"\1", quoted))
+    while len(stack) > 1:
+        group = stack.pop()
+        stack[-1].append(group)
+    return stack[0]
+
+
+def _flatten(tokens):
+    for token in tokens:
+        if isinstance(token, list):
+            yield from _flatten(token)
+        else:
+            yield token
+
+
+def _sequence_set(spec: bytes, largest: int) -> set:
+    wanted = set()
+    for part in spec.decode().split(","):
+        low, _, high = part.partition(":")
+        low = largest if low == "*" else int(low)
+        high = low if not high else (largest if high == "*" else int(high))
+        wanted.update(range(min(low, high), max(low, high) + 1))
+    return wanted
+
+
+def _search(messages: list, criteria) -> list:
+    tokens = [t.decode() if isinstance(t, bytes) else t for t in _flatten(criteria)]
+    if tokens[:1] and tokens[0].upper() == "CHARSET":
+        tokens = tokens[2:]
+    tests = []
+    i = 0
+    while i < len(tokens):
+        key = tokens[i].upper()
+        if key == "ALL":
+            i += 1
+            continue
+        if key not in ("SUBJECT", "FROM", "SINCE", "BEFORE", "ON") or i + 1 >= len(tokens):
+            raise ValueError(f"unsupported search key {tokens[i]}")
+        value = tokens[i + 1]
+        if key == "SUBJECT":
+            tests.append(lambda m, v=value.lower(): v in m["subject"].lower())
+        elif key == "FROM":
+            tests.append(lambda m, v=value.lower(): v in m["sender"].lower())
+        else:
+            day = datetime.strptime(value, "%d-%b-%Y").date()
+            op = {"SINCE": lambda d, v=day: d >= v, "BEFORE": lambda d, v=day: d < v, "ON": lambda d, v=day: d == v}[key]
+            tests.append(lambda m, op=op: op(m["internal"].date()))
+        i += 2
+    return [m for m in messages if all(test(m) for test in tests)]
+
+
+def _fetch_items(message: dict, items) -> list:
+    """[(name, value)] where value is bytes (sent as a literal) or str (inline)."""
+    names = [t.decode().upper() for t in _flatten(items)] if isinstance(items, list) else [items.decode().upper()]
+    if "FAST" in names or "ALL" in names or "FULL" in names:
+        names = ["FLAGS", "INTERNALDATE", "RFC822.SIZE"]
+    out = [("UID", str(message["uid"]))]
+    for name in names:
+        if name == "UID":
+            continue
+        if name in ("RFC822", "BODY[]", "BODY.PEEK[]"):
+            out.append(("RFC822" if name == "RFC822" else "BODY[]", message["raw"]))
+        elif name == "RFC822.SIZE":
+            out.append((name, str(len(message["raw"]))))
+        elif name == "INTERNALDATE":
+            out.append((name, '"' + message["internal"].strftime("%d-%b-%Y %H:%M:%S %z") + '"'))
+        elif name == "FLAGS":
+            out.append((name, "(\\Seen)"))
+        else:
+            raise ValueError(f"unsupported fetch item {name}")
+    return out
+
+
+class ReplayServer:
+    """
+    Serves `messages` (from load_fixtures) on 127.0.0.1. start() runs it on a
+    background thread and returns the port; counters are updated as it serves.
+    """
+
+    def __init__(self, messages: list, latency: float = 0.0, login_latency: float = 0.0):
+        self.messages = messages
+        self.latency = latency
+        self.login_latency = login_latency
+        self.stats = {"connections": 0, "logins": 0, "commands": 0, "messages_sent": 0, "bytes_sent": 0}
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    async def _respond(self, writer, lines):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        writer.write(b"".join(lines))
+        await writer.drain()
+
+    async def _handle(self, reader, writer):
+        self.stats["connections"] += 1
+        writer.write(b"* OK [CAPABILITY IMAP4rev1 AUTH=PLAIN] replay server ready\r\n")
+        await writer.drain()
+        selected = False
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                # Client literals ({n}) - answer the continuation and append them
+                while (match := _LITERAL_RE.search(line.rstrip(b"\r\n"))):
+                    writer.write(b"+ go ahead\r\n")
+                    await writer.drain()
+                    literal = await reader.readexactly(int(match.group(1)))
+                    line = line.rstrip(b"\r\n")[:match.start()] + b'"' + literal.replace(b'"', b'\\"') + b'"'
+                    line += await reader.readline()
+                self.stats["commands"] += 1
+                tag, _, rest = line.rstrip(b"\r\n").partition(b" ")
+                command, _, args = rest.partition(b" ")
+                command = command.upper()
+                use_uid = command == b"UID"
+                if use_uid:
+                    command, _, args = args.partition(b" ")
+                    command = command.upper()
+                try:
+                    lines = await self._command(command, args, use_uid, selected)
+                except Exception as e:
+                    lines = [tag + b" BAD " + str(e).encode() + b"\r\n"]
+                    await self._respond(writer, lines)
+                    continue
+                if command in (b"SELECT", b"EXAMINE"):
+                    selected = True
+                elif command == b"CLOSE":
+                    selected = False
+                lines.append(tag + b" OK " + command + b" completed\r\n")
+                await self._respond(writer, lines)
+                if command == b"LOGOUT":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _command(self, command, args, use_uid, selected) -> list:
+        if command == b"CAPABILITY":
+            return [b"* CAPABILITY IMAP4rev1 AUTH=PLAIN\r\n"]
+        if command in (b"NOOP", b"CLOSE", b"CHECK", b"STORE", b"EXPUNGE"):
+            return []
+        if command == b"LOGOUT":
+            return [b"* BYE logging out\r\n"]
+        if command == b"LOGIN":
+            if self.login_latency:
+                await asyncio.sleep(self.login_latency)
+            self.stats["logins"] += 1
+            return [b"* CAPABILITY IMAP4rev1\r\n"]
+        if command in (b"SELECT", b"EXAMINE"):
+            next_uid = (self.messages[-1]["uid"] + 1) if self.messages else 1
+            return [
+                b"* FLAGS (\\Seen \\Answered \\Flagged \\Deleted \\Draft)\r\n",
+                f"* {len(self.messages)} EXISTS\r\n".encode(),
+                b"* 0 RECENT\r\n",
+                b"* OK [UIDVALIDITY 1] UIDs valid\r\n",
+                f"* OK [UIDNEXT {next_uid}] next UID\r\n".encode(),
+            ]
+        if command == b"LIST":
+            return [b'* LIST (\\HasNoChildren) "/" "INBOX"\r\n']
+        if not selected:
+            raise ValueError("no mailbox selected")
+
+        if command == b"SEARCH":
+            found = _search(self.messages, _tokens(args))
+            ids = [m["uid"] if use_uid else self.messages.index(m) + 1 for m in found]
+            return [b"* SEARCH" + b"".join(b" %d" % i for i in ids) + b"\r\n"]
+
+        if command == b"FETCH":
+            spec, _, items = args.partition(b" ")
+            tokens = _tokens(items)
+            items = tokens[0] if tokens else b"FLAGS"
+            if use_uid:
+                wanted = _sequence_set(spec, self.messages[-1]["uid"] if self.messages else 0)
+                chosen = [(n, m) for n, m in enumerate(self.messages, 1) if m["uid"] in wanted]
+            else:
+                wanted = _sequence_set(spec, len(self.messages))
+                chosen = [(n, self.messages[n - 1]) for n in sorted(wanted) if 0 < n <= len(self.messages)]
+            lines = []
+            for seq, message in chosen:
+                parts = []
+                for name, value in _fetch_items(message, items):
+                    if isinstance(value, bytes):
+                        parts.append(f"{name} {{{len(value)}}}\r\n".encode() + value)
+                        self.stats["messages_sent"] += 1
+                        self.stats["bytes_sent"] += len(value)
+                    else:
+                        parts.append(f"{name} {value}".encode())
+                lines.append(f"* {seq} FETCH (".encode() + b" ".join(parts) + b")\r\n")
+            return lines
+
+        raise ValueError(f"unsupported command {command.decode()}")
+
+    async def _serve(self, port, ready):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        ready.set()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start(self, port: int = 0) -> int:
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._loop.run_until_complete(self._serve(port, ready))
+            except asyncio.CancelledError:
+                pass
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self.port
+
+    def stop(self):
+        if self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+            for task in asyncio.all_tasks(self._loop):
+                self._loop.call_soon_threadsafe(task.cancel)
+            self._thread.join(timeout=5)
+
+
+def parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline IMAP stand-in serving recorded .eml fixtures")
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    serve = sub.add_parser("serve", help="Serve the fixtures until Ctrl+C")
+    serve.add_argument("--fixtures", type=Path, default=FIXTURE_DIR)
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--latency", type=float, default=0, help="Milliseconds added to every response")
+    serve.add_argument("--login-latency", type=float, default=0, help="Milliseconds added to LOGIN")
+
+    synth = sub.add_parser("synthesize", help="Generate a synthetic mailbox")
+    synth.add_argument("--out", type=Path, default=FIXTURE_DIR)
+    synth.add_argument("--start", type=parse_date, default=date.today() - timedelta(days=30))
+    synth.add_argument("--days", type=int, default=30)
+    synth.add_argument("--attachment-kb", type=int, default=40, help="Typical size of one DSS workbook")
+    synth.add_argument("--noise", type=float, default=1.0, help="Unrelated messages per report email")
+    synth.add_argument("--seed", type=int, default=7)
+
+    rec = sub.add_parser("record", help="Copy the downloaders' messages from the live mailbox")
+    rec.add_argument("--out", type=Path, default=FIXTURE_DIR)
+    rec.add_argument("--since", type=parse_date, default=date.today() - timedelta(days=30))
+    args = parser.parse_args()
+
+    if args.mode == "synthesize":
+        count = synthesize(args.out, args.start, args.days, args.attachment_kb, args.noise, args.seed)
+        safe_print(f"✅ Wrote {count} message(s) to {args.out}")
+        return 0
+
+    if args.mode == "record":
+        from dotenv import load_dotenv
+        load_dotenv(BASE_DIR / '.env')
+        count = record(args.out, args.since)
+        safe_print(f"✅ Recorded {count} message(s) since {args.since} to {args.out}")
+        return 0
+
+    messages = load_fixtures(args.fixtures)
+    if not messages:
+        safe_print(f"❌ No .eml fixtures in {args.fixtures} (run: python scripts/imap_replay.py synthesize)")
+        return 1
+    server = ReplayServer(messages, args.latency / 1000, args.login_latency / 1000)
+    port = server.start(args.port)
+    safe_print(f"📮 Serving {len(messages)} message(s) on 127.0.0.1:{port}")
+    safe_print(f"   IMAP_SERVER=127.0.0.1 IMAP_PORT={port} IMAP_SSL=0")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        safe_print(f"🛑 Stopped. {server.stats}")
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
+import argparse
 from pathlib import Path
 from datetime import datetime
 import pandas as pd
@@ -15,10 +16,25 @@ BASE_DIR = Path(__file__).resolve().parents[1]
 import sys
 sys.path.append(str(BASE_DIR))
 from dashboard.utils import supabase_db
+from dashboard.utils import parquet_lake
+from dashboard.utils import partitions
+from dashboard.utils import tender_types
+from dashboard.utils import coverage
+from dashboard.utils import day_loads
+from dashboard.utils import upsert as row_upsert
+from dashboard.utils import slices
 DB_PATH = BASE_DIR / "db" / "sales.db"
 COMPILED_DIR = BASE_DIR / "data" / "compiled"
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)  # ✅ Ensure db/ exists
 DELETE_AFTER_LOAD = False  # Set to True to delete file after successful load
+BATCH_SIZE = 50  # Rows per executemany (small batches avoid Supabase timeouts)
+
+# How load_to_supabase treats rows already in the database
+LOAD_MODES = {
+    "insert": "skip rows whose natural key exists",
+    "upsert": "update existing rows whose values changed (content hash)",
+    "replace": "replace each (store, date) slice in the file with the file's rows",
+}
 
 # File type mapping based on filename patterns and expected columns
 file_type_mapping = {
@@ -161,8 +177,198 @@ def extract_date_from_filename(filename):
     except Exception:
         return None
 
-def load_to_supabase():
-    excel_files = get_all_excel_files()
+def insert_rows(cur, table_name, df_upload, batch_size=BATCH_SIZE):
+    """
+    INSERT df_upload into table_name, batch_size rows per executemany.
+    Rows that hit a unique constraint are skipped. Leaves committing to the
+    caller. Returns the number of rows inserted.
+    """
+    cols = ','.join(df_upload.columns)
+    vals_placeholder = ','.join(['%s'] * len(df_upload.columns))
+    
+    # Use INSERT ... ON CONFLICT DO NOTHING to handle duplicates properly
+    # This respects the unique constraints we've set up for each table
+    insert_query = f"""
+        INSERT INTO {table_name} ({cols}) 
+        VALUES ({vals_placeholder})
+        ON CONFLICT DO NOTHING
+    """
+    
+    data = df_upload.values.tolist()
+    total_inserted = 0
+    total_batches = (len(data) + batch_size - 1) // batch_size
+    
+    for i in range(0, len(data), batch_size):
+        batch = data[i:i+batch_size]
+        batch_num = i // batch_size + 1
+        
+        safe_print(f"      Batch {batch_num}/{total_batches} ({len(batch)} rows)...", end='')
+        
+        try:
+            cur.executemany(insert_query, batch)
+            batch_inserted = cur.rowcount
+            total_inserted += batch_inserted
+            safe_print(f" SUCCESS {batch_inserted} inserted")
+            
+        except Exception as sql_error:
+            safe_print(f" ERROR")
+            safe_print(f"   [DEBUG] SQL Error details:")
+            safe_print(f"      Query: {insert_query}")
+            safe_print(f"      Columns: {list(df_upload.columns)}")
+            safe_print(f"      Sample data: {batch[0] if batch else 'No data'}")
+            raise sql_error
+    
+    return total_inserted
+
+def prepare_file(excel_file):
+    """
+    Read a compiled file and shape it for its table. Returns (table_name, df_upload);
+    raises ValueError when the file can't be uploaded.
+    """
+    # Detect file type
+    file_type = detect_file_type(excel_file.name)
+    if not file_type:
+        raise ValueError("Unknown file type, cannot upload")
+        
+    config = file_type_mapping[file_type]
+    table_name = config["table"]
+    
+    safe_print(f"   [INFO] Detected type: {file_type} -> {table_name}")
+    
+    # Read the Excel file (single sheet)
+    df = pd.read_excel(excel_file)
+    
+    safe_print(f"   [DATA] Read {len(df)} rows, {len(df.columns)} columns")
+    
+    # Convert date column to proper format
+    if 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date'], format='%m/%d/%y', errors='coerce').dt.date
+    
+    # Validate columns (flexible validation)
+    expected_cols = set(config["columns"])
+    actual_cols = set(df.columns)
+    
+    # Use columns that exist in both expected and actual
+    valid_cols = list(expected_cols & actual_cols)
+    if not valid_cols:
+        raise ValueError("No matching columns found")
+        
+    df_upload = df[valid_cols].copy()
+    
+    # Apply column mapping if specified (for labor file)
+    if 'column_mapping' in config:
+        column_mapping = config['column_mapping']
+        df_upload = df_upload.rename(columns=column_mapping)
+    
+    # Convert pc_number to string to avoid integer overflow issues
+    if 'pc_number' in df_upload.columns:
+        df_upload['pc_number'] = df_upload['pc_number'].astype(str)
+    
+    # FIX: Apply abs() to gift_card_sales to ensure positive values
+    if 'gift_card_sales' in df_upload.columns:
+        df_upload['gift_card_sales'] = df_upload['gift_card_sales'].abs()
+        safe_print(f"   [FIX] Applied abs() to gift_card_sales column")
+    
+    # Handle NaN values properly based on data type
+    for col in df_upload.columns:
+        if df_upload[col].dtype in ['float64', 'int64']:
+            # For numeric columns, fill NaN with 0
+            df_upload[col] = df_upload[col].fillna(0)
+        else:
+            # For text columns, fill NaN with empty string
+            df_upload[col] = df_upload[col].fillna('')
+    
+    # Remove rows where essential columns (store, pc_number, date) are missing
+    essential_cols = ['store', 'pc_number', 'date']
+    for col in essential_cols:
+        if col in df_upload.columns:
+            df_upload = df_upload[
+                (df_upload[col].notna()) & 
+                (df_upload[col] != '') & 
+                (df_upload[col] != '0')
+            ]
+    
+    # FIX: For tender_type_metrics, ensure Gift Card Redeem rows are included
+    if table_name == 'tender_type_metrics' and 'tender_type' in df_upload.columns:
+        # Log tender types being uploaded
+        tender_labels = df_upload['tender_type'].unique()
+        safe_print(f"   [INFO] Tender types in this file: {', '.join(tender_labels)}")
+        # Ensure we're not filtering out Gift Card Redeem
+        gc_redeem_count = len(df_upload[df_upload['tender_type'] == 'Gift Card Redeem'])
+        if gc_redeem_count > 0:
+            safe_print(f"   [INFO] Gift Card Redeem records: {gc_redeem_count}")
+    
+    return table_name, df_upload
+
+def load_file(cur, prepared, mode="insert"):
+    """
+    Write one prepared file (excel_file, table_name, df_upload) through cur:
+    partitions, rows and feed coverage. Runs inside the business date's
+    transaction (see dashboard/utils/day_loads.py).
+
+    mode is one of LOAD_MODES: existing rows are skipped ("insert"), updated
+    where their values changed ("upsert", dashboard/utils/upsert.py), or the
+    file's (store, date) slices are replaced outright ("replace",
+    dashboard/utils/slices.py). Returns the row counts.
+    """
+    excel_file, table_name, df_upload = prepared
+    
+    if table_name == 'tender_type_metrics' and 'tender_type' in df_upload.columns:
+        # Stamp the canonical tender category (registers any new labels in tender_types)
+        categories = tender_types.resolve_tender_categories(cur, df_upload['tender_type'].unique())
+        df_upload['tender_category'] = df_upload['tender_type'].map(categories)
+    
+    safe_print(f"   [UPLOAD] {excel_file.name}: {len(df_upload)} rows to {table_name}")
+    
+    # Make sure the months in this file have their own partitions
+    # (rows would otherwise land in the table's DEFAULT partition)
+    file_dates = pd.to_datetime(df_upload['date'], errors='coerce').dropna()
+    if table_name in partitions.PARTITIONED_TABLES and partitions.is_partitioned(cur, table_name):
+        if not file_dates.empty:
+            partitions.ensure_partitions(cur, table_name, file_dates.min().date(), file_dates.max().date())
+    
+    if mode == "replace":
+        result = slices.replace_slices(cur, table_name, list(df_upload.columns), df_upload.values.tolist())
+        for store, day, old_rows, new_rows in result["slices"]:
+            change = f"{new_rows - old_rows:+d}" if old_rows else "new"
+            safe_print(f"      {store} {day}: {old_rows} -> {new_rows} rows ({change})")
+        counts = {"deleted": result["deleted"], "inserted": result["inserted"]}
+        safe_print(f"   [SUCCESS] Replaced {len(result['slices'])} store-day slice(s): "
+                   f"{result['deleted']} rows deleted, {result['inserted']} inserted")
+    elif mode == "upsert":
+        counts = row_upsert.upsert_rows(cur, table_name, list(df_upload.columns), df_upload.values.tolist())
+        safe_print(f"   [SUCCESS] Processed {len(df_upload)} rows: {counts['inserted']} inserted, "
+                   f"{counts['updated']} updated, {counts['unchanged']} unchanged")
+    else:
+        total_inserted = insert_rows(cur, table_name, df_upload)
+        counts = {"inserted": total_inserted, "skipped": len(df_upload) - total_inserted}
+        safe_print(f"   [SUCCESS] Processed {len(df_upload)} rows, inserted {total_inserted} new rows (duplicates automatically skipped)")
+    
+    # Record what this file covers in the store x date x feed matrix
+    if table_name in coverage.FEEDS and not file_dates.empty:
+        cells = coverage.refresh_coverage(cur, table_name, file_dates.min().date(), file_dates.max().date())
+        safe_print(f"   [COVERAGE] {cells} store-day(s) recorded for {table_name}")
+    
+    return counts
+
+def load_to_supabase(files=None, mode="insert"):
+    """
+    Upload compiled files to Supabase. By default every compiled file newer
+    than the latest date in the database; pass `files` to upload exactly those
+    (e.g. late or re-sent reports picked up by scripts/watch_ingest.py).
+
+    One connection serves the whole run. Each business date is one
+    transaction and each file a savepoint within it: a bad file rolls back
+    only its own rows, and a date's files become visible together.
+
+    mode (see LOAD_MODES) decides what happens to rows already there:
+    "insert" skips them; "upsert" compares content hashes and updates the
+    rows whose values differ; "replace" swaps each (store, date) slice in
+    the file for the file's rows, so a re-issued day needs no hand-deletes.
+    """
+    if mode not in LOAD_MODES:
+        raise ValueError(f"Unknown load mode {mode!r}; expected one of {', '.join(LOAD_MODES)}")
+    excel_files = list(files) if files is not None else get_all_excel_files()
     if not excel_files:
         safe_print("No compiled Excel files found.")
         return
@@ -170,7 +376,7 @@ def load_to_supabase():
     safe_print(f"Found {len(excel_files)} compiled files")
     
     # Get latest date from database
-    latest_date = get_latest_date_from_supabase()
+    latest_date = get_latest_date_from_supabase() if files is None else None
     
     # Filter files to only those newer than latest_date
     if latest_date:
@@ -199,148 +405,61 @@ def load_to_supabase():
 
     successful_uploads = 0
     failed_uploads = 0
+    row_counts = {}
+
+    def report_failure(prepared, error):
+        safe_print(f"   [ERROR] {prepared[0].name} rolled back: {error}")
     
-    for excel_file in excel_files:
-        try:
+    days = day_loads.group_by_date(excel_files, lambda f: extract_date_from_filename(f.name))
+    for business_date, day_files in days.items():
+        safe_print(f"\n[DAY] {business_date or 'undated'}: {len(day_files)} file(s)")
+        
+        prepared = []
+        for excel_file in day_files:
             safe_print(f"\n[FILE] Loading: {excel_file.name}")
-            
-            # Detect file type
-            file_type = detect_file_type(excel_file.name)
-            if not file_type:
-                safe_print(f"   [WARNING] Unknown file type, cannot upload")
-                failed_uploads += 1
-                continue
-                
-            config = file_type_mapping[file_type]
-            table_name = config["table"]
-            
-            safe_print(f"   [INFO] Detected type: {file_type} -> {table_name}")
-            
-            # Read the Excel file (single sheet)
-            df = pd.read_excel(excel_file)
-            
-            safe_print(f"   [DATA] Read {len(df)} rows, {len(df.columns)} columns")
-            
-            # Convert date column to proper format
-            if 'date' in df.columns:
-                df['date'] = pd.to_datetime(df['date'], format='%m/%d/%y', errors='coerce').dt.date
-            
-            # Validate columns (flexible validation)
-            expected_cols = set(config["columns"])
-            actual_cols = set(df.columns)
-            
-            # Use columns that exist in both expected and actual
-            valid_cols = list(expected_cols & actual_cols)
-            if not valid_cols:
-                safe_print(f"   [ERROR] No matching columns found")
+            try:
+                prepared.append((excel_file, *prepare_file(excel_file)))
+            except Exception as e:
+                safe_print(f"   [ERROR] Error processing file: {e}")
                 failed_uploads += 1
-                continue
-                
-            df_upload = df[valid_cols].copy()
-            
-            # Apply column mapping if specified (for labor file)
-            if 'column_mapping' in config:
-                column_mapping = config['column_mapping']
-                df_upload = df_upload.rename(columns=column_mapping)
-            
-            # Convert pc_number to string to avoid integer overflow issues
-            if 'pc_number' in df_upload.columns:
-                df_upload['pc_number'] = df_upload['pc_number'].astype(str)
-            
-            # FIX: Apply abs() to gift_card_sales to ensure positive values
-            if 'gift_card_sales' in df_upload.columns:
-                df_upload['gift_card_sales'] = df_upload['gift_card_sales'].abs()
-                safe_print(f"   [FIX] Applied abs() to gift_card_sales column")
-            
-            # Handle NaN values properly based on data type
-            for col in df_upload.columns:
-                if df_upload[col].dtype in ['float64', 'int64']:
-                    # For numeric columns, fill NaN with 0
-                    df_upload[col] = df_upload[col].fillna(0)
-                else:
-                    # For text columns, fill NaN with empty string
-                    df_upload[col] = df_upload[col].fillna('')
-            
-            # Remove rows where essential columns (store, pc_number, date) are missing
-            essential_cols = ['store', 'pc_number', 'date']
-            for col in essential_cols:
-                if col in df_upload.columns:
-                    df_upload = df_upload[
-                        (df_upload[col].notna()) & 
-                        (df_upload[col] != '') & 
-                        (df_upload[col] != '0')
-                    ]
-            
-            # FIX: For tender_type_metrics, ensure Gift Card Redeem rows are included
-            if table_name == 'tender_type_metrics' and 'tender_type' in df_upload.columns:
-                # Log tender types being uploaded
-                tender_types = df_upload['tender_type'].unique()
-                safe_print(f"   [INFO] Tender types in this file: {', '.join(tender_types)}")
-                # Ensure we're not filtering out Gift Card Redeem
-                gc_redeem_count = len(df_upload[df_upload['tender_type'] == 'Gift Card Redeem'])
-                if gc_redeem_count > 0:
-                    safe_print(f"   [INFO] Gift Card Redeem records: {gc_redeem_count}")
-            
-            safe_print(f"   [UPLOAD] Uploading {len(df_upload)} rows to {table_name}")
-            
-            # Build insert query with conflict handling
-            cols = ','.join(df_upload.columns)
-            vals_placeholder = ','.join(['%s'] * len(df_upload.columns))
-            
-            with conn.cursor() as cur:
-                # Use INSERT ... ON CONFLICT DO NOTHING to handle duplicates properly
-                # This respects the unique constraints we've set up for each table
-                insert_query = f"""
-                    INSERT INTO {table_name} ({cols}) 
-                    VALUES ({vals_placeholder})
-                    ON CONFLICT DO NOTHING
-                """
-                
-                data = df_upload.values.tolist()
-                
-                # Process in smaller batches to avoid timeouts
-                batch_size = 50
-                total_inserted = 0
-                
-                for i in range(0, len(data), batch_size):
-                    batch = data[i:i+batch_size]
-                    batch_num = i // batch_size + 1
-                    total_batches = (len(data) + batch_size - 1) // batch_size
-                    
-                    safe_print(f"      Batch {batch_num}/{total_batches} ({len(batch)} rows)...", end='')
-                    
-                    try:
-                        cur.executemany(insert_query, batch)
-                        batch_inserted = cur.rowcount
-                        total_inserted += batch_inserted
-                        safe_print(f" SUCCESS {batch_inserted} inserted")
-                        
-                        conn.commit()
-                        
-                    except Exception as sql_error:
-                        safe_print(f" ERROR")
-                        safe_print(f"   [DEBUG] SQL Error details:")
-                        safe_print(f"      Query: {insert_query}")
-                        safe_print(f"      Columns: {list(df_upload.columns)}")
-                        safe_print(f"      Sample data: {batch[0] if batch else 'No data'}")
-                        conn.rollback()
-                        raise sql_error
-                
-                safe_print(f"   [SUCCESS] Processed {len(data)} rows, inserted {total_inserted} new rows (duplicates automatically skipped)")
-                successful_uploads += 1
-                    
+        if not prepared:
+            continue
+        
+        try:
+            loaded, failed = day_loads.load_days(
+                conn, {business_date: prepared}, lambda cur, item: load_file(cur, item, mode=mode),
+                on_error=report_failure,
+            )
         except Exception as e:
-            safe_print(f"   [ERROR] Error processing file: {e}")
-            failed_uploads += 1
+            # Connection-level failure: nothing of this date was committed
+            safe_print(f"   [ERROR] {business_date}: {e}")
+            failed_uploads += len(prepared)
             try:
                 conn.rollback()
-            except:
+            except Exception:
                 pass
+            continue
+        successful_uploads += len(loaded)
+        failed_uploads += len(failed)
+        for _, counts in loaded:
+            for name, n in counts.items():
+                row_counts[name] = row_counts.get(name, 0) + n
+        safe_print(f"[DAY] {business_date or 'undated'}: committed {len(loaded)} file(s), rolled back {len(failed)}")
+
+        # Mirror the committed files into the Parquet lake for local reports (best-effort)
+        for (excel_file, table_name, df_upload), _ in loaded:
+            try:
+                lake_files = parquet_lake.write_slices(table_name, df_upload)
+                safe_print(f"   [LAKE] {excel_file.name}: wrote {lake_files} partition file(s)")
+            except Exception as lake_error:
+                safe_print(f"   [WARNING] Parquet lake write failed: {lake_error}")
     
     safe_print(f"\n[SUMMARY] Upload Summary:")
     safe_print(f"   [SUCCESS] Successful: {successful_uploads}")
     safe_print(f"   [FAILED] Failed: {failed_uploads}")
     safe_print(f"   [TOTAL] Total files processed: {len(excel_files)}")
+    if row_counts:
+        safe_print(f"   [ROWS] " + ", ".join(f"{n} {name}" for name, n in row_counts.items()))
         
     try:
         conn.close()
@@ -348,5 +467,21 @@ def load_to_supabase():
         pass  # Connection might already be closed
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Upload compiled files to Supabase")
+    parser.add_argument("files", nargs="*", type=Path,
+                        help="Compiled files to load (default: every file newer than the latest date in the database)")
+    parser.add_argument("--date", help="Load every compiled file for this business date (YYYY-MM-DD)")
+    parser.add_argument("--mode", choices=list(LOAD_MODES), default="insert",
+                        help="; ".join(f"{name}: {text}" for name, text in LOAD_MODES.items()))
+    args = parser.parse_args()
+    
+    files = list(args.files)
+    if args.date:
+        day = datetime.strptime(args.date, '%Y-%m-%d')
+        files += sorted(COMPILED_DIR.glob(f"{day:%Y%m%d}_*_copy.xlsx"))
+        if not files:
+            safe_print(f"No compiled files for {args.date} in {COMPILED_DIR}")
+            sys.exit(1)
+    
     ### load_to_sqlite()
-    load_to_supabase()
\ No newline at end of file
+    load_to_supabase(files or None, mode=args.mode)
\ No newline at end of file
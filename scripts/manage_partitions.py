@@ -0,0 +1,122 @@
+"""
+Monthly partition maintenance for the partitioned fact tables.
+
+    python scripts/manage_partitions.py ensure [--months 3]
+    python scripts/manage_partitions.py list [--table sales_summary]
+    python scripts/manage_partitions.py drop --table sales_summary --month 2025-10
+    python scripts/manage_partitions.py detach --table sales_summary --month 2025-10
+    python scripts/manage_partitions.py attach --table sales_summary --month 2025-10 --source sales_summary_y2025m10_detached
+
+`drop` empties a month instantly (the partition is dropped and an empty one
+put back), ready to be reloaded. `detach` keeps the month as a standalone
+table; `attach` swaps a standalone table (a detached month, or a month
+reloaded into a staging table) back in.
+
+Use --table all with drop/detach to act on every partitioned table.
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from dashboard.utils.supabase_db import get_supabase_connection
+from dashboard.utils import partitions
+
+
+def safe_print(msg, end='\n'):
+    """Print with Unicode error handling for Windows console"""
+    try:
+        print(msg, end=end)
+    except UnicodeEncodeError:
+        print(msg.encode('ascii', errors='replace').decode('ascii'), end=end)
+
+
+def parse_month(value):
+    return datetime.strptime(value, "%Y-%m").date()
+
+
+def confirm(prompt):
+    return input(f"{prompt} (type 'DELETE' to confirm): ").strip() == "DELETE"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage monthly fact table partitions")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_ensure = sub.add_parser("ensure", help="Create partitions for upcoming months")
+    p_ensure.add_argument("--months", type=int, default=partitions.FUTURE_MONTHS)
+
+    p_list = sub.add_parser("list", help="List partitions and row counts")
+    p_list.add_argument("--table", choices=sorted(partitions.PARTITIONED_TABLES))
+
+    table_choices = sorted(partitions.PARTITIONED_TABLES) + ["all"]
+    for name, help_text in (("drop", "Drop a month's data (partition is re-created empty)"),
+                            ("detach", "Detach a month into a standalone table")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("--table", required=True, choices=table_choices)
+        p.add_argument("--month", required=True, type=parse_month, help="YYYY-MM")
+        p.add_argument("--yes", action="store_true", help="Skip the confirmation prompt")
+
+    p_attach = sub.add_parser("attach", help="Attach a standalone table as a month's partition")
+    p_attach.add_argument("--table", required=True, choices=sorted(partitions.PARTITIONED_TABLES))
+    p_attach.add_argument("--month", required=True, type=parse_month, help="YYYY-MM")
+    p_attach.add_argument("--source", required=True, help="Table to attach")
+
+    args = parser.parse_args()
+
+    conn = get_supabase_connection()
+    cur = conn.cursor()
+    try:
+        if args.command == "ensure":
+            if not any(partitions.is_partitioned(cur, t) for t in partitions.PARTITIONED_TABLES):
+                safe_print("ℹ️  No partitioned tables (migration 0003 not applied); nothing to do")
+                return 0
+            created = partitions.ensure_future_partitions(cur, args.months)
+            conn.commit()
+            safe_print(f"✅ Created {created} partition(s) ({args.months} months ahead)")
+
+        elif args.command == "list":
+            for table in [args.table] if args.table else list(partitions.PARTITIONED_TABLES):
+                if not partitions.is_partitioned(cur, table):
+                    safe_print(f"\n{table}: not partitioned (run scripts/migrate.py)")
+                    continue
+                safe_print(f"\n{table}:")
+                for name, lower, upper in partitions.list_partitions(cur, table):
+                    span = f"{lower} .. {upper}" if lower else "DEFAULT"
+                    safe_print(f"   {name:<40} {span:<26} {partitions.count_rows(cur, name):>10,} rows")
+
+        elif args.command in ("drop", "detach"):
+            tables = list(partitions.PARTITIONED_TABLES) if args.table == "all" else [args.table]
+            if not args.yes and not confirm(f"{args.command} {args.month:%Y-%m} from {', '.join(tables)}?"):
+                safe_print("❌ Cancelled. Nothing was changed.")
+                return 1
+            for table in tables:
+                if args.command == "drop":
+                    removed = partitions.drop_month(cur, table, args.month)
+                    safe_print(f"🗑️  {table}: dropped {removed:,} rows for {args.month:%Y-%m}")
+                else:
+                    kept = partitions.detach_month(cur, table, args.month)
+                    safe_print(f"📦 {table}: {'detached as ' + kept if kept else 'no partition for that month'}")
+            conn.commit()
+
+        elif args.command == "attach":
+            partitions.attach_month(cur, args.table, args.source, args.month)
+            conn.commit()
+            safe_print(f"✅ Attached {args.source} as {partitions.partition_name(args.table, args.month)}")
+
+    except Exception as e:
+        conn.rollback()
+        safe_print(f"❌ Error: {e}")
+        return 1
+    finally:
+        cur.close()
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
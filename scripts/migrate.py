@@ -0,0 +1,256 @@
+"""
+Versioned schema migrations for the Supabase database, plus an index check.
+
+Migrations are the numbered files in db/migrations (NNNN_description.sql).
+Each pending file runs in its own transaction and is recorded in
+schema_migrations with a checksum, so edited migrations are flagged.
+
+The index check runs EXPLAIN on the queries the dashboard pages issue and
+reports whether each one reads its table through an index.
+
+Usage:
+    python scripts/migrate.py                  # apply pending migrations
+    python scripts/migrate.py --status         # list applied / pending
+    python scripts/migrate.py --check-indexes  # EXPLAIN the dashboard queries
+    python scripts/migrate.py --check-indexes --strict   # plan as if tables were large
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from dashboard.utils import partitions
+from dashboard.utils.supabase_db import get_supabase_connection
+
+MIGRATIONS_DIR = BASE_DIR / "db" / "migrations"
+MIGRATION_RE = re.compile(r"^(\d{4})_(.+)\.sql$")
+
+# Representative dashboard queries (see dashboard/pages and utils/report_queries.py).
+# {stores}/{pcs} expand to placeholders; params are filled in by index_check_params().
+DASHBOARD_QUERIES = {
+    "Executive Summary / Store Comparison":
+        ("sales_summary", "SELECT * FROM sales_summary WHERE store IN ({stores}) AND date BETWEEN %s AND %s"),
+    "Cash Reconciliation":
+        ("sales_summary", "SELECT store, date, cash_in, paid_in, paid_out FROM sales_summary "
+                          "WHERE store IN ({stores}) AND date BETWEEN %s AND %s"),
+    "Sales Mix (order type)":
+        ("sales_by_order_type", "SELECT * FROM sales_by_order_type WHERE store IN ({stores}) AND date BETWEEN %s AND %s"),
+    "Sales Mix (subcategory)":
+        ("sales_by_subcategory", "SELECT * FROM sales_by_subcategory WHERE store IN ({stores}) AND date BETWEEN %s AND %s"),
+    "Daypart Analysis":
+        ("sales_by_daypart", "SELECT * FROM sales_by_daypart WHERE store IN ({stores}) AND date BETWEEN %s AND %s"),
+    "Labor Efficiency":
+        ("labor_metrics", "SELECT * FROM labor_metrics WHERE store IN ({stores}) AND date BETWEEN %s AND %s"),
+    "Tender Type":
+        ("tender_type_metrics", "SELECT * FROM tender_type_metrics WHERE store IN ({stores}) AND date BETWEEN %s AND %s"),
+    "Location Metrics (labor)":
+        ("labor_metrics", "SELECT SUM(total_pay) FROM labor_metrics WHERE store = {store} AND date BETWEEN %s AND %s"),
+    "Location Metrics (HME)":
+        ("hme_report", "SELECT * FROM hme_report WHERE store = {hme_store} AND date BETWEEN %s AND %s"),
+    "Guest Reviews":
+        ("medallia_reports", "SELECT COUNT(*), AVG(osat), AVG(ltr) FROM medallia_reports "
+                             "WHERE report_date BETWEEN %s AND %s AND pc_number IN ({pcs})"),
+    "Latest date":
+        ("sales_summary", "SELECT MAX(date) FROM sales_summary"),
+}
+CHECK_DAYS = 31
+
+
+def safe_print(msg, end='\n'):
+    """Print with Unicode error handling for Windows console"""
+    try:
+        print(msg, end=end)
+    except UnicodeEncodeError:
+        print(msg.encode('ascii', errors='replace').decode('ascii'), end=end)
+
+
+# --- Migrations ---
+def discover_migrations():
+    """[(version, name, path)] for every migration file, in version order."""
+    migrations = []
+    for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+        match = MIGRATION_RE.match(path.name)
+        if not match:
+            safe_print(f"⚠️  Ignoring {path.name} (expected NNNN_description.sql)")
+            continue
+        migrations.append((int(match.group(1)), match.group(2), path))
+    versions = [v for v, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError("Duplicate migration version numbers in db/migrations")
+    return migrations
+
+
+def checksum(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def ensure_migrations_table(conn):
+    with conn.cursor() as cur:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                checksum TEXT NOT NULL,
+                applied_at TIMESTAMP NOT NULL DEFAULT now()
+            )
+        """)
+    conn.commit()
+
+
+def applied_migrations(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT version, name, checksum, applied_at FROM schema_migrations ORDER BY version")
+        return {row[0]: row[1:] for row in cur.fetchall()}
+
+
+def show_status(conn):
+    applied = applied_migrations(conn)
+    for version, name, path in discover_migrations():
+        if version in applied:
+            _, recorded_checksum, applied_at = applied[version]
+            changed = "  ⚠️  file changed since applied" if recorded_checksum != checksum(path) else ""
+            safe_print(f"✅ {version:04d} {name} (applied {applied_at:%Y-%m-%d %H:%M}){changed}")
+        else:
+            safe_print(f"⏳ {version:04d} {name} (pending)")
+
+
+def apply_pending(conn):
+    applied = applied_migrations(conn)
+    pending = [m for m in discover_migrations() if m[0] not in applied]
+    if not pending:
+        safe_print("✅ Database schema is up to date.")
+        return 0
+
+    for version, name, path in pending:
+        safe_print(f"🔧 Applying {version:04d} {name}...", end="")
+        try:
+            with conn.cursor() as cur:
+                cur.execute(path.read_text(encoding="utf-8"))
+                cur.execute(
+                    "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                    (version, name, checksum(path)),
+                )
+            conn.commit()
+            safe_print(" done")
+        except Exception as e:
+            conn.rollback()
+            safe_print(" FAILED")
+            safe_print(f"❌ {path.name}: {e}")
+            return 1
+    safe_print(f"\n🎉 Applied {len(pending)} migration(s).")
+    return 0
+
+
+# --- Index check ---
+def _plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def index_check_params(conn):
+    """Sample filter values: every store, the most recent CHECK_DAYS days."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT DISTINCT store FROM sales_summary")
+        stores = [row[0] for row in cur.fetchall()] or [""]
+        cur.execute("SELECT DISTINCT store FROM hme_report LIMIT 1")
+        hme_row = cur.fetchone()
+        cur.execute("SELECT DISTINCT pc_number FROM medallia_reports")
+        pcs = [row[0] for row in cur.fetchall()] or [""]
+    end = date.today()
+    return {
+        "stores": stores,
+        "store": stores[0],
+        "hme_store": hme_row[0] if hme_row else 0,
+        "pcs": pcs,
+        "dates": [end - timedelta(days=CHECK_DAYS), end],
+    }
+
+
+def check_indexes(conn, strict=False):
+    """EXPLAIN each dashboard query; returns the number of queries that scan a table sequentially."""
+    sample = index_check_params(conn)
+    failures = 0
+
+    with conn.cursor() as cur:
+        if strict:
+            # Small tables are cheaper to scan than to index-probe, so the
+            # planner picks Seq Scan today; this shows what it will do at scale
+            cur.execute("SET enable_seqscan = off")
+
+        for label, (table, template) in DASHBOARD_QUERIES.items():
+            sql = template.format(
+                stores=",".join(["%s"] * len(sample["stores"])),
+                pcs=",".join(["%s"] * len(sample["pcs"])),
+                store="%s",
+                hme_store="%s",
+            )
+            params = []
+            if "{stores}" in template:
+                params += sample["stores"]
+            if "{store}" in template:
+                params.append(sample["store"])
+            if "{hme_store}" in template:
+                params.append(sample["hme_store"])
+            if "%s AND %s" in template:
+                params += sample["dates"]
+            if "{pcs}" in template:
+                params += sample["pcs"]
+
+            cur.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cur.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            # Partitioned tables (0003) are scanned through their monthly partitions
+            relations = {table} | {name for name, _, _ in partitions.list_partitions(cur, table)}
+            nodes = [n for n in _plan_nodes(plan[0]["Plan"]) if n.get("Relation Name") in relations]
+            scans = sorted({n["Node Type"] for n in nodes})
+            indexes = sorted({n["Index Name"] for n in nodes if "Index Name" in n})
+
+            if not nodes or "Seq Scan" in scans:
+                failures += 1
+                safe_print(f"❌ {label}: {table} -> {', '.join(scans) or 'no scan'}")
+            else:
+                safe_print(f"✅ {label}: {table} -> {', '.join(scans)} ({', '.join(indexes) or 'bitmap'})")
+
+        if strict:
+            cur.execute("RESET enable_seqscan")
+    conn.rollback()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply db/migrations and check dashboard index usage")
+    parser.add_argument("--status", action="store_true", help="List applied and pending migrations")
+    parser.add_argument("--check-indexes", action="store_true", help="EXPLAIN dashboard queries and report index usage")
+    parser.add_argument("--strict", action="store_true",
+                        help="With --check-indexes: disable sequential scans so small tables show their large-table plan")
+    args = parser.parse_args()
+
+    conn = get_supabase_connection()
+    try:
+        ensure_migrations_table(conn)
+        if args.status:
+            show_status(conn)
+            return 0
+        if args.check_indexes:
+            failures = check_indexes(conn, strict=args.strict)
+            if failures:
+                safe_print(f"\n⚠️  {failures} query(ies) fall back to a sequential scan. Run: python scripts/migrate.py")
+                return 1
+            safe_print("\n🎉 Every dashboard query uses an index.")
+            return 0
+        return apply_pending(conn)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,6 +20,7 @@ from datetime import datetime
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dashboard.utils import excel_reader
 
 # Store mapping (PC number to store name)
 LOC_TO_PC = {
@@ -89,7 +90,7 @@ def parse_transposed_file(filepath):
     if str(filepath).endswith('.csv'):
         df = pd.read_csv(filepath, header=None)
     else:
-        df = pd.read_excel(filepath, header=None)
+        df = excel_reader.read_sheet(filepath, header=None)
     
     print(f"Loaded {len(df)} rows x {len(df.columns)} columns")
     
@@ -0,0 +1,203 @@
+"""
+Throwaway local PostgreSQL with the project schema, for trying the loaders
+without touching production Supabase.
+
+initdb's a cluster in a temp folder, starts it on a free localhost port and
+creates a database with db/base_schema.sql, db/guest_comments_schema.sql and
+every db/migrations file applied (unique keys, partitioning, tender_types,
+feed_coverage, ...). The loaders reach it through the SUPABASE_* env vars that
+dashboard/utils/supabase_db.py reads - complete env vars win over
+.streamlit/secrets.toml, so nothing falls through to production.
+
+Needs the PostgreSQL server binaries (initdb, pg_ctl) on PATH or in PG_BIN.
+initdb refuses to run as root/Administrator.
+
+Usage:
+    python scripts/pg_sandbox.py start              # runs until Ctrl+C, prints the env vars to set
+    python scripts/pg_sandbox.py start --port 55432 --keep
+    python scripts/benchmark_loaders.py             # starts its own sandbox
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import psycopg2
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+import migrate
+
+SCHEMA_FILES = [
+    BASE_DIR / "db" / "base_schema.sql",
+    BASE_DIR / "db" / "guest_comments_schema.sql",
+]
+DB_NAME = "sandbox"
+DB_USER = "postgres"
+DB_PASS = "sandbox"  # trust auth ignores it; supabase_db only needs it set
+
+# Durability is pointless for a throwaway cluster
+FAST_SETTINGS = {"fsync": "off", "synchronous_commit": "off", "full_page_writes": "off"}
+
+
+def safe_print(msg, end='\n'):
+    """Print with Unicode error handling for Windows console"""
+    try:
+        print(msg, end=end)
+    except UnicodeEncodeError:
+        print(msg.encode('ascii', errors='replace').decode('ascii'), end=end)
+
+
+def find_pg_bin() -> Path:
+    """Folder holding initdb/pg_ctl: PG_BIN, PATH, then the usual install locations."""
+    if os.getenv("PG_BIN"):
+        return Path(os.environ["PG_BIN"])
+    initdb = shutil.which("initdb")
+    if initdb:
+        return Path(initdb).parent
+    patterns = [
+        "/usr/lib/postgresql/*/bin",
+        "/usr/local/opt/postgresql*/bin",
+        "C:/Program Files/PostgreSQL/*/bin",
+    ]
+    for pattern in patterns:
+        found = sorted(glob.glob(pattern))
+        if found:
+            return Path(found[-1])
+    raise FileNotFoundError("PostgreSQL server binaries not found; install PostgreSQL or set PG_BIN")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def apply_schema(conn):
+    """Base tables, guest comments, then db/migrations in order."""
+    for path in SCHEMA_FILES:
+        with conn.cursor() as cur:
+            cur.execute(path.read_text(encoding="utf-8"))
+        conn.commit()
+    migrate.ensure_migrations_table(conn)
+    if migrate.apply_pending(conn) != 0:
+        raise RuntimeError("db/migrations failed on the sandbox database")
+
+
+class LocalPostgres:
+    """
+    A private PostgreSQL cluster. Use as a context manager:
+
+        with LocalPostgres() as pg:
+            os.environ.update(pg.env())
+            conn = get_supabase_connection()
+    """
+
+    def __init__(self, port=None, fast=True, keep=False):
+        self.port = port or free_port()
+        self.fast = fast
+        self.keep = keep
+        self.bin = find_pg_bin()
+        self.data_dir = None
+
+    def _run(self, tool, *args):
+        result = subprocess.run([str(self.bin / tool), *args], capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"{tool} failed:\n{result.stdout}\n{result.stderr}")
+
+    def start(self):
+        self.data_dir = Path(tempfile.mkdtemp(prefix="pg_sandbox_"))
+        self._run("initdb", "-D", str(self.data_dir), "-U", DB_USER, "-A", "trust", "-E", "UTF8", "--no-locale")
+
+        options = ["-p", str(self.port), "-c", "listen_addresses=127.0.0.1", "-c", "unix_socket_directories="]
+        if self.fast:
+            for name, value in FAST_SETTINGS.items():
+                options += ["-c", f"{name}={value}"]
+        self._run("pg_ctl", "-D", str(self.data_dir), "-l", str(self.data_dir / "server.log"),
+                  "-o", subprocess.list2cmdline(options), "-w", "start")
+
+        admin = psycopg2.connect(host="127.0.0.1", port=self.port, dbname="postgres", user=DB_USER)
+        admin.autocommit = True
+        with admin.cursor() as cur:
+            cur.execute(f"CREATE DATABASE {DB_NAME}")
+        admin.close()
+
+        conn = self.connect()
+        try:
+            apply_schema(conn)
+        finally:
+            conn.close()
+        return self
+
+    def connect(self):
+        return psycopg2.connect(host="127.0.0.1", port=self.port, dbname=DB_NAME, user=DB_USER, password=DB_PASS)
+
+    def env(self) -> dict:
+        """SUPABASE_* vars pointing dashboard.utils.supabase_db at this cluster."""
+        return {
+            "SUPABASE_HOST": "127.0.0.1",
+            "SUPABASE_PORT": str(self.port),
+            "SUPABASE_DB": DB_NAME,
+            "SUPABASE_USER": DB_USER,
+            "SUPABASE_PASS": DB_PASS,
+            "SUPABASE_SSLMODE": "disable",
+        }
+
+    def stop(self):
+        if self.data_dir is None:
+            return
+        try:
+            self._run("pg_ctl", "-D", str(self.data_dir), "-m", "fast", "-w", "stop")
+        finally:
+            if not self.keep:
+                shutil.rmtree(self.data_dir, ignore_errors=True)
+            self.data_dir = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a throwaway local PostgreSQL with the project schema")
+    sub = parser.add_subparsers(dest="command", required=True)
+    start = sub.add_parser("start", help="Start a sandbox and keep it running until Ctrl+C")
+    start.add_argument("--port", type=int, help="Port to listen on (default: a free one)")
+    start.add_argument("--keep", action="store_true", help="Keep the data folder after stopping")
+    start.add_argument("--durable", action="store_true", help="Leave fsync/synchronous_commit on")
+    args = parser.parse_args()
+
+    try:
+        pg = LocalPostgres(port=args.port, fast=not args.durable, keep=args.keep).start()
+    except Exception as e:
+        safe_print(f"❌ Could not start the sandbox: {e}")
+        return 1
+
+    safe_print(f"🐘 Sandbox PostgreSQL on 127.0.0.1:{pg.port} (data: {pg.data_dir})")
+    safe_print("   Point the loaders at it with:\n")
+    for name, value in pg.env().items():
+        safe_print(f'   $env:{name} = "{value}"' if os.name == "nt" else f"   export {name}={value}")
+    safe_print("\n   Ctrl+C to stop" + ("" if args.keep else " and delete it"))
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pg.stop()
+        safe_print("🛑 Sandbox stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,6 +16,8 @@ from bs4 import BeautifulSoup
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from dashboard.utils.supabase_db import get_supabase_connection
+from dashboard.utils.coverage import refresh_coverage
+from dashboard.utils import partitions
 
 
 def parse_medallia_email_html(html_text, report_date):
@@ -206,14 +208,16 @@ def parse_medallia_email(email_text, report_date):
     return records
 
 
-def insert_records(conn, records):
+def insert_records(conn, records, page_size=100):
     """
-    Insert records into medallia_report table
+    Insert records into medallia_reports table
     Uses ON CONFLICT to handle duplicates
+    Populates comment_tsv alongside comment so full-text search stays indexed
     
     Args:
         conn: Database connection
         records: List of record dictionaries
+        page_size: Rows per INSERT statement sent by execute_values
     
     Returns:
         Tuple of (inserted_count, duplicate_count)
@@ -223,13 +227,19 @@ def insert_records(conn, records):
     
     cursor = conn.cursor()
     
+    # Give the report months their own partitions (not the DEFAULT one)
+    if partitions.is_partitioned(cursor, "medallia_reports"):
+        report_dates = [r["report_date"] for r in records]
+        partitions.ensure_partitions(cursor, "medallia_reports", min(report_dates), max(report_dates))
+    
     # Prepare data for batch insert
     insert_query = """
-        INSERT INTO medallia_report (
+        INSERT INTO medallia_reports (
             report_date, pc_number, restaurant_address, order_channel,
-            transaction_datetime, response_datetime, osat, ltr, accuracy, comment
+            transaction_datetime, response_datetime, osat, ltr, accuracy, comment,
+            comment_tsv
         ) VALUES %s
-        ON CONFLICT (pc_number, response_datetime, comment)
+        ON CONFLICT (pc_number, response_datetime, comment, report_date)
         DO NOTHING
         RETURNING id
     """
@@ -245,17 +255,22 @@ def insert_records(conn, records):
             r["osat"],
             r["ltr"],
             r["accuracy"],
+            r["comment"],
             r["comment"]
         )
         for r in records
     ]
     
+    # Last placeholder is the comment again, converted to a tsvector server-side
+    template = "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, to_tsvector('english', COALESCE(%s, '')))"
+    
     # Use execute_values for efficient batch insert
     result = execute_values(
         cursor,
         insert_query,
         values,
-        template=None,
+        template=template,
+        page_size=page_size,
         fetch=True
     )
     
@@ -311,6 +326,11 @@ def process_medallia_file(filepath, conn):
     # Insert into database
     inserted, duplicates = insert_records(conn, records)
     print(f"  [OK] Inserted: {inserted}, Duplicates skipped: {duplicates}")
+
+    if inserted:
+        with conn.cursor() as cur:
+            refresh_coverage(cur, "medallia_reports", report_date, report_date)
+        conn.commit()
     
     return inserted, duplicates
 
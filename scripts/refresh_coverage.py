@@ -0,0 +1,98 @@
+"""
+Maintain and query the store x date x feed coverage matrix (feed_coverage,
+db/migrations/0007_feed_coverage.sql).
+
+The loaders keep it current for what they write; use this to backfill it,
+to refresh a range after rows were changed by hand, or to ask what's missing.
+
+Usage:
+    python scripts/refresh_coverage.py --all                      # rebuild from the fact tables
+    python scripts/refresh_coverage.py --start 2025-11-01 --end 2025-11-30 [--feed hme_report]
+    python scripts/refresh_coverage.py --missing --start 2025-11-01 --end 2025-11-30
+    python scripts/refresh_coverage.py --summary
+"""
+
+import argparse
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from dashboard.utils.supabase_db import get_supabase_connection
+from dashboard.utils import coverage
+
+DEFAULT_DAYS = 31
+
+
+def safe_print(msg, end='\n'):
+    """Print with Unicode error handling for Windows console"""
+    try:
+        print(msg, end=end)
+    except UnicodeEncodeError:
+        print(msg.encode('ascii', errors='replace').decode('ascii'), end=end)
+
+
+def parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain / query the feed coverage matrix")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--all", action="store_true", help="Rebuild coverage from the whole fact tables")
+    mode.add_argument("--missing", action="store_true", help="List store-days missing feeds")
+    mode.add_argument("--summary", action="store_true", help="First/last date and store count per feed")
+    parser.add_argument("--start", type=parse_date, help="YYYY-MM-DD (default: --days before --end)")
+    parser.add_argument("--end", type=parse_date, help="YYYY-MM-DD (default: yesterday)")
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS)
+    parser.add_argument("--feed", action="append", choices=sorted(coverage.FEEDS),
+                        help="Feed(s) to refresh / check (default: all for refresh, POS feeds for --missing)")
+    args = parser.parse_args()
+
+    end_date = args.end or date.today() - timedelta(days=1)
+    start_date = args.start or end_date - timedelta(days=args.days - 1)
+
+    conn = get_supabase_connection()
+    cur = conn.cursor()
+    try:
+        started = time.perf_counter()
+        if args.summary:
+            safe_print(f"{'Feed':<22} {'First':<12} {'Last':<12} {'Days':>6} {'Stores':>7}")
+            for feed, first, last, days, stores in coverage.feed_summary(cur):
+                safe_print(f"{feed:<22} {str(first):<12} {str(last):<12} {days:>6} {stores:>7}")
+
+        elif args.missing:
+            missing = coverage.missing_coverage(cur, start_date, end_date, args.feed)
+            safe_print(f"🔍 Missing feeds {start_date} .. {end_date}")
+            for pc_number, store, day, feeds in missing:
+                safe_print(f"   {day}  {store or pc_number:<14} {', '.join(feeds)}")
+            safe_print(f"{'✅ Nothing missing' if not missing else f'⚠️  {len(missing)} store-day(s) incomplete'}"
+                       f" ({time.perf_counter() - started:.2f}s)")
+
+        elif args.all:
+            for feed, cells in coverage.rebuild_coverage(cur, args.feed).items():
+                safe_print(f"   {feed:<22} {cells:,} store-day(s)")
+            conn.commit()
+            safe_print(f"✅ Coverage rebuilt in {time.perf_counter() - started:.2f}s")
+
+        else:
+            for feed in args.feed or list(coverage.FEEDS):
+                cells = coverage.refresh_coverage(cur, feed, start_date, end_date)
+                safe_print(f"   {feed:<22} {cells:,} store-day(s)")
+            conn.commit()
+            safe_print(f"✅ Coverage refreshed for {start_date} .. {end_date} in {time.perf_counter() - started:.2f}s")
+    except Exception as e:
+        conn.rollback()
+        safe_print(f"❌ Error: {e}")
+        return 1
+    finally:
+        cur.close()
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -41,10 +41,10 @@ def send_email(subject, body):
         smtp.send_message(msg)
 
 
-def run(script_path):
+def run(script_path, *args):
     logging.info(f"📄 Running {script_path.name}...")
     result = subprocess.run(
-        [sys.executable, str(script_path)],
+        [sys.executable, str(script_path), *args],
         capture_output=True,
         text=True,
     )
@@ -55,22 +55,50 @@ def run(script_path):
         )
     logging.info(f"✅ {script_path.name} finished OK.")
     logging.debug(result.stdout)
+    return result.stdout
+
+
+def run_optional(script_path, *args):
+    """run() for steps whose failure is logged but doesn't fail the pipeline. None if it failed."""
+    try:
+        return run(script_path, *args)
+    except RuntimeError as e:
+        logging.warning(f"⚠️ {script_path.name} did not complete: {e}")
+        return None
 
 
 def main():
     try:
         scripts = [
-            BASE_DIR / "scripts" / "download_from_gmail.py",
             BASE_DIR / "scripts" / "compile_store_reports.py",
             BASE_DIR / "scripts" / "load_to_sqlite.py",
         ]
 
+        # Next months' partitions exist before anything is loaded into them
+        # (optional: the loaders fall back to the DEFAULT partition / plain tables)
+        run_optional(BASE_DIR / "scripts" / "manage_partitions.py", "ensure")
+
+        # DSS only: the tender/Medallia/HME feeds have their own pipelines
+        run(BASE_DIR / "scripts" / "download_mail.py", "--feed", "dss")
+
         for script in scripts:
             run(script)
 
+        # The data is committed to Supabase by now: the local replica and the
+        # data-quality findings are reported, never fatal
+        notes = []
+        if run_optional(BASE_DIR / "scripts" / "sync_local_replica.py") is None:
+            notes.append(f"⚠️ Local replica sync did not complete (see {log_file})")
+        quality_report = run_optional(BASE_DIR / "scripts" / "data_quality.py")
+        if quality_report is None:
+            notes.append(f"⚠️ Data-quality check did not complete (see {log_file})")
+            quality_report = ""
+
         send_email(
             "✅ Dunkin ETL pipeline success",
-            f"All steps finished without errors on {datetime.now():%Y-%m-%d %H:%M}."
+            f"{'The data loaded, with warnings' if notes else 'All steps finished without errors'}"
+            f" on {datetime.now():%Y-%m-%d %H:%M}.\n\n"
+            + "".join(f"{note}\n" for note in notes) + quality_report
         )
         logging.info("✅ Pipeline completed successfully.")
 
@@ -0,0 +1,362 @@
+"""
+Incrementally replicate the Supabase fact tables into a local SQLite file
+(db/replica.db) so the dashboard can run offline or off the shared database.
+
+Each table keeps a high-water mark (largest replicated id). A sync copies only
+rows with id above it, plus a short re-check window of recent dates, because
+the loaders can replace rows for days that are re-downloaded.
+
+Older dates can change too without a new id reaching them (an upsert updates
+rows in place, slice replacement and dedupe delete rows). Those dates are
+found in the coverage matrix (feed_coverage, db/migrations/0007_feed_coverage.sql):
+every date a loader refreshed since the last sync, and every date whose row
+count differs from the replica's, is re-copied whole. Without feed_coverage
+(or with it not backfilled for a table) only the re-check window is seen;
+run with --full after correcting older data there.
+
+Dashboard pages read the replica when DASHBOARD_DB_SOURCE=replica (or =auto,
+as a fallback when Supabase is unreachable) - see dashboard/utils/db.py.
+
+Usage:
+    python scripts/sync_local_replica.py
+    python scripts/sync_local_replica.py --tables sales_summary labor_metrics
+    python scripts/sync_local_replica.py --full
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from dashboard.utils.supabase_db import get_supabase_connection
+from dashboard.utils.db import REPLICA_PATH
+from dashboard.utils.coverage import FEEDS as COVERAGE_FEEDS
+
+# table -> business date column
+REPLICATED_TABLES = {
+    "sales_summary": "date",
+    "sales_by_daypart": "date",
+    "sales_by_subcategory": "date",
+    "sales_by_order_type": "date",
+    "tender_type_metrics": "date",
+    "labor_metrics": "date",
+    "hme_report": "date",
+    "medallia_reports": "report_date",
+}
+SKIP_COLUMNS = {"comment_tsv", "row_hash"}  # Postgres-only search column / upsert bookkeeping
+
+# SQLite versions of the Postgres views the dashboard reads
+# (tender_daily_pivot: db/migrations/0005_tender_daily_pivot.sql)
+TENDER_PIVOT_CATEGORIES = [
+    "mastercard", "visa", "visa_kiosk", "discover", "amex", "gift_card_redeem",
+    "gc_redeem_offline", "uber_eats", "door_dash", "grubhub", "clover_go",
+]
+REPLICA_VIEWS = {
+    "tender_daily_pivot": """
+        CREATE VIEW tender_daily_pivot AS
+        SELECT store, date,
+            {columns}
+        FROM (
+            SELECT store, date, tender_category, detail_amount,
+                   ROW_NUMBER() OVER (PARTITION BY store, date, tender_category ORDER BY id) AS rn
+            FROM tender_type_metrics
+        )
+        WHERE rn = 1
+        GROUP BY store, date
+    """.format(columns=",\n            ".join(
+        f"SUM(detail_amount) FILTER (WHERE tender_category = '{c}') AS {c}" for c in TENDER_PIVOT_CATEGORIES
+    )),
+    # feed_coverage is a table upstream (db/migrations/0007_feed_coverage.sql); the
+    # replica derives it from the replicated tables instead
+    "feed_coverage": "CREATE VIEW feed_coverage AS\n" + "\nUNION ALL\n".join(
+        f"""SELECT CAST({pc_col} AS TEXT) AS pc_number, {date_col} AS date, '{feed}' AS feed,
+               {f"MAX({store_col})" if store_col else "NULL"} AS store, COUNT(*) AS row_count
+        FROM {table} GROUP BY {pc_col}, {date_col}"""
+        for feed, (table, pc_col, date_col, store_col) in COVERAGE_FEEDS.items()
+    ),
+}
+BATCH_SIZE = 5000
+RECHECK_DAYS = 7
+# Coverage refreshes stamped up to this long before the last one seen are
+# re-read, for load transactions that were still open during the last sync
+COVERAGE_MARGIN = timedelta(hours=1)
+
+
+def safe_print(msg, end='\n'):
+    """Print with Unicode error handling for Windows console"""
+    try:
+        print(msg, end=end)
+    except UnicodeEncodeError:
+        print(msg.encode('ascii', errors='replace').decode('ascii'), end=end)
+
+
+def sqlite_type(pg_type: str) -> str:
+    if pg_type in ("integer", "bigint", "smallint", "boolean"):
+        return "INTEGER"
+    if pg_type in ("numeric", "real", "double precision"):
+        return "REAL"
+    if pg_type == "date":
+        return "DATE"
+    if pg_type.startswith("timestamp"):
+        return "TIMESTAMP"
+    return "TEXT"
+
+
+def remote_columns(pg_cur, table):
+    pg_cur.execute("""
+        SELECT column_name, data_type
+        FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = %s
+        ORDER BY ordinal_position
+    """, (table,))
+    return [(name, dtype) for name, dtype in pg_cur.fetchall() if name not in SKIP_COLUMNS]
+
+
+def ensure_local_table(local, table, columns, date_col):
+    """Create the replica table, or add any columns the remote table gained since the last sync."""
+    col_defs = [
+        f'"{name}" INTEGER PRIMARY KEY' if name == "id" else f'"{name}" {sqlite_type(dtype)}'
+        for name, dtype in columns
+    ]
+    local.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({", ".join(col_defs)})')
+
+    existing = {row[1] for row in local.execute(f'PRAGMA table_info("{table}")')}
+    for name, dtype in columns:
+        if name not in existing:
+            local.execute(f'ALTER TABLE "{table}" ADD COLUMN "{name}" {sqlite_type(dtype)}')
+
+    names = {name for name, _ in columns}
+    store_col = "store" if "store" in names else "pc_number" if "pc_number" in names else None
+    if store_col:
+        local.execute(
+            f'CREATE INDEX IF NOT EXISTS "idx_{table}_{date_col}_{store_col}" '
+            f'ON "{table}"("{date_col}", "{store_col}")'
+        )
+
+
+def _to_sqlite(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, datetime):
+        # sqlite3's TIMESTAMP converter cannot parse a UTC offset
+        return value.replace(tzinfo=None).isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def copy_rows(pg_conn, local, table, col_names, where_sql, params, cursor_name):
+    """Stream rows from Supabase with a server-side cursor and upsert them locally."""
+    quoted = ", ".join(f'"{c}"' for c in col_names)
+    insert_sql = f'INSERT OR REPLACE INTO "{table}" ({quoted}) VALUES ({", ".join(["?"] * len(col_names))})'
+
+    copied = 0
+    max_id = 0
+    id_pos = col_names.index("id")
+    with pg_conn.cursor(name=cursor_name) as pg_cur:
+        pg_cur.itersize = BATCH_SIZE
+        pg_cur.execute(f'SELECT {quoted} FROM "{table}" {where_sql} ORDER BY id', params)
+        while True:
+            rows = pg_cur.fetchmany(BATCH_SIZE)
+            if not rows:
+                break
+            local.executemany(insert_sql, [tuple(_to_sqlite(v) for v in row) for row in rows])
+            copied += len(rows)
+            max_id = max(max_id, rows[-1][id_pos])
+    return copied, max_id
+
+
+def changed_dates(pg_conn, local, table, date_col, coverage_mark=None):
+    """
+    Dates (ISO strings) of table to re-copy per the coverage matrix: refreshed
+    upstream since coverage_mark (minus COVERAGE_MARGIN), or holding a different
+    row count than the replica. Returns (dates, new coverage mark).
+    """
+    if table not in COVERAGE_FEEDS:
+        return set(), coverage_mark
+    with pg_conn.cursor() as pg_cur:
+        pg_cur.execute("SELECT to_regclass('public.feed_coverage') IS NOT NULL")
+        if not pg_cur.fetchone()[0]:
+            return set(), coverage_mark
+        pg_cur.execute("""
+            SELECT date, SUM(row_count), MAX(updated_at)
+            FROM feed_coverage
+            WHERE feed = %s
+            GROUP BY date
+        """, (table,))
+        upstream = pg_cur.fetchall()
+    if not upstream:  # coverage not backfilled for this table
+        return set(), coverage_mark
+
+    remote_counts = {day.isoformat(): count for day, count, _ in upstream}
+    local_counts = {
+        day: count for day, count in
+        local.execute(f'SELECT "{date_col}", COUNT(*) FROM "{table}" GROUP BY "{date_col}"')
+        if day is not None
+    }
+    dates = {
+        day for day in set(remote_counts) | set(local_counts)
+        if remote_counts.get(day, 0) != local_counts.get(day, 0)
+    }
+    if coverage_mark:
+        since = datetime.fromisoformat(coverage_mark) - COVERAGE_MARGIN
+        dates |= {day.isoformat() for day, _, updated in upstream if updated > since}
+    return dates, max(updated for _, _, updated in upstream).isoformat()
+
+
+def sync_table(pg_conn, local, table, date_col, full=False, recheck_days=RECHECK_DAYS):
+    with pg_conn.cursor() as pg_cur:
+        columns = remote_columns(pg_cur, table)
+    if not columns:
+        safe_print(f"⚠️  {table}: not found in Supabase, skipping")
+        return None
+    col_names = [name for name, _ in columns]
+    if "id" not in col_names:
+        safe_print(f"⚠️  {table}: no id column, skipping")
+        return None
+
+    ensure_local_table(local, table, columns, date_col)
+
+    if full:
+        local.execute(f'DELETE FROM "{table}"')
+        local.execute("DELETE FROM _replica_state WHERE table_name = ?", (table,))
+
+    row = local.execute(
+        "SELECT high_water_id, coverage_mark FROM _replica_state WHERE table_name = ?", (table,)
+    ).fetchone()
+    high_water, coverage_mark = row if row else (0, None)
+
+    # Re-check window: recent days can be deleted and re-loaded upstream, so
+    # replace them wholesale (this also drops rows deleted remotely)
+    rechecked = 0
+    since = None
+    if high_water and recheck_days > 0:
+        since = date.today() - timedelta(days=recheck_days)
+        local.execute(f'DELETE FROM "{table}" WHERE "{date_col}" >= ?', (since.isoformat(),))
+        rechecked, _ = copy_rows(
+            pg_conn, local, table, col_names,
+            f'WHERE "{date_col}" >= %s AND id <= %s', (since, high_water),
+            f"replica_recheck_{table}",
+        )
+
+    new_rows, max_id = copy_rows(
+        pg_conn, local, table, col_names,
+        "WHERE id > %s", (high_water,),
+        f"replica_new_{table}",
+    )
+    high_water = max(high_water, max_id)
+
+    # Older dates changed in place or with rows deleted: replace them wholesale
+    dates, coverage_mark = changed_dates(pg_conn, local, table, date_col, coverage_mark)
+    if since:
+        dates = {day for day in dates if day < since.isoformat()}
+    corrected = 0
+    if dates:
+        local.executemany(f'DELETE FROM "{table}" WHERE "{date_col}" = ?', [(day,) for day in sorted(dates)])
+        corrected, max_id = copy_rows(
+            pg_conn, local, table, col_names,
+            f'WHERE "{date_col}" = ANY(%s::date[])', (sorted(dates),),
+            f"replica_changed_{table}",
+        )
+        high_water = max(high_water, max_id)
+    row_count = local.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+
+    local.execute("""
+        INSERT OR REPLACE INTO _replica_state (table_name, high_water_id, row_count, synced_at, coverage_mark)
+        VALUES (?, ?, ?, ?, ?)
+    """, (table, high_water, row_count, datetime.now().isoformat(timespec="seconds"), coverage_mark))
+    return {"new": new_rows, "rechecked": rechecked, "corrected": corrected, "dates": len(dates),
+            "rows": row_count, "high_water": high_water}
+
+
+def ensure_replica_views(local):
+    """(Re)create the replica's views over whatever tables it has."""
+    for view, ddl in REPLICA_VIEWS.items():
+        local.execute(f'DROP VIEW IF EXISTS "{view}"')
+        try:
+            local.execute(ddl)
+        except sqlite3.OperationalError as e:  # source table/column not replicated yet
+            safe_print(f"⚠️  View {view} not created: {e}")
+
+
+def open_replica():
+    REPLICA_PATH.parent.mkdir(parents=True, exist_ok=True)
+    local = sqlite3.connect(REPLICA_PATH)
+    # WAL lets dashboard readers keep going while the sync writes
+    local.execute("PRAGMA journal_mode=WAL")
+    local.execute("PRAGMA synchronous=NORMAL")
+    local.execute("""
+        CREATE TABLE IF NOT EXISTS _replica_state (
+            table_name TEXT PRIMARY KEY,
+            high_water_id INTEGER NOT NULL,
+            row_count INTEGER,
+            synced_at TEXT,
+            coverage_mark TEXT
+        )
+    """)
+    # Replicas created before coverage_mark existed
+    if "coverage_mark" not in {row[1] for row in local.execute("PRAGMA table_info(_replica_state)")}:
+        local.execute("ALTER TABLE _replica_state ADD COLUMN coverage_mark TEXT")
+    local.commit()
+    return local
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync Supabase fact tables into the local SQLite replica")
+    parser.add_argument("--tables", nargs="+", choices=sorted(REPLICATED_TABLES), help="Tables to sync (default: all)")
+    parser.add_argument("--full", action="store_true", help="Discard the replica's copy and re-copy everything")
+    parser.add_argument("--recheck-days", type=int, default=RECHECK_DAYS,
+                        help=f"Re-copy rows from the last N days (default: {RECHECK_DAYS})")
+    args = parser.parse_args()
+
+    tables = args.tables or list(REPLICATED_TABLES)
+
+    safe_print("=" * 60)
+    safe_print(f"🔄 Syncing local replica: {REPLICA_PATH}")
+    safe_print("=" * 60)
+
+    pg_conn = get_supabase_connection()
+    local = open_replica()
+    failed = []
+    try:
+        for table in tables:
+            started = time.perf_counter()
+            try:
+                with local:  # one local transaction per table
+                    result = sync_table(pg_conn, local, table, REPLICATED_TABLES[table],
+                                        full=args.full, recheck_days=args.recheck_days)
+                pg_conn.rollback()  # close the read transaction
+            except Exception as e:
+                pg_conn.rollback()
+                failed.append(table)
+                safe_print(f"❌ {table}: {e}")
+                continue
+            if result:
+                safe_print(
+                    f"✅ {table}: +{result['new']:,} new, {result['rechecked']:,} re-checked, "
+                    f"{result['corrected']:,} re-copied for {result['dates']} changed date(s), "
+                    f"{result['rows']:,} rows (high-water id {result['high_water']}) "
+                    f"in {time.perf_counter() - started:.1f}s"
+                )
+        with local:
+            ensure_replica_views(local)
+    finally:
+        local.close()
+        pg_conn.close()
+
+    if failed:
+        safe_print(f"\n⚠️  Failed tables: {', '.join(failed)}")
+        sys.exit(1)
+    safe_print("\n🎉 Replica is up to date.")
+
+
+if __name__ == "__main__":
+    main()
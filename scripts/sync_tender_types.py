@@ -0,0 +1,84 @@
+"""
+Register every tender_type label in the tender_types dimension and stamp
+tender_type_metrics.tender_category from it.
+
+Run once after db/migrations/0004_tender_types.sql, and again after editing
+the rules in dashboard/utils/tender_types.py (with --reclassify) or a
+category in the tender_types table by hand.
+
+Usage:
+    python scripts/sync_tender_types.py
+    python scripts/sync_tender_types.py --reclassify   # re-apply the rules to known labels too
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from dashboard.utils.supabase_db import get_supabase_connection
+from dashboard.utils.tender_types import classify_tender, tender_display_name, resolve_tender_categories
+
+
+def safe_print(msg, end='\n'):
+    """Print with Unicode error handling for Windows console"""
+    try:
+        print(msg, end=end)
+    except UnicodeEncodeError:
+        print(msg.encode('ascii', errors='replace').decode('ascii'), end=end)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync the tender_types dimension and tender_category stamps")
+    parser.add_argument("--reclassify", action="store_true",
+                        help="Overwrite existing tender_types rows with the current rules")
+    args = parser.parse_args()
+
+    conn = get_supabase_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT DISTINCT tender_type FROM tender_type_metrics")
+        labels = [row[0] for row in cur.fetchall()]
+
+        if args.reclassify:
+            cur.execute("SELECT tender_type, tender_category FROM tender_types")
+            changed = 0
+            for label, current in cur.fetchall():
+                category = classify_tender(label)
+                if category != current:
+                    cur.execute(
+                        "UPDATE tender_types SET tender_category = %s, display_name = %s WHERE tender_type = %s",
+                        (category, tender_display_name(category), label),
+                    )
+                    changed += 1
+                    safe_print(f"   ↻ {label}: {current} -> {category}")
+            safe_print(f"🔁 Re-classified {changed} label(s)")
+
+        categories = resolve_tender_categories(cur, labels)
+        safe_print(f"🏷️  {len(categories)} tender label(s) in tender_types")
+        for label in sorted(categories):
+            safe_print(f"   {label:<40} -> {categories[label]}")
+
+        cur.execute("""
+            UPDATE tender_type_metrics t
+            SET tender_category = tt.tender_category
+            FROM tender_types tt
+            WHERE t.tender_type = tt.tender_type
+              AND t.tender_category IS DISTINCT FROM tt.tender_category
+        """)
+        safe_print(f"✅ Stamped tender_category on {cur.rowcount:,} row(s)")
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        safe_print(f"❌ Error: {e}")
+        return 1
+    finally:
+        cur.close()
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
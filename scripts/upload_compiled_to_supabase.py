@@ -14,6 +14,9 @@ import glob
 BASE_DIR = Path(__file__).resolve().parents[1]
 sys.path.append(str(BASE_DIR))
 from dashboard.utils import supabase_db
+from dashboard.utils import coverage
+from dashboard.utils import day_loads
+from dashboard.utils import tender_types
 
 COMPILED_DIR = BASE_DIR / "data" / "compiled"
 
@@ -76,84 +79,87 @@ def get_all_compiled_files():
     excel_files = list(COMPILED_DIR.glob("*_copy.xlsx"))
     return sorted(excel_files, reverse=True)  # Newest first
 
-def upload_file_to_supabase(excel_path):
-    """Upload a single Excel file to Supabase"""
+def business_date(excel_path):
+    """Business date from the compiled filename (20251204_...), or None"""
+    try:
+        return datetime.strptime(excel_path.name[:8], '%Y%m%d').date()
+    except ValueError:
+        return None
+
+def upload_file_to_supabase(cur, excel_path):
+    """
+    Upload a single Excel file through cur (committing is up to the caller).
+    Returns the number of rows inserted; raises on an unknown type or a failed insert.
+    """
     print(f"\n📁 Processing: {excel_path.name}")
     
     # Detect file type
     file_type = detect_file_type(excel_path.name)
     if not file_type:
-        print(f"   ⚠️  Unknown file type, skipping...")
-        return False
+        raise ValueError("Unknown file type, skipping")
     
     config = file_type_mapping[file_type]
     table_name = config["table"]
     
     print(f"   📊 Detected type: {file_type} -> {table_name}")
-    
-    try:
-        conn = supabase_db.get_supabase_connection()
-    except Exception as e:
-        print(f"   ❌ Supabase connection error: {e}")
-        return False
 
-    try:
-        # Read the Excel file (it should have only one sheet)
-        df = pd.read_excel(excel_path)
-        
-        print(f"   📈 Read {len(df)} rows, {len(df.columns)} columns")
-        print(f"   🔍 Columns: {list(df.columns)}")
-        
-        # Convert date column to proper format
-        if 'date' in df.columns:
-            df['date'] = pd.to_datetime(df['date'], errors='coerce').dt.date
-        
-        # Validate that we have the expected columns
-        expected_cols = set(config["columns"])
-        actual_cols = set(df.columns)
-        
-        if not expected_cols.issubset(actual_cols):
-            missing = expected_cols - actual_cols
-            extra = actual_cols - expected_cols
-            print(f"   ⚠️  Column mismatch!")
-            if missing:
-                print(f"       Missing: {missing}")
-            if extra:
-                print(f"       Extra: {extra}")
-            print(f"   🔄 Proceeding with available columns...")
-        
-        # Use only the columns that exist in both
-        valid_cols = list(expected_cols & actual_cols)
-        df_upload = df[valid_cols].copy()
-        
-        print(f"   📤 Uploading {len(df_upload)} rows to {table_name}")
-        
-        # Build insert query with conflict handling
-        cols = ','.join(df_upload.columns)
-        vals_placeholder = ','.join(['%s'] * len(df_upload.columns))
-        
-        # Use INSERT with ON CONFLICT DO NOTHING to avoid duplicates
-        insert_query = f"""
-            INSERT INTO {table_name} ({cols}) 
-            VALUES ({vals_placeholder})
-            ON CONFLICT DO NOTHING
-        """
-        
-        data = df_upload.values.tolist()
-        with conn.cursor() as cur:
-            cur.executemany(insert_query, data)
-            rows_inserted = cur.rowcount
-            
-        conn.commit()
-        print(f"   ✅ Successfully inserted {rows_inserted} rows (duplicates skipped)")
-        return True
-        
-    except Exception as e:
-        print(f"   ❌ Error during upload: {e}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
+    # Read the Excel file (it should have only one sheet)
+    df = pd.read_excel(excel_path)
+    
+    print(f"   📈 Read {len(df)} rows, {len(df.columns)} columns")
+    print(f"   🔍 Columns: {list(df.columns)}")
+    
+    # Convert date column to proper format
+    if 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date'], errors='coerce').dt.date
+    
+    # Validate that we have the expected columns
+    expected_cols = set(config["columns"])
+    actual_cols = set(df.columns)
+    
+    if not expected_cols.issubset(actual_cols):
+        missing = expected_cols - actual_cols
+        extra = actual_cols - expected_cols
+        print(f"   ⚠️  Column mismatch!")
+        if missing:
+            print(f"       Missing: {missing}")
+        if extra:
+            print(f"       Extra: {extra}")
+        print(f"   🔄 Proceeding with available columns...")
+    
+    # Use only the columns that exist in both
+    valid_cols = list(expected_cols & actual_cols)
+    df_upload = df[valid_cols].copy()
+    
+    if table_name == 'tender_type_metrics' and 'tender_type' in df_upload.columns:
+        # Stamp the canonical tender category (registers any new labels in tender_types)
+        categories = tender_types.resolve_tender_categories(cur, df_upload['tender_type'].unique())
+        df_upload['tender_category'] = df_upload['tender_type'].map(categories).astype(object)
+        df_upload['tender_category'] = df_upload['tender_category'].where(df_upload['tender_category'].notna(), None)
+    
+    print(f"   📤 Uploading {len(df_upload)} rows to {table_name}")
+    
+    # Build insert query with conflict handling
+    cols = ','.join(df_upload.columns)
+    vals_placeholder = ','.join(['%s'] * len(df_upload.columns))
+    
+    # Use INSERT with ON CONFLICT DO NOTHING to avoid duplicates
+    insert_query = f"""
+        INSERT INTO {table_name} ({cols}) 
+        VALUES ({vals_placeholder})
+        ON CONFLICT DO NOTHING
+    """
+    
+    data = df_upload.values.tolist()
+    cur.executemany(insert_query, data)
+    rows_inserted = cur.rowcount
+    print(f"   ✅ Inserted {rows_inserted} rows (duplicates skipped)")
+    
+    if table_name in coverage.FEEDS and 'date' in df_upload.columns:
+        file_dates = df_upload['date'].dropna()
+        if not file_dates.empty:
+            coverage.refresh_coverage(cur, table_name, file_dates.min(), file_dates.max())
+    return rows_inserted
 
 def main():
     print("🚀 Starting upload of compiled files to Supabase...")
@@ -177,17 +183,24 @@ def main():
         print("❌ Upload cancelled.")
         return
     
-    # Process each file
-    successful_uploads = 0
-    failed_uploads = 0
-    
-    for i, excel_file in enumerate(files, 1):
-        print(f"\n📈 Progress: {i}/{len(files)}")
-        
-        if upload_file_to_supabase(excel_file):
-            successful_uploads += 1
-        else:
-            failed_uploads += 1
+    try:
+        conn = supabase_db.get_supabase_connection()
+    except Exception as e:
+        print(f"❌ Supabase connection error: {e}")
+        return
+    
+    # One session for the run; one transaction per business date, one savepoint per file
+    def report_failure(excel_file, error):
+        print(f"   ❌ {excel_file.name} rolled back: {error}")
+    
+    try:
+        loaded, failed = day_loads.load_days(
+            conn, day_loads.group_by_date(files, business_date), upload_file_to_supabase, on_error=report_failure
+        )
+    finally:
+        conn.close()
+    successful_uploads = len(loaded)
+    failed_uploads = len(failed)
     
     # Summary
     print(f"\n📊 Upload Summary:")
@@ -0,0 +1,292 @@
+"""
+Streaming ingestion: watch the download folders and compile / load reports as
+soon as they land, instead of waiting for the daily scheduled run.
+
+Watched folders:
+    data/raw_emails           DSS reports - a date is compiled and loaded once
+                              all six report types for it are present
+    data/hme/raw              HME reports - each transformed and its rows replaced
+    data/raw_emails/medallia  Medallia emails - parsed and inserted
+
+The folders are polled (works the same on the Windows task host and on
+network drives). A file is picked up once its size and mtime have been
+stable for --debounce seconds, so half-written downloads are never read.
+Work goes through a bounded queue to a single worker; when the queue is full,
+new work waits for the next poll instead of piling up. Re-sent files for a
+date that was already loaded are picked up the same way, and the rows whose
+values changed are updated (load_to_supabase mode="upsert").
+
+Usage:
+    python scripts/watch_ingest.py
+    python scripts/watch_ingest.py --interval 10 --debounce 30 --queue-size 16
+    python scripts/watch_ingest.py --process-existing   # also ingest files already there
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(BASE_DIR / "data" / "hme"))
+
+from compile_store_reports import compile_one
+from load_to_sqlite import load_to_supabase
+from dashboard.utils import raw_catalog
+from dashboard.utils.supabase_db import get_supabase_connection
+
+HME_DIR = BASE_DIR / "data" / "hme"
+MEDALLIA_DIR = raw_catalog.RAW_DIR / "medallia"
+
+# source -> (folder, glob pattern)
+WATCHED = {
+    "dss": (raw_catalog.RAW_DIR, "*.xlsx"),
+    "hme": (HME_DIR / "raw", "*.xlsx"),
+    "medallia": (MEDALLIA_DIR, "medallia_*.txt"),
+}
+POLL_SECONDS = 15
+DEBOUNCE_SECONDS = 60
+QUEUE_SIZE = 32
+
+LOG_DIR = BASE_DIR / "logs"
+LOG_DIR.mkdir(exist_ok=True)
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    handlers=[
+        logging.FileHandler(LOG_DIR / f"watch_ingest_{datetime.now():%Y%m%d}.log", encoding="utf-8"),
+        logging.StreamHandler(sys.stdout),
+    ],
+)
+
+
+def snapshot(folder: Path, pattern: str) -> dict:
+    """{path: (size, mtime_ns)} for the folder's matching files."""
+    files = {}
+    if not folder.exists():
+        return files
+    for path in folder.glob(pattern):
+        if path.name.endswith("_copy.xlsx") or path.name.startswith("~$"):  # compiled output / Excel lock files
+            continue
+        try:
+            st = path.stat()
+        except FileNotFoundError:  # removed between glob and stat
+            continue
+        files[path] = (st.st_size, st.st_mtime_ns)
+    return files
+
+
+class Debouncer:
+    """Reports a file once its fingerprint has been unchanged for `quiet` seconds."""
+
+    def __init__(self, quiet: float, baseline: dict | None = None):
+        self.quiet = quiet
+        self.handled = dict(baseline or {})  # path -> fingerprint already emitted
+        self.changing = {}                   # path -> (fingerprint, unchanged since)
+
+    def settled(self, current: dict, now: float) -> list:
+        ready = []
+        for path, fp in current.items():
+            if self.handled.get(path) == fp:
+                self.changing.pop(path, None)
+                continue
+            seen_fp, since = self.changing.get(path, (None, now))
+            if seen_fp != fp:
+                self.changing[path] = (fp, now)
+            elif now - since >= self.quiet:
+                self.handled[path] = fp
+                del self.changing[path]
+                ready.append(path)
+        for path in set(self.changing) - set(current):
+            del self.changing[path]
+        return ready
+
+
+class IngestQueue:
+    """
+    Bounded work queue keyed by job, so a burst of files for one date becomes
+    one job. Files that arrive while their job waits join it.
+    """
+
+    def __init__(self, maxsize: int):
+        self.jobs = queue.Queue(maxsize=maxsize)
+        self.lock = threading.Lock()
+        self.files = {}      # job key -> set of paths waiting for it
+        self.queued = set()  # job keys currently in the queue
+        self.backlog = set() # job keys that didn't fit; retried on the next poll
+
+    def add(self, key, path):
+        with self.lock:
+            self.files.setdefault(key, set()).add(path)
+        self._enqueue(key)
+
+    def retry_backlog(self):
+        for key in list(self.backlog):
+            self._enqueue(key)
+
+    def _enqueue(self, key):
+        with self.lock:
+            if key in self.queued:
+                return
+            try:
+                self.jobs.put_nowait(key)
+            except queue.Full:
+                if key not in self.backlog:
+                    logging.warning(f"⏳ Queue full ({self.jobs.maxsize}); {key} waits for the next poll")
+                self.backlog.add(key)
+                return
+            self.queued.add(key)
+            self.backlog.discard(key)
+
+    def take(self, key) -> set:
+        """Claim the files waiting for a job (called by the worker when it starts it)."""
+        with self.lock:
+            self.queued.discard(key)
+            return self.files.pop(key, set())
+
+    def put_back(self, key, paths):
+        with self.lock:
+            self.files.setdefault(key, set()).update(paths)
+
+
+# --- Jobs ---
+def ingest_dss_date(business_date, paths, work: IngestQueue):
+    """
+    Compile and load all of a date's reports once its six-report set is
+    complete - including those already there at startup, which the debouncer
+    never reports.
+    """
+    catalog = raw_catalog.open_catalog()
+    try:
+        raw_catalog.refresh(catalog)
+        missing = raw_catalog.missing_report_types(catalog, business_date)
+        files = raw_catalog.files_for_date(catalog, business_date)
+    finally:
+        catalog.close()
+    if missing:
+        work.put_back(("dss", business_date), paths)
+        logging.info(f"🕒 {business_date}: waiting for {', '.join(missing)}")
+        return
+
+    compiled = []
+    for path in sorted(set(files) | set(paths), key=lambda p: p.name):
+        outp = compile_one(path)
+        if outp is None:
+            logging.error(f"❌ {business_date}: could not compile {path.name}")
+        else:
+            compiled.append(outp)
+    if compiled:
+        load_to_supabase(compiled, mode="upsert")
+        logging.info(f"✅ {business_date}: loaded {len(compiled)} report(s)")
+
+
+def ingest_hme(paths):
+    """Transform each HME report that arrived and replace its (date, store) rows in hme_report."""
+    from transform_hme import parse_hme_to_desired
+    from upload_hme_to_supabase import replace_rows, to_upload_frame
+
+    conn = get_supabase_connection()
+    try:
+        for path in sorted(paths):
+            try:
+                rows = to_upload_frame(parse_hme_to_desired(path)).to_dict(orient="records")
+                inserted, deleted = replace_rows(conn, rows)
+            except Exception as e:
+                logging.error(f"❌ HME {path.name}: {e}")
+                continue
+            logging.info(f"✅ HME {path.name}: {inserted} rows loaded, {deleted} replaced")
+    finally:
+        conn.close()
+
+
+def ingest_medallia(path):
+    from process_medallia_data import process_medallia_file
+
+    conn = get_supabase_connection()
+    try:
+        inserted, duplicates = process_medallia_file(path, conn)
+    finally:
+        conn.close()
+    logging.info(f"✅ Medallia {path.name}: {inserted} inserted, {duplicates} duplicate(s)")
+
+
+def job_key(source, path):
+    if source == "dss":
+        business_date = raw_catalog.parse_business_date(path.name)
+        return ("dss", business_date) if business_date else None
+    if source == "hme":
+        return ("hme", None)
+    return ("medallia", path)
+
+
+def worker(work: IngestQueue, stop: threading.Event):
+    while not stop.is_set():
+        try:
+            key = work.jobs.get(timeout=1)
+        except queue.Empty:
+            continue
+        paths = work.take(key)
+        started = time.perf_counter()
+        try:
+            if key[0] == "dss":
+                ingest_dss_date(key[1], paths, work)
+            elif key[0] == "hme":
+                ingest_hme(paths)
+            else:
+                ingest_medallia(key[1])
+            logging.info(f"   {key[0]} job took {time.perf_counter() - started:.1f}s")
+        except Exception as e:
+            logging.error(f"❌ {key}: {e}")
+        finally:
+            work.jobs.task_done()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch the download folders and ingest reports as they arrive")
+    parser.add_argument("--interval", type=float, default=POLL_SECONDS, help=f"Seconds between polls (default {POLL_SECONDS})")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_SECONDS,
+                        help=f"Seconds a file must be unchanged before it is ingested (default {DEBOUNCE_SECONDS})")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE, help=f"Max queued jobs (default {QUEUE_SIZE})")
+    parser.add_argument("--process-existing", action="store_true", help="Also ingest files present at startup")
+    args = parser.parse_args()
+
+    debouncers = {
+        source: Debouncer(args.debounce, None if args.process_existing else snapshot(folder, pattern))
+        for source, (folder, pattern) in WATCHED.items()
+    }
+    work = IngestQueue(args.queue_size)
+    stop = threading.Event()
+    thread = threading.Thread(target=worker, args=(work, stop), daemon=True)
+    thread.start()
+
+    logging.info("👀 Watching " + ", ".join(str(folder) for folder, _ in WATCHED.values()))
+    try:
+        while True:
+            now = time.monotonic()
+            work.retry_backlog()
+            for source, (folder, pattern) in WATCHED.items():
+                for path in debouncers[source].settled(snapshot(folder, pattern), now):
+                    key = job_key(source, path)
+                    if key is None:
+                        logging.warning(f"⚠️  {path.name}: no business date in the name, skipped")
+                        continue
+                    logging.info(f"📥 {source}: {path.name}")
+                    work.add(key, path)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        logging.info("🛑 Stopping; finishing the current job...")
+    finally:
+        stop.set()
+        thread.join()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())